@@ -2,41 +2,30 @@
 """
 Match episodes to Sceneweb artworks (original plays).
 
-This script searches Sceneweb for each episode title and attempts to match
-it to an original artwork (play). When matched, it fetches playwright info.
+Each episode title is looked up in the local Sceneweb mirror (see
+mirror_sceneweb.py) and matched to an original artwork (play), with the
+playwright taken from the mirrored artist page. No network access is needed,
+so re-matching the whole catalogue takes seconds. Progress is kept in the
+jobs table (utils/job_queue.py), so an interrupted run resumes where it
+stopped.
 
 Usage:
-    python 02_match_sceneweb.py [--db DB_PATH] [--delay SECONDS]
+    python 02_match_sceneweb.py [--db DB_PATH] [--mirror MIRROR_PATH] [--rematch]
 """
 
 import argparse
-import json
 import sqlite3
 import time
 from pathlib import Path
-from datetime import datetime
-
-from utils.sceneweb_scraper import (
-    search_artworks,
-    fetch_artwork_details,
-    fetch_person_details,
-)
-
-
-def normalize_title(title: str) -> str:
-    """Normalize a title for matching."""
-    import re
-    # Remove episode numbers like "1:2", "2:2", "1/3"
-    title = re.sub(r'\s*\d+[:/]\d+\s*$', '', title)
-    # Remove parenthetical notes
-    title = re.sub(r'\s*\([^)]*\)\s*', ' ', title)
-    # Remove "Fjernsynsteatret viste:" prefix
-    title = re.sub(r'^Fjernsynsteatret viste?:?\s*', '', title, flags=re.IGNORECASE)
-    # Remove " - Introduksjon" suffix
-    title = re.sub(r'\s*-\s*[Ii]ntroduksjon\s*$', '', title)
-    # Clean up whitespace
-    title = ' '.join(title.split())
-    return title.strip()
+from typing import Optional
+
+from utils.job_queue import JobQueue, import_progress_file
+from utils.sceneweb_mirror import ScenewebMirror, connect_mirror
+from utils.titles import clean_title, find_by_title, install_normalized_titles, normalize_title
+
+
+COMMIT_EVERY = 50  # episodes per transaction
+STAGE = "sceneweb_match"
 
 
 def get_or_create_person(conn: sqlite3.Connection, name: str, sceneweb_id: int = None,
@@ -59,7 +48,6 @@ def get_or_create_person(conn: sqlite3.Connection, name: str, sceneweb_id: int =
                     death_year = COALESCE(death_year, ?)
                 WHERE id = ?
             """, (sceneweb_url, birth_year, death_year, row[0]))
-            conn.commit()
             return row[0]
 
     # Check by normalized name
@@ -76,7 +64,6 @@ def get_or_create_person(conn: sqlite3.Connection, name: str, sceneweb_id: int =
                     death_year = COALESCE(death_year, ?)
                 WHERE id = ?
             """, (sceneweb_id, sceneweb_url, birth_year, death_year, row[0]))
-            conn.commit()
         return row[0]
 
     # Create new
@@ -84,7 +71,6 @@ def get_or_create_person(conn: sqlite3.Connection, name: str, sceneweb_id: int =
         INSERT INTO persons (name, normalized_name, sceneweb_id, sceneweb_url, birth_year, death_year)
         VALUES (?, ?, ?, ?, ?, ?)
     """, (name, normalized, sceneweb_id, sceneweb_url, birth_year, death_year))
-    conn.commit()
     return cursor.lastrowid
 
 
@@ -101,9 +87,9 @@ def get_or_create_play(conn: sqlite3.Connection, title: str, playwright_id: int
         if row:
             return row[0]
 
-    # Check by title
-    cursor.execute("SELECT id FROM plays WHERE title = ?", (title,))
-    row = cursor.fetchone()
+    # Check by title, on the indexed normalized_title
+    rows = find_by_title(conn, "plays", "id", title, prefix=False)
+    row = rows[0] if rows else None
     if row:
         # Update with sceneweb info if we have it
         if sceneweb_id:
@@ -115,184 +101,146 @@ def get_or_create_play(conn: sqlite3.Connection, title: str, playwright_id: int
                     year_written = COALESCE(year_written, ?)
                 WHERE id = ?
             """, (sceneweb_id, sceneweb_url, playwright_id, year_written, row[0]))
-            conn.commit()
         return row[0]
 
     # Create new
     cursor.execute("""
-        INSERT INTO plays (title, playwright_id, sceneweb_id, sceneweb_url, year_written)
-        VALUES (?, ?, ?, ?, ?)
-    """, (title, playwright_id, sceneweb_id, sceneweb_url, year_written))
-    conn.commit()
+        INSERT INTO plays (title, normalized_title, playwright_id, sceneweb_id, sceneweb_url, year_written)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (title, normalize_title(title), playwright_id, sceneweb_id, sceneweb_url, year_written))
     return cursor.lastrowid
 
 
-def load_progress(progress_file: Path) -> dict:
-    """Load matching progress from file."""
-    if progress_file.exists():
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {"matched": {}, "no_match": [], "errors": []}
-
+def match_episode(conn: sqlite3.Connection, mirror: ScenewebMirror, prf_id: str, normalized: str) -> Optional[dict]:
+    """Link one episode to its mirrored artwork. Returns the match, or None."""
+    artwork = mirror.match_title(normalized)
+    if not artwork:
+        return None
+
+    # Get or create playwright
+    playwright_id = None
+    if artwork.playwright_name and artwork.playwright_sceneweb_id:
+        playwright = mirror.artist(artwork.playwright_sceneweb_id)
+        playwright_id = get_or_create_person(
+            conn,
+            artwork.playwright_name,
+            sceneweb_id=artwork.playwright_sceneweb_id,
+            sceneweb_url=playwright.url if playwright else None,
+            birth_year=playwright.birth_year if playwright else None,
+            death_year=playwright.death_year if playwright else None,
+        )
+
+    # Get or create play
+    play_id = get_or_create_play(
+        conn,
+        artwork.title,
+        playwright_id=playwright_id,
+        sceneweb_id=artwork.sceneweb_id,
+        sceneweb_url=artwork.url,
+        year_written=artwork.year_written,
+    )
 
-def save_progress(progress_file: Path, progress: dict):
-    """Save matching progress to file."""
-    with open(progress_file, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+    # Update episode
+    conn.execute("UPDATE episodes SET play_id = ? WHERE prf_id = ?", (play_id, prf_id))
+    return {"play_id": play_id, "sceneweb_id": artwork.sceneweb_id, "title": artwork.title}
 
 
-def match_episodes(db_path: Path, delay: float = 2.0):
-    """Match episodes to Sceneweb artworks."""
+def match_episodes(db_path: Path, mirror_path: Path, rematch: bool = False):
+    """Match episodes to Sceneweb artworks in the local mirror."""
     print(f"\n{'='*60}")
     print(f"Matching episodes to Sceneweb")
     print(f"Database: {db_path}")
-    print(f"Delay: {delay}s")
+    print(f"Mirror: {mirror_path}")
     print(f"{'='*60}\n")
 
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    install_normalized_titles(conn)
+    conn.commit()
     cursor = conn.cursor()
 
-    # Load progress
-    progress_file = db_path.parent / "sceneweb_progress.json"
-    progress = load_progress(progress_file)
+    mirror_conn = connect_mirror(mirror_path)
+    mirror = ScenewebMirror(mirror_conn)
+
+    # Progress lives in the jobs table; --rematch retries earlier misses against a refreshed mirror
+    queue = JobQueue(conn, STAGE)
+    imported = import_progress_file(queue, db_path.parent / "sceneweb_progress.json", ["matched"], ["no_match"])
+    if imported:
+        print(f"Imported {imported} tasks from sceneweb_progress.json")
+    if rematch:
+        queue.retry()
+
+    start = time.perf_counter()
 
-    # Get all episodes without a play_id
+    # Get all episodes without a play_id; newer episodes are matched first
     cursor.execute("""
-        SELECT prf_id, title FROM episodes
+        SELECT prf_id, title, year FROM episodes
         WHERE play_id IS NULL
-        ORDER BY year DESC
     """)
-    episodes = cursor.fetchall()
+    rows = cursor.fetchall()
+    episodes = {row['prf_id']: row['title'] for row in rows}
+    queue.enqueue((row['prf_id'], row['year'] or 0) for row in rows)
+    conn.commit()
 
+    counts = queue.counts()
     print(f"Found {len(episodes)} episodes without play association")
-    print(f"Already matched: {len(progress['matched'])}")
-    print(f"Known no-match: {len(progress['no_match'])}")
+    print(f"Mirrored artworks: {len(mirror)}")
+    print(f"Already matched: {counts['done']}")
+    print(f"Known no-match: {counts['no_match']}")
     print()
 
     matched_count = 0
     no_match_count = 0
     error_count = 0
 
-    for i, ep in enumerate(episodes):
-        prf_id = ep['prf_id']
-        title = ep['title']
-
-        # Skip if already processed
-        if prf_id in progress['matched'] or prf_id in progress['no_match']:
-            continue
-
-        normalized = normalize_title(title)
-        if not normalized or len(normalized) < 3:
-            progress['no_match'].append(prf_id)
-            continue
-
-        print(f"[{i+1}/{len(episodes)}] Searching: {normalized[:50]}")
-
-        try:
-            # Search Sceneweb
-            results = search_artworks(normalized, delay=delay)
+    # Lease a batch, match it, and commit its links and statuses together
+    while batch := queue.lease(COMMIT_EVERY):
+        conn.execute("BEGIN")
+        for prf_id in batch:
+            title = episodes.get(prf_id)
+            if title is None:  # linked to a play since it was queued
+                queue.done(prf_id)
+                continue
 
-            if not results:
-                print(f"  -> No results")
-                progress['no_match'].append(prf_id)
-                no_match_count += 1
-                save_progress(progress_file, progress)
+            normalized = clean_title(title)
+            if not normalized or len(normalized) < 3:
+                queue.no_match(prf_id)
                 continue
 
-            # Try to find best match
-            best_match = None
-            for result in results:
-                result_title = result['title'].lower().strip()
-                search_title = normalized.lower().strip()
-
-                # Exact match or close match
-                if result_title == search_title or search_title in result_title:
-                    best_match = result
-                    break
-
-            if not best_match:
-                # Use first result if it looks reasonable
-                if len(results) == 1:
-                    best_match = results[0]
-                else:
-                    print(f"  -> No good match in {len(results)} results")
-                    progress['no_match'].append(prf_id)
-                    no_match_count += 1
-                    save_progress(progress_file, progress)
-                    continue
-
-            # Fetch artwork details
-            print(f"  -> Found: {best_match['title']} (ID: {best_match['sceneweb_id']})")
-            artwork = fetch_artwork_details(best_match['sceneweb_id'], delay=delay)
-
-            if not artwork:
-                print(f"  -> Failed to fetch details")
-                progress['errors'].append({"prf_id": prf_id, "error": "Failed to fetch artwork"})
+            # A savepoint per episode, so a failure only undoes that episode
+            conn.execute("SAVEPOINT episode")
+            try:
+                match = match_episode(conn, mirror, prf_id, normalized)
+                conn.execute("RELEASE episode")
+            except Exception as e:
+                conn.execute("ROLLBACK TO episode")
+                conn.execute("RELEASE episode")
+                print(f"  {normalized[:40]} -> Error: {e}")
+                queue.fail(prf_id, e)
                 error_count += 1
-                save_progress(progress_file, progress)
                 continue
 
-            # Get or create playwright
-            playwright_id = None
-            if artwork.playwright_name and artwork.playwright_sceneweb_id:
-                print(f"  -> Playwright: {artwork.playwright_name}")
-
-                # Fetch playwright details
-                playwright = fetch_person_details(
-                    artwork.playwright_sceneweb_id,
-                    delay=delay
-                )
-
-                playwright_id = get_or_create_person(
-                    conn,
-                    artwork.playwright_name,
-                    sceneweb_id=artwork.playwright_sceneweb_id,
-                    sceneweb_url=playwright.url if playwright else None,
-                    birth_year=playwright.birth_year if playwright else None,
-                    death_year=playwright.death_year if playwright else None,
-                )
-
-            # Get or create play
-            play_id = get_or_create_play(
-                conn,
-                artwork.title,
-                playwright_id=playwright_id,
-                sceneweb_id=artwork.sceneweb_id,
-                sceneweb_url=artwork.url,
-                year_written=artwork.year_written,
-            )
-
-            # Update episode
-            cursor.execute(
-                "UPDATE episodes SET play_id = ? WHERE prf_id = ?",
-                (play_id, prf_id)
-            )
-            conn.commit()
-
-            progress['matched'][prf_id] = {
-                "play_id": play_id,
-                "sceneweb_id": artwork.sceneweb_id,
-                "title": artwork.title,
-            }
-            matched_count += 1
-            print(f"  -> Matched! (play_id: {play_id})")
-
-        except Exception as e:
-            print(f"  -> Error: {e}")
-            progress['errors'].append({"prf_id": prf_id, "error": str(e)})
-            error_count += 1
-
-        save_progress(progress_file, progress)
+            if match:
+                queue.done(prf_id, match)
+                matched_count += 1
+                print(f"  {normalized[:40]} -> {match['title']} (play_id: {match['play_id']})")
+            else:
+                queue.no_match(prf_id)
+                no_match_count += 1
+
+        queue.flush()
+        conn.commit()
 
+    counts = queue.counts()
     conn.close()
+    mirror_conn.close()
 
     print(f"\n{'='*60}")
-    print(f"Matching complete!")
+    print(f"Matching complete in {time.perf_counter() - start:.2f}s")
     print(f"  New matches: {matched_count}")
     print(f"  No match: {no_match_count}")
     print(f"  Errors: {error_count}")
-    print(f"  Total matched: {len(progress['matched'])}")
+    print(f"  Total matched: {counts['done']}")
     print(f"{'='*60}\n")
 
 
@@ -304,22 +252,30 @@ def main():
         help="Database path (default: data/kulturperler.db)",
     )
     parser.add_argument(
-        "--delay",
-        type=float,
-        default=2.0,
-        help="Delay between requests in seconds (default: 2.0)",
+        "--mirror",
+        default="data/sceneweb.db",
+        help="Sceneweb mirror built by mirror_sceneweb.py (default: data/sceneweb.db)",
+    )
+    parser.add_argument(
+        "--rematch",
+        action="store_true",
+        help="Retry episodes recorded as no-match or error (e.g. after refreshing the mirror)",
     )
 
     args = parser.parse_args()
 
     script_dir = Path(__file__).parent.parent
     db_path = script_dir / args.db
+    mirror_path = script_dir / args.mirror
 
     if not db_path.exists():
         print(f"Error: Database not found at {db_path}")
         return
+    if not mirror_path.exists():
+        print(f"Error: Sceneweb mirror not found at {mirror_path}; run mirror_sceneweb.py first")
+        return
 
-    match_episodes(db_path, args.delay)
+    match_episodes(db_path, mirror_path, args.rematch)
 
 
 if __name__ == "__main__":
@@ -8,43 +8,37 @@ This script searches Wikidata for plays and persons, adding:
 - Birth/death years for persons
 - Original titles and year written for plays
 
+With --index, lookups go to a local Wikidata subset built by
+build_wikidata_index.py instead of the live API: no delay, no request limit,
+and names that are missing or ambiguous locally are left for a live run.
+
+Progress is kept in the jobs table (utils/job_queue.py): plays and persons
+already looked up are skipped, failed lookups are retried with backoff.
+
 Usage:
-    python 03_enrich_wikidata.py [--db DB_PATH] [--delay SECONDS]
+    python 03_enrich_wikidata.py [--db DB_PATH] [--delay SECONDS] [--workers N] [--index INDEX_PATH]
 """
 
 import argparse
-import json
 import sqlite3
-import time
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
+from utils.db_schema import table_columns
+from utils.executor import HostLimit, run_enrichment
+from utils.job_queue import JobQueue, import_progress_file
 from utils.wikidata_api import (
     search_plays,
     fetch_play_info,
     fetch_person_info,
     search_and_match_play,
 )
+from utils.wikidata_index import WikidataIndex, connect_index
 
 
-def load_progress(progress_file: Path) -> dict:
-    """Load enrichment progress from file."""
-    if progress_file.exists():
-        with open(progress_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {
-        "plays_enriched": [],
-        "plays_no_match": [],
-        "persons_enriched": [],
-        "persons_no_match": [],
-        "errors": []
-    }
-
-
-def save_progress(progress_file: Path, progress: dict):
-    """Save enrichment progress to file."""
-    with open(progress_file, 'w', encoding='utf-8') as f:
-        json.dump(progress, f, ensure_ascii=False, indent=2)
+BATCH_SIZE = 20           # lookups per transaction
+LIVE_PERSON_LIMIT = 200   # persons looked up per run against the live API
 
 
 def search_person_wikidata(name: str, birth_year: int = None) -> dict | None:
@@ -97,187 +91,175 @@ def search_person_wikidata(name: str, birth_year: int = None) -> dict | None:
     }
 
 
-def enrich_plays(conn: sqlite3.Connection, progress: dict, progress_file: Path, delay: float):
+def run_lookups(conn: sqlite3.Connection, queue: JobQueue, items: dict, fetch, apply, delay: float,
+                index: Optional[WikidataIndex], workers: int, limit: Optional[int] = None):
+    """Live lookups run on a worker pool, spaced by delay; local ones inline."""
+    return run_enrichment(
+        conn, queue, items, fetch, apply,
+        host=lambda _: "wikidata.org",
+        default_limit=HostLimit(concurrency=workers, interval=delay),
+        workers=0 if index else workers,
+        batch_size=BATCH_SIZE,
+        limit=limit,
+    )
+
+
+def enrich_plays(conn: sqlite3.Connection, queue: JobQueue, delay: float,
+                 index: Optional[WikidataIndex] = None, workers: int = 4):
     """Enrich plays with Wikidata information."""
-    cursor = conn.cursor()
+    match_play = index.match_play if index else search_and_match_play
 
     # Get plays without wikidata_id
-    cursor.execute("""
-        SELECT id, title, original_title, year_written
-        FROM plays
-        WHERE wikidata_id IS NULL
-        ORDER BY id
-    """)
-    plays = cursor.fetchall()
+    plays = {
+        str(row[0]): row
+        for row in conn.execute("""
+            SELECT id, title, original_title, year_written
+            FROM plays
+            WHERE wikidata_id IS NULL
+            ORDER BY id
+        """)
+    }
+    queue.enqueue(plays)
+    conn.commit()
 
     print(f"\nEnriching {len(plays)} plays...")
-    enriched = 0
-    no_match = 0
-
-    for play_id, title, original_title, year_written in plays:
-        if play_id in progress['plays_enriched'] or play_id in progress['plays_no_match']:
-            continue
-
-        print(f"  Searching: {title[:50]}")
-
-        try:
-            # Search Wikidata
-            play_info = search_and_match_play(title)
-
-            if not play_info:
-                # Try original title if different
-                if original_title and original_title != title:
-                    play_info = search_and_match_play(original_title)
-
-            if not play_info:
-                print(f"    -> No match")
-                progress['plays_no_match'].append(play_id)
-                no_match += 1
-            else:
-                print(f"    -> Found: {play_info.wikidata_id}")
-
-                # Update play
-                cursor.execute("""
-                    UPDATE plays SET
-                        wikidata_id = ?,
-                        original_title = COALESCE(original_title, ?),
-                        year_written = COALESCE(year_written, ?),
-                        wikipedia_url = COALESCE(wikipedia_url, ?)
-                    WHERE id = ?
-                """, (
-                    play_info.wikidata_id,
-                    play_info.original_title,
-                    play_info.year_written,
-                    play_info.wikipedia_url,
-                    play_id
-                ))
-                conn.commit()
-
-                progress['plays_enriched'].append(play_id)
-                enriched += 1
-
-            save_progress(progress_file, progress)
-            time.sleep(delay)
-
-        except Exception as e:
-            print(f"    -> Error: {e}")
-            progress['errors'].append({"type": "play", "id": play_id, "error": str(e)})
-            save_progress(progress_file, progress)
-
-    print(f"  Enriched: {enriched}, No match: {no_match}")
-
-
-def enrich_persons(conn: sqlite3.Connection, progress: dict, progress_file: Path, delay: float):
+
+    def fetch(play):
+        _, title, original_title, _ = play
+        # Try original title if different
+        play_info = match_play(title)
+        if not play_info and original_title and original_title != title:
+            play_info = match_play(original_title)
+        return play_info
+
+    def apply(conn, play, play_info):
+        play_id, title, _, _ = play
+        print(f"  {title[:50]} -> {play_info.wikidata_id}")
+        conn.execute("""
+            UPDATE plays SET
+                wikidata_id = ?,
+                original_title = COALESCE(original_title, ?),
+                year_written = COALESCE(year_written, ?),
+                wikipedia_url = COALESCE(wikipedia_url, ?)
+            WHERE id = ?
+        """, (
+            play_info.wikidata_id,
+            play_info.original_title,
+            play_info.year_written,
+            play_info.wikipedia_url,
+            play_id
+        ))
+        return {"wikidata_id": play_info.wikidata_id}
+
+    stats = run_lookups(conn, queue, plays, fetch, apply, delay, index, workers)
+    print(f"  Enriched: {stats.done}, No match: {stats.no_match}")
+
+
+def enrich_persons(conn: sqlite3.Connection, queue: JobQueue, delay: float,
+                   index: Optional[WikidataIndex] = None, workers: int = 4):
     """Enrich persons with Wikidata information."""
-    cursor = conn.cursor()
+    has_image = "image_url" in table_columns(conn, "persons")
 
-    # Get persons without wikidata_id (prioritize those with sceneweb_id or playwright role)
-    cursor.execute("""
-        SELECT DISTINCT p.id, p.name, p.birth_year, p.death_year
+    # Get persons without wikidata_id; playwrights, then persons known to Sceneweb, first
+    rows = conn.execute("""
+        SELECT p.id, p.name, p.birth_year, p.death_year,
+               MAX(pl.id IS NOT NULL) * 2 + (p.sceneweb_id IS NOT NULL) AS priority
         FROM persons p
         LEFT JOIN plays pl ON p.id = pl.playwright_id
         WHERE p.wikidata_id IS NULL
-        ORDER BY
-            CASE WHEN pl.id IS NOT NULL THEN 0 ELSE 1 END,
-            CASE WHEN p.sceneweb_id IS NOT NULL THEN 0 ELSE 1 END,
-            p.id
-        LIMIT 200
-    """)
-    persons = cursor.fetchall()
-
-    print(f"\nEnriching {len(persons)} persons...")
-    enriched = 0
-    no_match = 0
-
-    for person_id, name, birth_year, death_year in persons:
-        if person_id in progress['persons_enriched'] or person_id in progress['persons_no_match']:
-            continue
-
-        print(f"  Searching: {name}")
-
-        try:
-            # Search Wikidata
-            result = search_person_wikidata(name, birth_year)
-
-            if not result:
-                print(f"    -> No match")
-                progress['persons_no_match'].append(person_id)
-                no_match += 1
-            else:
-                # Fetch full info
-                person_info = fetch_person_info(result['wikidata_id'])
-
-                if person_info:
-                    print(f"    -> Found: {person_info.wikidata_id} ({person_info.birth_year or '?'}-{person_info.death_year or '?'})")
-
-                    # Update person
-                    cursor.execute("""
-                        UPDATE persons SET
-                            wikidata_id = ?,
-                            birth_year = COALESCE(birth_year, ?),
-                            death_year = COALESCE(death_year, ?),
-                            nationality = COALESCE(nationality, ?),
-                            wikipedia_url = COALESCE(wikipedia_url, ?)
-                        WHERE id = ?
-                    """, (
-                        person_info.wikidata_id,
-                        person_info.birth_year,
-                        person_info.death_year,
-                        person_info.nationality,
-                        person_info.wikipedia_url,
-                        person_id
-                    ))
-                    conn.commit()
-
-                    progress['persons_enriched'].append(person_id)
-                    enriched += 1
-                else:
-                    progress['persons_no_match'].append(person_id)
-                    no_match += 1
-
-            save_progress(progress_file, progress)
-            time.sleep(delay)
-
-        except Exception as e:
-            print(f"    -> Error: {e}")
-            progress['errors'].append({"type": "person", "id": person_id, "error": str(e)})
-            save_progress(progress_file, progress)
-
-    print(f"  Enriched: {enriched}, No match: {no_match}")
-
-
-def enrich_database(db_path: Path, delay: float = 1.0):
+        GROUP BY p.id
+    """).fetchall()
+    persons = {str(row[0]): row[:4] for row in rows}
+    queue.enqueue((str(row[0]), row[4]) for row in rows)
+    conn.commit()
+
+    # The live API is slow; look up at most LIVE_PERSON_LIMIT persons per run
+    limit = None if index else LIVE_PERSON_LIMIT
+    print(f"\nEnriching up to {min(limit or len(persons), len(persons))} of {len(persons)} persons...")
+
+    def fetch(person):
+        _, name, birth_year, _ = person
+        if index:
+            return index.match_person(name, birth_year)
+        result = search_person_wikidata(name, birth_year)
+        return fetch_person_info(result["wikidata_id"]) if result else None
+
+    def apply(conn, person, person_info):
+        person_id, name, _, _ = person
+        print(f"  {name} -> {person_info.wikidata_id} ({person_info.birth_year or '?'}-{person_info.death_year or '?'})")
+        conn.execute("""
+            UPDATE persons SET
+                wikidata_id = ?,
+                birth_year = COALESCE(birth_year, ?),
+                death_year = COALESCE(death_year, ?),
+                nationality = COALESCE(nationality, ?),
+                wikipedia_url = COALESCE(wikipedia_url, ?)
+            WHERE id = ?
+        """, (
+            person_info.wikidata_id,
+            person_info.birth_year,
+            person_info.death_year,
+            person_info.nationality,
+            person_info.wikipedia_url,
+            person_id
+        ))
+        if has_image and person_info.image_url:
+            conn.execute(
+                "UPDATE persons SET image_url = COALESCE(image_url, ?) WHERE id = ?",
+                (person_info.image_url, person_id),
+            )
+        return {"wikidata_id": person_info.wikidata_id}
+
+    stats = run_lookups(conn, queue, persons, fetch, apply, delay, index, workers, limit)
+    print(f"  Enriched: {stats.done}, No match: {stats.no_match}")
+
+
+def enrich_database(db_path: Path, delay: float = 1.0, index_path: Optional[Path] = None, workers: int = 4):
     """Enrich database with Wikidata information."""
     print(f"\n{'='*60}")
     print(f"Enriching database with Wikidata")
     print(f"Database: {db_path}")
-    print(f"Delay: {delay}s")
+    print(f"Index: {index_path}" if index_path else f"Delay: {delay}s")
     print(f"{'='*60}")
 
+    index_conn = connect_index(index_path) if index_path else None
+    index = WikidataIndex(index_conn) if index_conn else None
+
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    # Load progress
-    progress_file = db_path.parent / "wikidata_progress.json"
-    progress = load_progress(progress_file)
+    # Local lookups get their own stages, so misses there are still tried live
+    suffix = "_index" if index else ""
+    play_queue = JobQueue(conn, f"wikidata_plays{suffix}")
+    person_queue = JobQueue(conn, f"wikidata_persons{suffix}")
+    if not index:
+        legacy = db_path.parent / "wikidata_progress.json"
+        imported = import_progress_file(play_queue, legacy, ["plays_enriched"], ["plays_no_match"])
+        imported += import_progress_file(person_queue, legacy, ["persons_enriched"], ["persons_no_match"])
+        if imported:
+            print(f"\nImported {imported} tasks from {legacy.name}")
+    conn.commit()
 
     print(f"\nProgress loaded:")
-    print(f"  Plays enriched: {len(progress['plays_enriched'])}")
-    print(f"  Persons enriched: {len(progress['persons_enriched'])}")
+    print(f"  Plays enriched: {play_queue.counts()['done']}")
+    print(f"  Persons enriched: {person_queue.counts()['done']}")
 
     # Enrich plays first (smaller set, more important)
-    enrich_plays(conn, progress, progress_file, delay)
+    enrich_plays(conn, play_queue, delay, index, workers)
 
     # Then enrich persons (larger set)
-    enrich_persons(conn, progress, progress_file, delay)
+    enrich_persons(conn, person_queue, delay, index, workers)
 
+    play_counts = play_queue.counts()
+    person_counts = person_queue.counts()
     conn.close()
+    if index_conn:
+        index_conn.close()
 
     print(f"\n{'='*60}")
     print(f"Enrichment complete!")
-    print(f"  Plays enriched: {len(progress['plays_enriched'])}")
-    print(f"  Persons enriched: {len(progress['persons_enriched'])}")
-    print(f"  Errors: {len(progress['errors'])}")
+    print(f"  Plays enriched: {play_counts['done']}")
+    print(f"  Persons enriched: {person_counts['done']}")
+    print(f"  Errors: {play_counts['failed'] + person_counts['failed']}")
     print(f"{'='*60}\n")
 
 
@@ -292,19 +274,35 @@ def main():
         "--delay",
         type=float,
         default=1.0,
-        help="Delay between requests in seconds (default: 1.0)",
+        help="Minimum seconds between lookup starts (default: 1.0)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent live lookups (default: 4)",
+    )
+
+    parser.add_argument(
+        "--index",
+        help="Local Wikidata subset to use instead of the live API (e.g. data/wikidata.db)",
     )
 
     args = parser.parse_args()
 
     script_dir = Path(__file__).parent.parent
     db_path = script_dir / args.db
+    index_path = script_dir / args.index if args.index else None
 
     if not db_path.exists():
         print(f"Error: Database not found at {db_path}")
         return
 
-    enrich_database(db_path, args.delay)
+    if index_path and not index_path.exists():
+        print(f"Error: Wikidata index not found at {index_path}")
+        return
+
+    enrich_database(db_path, args.delay, index_path, args.workers)
 
 
 if __name__ == "__main__":
@@ -14,6 +14,10 @@ import sqlite3
 from pathlib import Path
 from datetime import datetime
 
+from utils.migrations import run_migrations
+from utils.read_tables import refresh_read_tables
+from utils.search_index import install_search_index
+
 
 SCHEMA = """
 -- Teaterstykker (originalverk)
@@ -193,19 +197,7 @@ CREATE INDEX IF NOT EXISTS idx_episode_persons_episode ON episode_persons(episod
 CREATE INDEX IF NOT EXISTS idx_episode_persons_person ON episode_persons(person_id);
 CREATE INDEX IF NOT EXISTS idx_persons_name ON persons(normalized_name);
 
--- Full-text search
-CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
-    prf_id,
-    title,
-    description,
-    content='episodes',
-    content_rowid='rowid'
-);
-
-CREATE TRIGGER IF NOT EXISTS episodes_ai AFTER INSERT ON episodes BEGIN
-    INSERT INTO episodes_fts(rowid, prf_id, title, description)
-    VALUES (NEW.rowid, NEW.prf_id, NEW.title, NEW.description);
-END;
+-- Full-text search is installed by utils.search_index after import
 """
 
 
@@ -434,6 +426,15 @@ def build_database(data_dir: Path, db_path: Path):
     print("Adding default tags...")
     add_default_tags(conn)
 
+    print("Applying migrations...")
+    run_migrations(conn)
+
+    print("Building search index...")
+    install_search_index(conn)
+
+    print("Building read tables...")
+    refresh_read_tables(conn)
+
     # Add metadata
     cursor = conn.cursor()
     cursor.execute(
@@ -5,25 +5,18 @@ import re
 import sqlite3
 from pathlib import Path
 
+from utils.db_schema import table_exists
+from utils.grouping import part_info, refresh_performances
+
 DB_PATH = Path(__file__).parent.parent / "data" / "kulturperler.db"
 
 
 def parse_part_info(title: str) -> tuple[str | None, int | None, int | None]:
     """Extract base title and part info from title like 'Peer Gynt 1:2'."""
-    # Pattern: Title X:Y where X is part number and Y is total parts
-    match = re.search(r"^(.+?)\s+(\d+):(\d+)$", title.strip())
-    if match:
-        return match.group(1).strip(), int(match.group(2)), int(match.group(3))
-
-    # Pattern: Title - Del X (av Y)
-    match = re.search(r"^(.+?)\s*-?\s*[Dd]el\s+(\d+)(?:\s*av\s*(\d+))?", title)
-    if match:
-        base = match.group(1).strip()
-        part = int(match.group(2))
-        total = int(match.group(3)) if match.group(3) else None
-        return base, part, total
-
-    return None, None, None
+    base, part, total = part_info(title)
+    if part is None:
+        return None, None, None
+    return base, part, total
 
 
 def is_introduction(title: str, description: str | None) -> bool:
@@ -134,6 +127,8 @@ def main():
             else:
                 print(f"  Intro (no target): {title}")
 
+    # Part numbers decide each performance's representative description and image
+    refreshed = refresh_performances(conn) if table_exists(conn, "performances") else 0
     conn.commit()
     conn.close()
 
@@ -141,6 +136,7 @@ def main():
     print(f"  Parts updated: {parts_updated}")
     print(f"  Introductions found: {intros_found}")
     print(f"  Introductions linked: {intros_linked}")
+    print(f"  Performances refreshed: {refreshed}")
 
 
 if __name__ == "__main__":
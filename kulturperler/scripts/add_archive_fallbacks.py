@@ -66,7 +66,7 @@ def main():
     parser.add_argument(
         "--db-path",
         type=str,
-        default="web/static/kulturperler.db",
+        default="data/kulturperler.db",
         help="Path to database",
     )
     parser.add_argument(
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Audit script for kulturperler database person data quality issues.
+
+Playwrights without a bio are looked up on Wikipedia concurrently over one
+pooled session, through the shared lookup cache (data/cache.db), and the
+bios found are written in one statement.
+
+With --incremental only persons changed since the last incremental run
+(see utils/change_log.py) are checked, so a nightly audit costs time in
+proportion to the day's changes.
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+
+from utils.change_log import advance, changed_filter, changed_since, current_seq, watermark
+from utils.db_schema import table_exists
+from utils.executor import HostLimit, fetch_all, http_session
+from utils.kv_cache import KVCache, open_cache
+from utils.person_resolution import AUTO_THRESHOLD, resolve_persons
+from utils.reachability import live_table, mark_live
+from utils.wikidata_api import fetch_wikipedia_page
+
+CONSUMER = "audit_persons"
+WIKIPEDIA_LIMIT = HostLimit(concurrency=4, interval=0.1)
+WIKIPEDIA_CACHE_TTL = 30 * 24 * 3600  # summaries are refetched after 30 days
+
+# Statistics
+stats = {
+    "playwrights_bio_fixed": 0,
+    "playwrights_bio_not_found": 0,
+    "dates_fixed": 0,
+    "duplicates_found": 0,
+    "orphaned_persons": 0,
+    "invalid_dates_fixed": 0,
+}
+
+review_items = []
+
+
+def changed_persons(since: Optional[int], column: str = "id") -> Tuple[str, tuple]:
+    """Extra condition restricting a persons query to rows changed after since."""
+    if since is None:
+        return "", ()
+    condition, params = changed_filter("persons", column, since)
+    return f"AND {condition}", params
+
+def lookup_wikipedia(names: List[str], summaries, session, workers: int) -> Dict[str, Dict]:
+    """Wikipedia summaries for names, Norwegian first, then English.
+
+    summaries is the shared lookup cache ("wikipedia" namespace), keyed
+    "lang:name"; only names missing from it are fetched, concurrently.
+    Pages that don't exist are cached as {}, failed lookups not at all.
+    """
+    found = {}
+    remaining = list(names)
+    for lang in ("no", "en"):
+        keys = {name: f"{lang}:{name}" for name in remaining}
+        missing = {name: name for name, key in keys.items() if key not in summaries}
+        fetched = fetch_all(
+            missing,
+            lambda name: fetch_wikipedia_page(name, lang, session) or {},
+            WIKIPEDIA_LIMIT,
+            workers,
+        )
+        for name, page in fetched.items():
+            summaries[keys[name]] = {k: page[k] for k in ("extract", "description") if k in page}
+        for name in remaining:
+            page = summaries.get(keys[name])
+            if page:
+                found[name] = page
+        remaining = [name for name in remaining if name not in found]
+    return found
+
+def extract_bio_and_dates(wiki_data: Dict) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+    """Extract bio and birth/death years from Wikipedia data."""
+    bio = wiki_data.get('extract')
+    birth_year = None
+    death_year = None
+
+    # Try to extract dates from description
+    description = wiki_data.get('description', '')
+    # Common patterns: "1944-2021", "(1944-2021)", "born 1944", "died 2021"
+    import re
+
+    # Pattern: YYYY-YYYY or (YYYY-YYYY)
+    date_pattern = r'\(?(\d{4})\s*[-–—]\s*(\d{4})\)?'
+    match = re.search(date_pattern, description)
+    if match:
+        birth_year = int(match.group(1))
+        death_year = int(match.group(2))
+    else:
+        # Pattern: born YYYY
+        born_pattern = r'born\s+(\d{4})'
+        match = re.search(born_pattern, description, re.IGNORECASE)
+        if match:
+            birth_year = int(match.group(1))
+
+        # Pattern: died YYYY
+        died_pattern = r'died\s+(\d{4})'
+        match = re.search(died_pattern, description, re.IGNORECASE)
+        if match:
+            death_year = int(match.group(1))
+
+    return bio, birth_year, death_year
+
+def audit_playwrights_without_bio(conn: sqlite3.Connection, since: Optional[int] = None,
+                                  workers: int = 8, cache: Optional[KVCache] = None):
+    """Task 1: Find and fix playwrights without bio."""
+    print("\n=== TASK 1: Playwrights without bio ===")
+    cursor = conn.cursor()
+    changed, params = changed_persons(since)
+
+    cursor.execute(f"""
+        SELECT id, name, birth_year, death_year
+        FROM persons
+        WHERE id IN (SELECT DISTINCT playwright_id FROM plays WHERE playwright_id IS NOT NULL)
+        AND (bio IS NULL OR bio = '')
+        {changed}
+        ORDER BY name
+    """, params)
+
+    playwrights = cursor.fetchall()
+    print(f"Found {len(playwrights)} playwrights without bio\n")
+    if not playwrights:
+        return
+
+    own_cache = cache is None
+    if own_cache:
+        cache = open_cache()
+    session = http_session(workers)
+    try:
+        start = time.perf_counter()
+        pages = lookup_wikipedia(
+            sorted({name for _, name, _, _ in playwrights}),
+            cache.namespace("wikipedia", ttl=WIKIPEDIA_CACHE_TTL),
+            session,
+            workers,
+        )
+        print(f"Looked up {len(playwrights)} playwrights in {time.perf_counter() - start:.1f}s\n")
+    finally:
+        session.close()
+        if own_cache:
+            cache.close()
+
+    updates = []
+    for person_id, name, birth_year, death_year in playwrights:
+        wiki_data = pages.get(name)
+        if not wiki_data:
+            print(f"  ✗ {name}: not found on Wikipedia")
+            stats["playwrights_bio_not_found"] += 1
+            review_items.append(f"- [ ] {name} (id={person_id}) - Playwright without bio (not found on Wikipedia)")
+            continue
+
+        bio, wiki_birth, wiki_death = extract_bio_and_dates(wiki_data)
+        if not bio:
+            print(f"  ✗ {name}: Wikipedia page found but no bio extract")
+            stats["playwrights_bio_not_found"] += 1
+            review_items.append(f"- [ ] {name} (id={person_id}) - Playwright without bio (Wikipedia page exists but no extract)")
+            continue
+
+        print(f"  ✓ {name}: added bio from Wikipedia")
+        stats["playwrights_bio_fixed"] += 1
+        # Also fill birth/death years if missing
+        if wiki_birth and not birth_year:
+            print(f"    ✓ Added birth year: {wiki_birth}")
+            stats["dates_fixed"] += 1
+        if wiki_death and not death_year:
+            print(f"    ✓ Added death year: {wiki_death}")
+            stats["dates_fixed"] += 1
+        updates.append((bio, wiki_birth, wiki_death, person_id))
+
+    with conn:
+        conn.executemany("""
+            UPDATE persons SET
+                bio = ?,
+                birth_year = COALESCE(birth_year, ?),
+                death_year = COALESCE(death_year, ?)
+            WHERE id = ?
+        """, updates)
+
+
+def audit_duplicate_names(conn: sqlite3.Connection, since: Optional[int] = None):
+    """Task 2: Find likely duplicate persons with the entity resolver."""
+    print("\n=== TASK 2: Likely duplicate persons ===")
+    cursor = conn.cursor()
+
+    if since is not None and not changed_since(conn, "persons", since):
+        print("No persons changed, skipping\n")
+        return
+
+    result = resolve_persons(conn)
+    print(f"Found {result['duplicates']} duplicates in {result['clusters']} clusters, "
+          f"{result['review_pairs']} uncertain pairs\n")
+
+    cursor.execute("""
+        SELECT c.cluster_id, c.winner_id, c.confidence,
+               GROUP_CONCAT(p.id || ': ' || p.name || ' (' || COALESCE(p.birth_year, '?') || ')', '; ')
+        FROM person_clusters c
+        JOIN persons p ON p.id = c.person_id
+        GROUP BY c.cluster_id
+        ORDER BY c.cluster_id
+    """)
+    for cluster_id, winner_id, confidence, members in cursor.fetchall():
+        print(f"Duplicate cluster {cluster_id}: {members}")
+        review_items.append(f"- [ ] Keep id={winner_id}: {members} - Duplicate persons (confidence {confidence:.2f}) - merge with fix_duplicates.py --apply")
+        stats["duplicates_found"] += 1
+
+    cursor.execute("""
+        SELECT m.person_a, a.name, m.person_b, b.name, m.score, m.reasons
+        FROM person_match_pairs m
+        JOIN persons a ON a.id = m.person_a
+        JOIN persons b ON b.id = m.person_b
+        LEFT JOIN person_match_decisions d ON d.person_a = m.person_a AND d.person_b = m.person_b
+        WHERE m.score < ? AND d.decision IS NULL
+        ORDER BY m.score DESC
+    """, (AUTO_THRESHOLD,))
+    for id1, name1, id2, name2, score, reasons in cursor.fetchall():
+        review_items.append(f"- [ ] {name1} (id={id1}) / {name2} (id={id2}) - Possible duplicate, score {score:.2f} ({reasons})")
+
+def audit_orphaned_persons(conn: sqlite3.Connection, since: Optional[int] = None):
+    """Task 3: Find orphaned persons.
+
+    A person is orphaned when no content root reaches them, the same live set
+    cleanup_orphans.py deletes by (see utils/reachability.py).
+    """
+    print("\n=== TASK 3: Orphaned persons ===")
+    cursor = conn.cursor()
+    changed, params = changed_persons(since)
+
+    began = not conn.in_transaction
+    try:
+        mark_live(conn)
+        cursor.execute(f"""
+            SELECT id, name, birth_year, death_year
+            FROM persons
+            WHERE id NOT IN (SELECT id FROM {live_table("persons")})
+            {changed}
+            ORDER BY id
+        """, params)
+        orphaned = cursor.fetchall()
+    finally:
+        # Only the temp live sets were written; leave a caller's transaction alone
+        if began:
+            conn.rollback()
+
+    print(f"Found {len(orphaned)} orphaned persons (unreachable from any content)\n")
+
+    stats["orphaned_persons"] = len(orphaned)
+
+    if len(orphaned) > 0:
+        review_items.append(f"\n### Orphaned Persons ({len(orphaned)} total)")
+        for person_id, name, birth_year, death_year in orphaned[:50]:  # Limit to first 50
+            review_items.append(f"- [ ] {name} (id={person_id}) - Orphaned person (consider cleanup_orphans.py --apply)")
+
+def audit_invalid_dates(conn: sqlite3.Connection, since: Optional[int] = None):
+    """Task 5: Find and fix invalid birth/death years."""
+    print("\n=== TASK 5: Invalid birth/death years ===")
+    cursor = conn.cursor()
+    changed, params = changed_persons(since)
+
+    # Check for birth_year > death_year
+    cursor.execute(f"""
+        SELECT id, name, birth_year, death_year
+        FROM persons
+        WHERE birth_year > death_year
+        {changed}
+    """, params)
+
+    invalid = cursor.fetchall()
+    print(f"Found {len(invalid)} persons with birth_year > death_year")
+    for person_id, name, birth_year, death_year in invalid:
+        print(f"  {name} (id={person_id}): birth={birth_year}, death={death_year}")
+        review_items.append(f"- [ ] {name} (id={person_id}) - Birth year ({birth_year}) > death year ({death_year})")
+
+    # Check for obviously wrong years (except ancient Greeks like Sophocles)
+    cursor.execute(f"""
+        SELECT id, name, birth_year, death_year
+        FROM persons
+        WHERE (birth_year < 1500 OR birth_year > 2020 OR death_year > 2025)
+        AND birth_year > 0
+        {changed}
+    """, params)
+
+    weird_dates = cursor.fetchall()
+    print(f"\nFound {len(weird_dates)} persons with unusual years")
+    for person_id, name, birth_year, death_year in weird_dates:
+        # Sophocles is fine (-496 to -406)
+        if birth_year < 0 and name == "Sofokles":
+            print(f"  {name} (id={person_id}): Ancient playwright, dates OK")
+            continue
+
+        print(f"  {name} (id={person_id}): birth={birth_year}, death={death_year}")
+
+        # If birth year is clearly wrong (e.g., > 2020), clear it
+        if birth_year and birth_year > 2020:
+            cursor.execute("UPDATE persons SET birth_year = NULL WHERE id = ?", (person_id,))
+            print(f"    ✓ Cleared invalid birth year: {birth_year}")
+            stats["invalid_dates_fixed"] += 1
+            conn.commit()
+
+        # If death year is clearly wrong (e.g., > 2025), clear it
+        if death_year and death_year > 2025:
+            cursor.execute("UPDATE persons SET death_year = NULL WHERE id = ?", (person_id,))
+            print(f"    ✓ Cleared invalid death year: {death_year}")
+            stats["invalid_dates_fixed"] += 1
+            conn.commit()
+
+        if birth_year and (birth_year < 1500 and birth_year > 0):
+            review_items.append(f"- [ ] {name} (id={person_id}) - Unusual birth year: {birth_year}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit person data quality")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--review-file", default="data/audit_review.md")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only check persons changed since the last incremental run")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent Wikipedia lookups (default: 8)")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    review_file = script_dir / args.review_file
+
+    print("Kulturperler Database Person Audit")
+    print("=" * 50)
+
+    conn = sqlite3.connect(script_dir / args.db_path)
+    if args.incremental and not table_exists(conn, "change_log"):
+        print("Error: no change_log table; run migrate.py first")
+        conn.close()
+        return
+
+    try:
+        since = watermark(conn, CONSUMER) if args.incremental else None
+        # Taken up front: tasks commit as they go, and later changes belong to the next run
+        until = current_seq(conn)
+        if since is not None:
+            print(f"Incremental: persons changed after change_log seq {since}")
+
+        audit_playwrights_without_bio(conn, since, args.workers)
+        audit_duplicate_names(conn, since)
+        audit_orphaned_persons(conn, since)
+        audit_invalid_dates(conn, since)
+
+        if args.incremental:
+            with conn:
+                advance(conn, CONSUMER, until)
+
+        # Write review file
+        print("\n" + "=" * 50)
+        print("Writing review file...")
+
+        with open(review_file, "w") as f:
+            f.write("# Kulturperler Person Data Audit Review\n\n")
+            f.write("## Summary\n\n")
+            f.write(f"- Playwrights bio fixed: {stats['playwrights_bio_fixed']}\n")
+            f.write(f"- Playwrights bio not found: {stats['playwrights_bio_not_found']}\n")
+            f.write(f"- Birth/death dates fixed: {stats['dates_fixed']}\n")
+            f.write(f"- Invalid dates fixed: {stats['invalid_dates_fixed']}\n")
+            f.write(f"- Duplicate names found: {stats['duplicates_found']}\n")
+            f.write(f"- Orphaned persons: {stats['orphaned_persons']}\n")
+            f.write(f"\n## Issues Needing Review ({len(review_items)} items)\n\n")
+            f.write("\n".join(review_items))
+
+        print(f"Review file written to: {review_file}")
+
+        print("\n" + "=" * 50)
+        print("AUDIT SUMMARY")
+        print("=" * 50)
+        print(f"✓ Playwrights bio fixed: {stats['playwrights_bio_fixed']}")
+        print(f"✗ Playwrights bio not found: {stats['playwrights_bio_not_found']}")
+        print(f"✓ Birth/death dates fixed: {stats['dates_fixed']}")
+        print(f"✓ Invalid dates fixed: {stats['invalid_dates_fixed']}")
+        print(f"⚠️  Duplicate names found: {stats['duplicates_found']}")
+        print(f"⚠️  Orphaned persons: {stats['orphaned_persons']}")
+        print(f"\nTotal issues fixed: {stats['playwrights_bio_fixed'] + stats['dates_fixed'] + stats['invalid_dates_fixed']}")
+        print(f"Total issues for review: {len(review_items)}")
+
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Audit script for kulturperler database content quality issues.
+Performs auto-fixes and generates a review file for uncertain issues.
+
+The rules live in utils/audit.py: fix rules (encoding, whitespace) run as
+one UPDATE each using SQL functions, check rules are counted and sampled.
+All rules run in a single transaction. With --incremental only rows changed
+since the last incremental run (utils/change_log.py) are audited.
+
+Usage:
+    python audit_quality.py [--db-path PATH] [--dry-run] [--incremental] [--report PATH] [--review PATH]
+"""
+
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from utils.audit import AuditReport, run_audit
+from utils.db_schema import table_exists
+
+CONSUMER = "audit_quality"
+
+
+def write_review(report: AuditReport, path: Path):
+    """Markdown review file of the check rules that matched rows."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# Kulturperler Database Audit Review\n\n")
+        f.write(f"Generated: {datetime.now().isoformat()}\n\n")
+        f.write("## Summary\n\n")
+        f.write(f"- Auto-fixed issues: {report.fixed}\n")
+        f.write(f"- Issues requiring review: {len(report.flagged)}\n\n")
+
+        for result in report.flagged:
+            f.write(f"## {result.rule.upper()} ({result.severity})\n\n")
+            f.write(f"{result.count} {result.description[0].lower()}{result.description[1:]}\n\n")
+            for key, value in result.sample:
+                f.write(f"- {key}: '{value}'\n")
+            f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit and fix content quality issues")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--dry-run", action="store_true", help="Count fixable issues without fixing them")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only audit rows changed since the last incremental run")
+    parser.add_argument("--report", help="Write the machine-readable JSON report here")
+    parser.add_argument("--review", default="data/audit_review.md", help="Markdown review file")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("=" * 60)
+    print("KULTURPERLER DATABASE QUALITY AUDIT")
+    print("=" * 60)
+    print(f"Database: {db_path}")
+    print(f"Timestamp: {datetime.now().isoformat()}")
+    print()
+
+    conn = sqlite3.connect(db_path)
+    if args.incremental and not table_exists(conn, "change_log"):
+        print("Error: no change_log table; run migrate.py first")
+        conn.close()
+        return
+    try:
+        with conn:
+            report = run_audit(
+                conn, fix=not args.dry_run, log=print,
+                consumer=CONSUMER if args.incremental else None,
+            )
+    finally:
+        conn.close()
+
+    print()
+    print("=" * 60)
+    print("AUDIT SUMMARY")
+    print("=" * 60)
+    print(f"Total issues auto-fixed: {report.fixed}")
+    print(f"Total issues flagged for review: {len(report.flagged)}")
+    if args.incremental:
+        print(f"Changes audited: {'all rows' if report.since is None else f'after seq {report.since}'}")
+    print(f"Time: {report.seconds * 1000:.0f} ms")
+    if args.dry_run:
+        fixable = sum(r.count for r in report.results if r.severity == "fix")
+        print(f"Dry run: {fixable} fixable issues left unfixed")
+
+    if args.report:
+        report_path = script_dir / args.report
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Report written to: {report_path}")
+
+    if report.flagged:
+        review_path = script_dir / args.review
+        write_review(report, review_path)
+        print(f"Review file written to: {review_path}")
+    else:
+        print("No issues requiring review. No review file generated.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Reconcile whole harvested sources against plays or episodes in one pass.
+
+Builds TF-IDF character n-gram matrices for every item in a source and every
+target, takes the top-k cosine matches per item, blends in year proximity and
+author agreement, and stores the scored candidates in match_candidates for
+review or import. Requires numpy and scipy.
+
+Usage:
+    python batch_match_sources.py [--db-path PATH] [--data-dir PATH] [--source NAME ...]
+                                  [--target plays|episodes] [--top-k N] [--min-score X] [--dry-run]
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from utils.batch_matcher import (
+    DEFAULT_TOP_K,
+    items_from_harvest,
+    load_targets,
+    match_batch,
+    write_candidates,
+)
+
+
+# Harvested source files under data/raw (see import_external.py); patterns
+# may glob, and harvest_metadata.json files are skipped
+SOURCE_FILES = {
+    "internet_archive": "internet_archive/items.json",
+    "youtube": "youtube_channels/all_videos.json",
+    "vimeo": "vimeo_channels/*.json",
+    "nationaltheatret": "nationaltheatret/ntv_videos.json",
+    "det_norske_teatret": "det_norske_teatret/programs.json",
+    "kilden": "kilden/videos.json",
+    "archive_unmatched": "../archive_unmatched.json",
+}
+
+
+def load_source(raw_dir: Path, source: str) -> list[dict]:
+    """Items from every file matching the source's pattern; warns when none exist."""
+    paths = [p for p in sorted(raw_dir.glob(SOURCE_FILES[source])) if p.name != "harvest_metadata.json"]
+    if not paths:
+        print(f"\n{source}: no files matching {raw_dir / SOURCE_FILES[source]}, skipped")
+        return []
+    items = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            items.extend(json.load(f))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch match harvested sources")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument(
+        "--source",
+        nargs="+",
+        choices=sorted(SOURCE_FILES),
+        default=sorted(SOURCE_FILES),
+        help="Sources to reconcile (default: all)",
+    )
+    parser.add_argument("--target", choices=["plays", "episodes"], default="plays")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    parser.add_argument("--min-score", type=float, default=0.3)
+    parser.add_argument("--dry-run", action="store_true", help="Print matches without writing")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+    raw_dir = script_dir / args.data_dir / "raw"
+
+    print("=" * 60)
+    print(f"Batch matching sources against {args.target}")
+    if args.dry_run:
+        print("(DRY RUN)")
+    print("=" * 60)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        targets = load_targets(conn, args.target)
+        print(f"Targets: {len(targets)}")
+
+        for source in args.source:
+            items = items_from_harvest(load_source(raw_dir, source))
+            if not items:
+                continue
+
+            start = time.perf_counter()
+            candidates = match_batch(items, targets, top_k=args.top_k, min_score=args.min_score)
+            elapsed = time.perf_counter() - start
+
+            matched = {c.item_key for c in candidates}
+            print(f"\n{source}: {len(items)} items, {len(matched)} with candidates "
+                  f"({len(candidates)} rows) in {elapsed:.2f}s")
+
+            if args.dry_run:
+                for c in candidates:
+                    if c.rank == 1:
+                        print(f"  {c.score:.2f} '{c.item_title[:40]}' -> '{c.target_title[:40]}'")
+            else:
+                write_candidates(conn, source, args.target, candidates)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rebuild the denormalized mv_* read tables used by the web listing queries.
+
+Run after every data change (import, enrichment, regrouping) so the web app
+sees current counts. See utils/read_tables.py.
+
+Usage:
+    python build_read_tables.py [--db-path PATH]
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from utils.read_tables import refresh_read_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build web read tables")
+    parser.add_argument(
+        "--db-path",
+        default="data/kulturperler.db",
+        help="Path to database (default: data/kulturperler.db)",
+    )
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        start = time.perf_counter()
+        counts = refresh_read_tables(conn)
+        for table, count in counts.items():
+            print(f"  {table}: {count} rows")
+        print(f"Done in {time.perf_counter() - start:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Install or rebuild the full-text search index, or run a test query against it.
+
+Creates FTS5 tables with update/delete triggers for episodes, performances,
+plays and persons (see utils/search_index.py).
+
+Usage:
+    python build_search_index.py [--db-path PATH] [--rebuild] [--query TEXT]
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from utils.search_index import install_search_index, rebuild_search_index, timed_search
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build full-text search index")
+    parser.add_argument(
+        "--db-path",
+        default="data/kulturperler.db",
+        help="Path to database (default: data/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Only repopulate existing FTS tables (e.g. after VACUUM)",
+    )
+    parser.add_argument(
+        "--query",
+        help="Run a search query and print ranked results",
+    )
+    parser.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if args.query:
+            hits, elapsed = timed_search(conn, args.query, limit=args.limit)
+            for hit in hits:
+                print(f"  {hit.relevance:5.2f}  {hit.entity:<12} {hit.key:<14} {hit.label}")
+            print(f"{len(hits)} hits in {elapsed:.1f} ms")
+            return
+
+        start = time.perf_counter()
+        if args.rebuild:
+            rebuild_search_index(conn)
+            print("Rebuilt search index")
+        else:
+            installed = install_search_index(conn)
+            for table, columns in installed.items():
+                count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                print(f"  {table}: {count} rows ({', '.join(columns)})")
+        print(f"Done in {time.perf_counter() - start:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
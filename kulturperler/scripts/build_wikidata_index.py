@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Build the local Wikidata subset from a JSON dump.
+
+Streams a dump (latest-all.json.gz / .bz2, or an uncompressed extract with
+one entity per line) and keeps persons with stage and writing occupations,
+literary and dramatic works and countries. Enrichment can then run against
+the index with `03_enrich_wikidata.py --index data/wikidata.db`.
+
+Usage:
+    python build_wikidata_index.py DUMP [--index PATH]
+"""
+
+import argparse
+from pathlib import Path
+
+from utils.wikidata_index import WikidataIndex, connect_index, ingest_dump, open_dump
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a local Wikidata subset from a dump")
+    parser.add_argument("dump", help="Wikidata JSON dump or extract")
+    parser.add_argument("--index", default="data/wikidata.db", help="Index database path")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    dump_path = Path(args.dump)
+    index_path = script_dir / args.index
+
+    print("=" * 60)
+    print("Building Wikidata index")
+    print(f"Dump: {dump_path}")
+    print(f"Index: {index_path}")
+    print("=" * 60)
+
+    conn = connect_index(index_path)
+    try:
+        with open_dump(dump_path) as lines:
+            counts = ingest_dump(conn, lines, source=dump_path.name)
+        print(f"Parsed {counts['parsed']} candidate entities in {counts['seconds']:.1f}s")
+        print(f"  Persons:   {counts['person']}")
+        print(f"  Works:     {counts['work']}")
+        print(f"  Countries: {counts['country']}")
+        print(f"Index holds {len(WikidataIndex(conn))} persons and works")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
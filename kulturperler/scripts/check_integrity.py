@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Check relational integrity: dangling foreign keys, duplicate junction rows
+and orphaned rows, all in one pass (see utils/integrity.py).
+
+With --fix the fixable issues are repaired and the missing foreign key and
+junction key indexes are created, in a single transaction.
+
+Usage:
+    python check_integrity.py [--db-path PATH] [--fix] [--report PATH]
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from utils.integrity import scan_integrity
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check relational integrity")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--fix", action="store_true", help="Repair fixable issues and add missing indexes")
+    parser.add_argument("--report", help="Write the machine-readable JSON report here")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("=" * 60)
+    print("Relational integrity check")
+    print(f"Database: {db_path}")
+    print("=" * 60)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            report = scan_integrity(conn, fix=args.fix)
+    finally:
+        conn.close()
+
+    for issue in report.issues:
+        fixed = f", {issue.fixed} fixed ({issue.action})" if issue.fixed else f" ({issue.action})"
+        print(f"  {issue.check:<12} {issue.table}: {issue.count}{fixed}")
+        print(f"    {issue.detail}")
+    if report.clean:
+        print("  No issues found.")
+
+    if report.created_indexes:
+        print(f"\nCreated indexes: {', '.join(report.created_indexes)}")
+    elif report.missing_indexes:
+        print(f"\nMissing indexes (add with --fix): {', '.join(report.missing_indexes)}")
+
+    print(f"\nTotal fixed: {report.fixed}")
+    print(f"Time: {report.seconds * 1000:.0f} ms")
+
+    if args.report:
+        report_path = script_dir / args.report
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Report written to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Clean up unreachable rows of every entity type.
+
+A row is kept when it can be reached from an episode, an external
+performance, an NRK program about a person or a non-NRK performance (see
+utils/reachability.py). Persons credited only on performances, external
+performances or NRK programs stay; plays, performances, tags and external
+resources nobody reaches any more are removed with their links.
+
+Without --apply only a report is printed. With it everything is deleted in
+one transaction, cheap enough to run after every import.
+
+Usage:
+    python cleanup_orphans.py [--db-path PATH] [--apply] [--report PATH]
+"""
+
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from utils.reachability import collect_garbage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete rows no content root can reach")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--apply", action="store_true", help="Delete the unreachable rows (default: report only)")
+    parser.add_argument("--report", help="Write the machine-readable JSON report here")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("=" * 60)
+    print("KULTURPERLER UNREACHABLE ROW CLEANUP")
+    print("=" * 60)
+    print(f"Database: {db_path}")
+    print()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            report = collect_garbage(conn, apply=args.apply)
+            if not args.apply:
+                conn.rollback()
+    finally:
+        conn.close()
+
+    print(f"{'table':<24} {'live':>8} {'dead':>8} {'deleted':>8}")
+    for result in report.results:
+        print(f"{result.table:<24} {result.live:>8} {result.dead:>8} {result.deleted:>8}")
+        if result.sample:
+            print(f"  e.g. {', '.join(str(key) for key in result.sample[:10])}")
+        for link, count in result.owned_deleted.items():
+            print(f"  + {count} rows from {link}")
+
+    print()
+    print(f"Unreachable rows: {report.dead}")
+    if args.apply:
+        print(f"Deleted: {report.deleted}")
+    elif report.dead:
+        print("Report only; run with --apply to delete")
+    print(f"Time: {report.seconds * 1000:.0f} ms")
+
+    if args.report:
+        report_path = script_dir / args.report
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Report written to: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,12 @@ This script:
 3. Inserts links into the play_external_links table with type='bokselskap'
 """
 
+import argparse
 import sqlite3
-import re
 from pathlib import Path
 
+from utils.titles import normalize_title
+
 # Bokselskap plays data (from the plan file)
 BOKSELSKAP_PLAYS = [
     {"title": "Den Politiske Kandstøber", "author": "Ludvig Holberg", "url": "https://www.bokselskap.no/boker/kandstober"},
@@ -49,15 +51,6 @@ BOKSELSKAP_PLAYS = [
     {"title": "Den store barnedåpen", "author": "Oskar Braaten", "url": "https://www.bokselskap.no/boker/barnedaapen"},
 ]
 
-def normalize_title(title: str) -> str:
-    """Normalize title for matching: lowercase, remove punctuation, normalize whitespace."""
-    title = title.lower()
-    # Remove punctuation including Norwegian special chars that might vary
-    title = re.sub(r'[^\w\s]', '', title)
-    # Normalize whitespace
-    title = re.sub(r'\s+', ' ', title).strip()
-    return title
-
 def normalize_author(author: str) -> str:
     """Extract last name for author matching."""
     parts = author.split()
@@ -164,7 +157,11 @@ def match_plays(db_path: str):
         print("\nAll plays matched successfully!")
 
 if __name__ == "__main__":
-    db_path = Path(__file__).parent / "static" / "kulturperler.db"
+    parser = argparse.ArgumentParser(description="Link plays to bokselskap.no texts")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    args = parser.parse_args()
+
+    db_path = Path(__file__).parent.parent / args.db_path
     if not db_path.exists():
         print(f"Error: Database not found at {db_path}")
         exit(1)
@@ -25,19 +25,10 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "static" / "kulturperler.db"
-CACHE_PATH = Path(__file__).parent.parent / "static" / "nrk_about_cache.json"
-ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
-
-def load_cache():
-    if CACHE_PATH.exists():
-        with open(CACHE_PATH) as f:
-            return json.load(f)
-    return {}
+from utils.kv_cache import open_cache
 
-def save_cache(cache):
-    with open(CACHE_PATH, 'w') as f:
-        json.dump(cache, f, indent=2, ensure_ascii=False)
+DB_PATH = Path(__file__).parent.parent / "data" / "kulturperler.db"
+ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
 
 def parse_duration(iso_duration):
     """Parse ISO 8601 duration (e.g., PT1H17M7.56S) to seconds."""
@@ -82,9 +73,12 @@ def get_series_details(series_id):
         return None
 
 def ai_assess_relevance(playwright_name, playwright_years, program_title, program_description, cache):
-    """Use Claude to assess if program is actually about the playwright."""
+    """Use Claude to assess if program is actually about the playwright.
+
+    cache is the "ai" namespace of the lookup cache.
+    """
 
-    cache_key = f"ai:{playwright_name}:{program_title}"
+    cache_key = f"{playwright_name}:{program_title}"
     if cache_key in cache:
         return cache[cache_key]
 
@@ -192,7 +186,8 @@ def main():
     cursor.execute("SELECT id FROM nrk_about_programs")
     existing_about = {row['id'] for row in cursor.fetchall()}
 
-    cache = load_cache()
+    cache = open_cache()
+    assessments = cache.namespace("ai")
     total_added = 0
     total_rejected = 0
 
@@ -329,7 +324,7 @@ def main():
                 name, years,
                 candidate['title'],
                 candidate['description'],
-                cache
+                assessments
             )
 
             is_relevant = assessment.get('is_about_playwright', False)
@@ -364,8 +359,6 @@ def main():
 
             time.sleep(0.3)  # Rate limit AI calls
 
-        # Save cache periodically
-        save_cache(cache)
         time.sleep(0.5)
 
     # Summary
@@ -391,7 +384,7 @@ def main():
     for row in cursor.fetchall():
         print(f"  {row[1]}: {row[0]} ({row[2]} min)")
 
-    save_cache(cache)
+    cache.close()
     conn.close()
 
 if __name__ == '__main__':
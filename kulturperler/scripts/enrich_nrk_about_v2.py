@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Fetch NRK programs about playwrights - comprehensive version.
+Fetches broadly and outputs candidates for manual review (data/nrk_candidates.json).
+NRK searches are cached in data/cache.db (namespace "search").
+
+Searches run concurrently (utils/executor.py) within a per-host limit.
+Progress and each playwright's candidates are kept in the jobs table (stage
+"nrk_about_search"), so an interrupted run resumes and the candidates file
+always covers every playwright searched so far.
+
+Usage:
+    python enrich_nrk_about_v2.py [--db-path PATH] [--workers N] [--retry]
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+import requests
+
+from utils.executor import HostLimit, http_session, run_enrichment
+from utils.job_queue import JobQueue
+from utils.kv_cache import open_cache
+
+
+STAGE = "nrk_about_search"
+NRK_LIMIT = HostLimit(concurrency=4, interval=0.1)
+
+def search_nrk(query, session, page_size=50):
+    """Search NRK for programs matching query. Errors are raised, so the task is retried."""
+    url = f"https://psapi.nrk.no/search?q={requests.utils.quote(query)}&pageSize={page_size}"
+    resp = session.get(url, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+def get_program_details(program_id, session):
+    """Get details for a single program."""
+    url = f"https://psapi.nrk.no/programs/{program_id}"
+    try:
+        resp = session.get(url, timeout=10)
+        if resp.ok:
+            return resp.json()
+    except:
+        pass
+    return None
+
+def get_series_details(series_id, session):
+    """Get details for a series."""
+    url = f"https://psapi.nrk.no/tv/catalog/series/{series_id}"
+    try:
+        resp = session.get(url, timeout=10)
+        if resp.ok:
+            return resp.json()
+    except:
+        pass
+    return None
+
+def extract_duration(data):
+    """Extract duration in seconds from API response."""
+    duration_str = data.get('duration', '') or data.get('actualDuration', '')
+    if not duration_str:
+        return 0
+
+    # Parse ISO 8601 duration (e.g., PT1H30M45S)
+    match = re.match(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?', duration_str)
+    if match:
+        hours = int(match.group(1) or 0)
+        minutes = int(match.group(2) or 0)
+        seconds = float(match.group(3) or 0)
+        return int(hours * 3600 + minutes * 60 + seconds)
+    return 0
+
+def extract_year(data):
+    """Extract year from API response."""
+    for field in ['firstAired', 'usageRights.availableFrom', 'productionYear']:
+        val = data.get(field, '')
+        if val:
+            match = re.search(r'(\d{4})', str(val))
+            if match:
+                return int(match.group(1))
+    return None
+
+def extract_image(data):
+    """Extract image URL from API response."""
+    images = data.get('webImages', []) or data.get('image', {}).get('webImages', [])
+    if images:
+        # Get largest image
+        for img in sorted(images, key=lambda x: x.get('width', 0), reverse=True):
+            if 'url' in img:
+                return img['url']
+            if 'uri' in img:
+                return img['uri']
+    return None
+
+def search_queries(name):
+    """The playwright's name, and the last name on its own."""
+    queries = [name]
+    name_parts = name.split()
+    if len(name_parts) > 1:
+        queries.append(name_parts[-1])  # Last name
+    return queries
+
+def find_candidates(person_id, name, searches, existing_ids, session):
+    """Search NRK for programs about one playwright.
+
+    searches holds cached results by query; new results are added to it.
+    """
+    queries = search_queries(name)
+    seen_ids = set()
+    candidates = []
+
+    for query in queries:
+        if query not in searches:
+            searches[query] = search_nrk(query, session)
+
+        results = searches[query]
+        if not results:
+            continue
+
+        for hit_wrapper in results.get('hits', []):
+            hit = hit_wrapper.get('hit', hit_wrapper)
+
+            prog_id = hit.get('id', '')
+            prog_type = hit.get('type', '')
+            title = hit.get('title', '')
+
+            if not prog_id or prog_id in seen_ids:
+                continue
+            seen_ids.add(prog_id)
+
+            # Skip if already in our database
+            if prog_id in existing_ids:
+                continue
+
+            # Skip news and radio
+            category = hit.get('category', {}).get('displayValue', '').lower()
+            if any(x in category for x in ['nyheter', 'radio', 'nrk1', 'nrk2']):
+                continue
+
+            # Get details
+            if prog_type == 'serie':
+                details = get_series_details(prog_id, session)
+                if details:
+                    duration = 0
+                    # Sum up episode durations
+                    for season in details.get('seasons', []):
+                        for ep in season.get('episodes', []):
+                            duration += extract_duration(ep)
+
+                    desc = details.get('description', '') or details.get('subtitle', '')
+                    year = extract_year(details)
+                    image = extract_image(details)
+
+                    candidates.append({
+                        'id': prog_id,
+                        'person_id': person_id,
+                        'person_name': name,
+                        'title': title,
+                        'description': desc,
+                        'duration': duration,
+                        'year': year,
+                        'image_url': image,
+                        'program_type': 'serie',
+                        'nrk_url': f"https://tv.nrk.no/serie/{prog_id}"
+                    })
+            else:
+                details = get_program_details(prog_id, session)
+                if details:
+                    desc = details.get('description', '') or details.get('titles', {}).get('subtitle', '')
+                    duration = extract_duration(details)
+                    year = extract_year(details)
+                    image = extract_image(details)
+
+                    # Skip very short programs (< 5 min)
+                    if duration > 0 and duration < 300:
+                        continue
+
+                    candidates.append({
+                        'id': prog_id,
+                        'person_id': person_id,
+                        'person_name': name,
+                        'title': title,
+                        'description': desc,
+                        'duration': duration,
+                        'year': year,
+                        'image_url': image,
+                        'program_type': 'program',
+                        'nrk_url': f"https://tv.nrk.no/program/{prog_id}"
+                    })
+
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find NRK programs about playwrights")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retry", action="store_true", help="Search again for playwrights that failed earlier")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    conn = sqlite3.connect(script_dir / args.db_path)
+    session = http_session(args.workers)
+
+    # Get existing programs and episodes to avoid duplicates
+    existing_ids = {row[0] for row in conn.execute("SELECT id FROM nrk_about_programs")}
+    existing_ids |= {row[0] for row in conn.execute("SELECT prf_id FROM episodes")}
+
+    # Get all playwrights, with their cached searches (the cache connection stays on this thread)
+    cache = open_cache()
+    searches = cache.namespace("search")
+    playwrights = {}
+    for person_id, name in conn.execute("""
+        SELECT DISTINCT p.id, p.name
+        FROM persons p
+        JOIN plays pl ON p.id = pl.playwright_id
+        ORDER BY p.name
+    """):
+        cached = {query: searches[query] for query in search_queries(name) if query in searches}
+        playwrights[str(person_id)] = (person_id, name, cached)
+    print(f"Found {len(playwrights)} playwrights with plays")
+
+    queue = JobQueue(conn, STAGE)
+    queue.enqueue(playwrights)
+    if args.retry:
+        queue.retry()
+    conn.commit()
+
+    def fetch(playwright):
+        person_id, name, cached = playwright
+        found = dict(cached)
+        candidates = find_candidates(person_id, name, found, existing_ids, session)
+        return {'searches': {q: r for q, r in found.items() if q not in cached}, 'candidates': candidates}
+
+    def apply(conn, playwright, result):
+        _, name, _ = playwright
+        for query, results in result['searches'].items():
+            searches[query] = results
+        candidates = result['candidates']
+        if candidates:
+            print(f"\n  Candidates for {name}:")
+            for c in candidates:
+                dur_str = f"{c['duration']//60}m" if c['duration'] else "?"
+                print(f"    [{c['program_type']}] {c['title']} ({dur_str})")
+        return candidates
+
+    stats = run_enrichment(
+        conn, queue, playwrights, fetch, apply,
+        host=lambda _: "psapi.nrk.no",
+        default_limit=NRK_LIMIT,
+        workers=args.workers,
+    )
+    cache.close()
+
+    # Candidates of every playwright searched so far, also in earlier runs
+    all_candidates = [
+        c
+        for (result,) in conn.execute(
+            "SELECT result FROM jobs WHERE stage = ? AND status = 'done' AND result IS NOT NULL ORDER BY task_key",
+            (STAGE,),
+        )
+        for c in json.loads(result)
+        if c['id'] not in existing_ids
+    ]
+    conn.close()
+
+    # Save candidates for review
+    candidates_path = script_dir / "data" / "nrk_candidates.json"
+    with open(candidates_path, 'w') as f:
+        json.dump(all_candidates, f, indent=2, ensure_ascii=False)
+
+    print(f"\n\n=== SUMMARY ===")
+    print(f"Playwrights searched: {stats.done}, failed: {stats.failed}")
+    print(f"Total candidates: {len(all_candidates)}")
+    print(f"Saved to: {candidates_path}")
+    print("\nReview the candidates and run with --import to add selected ones")
+
+    # Group by playwright for easier review
+    by_playwright = {}
+    for c in all_candidates:
+        name = c['person_name']
+        if name not in by_playwright:
+            by_playwright[name] = []
+        by_playwright[name].append(c)
+
+    print("\n=== CANDIDATES BY PLAYWRIGHT ===")
+    for name, cands in sorted(by_playwright.items()):
+        print(f"\n{name}:")
+        for c in cands:
+            dur_str = f"{c['duration']//60}m" if c['duration'] else "?"
+            desc_preview = c['description'][:80] + "..." if c['description'] and len(c['description']) > 80 else c['description']
+            print(f"  - {c['title']} ({dur_str}) [{c['program_type']}]")
+            print(f"    {desc_preview}")
+            print(f"    URL: {c['nrk_url']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Enrich plays and playwrights with data from Sceneweb.
+Fetches playwright info, year written, original title, etc.
+Caches fetched data in data/cache.db (namespace "artwork") to avoid repeated requests.
+
+Lookups run concurrently (utils/executor.py) within a per-host limit, and
+progress is kept in the jobs table (stage "sceneweb_artworks"), so an
+interrupted run resumes; failed lookups are retried with backoff.
+
+Usage:
+    python enrich_playwrights.py [--db-path PATH] [--workers N] [--retry]
+"""
+
+import argparse
+import re
+import sqlite3
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from utils.executor import HostLimit, http_session, run_enrichment
+from utils.job_queue import JobQueue
+from utils.kv_cache import open_cache
+
+
+STAGE = "sceneweb_artworks"
+SCENEWEB_LIMIT = HostLimit(concurrency=2, interval=0.25)
+
+
+def get_sceneweb_artwork(url, session):
+    """Fetch artwork data from Sceneweb."""
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+
+    data = {}
+
+    # Get playwright/author
+    author_link = soup.select_one('a[href*="/nb/person/"]')
+    if author_link:
+        data['playwright_name'] = author_link.get_text(strip=True)
+        data['playwright_sceneweb_url'] = 'https://sceneweb.no' + author_link['href'] if author_link['href'].startswith('/') else author_link['href']
+        # Extract sceneweb ID from URL
+        match = re.search(r'/person/(\d+)/', data['playwright_sceneweb_url'])
+        if match:
+            data['playwright_sceneweb_id'] = int(match.group(1))
+
+    # Look for original title
+    text = soup.get_text()
+    # Pattern: "Originaltittel" followed by title in quotes
+    orig_match = re.search(r'[Oo]riginaltittel[:\s]+["\']?([^"\'\n]+)["\']?', text)
+    if orig_match:
+        data['original_title'] = orig_match.group(1).strip()
+
+    # Look for quoted foreign titles (French, German, etc.)
+    if 'original_title' not in data:
+        for pattern in [r'"(L\'[^"]+)"', r'"(Le [^"]+)"', r'"(La [^"]+)"', r'"(Der [^"]+)"', r'"(Die [^"]+)"', r'"(The [^"]+)"']:
+            match = re.search(pattern, text)
+            if match:
+                data['original_title'] = match.group(1)
+                break
+
+    # Look for year written in the info table
+    for row in soup.select('dl'):
+        dts = row.select('dt')
+        dds = row.select('dd')
+        for dt, dd in zip(dts, dds):
+            label = dt.get_text(strip=True).lower()
+            value = dd.get_text(strip=True)
+            if 'skrevet' in label or 'år' in label or 'premiered' in label:
+                year_match = re.search(r'(\d{4})', value)
+                if year_match:
+                    data['year_written'] = int(year_match.group(1))
+
+    # Try alternate structure for year
+    for line in text.split('\n'):
+        if 'Skrevet' in line or 'Uroppført' in line:
+            year_match = re.search(r'(\d{4})', line)
+            if year_match and 'year_written' not in data:
+                data['year_written'] = int(year_match.group(1))
+
+    return data
+
+
+def get_sceneweb_person(url, session):
+    """Fetch person data from Sceneweb."""
+    response = session.get(url, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+
+    data = {}
+
+    # Get birth/death years from text
+    text = soup.get_text()
+
+    # Look for patterns like "1684-1754" or "(1684-1754)" or "f. 1684, d. 1754"
+    year_pattern = re.search(r'\(?\s*(\d{4})\s*[-–]\s*(\d{4})\s*\)?', text)
+    if year_pattern:
+        data['birth_year'] = int(year_pattern.group(1))
+        data['death_year'] = int(year_pattern.group(2))
+
+    # Look for Wikipedia link
+    wiki_link = soup.select_one('a[href*="wikipedia.org"]')
+    if wiki_link:
+        data['wikipedia_url'] = wiki_link['href']
+
+    return data
+
+
+def get_or_create_playwright(conn, name, data, person_data):
+    row = conn.execute("SELECT id FROM persons WHERE name = ?", (name,)).fetchone()
+    if row:
+        return row[0]
+    cursor = conn.execute("""
+        INSERT INTO persons (name, normalized_name, birth_year, death_year, sceneweb_id, sceneweb_url, wikipedia_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (
+        name,
+        name.lower(),
+        person_data.get('birth_year'),
+        person_data.get('death_year'),
+        data.get('playwright_sceneweb_id'),
+        data.get('playwright_sceneweb_url'),
+        person_data.get('wikipedia_url')
+    ))
+    print(f"  Created new person {name} with ID {cursor.lastrowid}")
+    return cursor.lastrowid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrich plays and playwrights from Sceneweb")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retry", action="store_true", help="Retry plays without Sceneweb data earlier")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    conn = sqlite3.connect(script_dir / args.db_path)
+    conn.row_factory = sqlite3.Row
+    session = http_session(args.workers)
+
+    # Load cache
+    cache = open_cache()
+    artworks = cache.namespace("artwork")
+    print(f"Loaded cache with {len(artworks)} artworks")
+
+    # Get plays with sceneweb URLs but missing data; cached pages are looked up
+    # here, since the cache connection stays on this thread
+    plays = {
+        str(row['id']): dict(row, artwork=artworks.get(row['sceneweb_url']) or None)
+        for row in conn.execute("""
+            SELECT id, title, sceneweb_url, playwright_id, year_written, original_title
+            FROM plays
+            WHERE sceneweb_url IS NOT NULL
+              AND (playwright_id IS NULL OR year_written IS NULL OR original_title IS NULL)
+            ORDER BY id
+        """)
+    }
+    print(f"Found {len(plays)} plays to enrich")
+    known_names = {row[0] for row in conn.execute("SELECT name FROM persons")}
+
+    queue = JobQueue(conn, STAGE)
+    queue.enqueue(plays)
+    if args.retry:
+        queue.retry()
+    conn.commit()
+
+    def fetch(play):
+        data = play['artwork'] or get_sceneweb_artwork(play['sceneweb_url'], session)
+        if not data:
+            return None
+        # Person pages only for playwrights about to be created
+        name = data.get('playwright_name')
+        person = {}
+        if name and not play['playwright_id'] and name not in known_names and data.get('playwright_sceneweb_url'):
+            person = get_sceneweb_person(data['playwright_sceneweb_url'], session)
+        return {'artwork': data, 'person': person}
+
+    def apply(conn, play, result):
+        data = result['artwork']
+        if play['artwork'] is None:
+            artworks[play['sceneweb_url']] = data
+
+        updates = {}
+        if 'playwright_name' in data and not play['playwright_id']:
+            updates['playwright_id'] = get_or_create_playwright(conn, data['playwright_name'], data, result['person'])
+            known_names.add(data['playwright_name'])
+        if 'year_written' in data and not play['year_written']:
+            updates['year_written'] = data['year_written']
+        if 'original_title' in data and not play['original_title']:
+            updates['original_title'] = data['original_title']
+
+        if updates:
+            conn.execute(
+                f"UPDATE plays SET {', '.join(f'{column} = ?' for column in updates)} WHERE id = ?",
+                (*updates.values(), play['id']),
+            )
+            print(f"  {play['title']}: {', '.join(f'{column}={value}' for column, value in updates.items())}")
+        return sorted(updates)
+
+    stats = run_enrichment(
+        conn, queue, plays, fetch, apply,
+        host=lambda _: "sceneweb.no",
+        default_limit=SCENEWEB_LIMIT,
+        workers=args.workers,
+    )
+
+    print(f"\nCache holds {len(artworks)} artworks")
+    cache.close()
+
+    # Summary
+    with_playwright = conn.execute("SELECT COUNT(*) FROM plays WHERE playwright_id IS NOT NULL").fetchone()[0]
+    with_year = conn.execute("SELECT COUNT(*) FROM plays WHERE year_written IS NOT NULL").fetchone()[0]
+    with_original = conn.execute("SELECT COUNT(*) FROM plays WHERE original_title IS NOT NULL").fetchone()[0]
+    total = conn.execute("SELECT COUNT(*) FROM plays").fetchone()[0]
+
+    print(f"\n=== Summary ===")
+    print(f"Looked up: {stats.done} with data, {stats.no_match} without, {stats.failed} failed")
+    print(f"Plays with playwright: {with_playwright}/{total}")
+    print(f"Plays with year written: {with_year}/{total}")
+    print(f"Plays with original title: {with_original}/{total}")
+
+    conn.close()
+
+if __name__ == '__main__':
+    main()
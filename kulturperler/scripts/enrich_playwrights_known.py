@@ -4,10 +4,12 @@ Enrich plays with known playwright mappings.
 Uses a curated list of well-known plays and their authors.
 """
 
+import argparse
 import sqlite3
-import re
+from pathlib import Path
+
+from utils.titles import normalize_title
 
-DB_PATH = '../static/kulturperler.db'
 
 # Known plays and their authors (Norwegian titles -> Author)
 KNOWN_PLAYS = {
@@ -209,20 +211,18 @@ def get_or_create_person(cur, name, birth_year=None, death_year=None):
     """, (name, normalized, birth_year, death_year))
     return cur.lastrowid
 
-def normalize_title(title):
-    """Normalize title for matching."""
-    title = re.sub(r'\s*\(\d{4}\)\s*$', '', title)
-    title = re.sub(r'\s*-\s*radioteater\s*$', '', title, flags=re.I)
-    title = title.strip()
-    return title
-
 def main():
-    conn = sqlite3.connect(DB_PATH)
+    parser = argparse.ArgumentParser(description="Enrich plays with known playwright mappings")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    conn = sqlite3.connect(script_dir / args.db_path)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
 
-    # Build case-insensitive lookup
-    known_lookup = {k.lower(): v for k, v in KNOWN_PLAYS.items()}
+    # Build lookup by normalized title
+    known_lookup = {normalize_title(k): v for k, v in KNOWN_PLAYS.items()}
 
     # Get plays without playwright
     cur.execute("SELECT id, title FROM plays WHERE playwright_id IS NULL")
@@ -234,7 +234,7 @@ def main():
     for play in plays:
         play_id = play['id']
         title = play['title']
-        norm_title = normalize_title(title).lower()
+        norm_title = normalize_title(title)
 
         if norm_title in known_lookup:
             author = known_lookup[norm_title]
@@ -2,26 +2,23 @@
 """
 Enrich plays with playwright information from Wikidata.
 
-Uses SPARQL queries to find plays by title and get their authors.
+Uses SPARQL queries to find plays by title and get their authors, or with
+--index a local Wikidata subset built by build_wikidata_index.py.
 """
 
+import argparse
 import sqlite3
 import requests
 import time
 import re
 import json
+from pathlib import Path
 from urllib.parse import quote
 
-DB_PATH = '../static/kulturperler.db'
-WIKIDATA_SPARQL = 'https://query.wikidata.org/sparql'
+from utils.titles import clean_title
+from utils.wikidata_index import WikidataIndex, connect_index
 
-def normalize_title(title):
-    """Normalize title for matching."""
-    # Remove common suffixes and clean up
-    title = re.sub(r'\s*\(\d{4}\)\s*$', '', title)  # Remove year
-    title = re.sub(r'\s*-\s*radioteater\s*$', '', title, flags=re.I)
-    title = title.strip()
-    return title
+WIKIDATA_SPARQL = 'https://query.wikidata.org/sparql'
 
 def search_wikidata_play(title):
     """Search Wikidata for a play by title and return author info."""
@@ -124,6 +121,21 @@ def search_wikidata_fuzzy(title):
 
     return None
 
+def search_local_index(index, title):
+    """Author of a play from the local index, shaped like the SPARQL bindings."""
+    play = index.match_play(title)
+    if not play or not play.author_wikidata_id:
+        return None
+    author = index.person(play.author_wikidata_id)
+    if author is None:
+        return None
+    binding = {'authorLabel': {'value': author.name}}
+    if author.birth_year:
+        binding['authorBirth'] = {'value': str(author.birth_year)}
+    if author.death_year:
+        binding['authorDeath'] = {'value': str(author.death_year)}
+    return [binding]
+
 def get_or_create_person(cur, name, birth_year=None, death_year=None):
     """Get existing person or create new one."""
     normalized = name.lower().strip()
@@ -154,7 +166,14 @@ def extract_year(date_str):
     return None
 
 def main():
-    conn = sqlite3.connect(DB_PATH)
+    parser = argparse.ArgumentParser(description="Enrich plays with playwrights from Wikidata")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--index", help="Local Wikidata subset to use instead of SPARQL")
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    conn = sqlite3.connect(script_dir / args.db_path)
+    index = WikidataIndex(connect_index(script_dir / args.index)) if args.index else None
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
 
@@ -174,16 +193,19 @@ def main():
     for i, play in enumerate(plays):
         play_id = play['id']
         title = play['title']
-        norm_title = normalize_title(title)
+        norm_title = clean_title(title)
 
         print(f"[{i+1}/{len(plays)}] {title}...", end=' ', flush=True)
 
-        # Try exact search first
-        results = search_wikidata_play(norm_title)
+        if index:
+            results = search_local_index(index, norm_title)
+        else:
+            # Try exact search first
+            results = search_wikidata_play(norm_title)
 
-        # Try fuzzy search if no results
-        if not results:
-            results = search_wikidata_fuzzy(norm_title)
+            # Try fuzzy search if no results
+            if not results:
+                results = search_wikidata_fuzzy(norm_title)
 
         if results:
             # Get author from first result with author
@@ -207,7 +229,8 @@ def main():
             not_found.append(title)
 
         # Rate limiting
-        time.sleep(0.5)
+        if not index:
+            time.sleep(0.5)
 
         # Commit periodically
         if updated % 10 == 0:
@@ -131,7 +131,7 @@ def main():
 
     # Connect to database
     print("\n3. Loading kulturperler database...")
-    conn = sqlite3.connect("/Users/stian/src/nrk/kulturperler/web/static/kulturperler.db")
+    conn = sqlite3.connect("/Users/stian/src/nrk/kulturperler/data/kulturperler.db")
     cursor = conn.cursor()
 
     # Get all episodes from database with their NRK URLs
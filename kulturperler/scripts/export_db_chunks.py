@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Write the web database as page-aligned chunks plus a JSON manifest.
+
+The chunks and manifest suit an HTTP-range/lazy virtual filesystem in the
+client (sql.js-httpvfs "chunked" mode), so a cold page load only fetches the
+B-tree pages its queries read. Run after export_web_db.py.
+
+The web app still downloads the whole database, so the chunks are written
+outside web/static and are not deployed; --report sizes the possible gain.
+
+Usage:
+    python export_db_chunks.py [--db-path PATH] [--out-dir PATH] [--chunk-size N] [--report]
+"""
+
+import argparse
+from pathlib import Path
+
+from utils.db_chunks import DEFAULT_CHUNK_SIZE, query_chunk_upper_bounds, write_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export chunked web database")
+    parser.add_argument(
+        "--db-path",
+        default="data/web/kulturperler.db",
+        help="Web export to split (default: data/web/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default="data/db_chunks",
+        help="Output directory, not deployed (default: data/db_chunks)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Chunk size in bytes, a multiple of the page size (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Report an upper bound on the chunks each standard query reads",
+    )
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+    out_dir = script_dir / args.out_dir
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        print("Run export_web_db.py first")
+        return
+
+    manifest = write_chunks(db_path, out_dir, args.chunk_size)
+    print(f"Wrote {len(manifest['chunks'])} chunks of {manifest['chunk_size']} bytes "
+          f"({manifest['total_length']} bytes, page size {manifest['page_size']}) to {out_dir}")
+
+    if args.report:
+        total = len(manifest["chunks"])
+        print(f"\n{'=' * 60}")
+        print("Chunks per route (cold load, upper bound: whole B-trees opened)")
+        print(f"{'=' * 60}")
+        for name, chunks in query_chunk_upper_bounds(db_path, args.chunk_size).items():
+            fetched = sum(manifest["chunks"][i]["length"] for i in chunks)
+            print(f"  {name:<28} {len(chunks):>3}/{total} chunks, {fetched // 1024} KB  {chunks}")
+
+
+if __name__ == "__main__":
+    main()
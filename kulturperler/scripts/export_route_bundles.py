@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Precompute one static JSON bundle per route entity.
+
+Each detail route (episode/[id], performance/[id], person/[id], play/[id]) and
+the persons listing gets a single compact JSON file holding everything its
+page shows, so it can render from one small fetch without loading SQLite.
+Every table is read once and grouped in memory. Bundles are written as
+gzip-compressed .json.gz files under data/bundles; nothing in the web app
+reads them yet, so they are not deployed.
+
+Usage:
+    python export_route_bundles.py [--db-path PATH] [--out-dir PATH]
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from utils.db_schema import table_exists
+
+
+ROLE_ORDER = {"director": 1, "playwright": 2, "actor": 3}
+NRK_ABOUT_LIMIT = 10
+
+
+def compact(row: sqlite3.Row) -> dict:
+    """Row as a dict without NULL columns."""
+    return {key: row[key] for key in row.keys() if row[key] is not None}
+
+
+def load_rows(conn: sqlite3.Connection, table: str) -> list[sqlite3.Row]:
+    if not table_exists(conn, table):
+        return []
+    return conn.execute(f"SELECT * FROM {table}").fetchall()
+
+
+def group_by(rows: list, key: str) -> dict:
+    groups = defaultdict(list)
+    for row in rows:
+        if row[key] is not None:
+            groups[row[key]].append(row)
+    return groups
+
+
+def contributor_sort_key(item: dict):
+    return (ROLE_ORDER.get(item.get("role"), 4), item.get("person_name", ""))
+
+
+class BundleBuilder:
+    """Loads every table once and assembles per-entity bundles in memory."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.persons = {row["id"]: row for row in load_rows(conn, "persons")}
+        self.plays = {row["id"]: row for row in load_rows(conn, "plays")}
+        self.performances = {row["id"]: row for row in load_rows(conn, "performances")}
+        self.episodes = {row["prf_id"]: row for row in load_rows(conn, "episodes")}
+
+        episode_rows = sorted(self.episodes.values(), key=lambda e: e["prf_id"])
+        self.episodes_by_performance = group_by(episode_rows, "performance_id")
+        self.episodes_by_play = group_by(episode_rows, "play_id")
+        self.performances_by_work = group_by(self.performances.values(), "work_id")
+        self.plays_by_playwright = group_by(self.plays.values(), "playwright_id")
+
+        episode_persons = load_rows(conn, "episode_persons")
+        self.episode_persons_by_episode = group_by(episode_persons, "episode_id")
+        self.episode_persons_by_person = group_by(episode_persons, "person_id")
+
+        self.performance_persons_by_performance = group_by(
+            load_rows(conn, "performance_persons"), "performance_id"
+        )
+        self.links_by_play = group_by(load_rows(conn, "play_external_links"), "play_id")
+        self.nrk_about_by_person = group_by(load_rows(conn, "nrk_about_programs"), "person_id")
+
+        resources = {row["id"]: row for row in load_rows(conn, "external_resources")}
+        self.resources_by_person = defaultdict(list)
+        for link in load_rows(conn, "person_resources"):
+            resource = resources.get(link["resource_id"])
+            if resource is not None and resource["is_working"] != 0:
+                self.resources_by_person[link["person_id"]].append(resource)
+
+    def person_name(self, person_id) -> str | None:
+        person = self.persons.get(person_id)
+        return person["name"] if person else None
+
+    def play_with_playwright(self, play_id) -> dict | None:
+        play = self.plays.get(play_id)
+        if play is None:
+            return None
+        result = compact(play)
+        name = self.person_name(play["playwright_id"])
+        if name:
+            result["playwright_name"] = name
+        return result
+
+    def contributors(self, rows: list) -> list[dict]:
+        result = []
+        for row in rows:
+            item = compact(row)
+            item["person_name"] = self.person_name(row["person_id"]) or ""
+            result.append(item)
+        result.sort(key=contributor_sort_key)
+        return result
+
+    def performance_summary(self, perf: sqlite3.Row) -> dict:
+        """Performance with the derived fields the listings show."""
+        result = compact(perf)
+        media = self.episodes_by_performance.get(perf["id"], [])
+        result["media_count"] = len(media)
+        image = next((e["image_url"] for e in media if e["image_url"]), None) or perf["image_url"]
+        if image:
+            result["image_url"] = image
+        directors = sorted(
+            self.person_name(pp["person_id"]) or ""
+            for pp in self.performance_persons_by_performance.get(perf["id"], [])
+            if pp["role"] == "director"
+        )
+        if directors:
+            result["director_name"] = directors[0]
+        return result
+
+    def episode_bundle(self, episode: sqlite3.Row) -> dict:
+        result = compact(episode)
+        play = self.plays.get(episode["play_id"])
+        if play is not None:
+            result["play_title"] = play["title"]
+            name = self.person_name(play["playwright_id"])
+            if name:
+                result["playwright_name"] = name
+        return {
+            "episode": result,
+            "contributors": self.contributors(self.episode_persons_by_episode.get(episode["prf_id"], [])),
+        }
+
+    def performance_bundle(self, perf: sqlite3.Row) -> dict:
+        performance = self.performance_summary(perf)
+        work = self.play_with_playwright(perf["work_id"])
+        if work:
+            performance["work_title"] = work["title"]
+            if "playwright_id" in work:
+                performance["playwright_id"] = work["playwright_id"]
+            if "playwright_name" in work:
+                performance["playwright_name"] = work["playwright_name"]
+
+        others = [
+            self.performance_summary(other)
+            for other in self.performances_by_work.get(perf["work_id"], [])
+            if other["id"] != perf["id"]
+        ]
+        others.sort(key=lambda p: p.get("year") or 0, reverse=True)
+
+        return {
+            "performance": performance,
+            "work": work,
+            "contributors": self.contributors(self.performance_persons_by_performance.get(perf["id"], [])),
+            "media": [compact(e) for e in self.episodes_by_performance.get(perf["id"], [])],
+            "other_performances": others,
+        }
+
+    def play_bundle(self, play: sqlite3.Row) -> dict:
+        by_medium = {"tv": [], "radio": []}
+        for perf in self.performances_by_work.get(play["id"], []):
+            summary = self.performance_summary(perf)
+            summary["media"] = [
+                compact(e) for e in self.episodes_by_performance.get(perf["id"], [])
+                if not e["is_introduction"]
+            ]
+            # Performances without a medium are TV, the column default
+            medium = (perf["medium"] if "medium" in perf.keys() else None) or "tv"
+            by_medium.setdefault(medium, []).append(summary)
+        for perfs in by_medium.values():
+            perfs.sort(key=lambda p: p.get("year") or 0, reverse=True)
+
+        playwright = self.persons.get(play["playwright_id"])
+        return {
+            "play": self.play_with_playwright(play["id"]),
+            "playwright": compact(playwright) if playwright else None,
+            "tv_performances": by_medium["tv"],
+            "radio_performances": by_medium["radio"],
+            "external_links": sorted(
+                (compact(link) for link in self.links_by_play.get(play["id"], [])),
+                key=lambda link: link.get("title", ""),
+            ),
+        }
+
+    def person_bundle(self, person: sqlite3.Row) -> dict:
+        plays_written = []
+        for play in self.plays_by_playwright.get(person["id"], []):
+            perfs = self.performances_by_work.get(play["id"], [])
+            image = next(
+                (e["image_url"] for perf in perfs
+                 for e in self.episodes_by_performance.get(perf["id"], []) if e["image_url"]),
+                None,
+            )
+            item = {"id": play["id"], "title": play["title"], "performance_count": len(perfs)}
+            if play["year_written"] is not None:
+                item["year_written"] = play["year_written"]
+            if image:
+                item["image_url"] = image
+            plays_written.append(item)
+        plays_written.sort(key=lambda p: (p.get("year_written") or 0, p["title"]))
+
+        # Plays per role, aggregated over this person's episodes (playwright shown above)
+        by_role = defaultdict(dict)
+        for ep in self.episode_persons_by_person.get(person["id"], []):
+            if ep["role"] == "playwright":
+                continue
+            episode = self.episodes.get(ep["episode_id"])
+            if episode is None or episode["play_id"] not in self.plays:
+                continue
+            play = self.plays[episode["play_id"]]
+            entry = by_role[ep["role"]].setdefault(play["id"], {
+                "play_id": play["id"],
+                "title": play["title"],
+                "episode_count": 0,
+                "images": [],
+                "years": [],
+                "playwright_name": self.person_name(play["playwright_id"]),
+            })
+            entry["episode_count"] += 1
+            if episode["image_url"]:
+                entry["images"].append(episode["image_url"])
+            if episode["year"] is not None:
+                entry["years"].append(episode["year"])
+
+        plays_by_role = []
+        for role, plays in by_role.items():
+            items = []
+            for entry in plays.values():
+                images = entry.pop("images")
+                years = entry.pop("years")
+                entry["image_url"] = min(images) if images else None
+                entry["year"] = min(years) if years else None
+                items.append({k: v for k, v in entry.items() if v is not None})
+            items.sort(key=lambda p: p.get("year") or 0, reverse=True)
+            plays_by_role.append({"role": role, "plays": items})
+
+        nrk_about = sorted(
+            self.nrk_about_by_person.get(person["id"], []),
+            key=lambda p: p["interest_score"] or 0,
+            reverse=True,
+        )[:NRK_ABOUT_LIMIT]
+
+        return {
+            "person": compact(person),
+            "plays_written": plays_written,
+            "plays_by_role": plays_by_role,
+            "nrk_about_programs": [compact(p) for p in nrk_about],
+            "resources": [compact(r) for r in self.resources_by_person.get(person["id"], [])],
+        }
+
+    def persons_bundle(self) -> dict:
+        playwrights = []
+        for person_id, plays in self.plays_by_playwright.items():
+            person = self.persons.get(person_id)
+            if person is None:
+                continue
+            performed = [p for p in plays if self.performances_by_work.get(p["id"])]
+            if not performed:
+                continue
+            item = {
+                "id": person["id"],
+                "name": person["name"],
+                "birth_year": person["birth_year"],
+                "death_year": person["death_year"],
+                "nationality": person["nationality"],
+                "play_count": len(performed),
+                "performance_count": sum(len(self.performances_by_work[p["id"]]) for p in performed),
+            }
+            playwrights.append({k: v for k, v in item.items() if v is not None})
+        playwrights.sort(key=lambda p: p["name"])
+
+        nationalities = sorted({p["nationality"] for p in playwrights if p.get("nationality")})
+        return {"playwrights": playwrights, "nationalities": nationalities}
+
+
+def write_bundle(path: Path, bundle: dict) -> tuple[int, int]:
+    """Write bundle as gzipped compact JSON to path + ".gz". Returns (raw, compressed) size."""
+    data = json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    path.with_name(path.name + ".gz").write_bytes(compressed)
+    return len(data), len(compressed)
+
+
+def export_bundles(conn: sqlite3.Connection, out_dir: Path) -> dict[str, tuple[int, int, int]]:
+    """Write all bundles. Returns {kind: (count, raw bytes, compressed bytes)}."""
+    builder = BundleBuilder(conn)
+
+    kinds = {
+        "episode": (builder.episodes.values(), "prf_id", builder.episode_bundle),
+        "performance": (builder.performances.values(), "id", builder.performance_bundle),
+        "play": (builder.plays.values(), "id", builder.play_bundle),
+        "person": (builder.persons.values(), "id", builder.person_bundle),
+    }
+
+    stats = {}
+    for kind, (rows, key, build) in kinds.items():
+        kind_dir = out_dir / kind
+        if kind_dir.exists():
+            shutil.rmtree(kind_dir)
+        kind_dir.mkdir(parents=True)
+        raw = compressed = 0
+        for row in rows:
+            sizes = write_bundle(kind_dir / f"{row[key]}.json", build(row))
+            raw += sizes[0]
+            compressed += sizes[1]
+        stats[kind] = (len(rows), raw, compressed)
+
+    stats["persons"] = (1, *write_bundle(out_dir / "persons.json", builder.persons_bundle()))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export per-route JSON bundles")
+    parser.add_argument(
+        "--db-path",
+        default="data/kulturperler.db",
+        help="Path to database (default: data/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default="data/bundles",
+        help="Output directory, not deployed (default: data/bundles)",
+    )
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+    out_dir = script_dir / args.out_dir
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        return
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stats = export_bundles(conn, out_dir)
+    finally:
+        conn.close()
+
+    for kind, (count, raw, compressed) in stats.items():
+        avg = compressed // count if count else 0
+        print(f"  {kind:<12} {count:>6} bundles, {raw // 1024:>6} KB raw, "
+              f"{compressed // 1024:>6} KB gzip (avg {avg} B)")
+    print(f"Done in {time.perf_counter() - start:.2f}s -> {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
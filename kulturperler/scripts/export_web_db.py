@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Export the slim, read-only database the web app downloads.
+
+Copies only the tables and columns the routes need from the working database,
+builds the mv_* read tables, adds the indexes the web queries use, runs
+ANALYZE and VACUUM, and prints a size report. The export itself is written to
+data/web; only its content-hashed and gzip copies plus the current.json
+manifest the web app reads are published to web/static/db (see
+utils/db_artifacts.py). The working database lives in data/ (05_build_db.py's
+output) and is never copied into web/static.
+
+Usage:
+    python export_web_db.py [--db-path PATH] [--output PATH] [--page-size N]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from utils.db_artifacts import publish_artifacts
+from utils.web_export import DEFAULT_PAGE_SIZE, export_web_db
+
+# Only the hashed artifacts and current.json are copied here
+ARTIFACT_DIR = "web/static/db"
+
+# Old working copy location, removed once data/kulturperler.db is newer
+LEGACY_WORKING_DB = "web/static/kulturperler.db"
+
+
+def format_bytes(n: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def print_report(report: dict):
+    source = report["source_bytes"]
+    output = report["output_bytes"]
+
+    print(f"\n{'=' * 60}")
+    print("Size report")
+    print(f"{'=' * 60}")
+    print(f"  Working database: {format_bytes(source)}")
+    print(f"  Web export:       {format_bytes(output)} ({output / source:.0%} of working db)")
+    print(f"  Page size:        {report['page_size']}")
+
+    if report["table_bytes"]:
+        print("\n  Per table (including indexes):")
+        for table, size in report["table_bytes"].items():
+            rows = report["rows"].get(table)
+            rows_str = f"{rows} rows" if rows is not None else ""
+            print(f"    {table:<24} {format_bytes(size):>10}  {rows_str}")
+
+
+def print_artifacts(manifest: dict):
+    raw = manifest["bytes"]
+    print(f"\n  Published version {manifest['version']}:")
+    for encoding, info in manifest["files"].items():
+        print(f"    {encoding:<10} {info['file']:<36} {format_bytes(info['bytes']):>10} "
+              f"({info['bytes'] / raw:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export slim web database")
+    parser.add_argument(
+        "--db-path",
+        default="data/kulturperler.db",
+        help="Working database (default: data/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--output",
+        default="data/web/kulturperler.db",
+        help="Web export path, published from here (default: data/web/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"SQLite page size for the export (default: {DEFAULT_PAGE_SIZE})",
+    )
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+    output = script_dir / args.output
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        return
+
+    legacy = script_dir / LEGACY_WORKING_DB
+    if legacy.exists():
+        if legacy.stat().st_mtime <= db_path.stat().st_mtime:
+            legacy.unlink()
+            print(f"Removed old working copy {legacy}")
+        else:
+            print(f"Warning: {legacy} is newer than {db_path} and was left in place.")
+            print("  Move its changes into the working database, then delete it.")
+
+    start = time.perf_counter()
+    report = export_web_db(db_path, output, page_size=args.page_size)
+    manifest = publish_artifacts(output, script_dir / ARTIFACT_DIR)
+    print_report(report)
+    print_artifacts(manifest)
+    print(f"\nWrote {output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
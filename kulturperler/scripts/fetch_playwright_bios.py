@@ -1,98 +1,98 @@
 #!/usr/bin/env python3
 """
 Fetch bios for playwrights from Wikipedia.
+
+Lookups run concurrently (utils/executor.py) within a per-host limit, and
+progress is kept in the jobs table, so an interrupted run resumes.
+
+Usage:
+    python fetch_playwright_bios.py [--db-path PATH] [--workers N] [--retry]
 """
 
+import argparse
 import sqlite3
-import time
-import urllib.parse
-import urllib.request
-import json
 from pathlib import Path
 
+from utils.executor import HostLimit, http_session, run_enrichment
+from utils.job_queue import JobQueue
+from utils.wikidata_api import fetch_wikipedia_summary
 
-def fetch_wikipedia_summary(name: str, lang: str = "no") -> str | None:
-    """Fetch summary from Wikipedia API."""
-    import subprocess
 
-    # Try Norwegian Wikipedia first, then English
-    for wiki_lang in [lang, "en"]:
-        try:
-            encoded_name = name.replace(" ", "_")
-            url = f"https://{wiki_lang}.wikipedia.org/api/rest_v1/page/summary/{encoded_name}"
+STAGE = "playwright_bios"
+MAX_BIO_LENGTH = 2000
+WIKIPEDIA_LIMIT = HostLimit(concurrency=4, interval=0.1)
 
-            result = subprocess.run(
-                ["curl", "-s", "-H", "User-Agent: KulturperlerBot/1.0", url],
-                capture_output=True,
-                text=True,
-                timeout=15
-            )
 
-            if result.returncode == 0 and result.stdout:
-                data = json.loads(result.stdout)
-                if data.get("type") == "standard" and data.get("extract"):
-                    return data["extract"]
-        except Exception as e:
-            pass
-
-    return None
+def main():
+    parser = argparse.ArgumentParser(description="Fetch playwright bios from Wikipedia")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--retry", action="store_true", help="Retry playwrights not found earlier")
 
+    args = parser.parse_args()
 
-def main():
     script_dir = Path(__file__).parent.parent
-    db_path = script_dir / "web" / "static" / "kulturperler.db"
+    db_path = script_dir / args.db_path
 
     print("=" * 60)
     print("Fetching bios for playwrights")
     print("=" * 60)
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    session = http_session(args.workers)
 
     # Get playwrights without bios
-    cursor.execute("""
-        SELECT DISTINCT p.id, p.name
-        FROM persons p
-        WHERE p.id IN (SELECT DISTINCT playwright_id FROM plays WHERE playwright_id IS NOT NULL)
-        AND (p.bio IS NULL OR p.bio = '')
-        ORDER BY p.name
-    """)
-
-    playwrights = cursor.fetchall()
+    playwrights = {
+        str(person_id): (person_id, name)
+        for person_id, name in conn.execute("""
+            SELECT DISTINCT p.id, p.name
+            FROM persons p
+            WHERE p.id IN (SELECT DISTINCT playwright_id FROM plays WHERE playwright_id IS NOT NULL)
+            AND (p.bio IS NULL OR p.bio = '')
+        """)
+    }
     print(f"Found {len(playwrights)} playwrights without bios")
 
-    updated = 0
-    not_found = []
-
-    for person_id, name in playwrights:
-        print(f"  Fetching: {name}...", end=" ", flush=True)
-
-        bio = fetch_wikipedia_summary(name)
-
-        if bio:
-            # Truncate if too long
-            if len(bio) > 2000:
-                bio = bio[:1997] + "..."
-
-            cursor.execute("UPDATE persons SET bio = ? WHERE id = ?", (bio, person_id))
-            print("OK")
-            updated += 1
-        else:
-            print("not found")
-            not_found.append(name)
-
-        time.sleep(0.5)  # Be nice to Wikipedia
-
+    queue = JobQueue(conn, STAGE)
+    queue.enqueue(playwrights)
+    if args.retry:
+        queue.retry()
     conn.commit()
+
+    def fetch(playwright):
+        # Norwegian Wikipedia first, then English
+        _, name = playwright
+        return fetch_wikipedia_summary(name, "no", session) or fetch_wikipedia_summary(name, "en", session)
+
+    def apply(conn, playwright, bio):
+        person_id, _ = playwright
+        if len(bio) > MAX_BIO_LENGTH:
+            bio = bio[:MAX_BIO_LENGTH - 3] + "..."
+        conn.execute("UPDATE persons SET bio = ? WHERE id = ?", (bio, person_id))
+
+    stats = run_enrichment(
+        conn, queue, playwrights, fetch, apply,
+        host=lambda _: "wikipedia.org",
+        default_limit=WIKIPEDIA_LIMIT,
+        workers=args.workers,
+    )
+
+    not_found = conn.execute("""
+        SELECT p.name FROM jobs j JOIN persons p ON p.id = CAST(j.task_key AS INTEGER)
+        WHERE j.stage = ? AND j.status = 'no_match'
+        ORDER BY p.name
+    """, (STAGE,)).fetchall()
     conn.close()
 
     print(f"\n{'=' * 60}")
     print("Results:")
-    print(f"  Bios updated: {updated}")
+    print(f"  Bios updated: {stats.done}")
+    print(f"  Errors: {stats.failed}")
+    print(f"  Time: {stats.seconds:.1f}s ({stats.rate:.1f} lookups/s)")
     print(f"  Not found: {len(not_found)}")
     if not_found:
         print(f"\nNot found on Wikipedia:")
-        for name in not_found:
+        for (name,) in not_found:
             print(f"  - {name}")
     print(f"{'=' * 60}")
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Fix duplicate persons and merge them.
+
+Duplicates come from the entity resolver (resolve_persons.py): each cluster
+in person_clusters is merged into its winner in one set-based pass over all
+referencing tables. Known pairs are recorded as manual decisions so they are
+merged even if their names drift.
+
+By default the planned merges are only listed, for review. Record a verdict
+for a wrong pair with `resolve_persons.py --different ID ID`, then run again
+with --apply to merge.
+
+Usage:
+    python fix_duplicates.py [--db-path PATH] [--apply]
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from utils.person_merge import merge_persons_bulk
+from utils.person_resolution import record_decision, resolve_persons
+
+# Pairs confirmed by hand: (person_a, person_b, note)
+KNOWN_DUPLICATES = [
+    (3094, 3210, "Bertolt Brecht"),
+    (775, 2703, "Åsmund Feidje"),
+    (3117, 3134, "Lars Norén"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge duplicate persons found by the resolver")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--apply", action="store_true", help="Merge; without it the merges are only listed")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("Kulturperler Database - Fix Duplicates")
+    print("=" * 50)
+
+    conn = sqlite3.connect(db_path)
+
+    try:
+        with conn:
+            for a, b, note in KNOWN_DUPLICATES:
+                record_decision(conn, a, b, "same", note)
+
+        result = resolve_persons(conn)
+        print(f"Resolver found {result['clusters']} clusters ({result['duplicates']} duplicates)")
+
+        merges = conn.execute("""
+            SELECT c.person_id, c.winner_id, p.name, w.name, c.confidence
+            FROM person_clusters c
+            JOIN persons p ON p.id = c.person_id
+            JOIN persons w ON w.id = c.winner_id
+            WHERE c.person_id != c.winner_id
+            ORDER BY c.winner_id, c.person_id
+        """).fetchall()
+        for remove_id, keep_id, name, keep_name, confidence in merges:
+            print(f"  {name} (id={remove_id}) -> {keep_name} (id={keep_id}), confidence {confidence:.2f}")
+
+        if not args.apply:
+            print(f"\nDry run: {len(merges)} persons would be merged.")
+            print("Mark wrong pairs with resolve_persons.py --different ID ID, then re-run with --apply.")
+            return
+
+        result = merge_persons_bulk(conn, [(remove_id, keep_id) for remove_id, keep_id, *_ in merges])
+        print(f"\nMerged {result.merged} persons")
+        for table, count in result.rewritten.items():
+            print(f"  Updated {count} {table} records")
+        for table, count in result.collapsed.items():
+            print(f"  Removed {count} duplicate {table} records")
+        for column, count in result.filled.items():
+            print(f"  Filled {column} on {count} persons")
+
+        print("\n" + "=" * 50)
+        print("✓ All duplicates fixed!")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,32 +13,11 @@ import argparse
 import json
 import re
 import sqlite3
-import unicodedata
 from datetime import datetime
 from pathlib import Path
 
-
-def normalize_title(title: str) -> str:
-    """Normalize a title for matching - remove dates, episode info, etc."""
-    if not title:
-        return ""
-
-    # Remove date patterns like "05.11.1985" or "15.01.1995"
-    normalized = re.sub(r"\d{1,2}\.\d{1,2}\.\d{4}", "", title)
-
-    # Remove episode patterns like "1:2", "(1:4)", "Del 1", "1/2"
-    normalized = re.sub(r"\s*\(?(\d+)\s*[:/]\s*(\d+)\)?", "", normalized)
-    normalized = re.sub(r"\s*-?\s*[Dd]el\s+\d+.*", "", normalized)
-    normalized = re.sub(r"\s*\(\d+\s*av\s*\d+\)", "", normalized)
-
-    # Remove "Fjernsynsteatret viser:" prefix
-    normalized = re.sub(r"^Fjernsynsteatret\s+(viser|viste)?\s*:?\s*", "", normalized, flags=re.IGNORECASE)
-
-    # Remove trailing/leading whitespace and normalize unicode
-    normalized = unicodedata.normalize("NFKC", normalized)
-    normalized = " ".join(normalized.split()).strip()
-
-    return normalized.lower()
+from utils.title_index import TitleIndex
+from utils.titles import normalize_title
 
 
 def extract_author_from_description(description: str) -> str | None:
@@ -88,44 +67,46 @@ def fuzzy_score(s1: str, s2: str) -> float:
     return len(common) / max(len(words1), len(words2))
 
 
-def load_episodes(conn: sqlite3.Connection) -> list[dict]:
-    """Load all episodes with their normalized titles."""
+def load_episodes(conn: sqlite3.Connection) -> TitleIndex:
+    """Index all episode titles for candidate lookup."""
     cursor = conn.cursor()
-    cursor.execute("SELECT prf_id, title FROM episodes")
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(episodes)")}
+    stored = "normalized_title" if "normalized_title" in columns else "NULL"
+    cursor.execute(f"SELECT prf_id, title, {stored} FROM episodes")
 
-    episodes = []
-    for row in cursor.fetchall():
-        prf_id, title = row
-        episodes.append({
-            "prf_id": prf_id,
-            "title": title,
-            "normalized": normalize_title(title),
-        })
-    return episodes
+    index = TitleIndex(normalize_title)
+    for prf_id, title, normalized in cursor.fetchall():
+        index.add(prf_id, title, normalized)
+    return index
 
 
-def find_best_match(item: dict, episodes: list[dict], threshold: float = 0.7) -> dict | None:
+def find_best_match(item: dict, episodes: TitleIndex, threshold: float = 0.7) -> dict | None:
     """Find the best matching episode for an archive item."""
     item_title = normalize_title(item.get("title", ""))
     if not item_title:
         return None
 
-    best_match = None
-    best_score = 0.0
-
-    for ep in episodes:
-        score = fuzzy_score(item_title, ep["normalized"])
-
-        # Boost score if author matches
-        author = extract_author_from_description(item.get("description", ""))
-        if author and author in ep["title"].lower():
-            score = min(1.0, score + 0.2)
-
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = {**ep, "score": score}
+    author = extract_author_from_description(item.get("description", ""))
+
+    # Titles naming the author are boosted even outside the top gram candidates
+    candidates = episodes.search(
+        item_title,
+        fuzzy_score,
+        threshold=threshold,
+        normalized=True,
+        boost_words=normalize_title(author).split() if author else None,
+        boost=0.2,
+    )
+    if not candidates:
+        return None
 
-    return best_match
+    best = candidates[0]
+    return {
+        "prf_id": best.key,
+        "title": best.title,
+        "normalized": best.normalized,
+        "score": best.score,
+    }
 
 
 def add_fallback_link(
@@ -166,7 +147,7 @@ def add_fallback_link(
 
 def main():
     parser = argparse.ArgumentParser(description="Fuzzy match Archive.org items")
-    parser.add_argument("--db-path", default="web/static/kulturperler.db")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
     parser.add_argument("--data-dir", default="data")
     parser.add_argument("--threshold", type=float, default=0.7, help="Match threshold (0-1)")
     parser.add_argument("--dry-run", action="store_true")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Regroup episodes into performances.
+
+One pass derives grouping keys for every episode (radio series, part titles
+like "Peer Gynt 1:2", part-numbered prf_id families, play and year), clusters
+them with union-find and writes performances and performance_persons in a
+single transaction. Existing performance IDs are kept wherever possible, so
+running it again after an import only touches what changed.
+
+Usage:
+    python group_performances.py [--db-path PATH] [--dry-run]
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from utils.grouping import regroup_performances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regroup episodes into performances")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--dry-run", action="store_true", help="Report the changes and roll back")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("=" * 60)
+    print("Regroup episodes into performances")
+    print("=" * 60)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if args.dry_run:
+            conn.execute("BEGIN")
+            result = regroup_performances(conn)
+            conn.rollback()
+        else:
+            with conn:
+                result = regroup_performances(conn)
+    finally:
+        conn.close()
+
+    print(f"Episodes:      {result['episodes']}")
+    print(f"Performances:  {result['performances']}")
+    print(f"Moved:         {result['moved']} episodes")
+    print(f"Created:       {result['created']} performances")
+    print(f"Deleted:       {result['deleted']} empty performances")
+    print(f"Time:          {result['seconds'] * 1000:.0f} ms")
+    if args.dry_run:
+        print("\nDry run: nothing written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,48 +11,12 @@ Usage:
 
 import argparse
 import json
-import re
 import sqlite3
-import unicodedata
 from datetime import datetime
 from pathlib import Path
 
-
-def normalize_title(title: str) -> str:
-    """Normalize a title for matching."""
-    if not title:
-        return ""
-
-    # Lowercase
-    normalized = title.lower()
-
-    # Remove common prefixes/suffixes
-    prefixes = [
-        "fjernsynsteatret:", "fjernsynsteatret -",
-        "radioteatret:", "radioteatret -",
-        "nrk:", "nrk -",
-    ]
-    for prefix in prefixes:
-        if normalized.startswith(prefix):
-            normalized = normalized[len(prefix):].strip()
-
-    # Remove quotes
-    normalized = normalized.replace('"', '').replace("'", "").replace("«", "").replace("»", "")
-
-    # Remove parenthetical content like (1962) or (TV)
-    normalized = re.sub(r"\([^)]*\)", "", normalized)
-
-    # Remove part indicators
-    normalized = re.sub(r"\s*-?\s*del\s+\d+.*", "", normalized, flags=re.IGNORECASE)
-    normalized = re.sub(r"\s*-?\s*\d+\s*:\s*\d+.*", "", normalized)
-
-    # Normalize unicode
-    normalized = unicodedata.normalize("NFKC", normalized)
-
-    # Remove extra whitespace
-    normalized = " ".join(normalized.split())
-
-    return normalized.strip()
+from utils.title_index import TitleIndex
+from utils.titles import find_by_title, install_normalized_titles, normalize_title
 
 
 def fuzzy_match_score(s1: str, s2: str) -> float:
@@ -90,7 +54,8 @@ class ExternalImporter:
         self.data_dir = data_dir
         self.dry_run = dry_run
         self.conn = None
-        self.plays_cache = {}  # normalized_title -> play_id
+        self.plays_cache = {}  # normalized original_title -> play_id
+        self.play_index = TitleIndex(normalize_title)  # fuzzy candidates
         self.existing_episodes = set()  # prf_ids already in episodes table
         self.stats = {
             "total": 0,
@@ -105,30 +70,33 @@ class ExternalImporter:
         """Connect to database."""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
+        install_normalized_titles(self.conn)
+        self.conn.commit()
         self._load_plays_cache()
         self._load_existing_episodes()
 
     def _load_plays_cache(self):
         """Load plays into cache for matching."""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT id, title, original_title FROM plays")
+        cursor.execute("SELECT id, title, original_title, normalized_title FROM plays")
 
         for row in cursor.fetchall():
             play_id = row["id"]
             title = row["title"]
             original_title = row["original_title"]
 
-            # Index by normalized title
-            norm_title = normalize_title(title)
+            # Exact titles are looked up on the normalized_title index
+            norm_title = row["normalized_title"]
             if norm_title:
-                self.plays_cache[norm_title] = play_id
+                self.play_index.add(play_id, title, norm_title)
 
             if original_title:
                 norm_original = normalize_title(original_title)
                 if norm_original:
                     self.plays_cache[norm_original] = play_id
+                    self.play_index.add(play_id, original_title, norm_original)
 
-        print(f"Loaded {len(self.plays_cache)} play titles for matching")
+        print(f"Loaded {len(self.play_index)} play titles for matching")
 
     def _load_existing_episodes(self):
         """Load existing episode prf_ids to avoid duplicates from Internet Archive."""
@@ -150,22 +118,19 @@ class ExternalImporter:
         """Try to match a title to an existing play."""
         norm_title = normalize_title(title)
 
-        # Direct match
+        if not norm_title:
+            return None
+
+        # Exact match on the indexed title; prefixes go through the fuzzy threshold
+        rows = find_by_title(self.conn, "plays", "id", norm_title, prefix=False, normalized=True)
+        if rows:
+            return rows[0]["id"]
         if norm_title in self.plays_cache:
             return self.plays_cache[norm_title]
 
-        # Fuzzy match
-        best_match = None
-        best_score = 0.0
-        threshold = 0.8
-
-        for play_title, play_id in self.plays_cache.items():
-            score = fuzzy_match_score(norm_title, play_title)
-            if score > best_score and score >= threshold:
-                best_score = score
-                best_match = play_id
-
-        return best_match
+        # Fuzzy match, scoring only titles that share grams with this one
+        best_match = self.play_index.best(norm_title, fuzzy_match_score, threshold=0.8, normalized=True)
+        return best_match.key if best_match else None
 
     def url_exists(self, url: str) -> bool:
         """Check if URL already exists in external_performances."""
@@ -396,8 +361,8 @@ def main():
     parser.add_argument(
         "--db-path",
         type=str,
-        default="web/static/kulturperler.db",
-        help="Path to database (default: web/static/kulturperler.db)",
+        default="data/kulturperler.db",
+        help="Path to database (default: data/kulturperler.db)",
     )
     parser.add_argument(
         "--data-dir",
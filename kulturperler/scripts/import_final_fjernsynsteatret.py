@@ -9,6 +9,10 @@ from datetime import datetime
 from pathlib import Path
 import re
 
+from utils.db_schema import table_exists
+from utils.grouping import regroup_performances
+from utils.titles import register_title_functions
+
 # Confirmed Fjernsynsteatret performances to import
 PERFORMANCES = [
     {
@@ -113,13 +117,14 @@ PERFORMANCES = [
 
 def main():
     script_dir = Path(__file__).parent.parent
-    db_path = script_dir / "web" / "static" / "kulturperler.db"
+    db_path = script_dir / "data" / "kulturperler.db"
 
     print("=" * 60)
     print("Importing remaining Fjernsynsteatret performances")
     print("=" * 60)
 
     conn = sqlite3.connect(db_path)
+    register_title_functions(conn)
     cursor = conn.cursor()
 
     added = 0
@@ -171,6 +176,7 @@ def main():
 
         added += 1
 
+    grouped = regroup_performances(conn) if table_exists(conn, "performances") else None
     conn.commit()
     conn.close()
 
@@ -178,6 +184,8 @@ def main():
     print("Results:")
     print(f"  Added: {added}")
     print(f"  Skipped: {skipped}")
+    if grouped:
+        print(f"  Performances created: {grouped['created']}, refreshed: {grouped['changed']}")
     print(f"{'=' * 60}")
 
 
@@ -14,6 +14,10 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from utils.db_schema import table_exists
+from utils.grouping import prf_family, regroup_performances
+from utils.titles import register_title_functions
+
 
 def normalize_prf_id_for_parts(prf_id: str) -> str | None:
     """
@@ -22,32 +26,7 @@ def normalize_prf_id_for_parts(prf_id: str) -> str | None:
     FTEA00025883 (part 2) → FTEA00005883
     FUHA03010086 (part 1) → FUHA03000086
     """
-    if not prf_id:
-        return None
-
-    # Pattern: FTEA000XNNNN where X is part number (1,2,3)
-    # Convert to FTEA0000NNNN
-    match = re.match(r'^(FTEA)000([123])(\d{4})$', prf_id)
-    if match:
-        return f"{match.group(1)}0000{match.group(3)}"
-
-    # Pattern: FUHA030X0086 where X is part number
-    match = re.match(r'^(FUHA)030([123])(\d{4})$', prf_id)
-    if match:
-        return f"{match.group(1)}0300{match.group(3)}"
-
-    # Pattern: FTEA6X0YYYYY (older format with part in different position)
-    match = re.match(r'^(FTEA)6([56])0([12])(\d{4})$', prf_id)
-    if match:
-        # FTEA65011265 → FTEA65001265 or similar
-        return f"{match.group(1)}6{match.group(2)}00{match.group(4)}"
-
-    # Pattern: FTEA63011463 → FTEA63001463
-    match = re.match(r'^(FTEA)(\d{2})0([12])(\d{4})$', prf_id)
-    if match:
-        return f"{match.group(1)}{match.group(2)}00{match.group(4)}"
-
-    return None
+    return prf_family(prf_id)
 
 
 def add_fallback_link(
@@ -183,7 +162,7 @@ def parse_unmatched_file(file_path: Path) -> list[dict]:
 
 def main():
     parser = argparse.ArgumentParser(description="Import remaining Archive.org items")
-    parser.add_argument("--db-path", default="web/static/kulturperler.db")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
     parser.add_argument("--data-dir", default="data")
     parser.add_argument("--dry-run", action="store_true")
 
@@ -208,6 +187,7 @@ def main():
     print(f"Loaded {len(items)} unmatched items")
 
     conn = sqlite3.connect(db_path)
+    register_title_functions(conn)
     cursor = conn.cursor()
 
     # Load existing episodes for multi-part matching
@@ -265,7 +245,10 @@ def main():
         # Still unmatched
         still_unmatched.append(item)
 
+    grouped = None
     if not args.dry_run:
+        if table_exists(conn, "performances"):
+            grouped = regroup_performances(conn)
         conn.commit()
 
     conn.close()
@@ -276,6 +259,8 @@ def main():
     print(f"  Tramteatret episodes imported: {tramteatret_imported}")
     print(f"  Skipped (already exists): {skipped}")
     print(f"  Still unmatched: {len(still_unmatched)}")
+    if grouped:
+        print(f"  Performances created: {grouped['created']}, refreshed: {grouped['changed']}")
     print(f"{'=' * 60}")
 
     # Save remaining unmatched
@@ -2,6 +2,10 @@
 """
 Extract playwright names from episode descriptions and link them to plays.
 
+Known persons are found with the gazetteer (utils/gazetteer.py): a person
+named right after "av", "dramatiker" or "forfatter". Names not yet in the
+database fall back to the patterns below.
+
 Patterns to match:
 - "av den [nationality] dramatikeren [Name]"
 - "av [Name]" (at start or after punctuation)
@@ -12,6 +16,8 @@ import re
 import sqlite3
 from pathlib import Path
 
+from utils.gazetteer import Gazetteer, author_candidates
+
 
 def extract_playwright(description: str) -> str | None:
     """Extract playwright name from description."""
@@ -202,7 +208,7 @@ def find_or_create_person(conn: sqlite3.Connection, name: str) -> int:
 
 def main():
     script_dir = Path(__file__).parent.parent
-    db_path = script_dir / "web" / "static" / "kulturperler.db"
+    db_path = script_dir / "data" / "kulturperler.db"
 
     print("=" * 60)
     print("Linking playwrights to plays")
@@ -210,6 +216,7 @@ def main():
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    gazetteer = Gazetteer.from_database(conn)
 
     # Find plays without playwright that have episode descriptions
     cursor.execute("""
@@ -229,8 +236,12 @@ def main():
         if play_title in KNOWN_PLAYS:
             playwright_name = KNOWN_PLAYS[play_title]
         else:
-            # Try to extract from description
-            playwright_name = extract_playwright(description)
+            # Known persons first, then the patterns for names not in the database
+            authors = author_candidates(gazetteer.find(description))
+            if authors:
+                playwright_name = authors[0].entry.name
+            else:
+                playwright_name = extract_playwright(description)
 
         if playwright_name:
             # Filter out obvious non-names
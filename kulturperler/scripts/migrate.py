@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Apply pending schema and data migrations to the database.
+
+Migrations are defined in utils/migrations.py and recorded in the
+schema_version table; each runs in its own transaction, so a failure rolls
+back only that migration and no full-file backup is needed.
+
+Usage:
+    python migrate.py [--db-path PATH] [--status] [--dry-run] [--to VERSION]
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from utils.migrations import MIGRATIONS, applied_versions, current_version, run_migrations
+
+
+def print_status(conn: sqlite3.Connection):
+    applied = applied_versions(conn)
+    durations = {}
+    if applied:
+        durations = dict(conn.execute("SELECT version, applied_at FROM schema_version"))
+    print(f"Schema version: {current_version(conn)}")
+    for m in MIGRATIONS:
+        state = f"applied {durations[m.version]}" if m.version in applied else "pending"
+        print(f"  {m.version:04d} {m.name:<32} {state}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument(
+        "--db-path",
+        default="data/kulturperler.db",
+        help="Path to database (default: data/kulturperler.db)",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="List migrations and whether they are applied",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run pending migrations and roll them back",
+    )
+    parser.add_argument(
+        "--to",
+        type=int,
+        dest="target",
+        help="Only apply migrations up to this version",
+    )
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    if not db_path.exists():
+        print(f"Error: Database not found at {db_path}")
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if args.status:
+            print_status(conn)
+            return
+
+        print(f"Database: {db_path} (schema version {current_version(conn)})")
+        start = time.perf_counter()
+        results = run_migrations(conn, target=args.target, dry_run=args.dry_run)
+        elapsed = time.perf_counter() - start
+
+        if not results:
+            print("Up to date")
+        elif args.dry_run:
+            print(f"Dry run: {len(results)} migrations rolled back ({elapsed:.2f}s)")
+        else:
+            print(f"Applied {len(results)} migrations in {elapsed:.2f}s, "
+                  f"now at version {current_version(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Crawl Sceneweb artworks and artists into a local mirror.
+
+The first run seeds the queue from Sceneweb IDs already in the database (and
+optionally an artwork ID range) and follows playwright and artist links from
+there. Later runs fetch only newly queued pages, plus pages older than
+--refresh-days.
+
+Usage:
+    python mirror_sceneweb.py [--db-path PATH] [--mirror PATH] [--seed-range START END]
+                              [--refresh-days N] [--max-pages N] [--delay SECONDS]
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from utils.sceneweb_mirror import (
+    connect_mirror,
+    crawl,
+    due_pages,
+    refresh_cutoff,
+    seed,
+    seed_from_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror Sceneweb artworks and artists")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--mirror", default="data/sceneweb.db", help="Mirror database path")
+    parser.add_argument("--seed-range", nargs=2, type=int, metavar=("START", "END"),
+                        help="Also queue artwork IDs START..END")
+    parser.add_argument("--refresh-days", type=float, help="Re-fetch pages older than this")
+    parser.add_argument("--max-pages", type=int, help="Stop after fetching this many pages")
+    parser.add_argument("--delay", type=float, default=2.0, help="Delay between requests in seconds")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+    mirror_path = script_dir / args.mirror
+
+    print("=" * 60)
+    print("Mirroring Sceneweb")
+    print(f"Mirror: {mirror_path}")
+    print("=" * 60)
+
+    mirror = connect_mirror(mirror_path)
+    try:
+        if db_path.exists():
+            db = sqlite3.connect(db_path)
+            try:
+                added = seed_from_database(mirror, db)
+            finally:
+                db.close()
+            print(f"Queued from database: {added['artwork']} artworks, {added['artist']} artists")
+        if args.seed_range:
+            start, end = args.seed_range
+            print(f"Queued from range: {seed(mirror, 'artwork', range(start, end + 1))} artworks")
+
+        print(f"Due now: {len(due_pages(mirror, refresh_cutoff(args.refresh_days)))} pages\n")
+        counts = crawl(mirror, args.max_pages, args.refresh_days, args.delay)
+
+        total = mirror.execute("SELECT COUNT(*) FROM sceneweb_artworks WHERE status = 'ok'").fetchone()[0]
+        print(f"\nFetched {counts['artwork']} artworks, {counts['artist']} artists "
+              f"({counts['missing']} missing)")
+        print(f"Mirror holds {total} artworks")
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Find duplicate persons with blocked, scored entity resolution.
+
+Scores candidate pairs (same surname key, initials or external IDs, birth
+years within a window), clusters accepted pairs with union-find and stores
+the result in person_clusters / person_match_pairs. Pairs below the automatic
+threshold are listed for review; record a verdict with --same or --different
+and it is honoured on every later run.
+
+Usage:
+    python resolve_persons.py [--db-path PATH] [--show N]
+    python resolve_persons.py --same ID ID [--note TEXT]
+    python resolve_persons.py --different ID ID [--note TEXT]
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from utils.person_resolution import AUTO_THRESHOLD, record_decision, resolve_persons
+
+
+def print_clusters(conn: sqlite3.Connection, limit: int):
+    rows = conn.execute("""
+        SELECT c.cluster_id, c.winner_id, c.person_id, p.name, p.birth_year, c.confidence
+        FROM person_clusters c
+        JOIN persons p ON p.id = c.person_id
+        ORDER BY c.cluster_id, c.person_id = c.winner_id DESC, c.person_id
+    """).fetchall()
+    current = None
+    shown = 0
+    for cluster_id, winner_id, person_id, name, birth_year, confidence in rows:
+        if cluster_id != current:
+            if shown >= limit:
+                break
+            current = cluster_id
+            shown += 1
+            print(f"\n  Cluster {cluster_id} (confidence {confidence:.2f}):")
+        marker = "*" if person_id == winner_id else " "
+        print(f"   {marker} {person_id}: {name} ({birth_year or '?'})")
+
+
+def print_review(conn: sqlite3.Connection, limit: int):
+    rows = conn.execute("""
+        SELECT m.person_a, a.name, m.person_b, b.name, m.score, m.reasons
+        FROM person_match_pairs m
+        JOIN persons a ON a.id = m.person_a
+        JOIN persons b ON b.id = m.person_b
+        LEFT JOIN person_match_decisions d ON d.person_a = m.person_a AND d.person_b = m.person_b
+        WHERE m.score < ? AND d.decision IS NULL
+        ORDER BY m.score DESC
+        LIMIT ?
+    """, (AUTO_THRESHOLD, limit)).fetchall()
+    for id_a, name_a, id_b, name_b, score, reasons in rows:
+        print(f"  {score:.2f}  {id_a}: {name_a}  <->  {id_b}: {name_b}  ({reasons})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve duplicate persons")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--same", nargs=2, type=int, metavar="ID", help="Record that two persons are the same")
+    parser.add_argument("--different", nargs=2, type=int, metavar="ID", help="Record that two persons differ")
+    parser.add_argument("--note", default="", help="Note stored with a decision")
+    parser.add_argument("--show", type=int, default=20, help="Clusters and review pairs to print")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if args.same or args.different:
+            decision = "same" if args.same else "different"
+            a, b = args.same or args.different
+            with conn:
+                record_decision(conn, a, b, decision, args.note)
+            print(f"Recorded {a} / {b} as {decision}")
+
+        print("=" * 60)
+        print("Resolving persons")
+        print("=" * 60)
+
+        result = resolve_persons(conn)
+        print(f"Persons:          {result['persons']}")
+        print(f"Candidate pairs:  {result['candidate_pairs']}")
+        print(f"Scored pairs:     {result['scored_pairs']} ({result['review_pairs']} for review)")
+        print(f"Clusters:         {result['clusters']} ({result['duplicates']} duplicates)")
+        print(f"Blocked links:    {result['blocked']} (would join persons marked different)")
+        print(f"Time:             {result['seconds']:.2f}s")
+
+        if result["clusters"]:
+            print("\nClusters (* = kept record):")
+            print_clusters(conn, args.show)
+        if result["review_pairs"]:
+            print("\nPairs for review:")
+            print_review(conn, args.show)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Find known persons and plays mentioned in descriptions.
+
+Builds the gazetteer from all person names and play titles and scans every
+episode, performance and external performance description in one pass. Hits
+are stored in mention_candidates with their position and the cue word before
+them ("av", "dramatiker", "etter", ...), for linking scripts to act on.
+
+Usage:
+    python scan_mentions.py [--db-path PATH] [--show N]
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from utils.gazetteer import Gazetteer, store_candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan descriptions for known persons and plays")
+    parser.add_argument("--db-path", default="data/kulturperler.db")
+    parser.add_argument("--show", type=int, default=20, help="Author candidates to print")
+
+    args = parser.parse_args()
+
+    script_dir = Path(__file__).parent.parent
+    db_path = script_dir / args.db_path
+
+    print("=" * 60)
+    print("Scanning descriptions")
+    print("=" * 60)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        start = time.perf_counter()
+        gazetteer = Gazetteer.from_database(conn)
+        print(f"Gazetteer: {len(gazetteer)} names and titles")
+
+        written = store_candidates(conn, gazetteer)
+        print(f"Candidates: {written} in {time.perf_counter() - start:.2f}s")
+
+        for kind, cue, count in conn.execute("""
+            SELECT kind, COALESCE(cue, '-'), COUNT(*) FROM mention_candidates
+            GROUP BY kind, cue ORDER BY kind, COUNT(*) DESC
+        """):
+            print(f"  {kind:<7} {cue:<11} {count}")
+
+        rows = conn.execute("""
+            SELECT source_table, source_id, matched, cue FROM mention_candidates
+            WHERE kind = 'person' AND cue IN ('av', 'dramatiker', 'forfatter')
+            ORDER BY source_table, source_id, start
+            LIMIT ?
+        """, (args.show,)).fetchall()
+        if rows:
+            print("\nAuthor candidates:")
+            for table, source_id, matched, cue in rows:
+                print(f"  {table}/{source_id}: {cue} {matched}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
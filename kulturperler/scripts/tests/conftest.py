@@ -0,0 +1,79 @@
+"""Shared fixtures: a small database built with the pipeline schema and migrations."""
+
+import importlib
+import sqlite3
+
+import pytest
+
+from utils.migrations import run_migrations
+
+build_db = importlib.import_module("05_build_db")
+
+
+PERSONS = [
+    (1, "Henrik Ibsen", 1828, "Q36661"),
+    (2, "Bjørnstjerne Bjørnson", 1832, "Q44371"),
+    (3, "Kåre Kristiansen", None, None),
+    (4, "Liv Ullmann", 1938, None),
+    (5, "Toralv Maurstad", 1926, None),
+]
+
+PLAYS = [
+    (1, "Peer Gynt", 1, 1867),
+    (2, "Et dukkehjem", 1, 1879),
+    (3, "En fallit", 2, 1875),
+]
+
+# prf_id, title, year, duration, nrk_url, play_id, medium
+EPISODES = [
+    ("FTEA00001078", "Peer Gynt 1:2", 1975, 3600, "https://tv.nrk.no/program/FTEA00001078", 1, "tv"),
+    ("FTEA00001178", "Peer Gynt 2:2", 1975, 3000, "https://tv.nrk.no/program/FTEA00001178", 1, "tv"),
+    ("FTEA00007974", "Et dukkehjem", 1974, 5400, "https://tv.nrk.no/program/FTEA00007974", 2, "tv"),
+    ("MKRT00000162", "En fallit", 1962, 4200,
+     "https://radio.nrk.no/serie/radioteatret/MKRT00000162", 3, "radio"),
+    ("FTEA00009999", "Kaare og kråka", 1980, 1800, "https://tv.nrk.no/program/FTEA00009999", None, "tv"),
+]
+
+# episode_id, person_id, role, character_name
+EPISODE_PERSONS = [
+    ("FTEA00001078", 5, "actor", "Peer Gynt"),
+    ("FTEA00001178", 5, "actor", "Peer Gynt"),
+    ("FTEA00007974", 4, "actor", "Nora"),
+    ("FTEA00009999", 3, "director", None),
+]
+
+
+def populate(conn: sqlite3.Connection):
+    with conn:
+        conn.executemany(
+            "INSERT INTO persons (id, name, birth_year, wikidata_id) VALUES (?, ?, ?, ?)", PERSONS
+        )
+        conn.executemany(
+            "INSERT INTO plays (id, title, playwright_id, year_written) VALUES (?, ?, ?, ?)", PLAYS
+        )
+        conn.executemany(
+            """INSERT INTO episodes (prf_id, title, year, duration_seconds, nrk_url, play_id, medium)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            EPISODES,
+        )
+        conn.executemany(
+            "INSERT INTO episode_persons (episode_id, person_id, role, character_name) VALUES (?, ?, ?, ?)",
+            EPISODE_PERSONS,
+        )
+
+
+@pytest.fixture
+def raw_db(tmp_path):
+    """Freshly built database before any migrations."""
+    conn = sqlite3.connect(tmp_path / "kulturperler.db")
+    conn.executescript(build_db.SCHEMA)
+    populate(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def db(raw_db):
+    """Fully migrated database."""
+    run_migrations(raw_db, log=lambda _: None)
+    return raw_db
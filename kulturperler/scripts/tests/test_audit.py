@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from utils.audit import RULES, Rule, register, run_audit
+
+
+def dirty(db):
+    with db:
+        db.execute("UPDATE episodes SET title = '  Peer  Gynt 1:2 ' WHERE prf_id = 'FTEA00001078'")
+        db.execute("UPDATE plays SET title = 'Et dukkehjÃ¦m' WHERE id = 2")
+        db.execute("UPDATE persons SET name = 'BjÃ¸rnstjerne  BjÃ¸rnson' WHERE id = 2")
+        db.execute("UPDATE episodes SET description = 'Kort' WHERE prf_id = 'FTEA00007974'")
+        db.execute("UPDATE episodes SET title = 'EN FALLIT' WHERE prf_id = 'MKRT00000162'")
+
+
+def results(report):
+    return {r.rule: r for r in report.results}
+
+
+def test_fix_rules_update_in_one_statement(db):
+    dirty(db)
+    with db:
+        report = run_audit(db)
+    by_rule = results(report)
+
+    assert db.execute("SELECT title FROM episodes WHERE prf_id = 'FTEA00001078'").fetchone()[0] == "Peer Gynt 1:2"
+    assert db.execute("SELECT title FROM plays WHERE id = 2").fetchone()[0] == "Et dukkehjæm"
+    # Encoding runs before whitespace on the same column
+    assert db.execute("SELECT name FROM persons WHERE id = 2").fetchone()[0] == "Bjørnstjerne Bjørnson"
+    assert by_rule["encoding_persons"].fixed == 1
+    assert by_rule["whitespace_persons"].fixed == 1
+    assert by_rule["whitespace_episodes"].sample == [["FTEA00001078", "  Peer  Gynt 1:2 ", "Peer Gynt 1:2"]]
+    assert report.fixed == 4
+
+    assert by_rule["short_description"].count == 1
+    assert by_rule["all_caps_title"].sample == [["MKRT00000162", "EN FALLIT"]]
+    assert {r.rule for r in report.flagged} == {"short_description", "all_caps_title", "mixed_numbering"}
+
+
+def test_dry_run_counts_without_fixing(db):
+    dirty(db)
+    report = run_audit(db, fix=False)
+    db.commit()
+
+    assert report.fixed == 0
+    assert results(report)["whitespace_episodes"].count == 1
+    assert db.execute("SELECT title FROM plays WHERE id = 2").fetchone()[0] == "Et dukkehjÃ¦m"
+
+
+def test_all_rules_share_the_callers_transaction(db):
+    dirty(db)
+    run_audit(db)
+    assert db.in_transaction
+    db.rollback()
+
+    assert db.execute("SELECT name FROM persons WHERE id = 2").fetchone()[0] == "BjÃ¸rnstjerne  BjÃ¸rnson"
+
+
+def test_clean_database_and_json_report(db):
+    report = run_audit(db, fix=False)
+    db.rollback()
+    data = json.loads(json.dumps(report.to_dict()))
+
+    assert data["fixed"] == 0
+    assert [r["rule"] for r in data["rules"]] == [rule.name for rule in RULES]
+    assert all(r["count"] == 0 for r in data["rules"] if r["severity"] == "fix")
+    assert all(r["seconds"] >= 0 for r in data["rules"])
+
+
+def test_register_rejects_bad_rules():
+    with pytest.raises(ValueError):
+        register(Rule("encoding_episodes", "episodes", "title", "1", "duplicate"))
+    with pytest.raises(ValueError):
+        register(Rule("x", "tags", "name", "1", "table without key"))
+    with pytest.raises(ValueError):
+        register(Rule("y", "plays", "title", "1", "unknown fix", fix="nope"))
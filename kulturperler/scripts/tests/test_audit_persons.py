@@ -0,0 +1,95 @@
+import importlib
+import threading
+
+import pytest
+
+from utils.kv_cache import KVCache
+
+audit_persons = importlib.import_module("audit_persons")
+
+PAGES = {
+    ("no", "Henrik Ibsen"): {
+        "type": "standard",
+        "extract": "Henrik Johan Ibsen var en norsk dramatiker.",
+        "description": "norsk dramatiker (1828–1906)",
+    },
+    ("en", "Bjørnstjerne Bjørnson"): {
+        "type": "standard",
+        "extract": "Bjørnstjerne Martinius Bjørnson was a Norwegian writer.",
+        "description": "Norwegian writer (1832-1910)",
+    },
+}
+
+
+@pytest.fixture
+def bio_db(db):
+    with db:
+        db.execute("ALTER TABLE persons ADD COLUMN bio TEXT")
+        db.execute("INSERT INTO persons (id, name) VALUES (6, 'Helge Krog')")
+        db.execute("INSERT INTO plays (id, title, playwright_id) VALUES (4, 'Opbrudd', 6)")
+    yield db
+    audit_persons.review_items.clear()
+    for key in audit_persons.stats:
+        audit_persons.stats[key] = 0
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = KVCache(tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def wikipedia(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(title, lang, session):
+        with lock:
+            calls.append((lang, title))
+        return PAGES.get((lang, title))
+
+    monkeypatch.setattr(audit_persons, "fetch_wikipedia_page", fetch)
+    return calls
+
+
+def test_fills_bios_and_missing_years_in_bulk(bio_db, cache, wikipedia):
+    audit_persons.audit_playwrights_without_bio(bio_db, workers=4, cache=cache)
+
+    rows = dict(
+        (pid, (bio, birth, death))
+        for pid, bio, birth, death in bio_db.execute("SELECT id, bio, birth_year, death_year FROM persons")
+    )
+    assert rows[1] == ("Henrik Johan Ibsen var en norsk dramatiker.", 1828, 1906)
+    # English fallback; the known birth year is kept
+    assert rows[2] == ("Bjørnstjerne Martinius Bjørnson was a Norwegian writer.", 1832, 1910)
+    assert rows[6] == (None, None, None)
+    assert audit_persons.stats["playwrights_bio_fixed"] == 2
+    assert audit_persons.stats["playwrights_bio_not_found"] == 1
+    assert any("Helge Krog" in item for item in audit_persons.review_items)
+    assert sorted(wikipedia) == [
+        ("en", "Bjørnstjerne Bjørnson"), ("en", "Helge Krog"),
+        ("no", "Bjørnstjerne Bjørnson"), ("no", "Helge Krog"), ("no", "Henrik Ibsen"),
+    ]
+
+
+def test_cached_summaries_are_not_fetched_again(bio_db, cache, wikipedia):
+    audit_persons.audit_playwrights_without_bio(bio_db, cache=cache)
+    wikipedia.clear()
+    with bio_db:
+        bio_db.execute("UPDATE persons SET bio = NULL")
+
+    audit_persons.audit_playwrights_without_bio(bio_db, cache=cache)
+    assert wikipedia == []
+    assert bio_db.execute("SELECT COUNT(*) FROM persons WHERE bio IS NOT NULL").fetchone()[0] == 2
+
+
+def test_failed_lookups_are_retried_next_time(bio_db, cache, monkeypatch):
+    def down(title, lang, session):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(audit_persons, "fetch_wikipedia_page", down)
+    audit_persons.audit_playwrights_without_bio(bio_db, cache=cache)
+    assert len(cache) == 0
+    assert bio_db.execute("SELECT COUNT(*) FROM persons WHERE bio IS NOT NULL").fetchone()[0] == 0
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from batch_match_sources import load_source
+from utils.batch_matcher import (
+    MatchRecord,
+    items_from_harvest,
+    load_targets,
+    match_batch,
+    write_candidates,
+)
+
+pytest.importorskip("scipy")
+
+
+def test_matches_titles_with_year_and_author():
+    targets = [
+        MatchRecord("1", "Peer Gynt", author="Henrik Ibsen"),
+        MatchRecord("2", "Et dukkehjem", author="Henrik Ibsen"),
+        MatchRecord("3", "En fallit", author="Bjørnstjerne Bjørnson"),
+    ]
+    items = [MatchRecord("a", "Peer Gynt - del 1", author="henrik ibsen"), MatchRecord("b", "Dukkehjem")]
+    best = {c.item_key: c.target_key for c in match_batch(items, targets) if c.rank == 1}
+    assert best == {"a": "1", "b": "2"}
+
+
+def test_duplicate_items_are_kept_once(db):
+    raw = [
+        {"source_id": "v1", "title": "Peer Gynt"},
+        {"source_id": "v1", "title": "Peer Gynt"},
+        {"url": "https://vimeo.com/2", "title": "Et dukkehjem"},
+    ]
+    items = items_from_harvest(raw)
+    assert [i.key for i in items] == ["v1", "https://vimeo.com/2"]
+
+    candidates = match_batch(items + items[:1], load_targets(db, "plays"))
+    write_candidates(db, "vimeo", "plays", candidates)
+    rows = db.execute("SELECT item_key, rank FROM match_candidates ORDER BY item_key, rank").fetchall()
+    assert len(rows) == len(set(rows))
+
+
+def test_load_source_globs_and_reports_missing(tmp_path, capsys):
+    channels = tmp_path / "vimeo_channels"
+    channels.mkdir()
+    (channels / "den_norske_opera.json").write_text(json.dumps([{"source_id": "1", "title": "Carmen"}]))
+    (channels / "oslo_nye.json").write_text(json.dumps([{"source_id": "2", "title": "Hamlet"}]))
+    (channels / "harvest_metadata.json").write_text(json.dumps({"harvested": "today"}))
+
+    assert [i["title"] for i in load_source(tmp_path, "vimeo")] == ["Carmen", "Hamlet"]
+    assert load_source(tmp_path, "kilden") == []
+    assert "kilden: no files matching" in capsys.readouterr().out
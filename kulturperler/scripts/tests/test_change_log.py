@@ -0,0 +1,122 @@
+import importlib
+
+from utils.audit import run_audit
+from utils.change_log import advance, changed_since, current_seq, prune, watermark
+
+audit_persons = importlib.import_module("audit_persons")
+
+
+def logged(db, table):
+    return set(changed_since(db, table, 0))
+
+
+def test_migrated_database_starts_with_an_empty_log(db):
+    assert current_seq(db) == 0
+    assert watermark(db, "audit_quality") is None
+
+
+def test_triggers_log_changed_keys_once(db):
+    with db:
+        db.execute("UPDATE episodes SET title = 'Peer Gynt I' WHERE prf_id = 'FTEA00001078'")
+        db.execute("UPDATE episodes SET title = 'Peer Gynt 1:2' WHERE prf_id = 'FTEA00001078'")
+        db.execute("INSERT INTO persons (id, name) VALUES (6, 'Wenche Foss')")
+        db.execute("DELETE FROM plays WHERE id = 3")
+
+    assert logged(db, "episodes") == {"FTEA00001078"}
+    # Deleting a play also marks its playwright
+    assert logged(db, "persons") == {2, 6}
+    assert logged(db, "plays") == {3}
+    assert db.execute("SELECT COUNT(*) FROM change_log").fetchone()[0] == 4
+
+
+def test_links_mark_both_ends(db):
+    with db:
+        db.execute("INSERT INTO episode_persons (episode_id, person_id, role) VALUES ('MKRT00000162', 3, 'actor')")
+        db.execute("UPDATE plays SET playwright_id = 2 WHERE id = 2")
+
+    assert logged(db, "episodes") == {"MKRT00000162"}
+    assert logged(db, "persons") == {1, 2, 3}
+    assert logged(db, "plays") == {2}
+
+
+def test_new_and_deleted_plays_mark_their_playwright(db):
+    with db:
+        db.execute("INSERT INTO persons (id, name) VALUES (9, 'Helge Krog')")
+        seq = current_seq(db)
+        db.execute("INSERT INTO plays (id, title, playwright_id) VALUES (9, 'Oppbrudd', 9)")
+    assert changed_since(db, "persons", seq) == [9]
+
+    with db:
+        seq = current_seq(db)
+        db.execute("DELETE FROM plays WHERE id = 9")
+    assert changed_since(db, "persons", seq) == [9]
+
+
+def test_watermark_limits_later_reads(db):
+    with db:
+        db.execute("UPDATE persons SET birth_year = 1829 WHERE id = 1")
+        seq = advance(db, "nightly")
+        db.execute("UPDATE persons SET birth_year = 1927 WHERE id = 5")
+
+    assert watermark(db, "nightly") == seq
+    assert changed_since(db, "persons", seq) == [5]
+
+
+def test_prune_keeps_what_a_consumer_still_needs(db):
+    with db:
+        db.execute("UPDATE persons SET birth_year = 1829 WHERE id = 1")
+        advance(db, "fast")
+        advance(db, "slow", 0)
+        db.execute("UPDATE persons SET birth_year = 1927 WHERE id = 5")
+
+    assert prune(db) == 0
+    with db:
+        advance(db, "slow")
+    assert prune(db) == 1
+    assert logged(db, "persons") == {5}
+    # seq keeps growing after pruning
+    with db:
+        db.execute("UPDATE persons SET birth_year = 1833 WHERE id = 2")
+    assert changed_since(db, "persons", watermark(db, "slow")) == [2]
+
+
+def test_incremental_audit_checks_only_changed_rows(db):
+    with db:
+        db.execute("UPDATE plays SET title = 'En  fallit' WHERE id = 3")
+        first = run_audit(db, consumer="audit_quality")
+    assert first.since is None
+    assert first.fixed == 1
+    assert first.until == current_seq(db)
+
+    # A bad row written without logging (e.g. before the triggers existed) is not revisited
+    with db:
+        db.execute("DROP TRIGGER plays_log_au")
+        db.execute("UPDATE plays SET title = 'Et  dukkehjem' WHERE id = 2")
+        db.execute("UPDATE episodes SET title = 'PEER GYNT DEL 1' WHERE prf_id = 'FTEA00001078'")
+        second = run_audit(db, consumer="audit_quality")
+
+    by_rule = {r.rule: r for r in second.results}
+    assert second.since == first.until
+    assert second.fixed == 0
+    assert by_rule["all_caps_title"].sample == [["FTEA00001078", "PEER GYNT DEL 1"]]
+    assert by_rule["mixed_numbering"].count == 1
+    assert db.execute("SELECT title FROM plays WHERE id = 2").fetchone()[0] == "Et  dukkehjem"
+
+
+def test_dry_run_leaves_the_watermark(db):
+    with db:
+        run_audit(db, fix=False, consumer="audit_quality")
+    assert watermark(db, "audit_quality") is None
+
+
+def test_person_audit_queries_follow_the_log(db, capsys):
+    with db:
+        db.execute("INSERT INTO persons (id, name) VALUES (6, 'Wenche Foss'), (7, 'Espen Skjønberg')")
+        seq = advance(db, audit_persons.CONSUMER)
+        db.execute("UPDATE persons SET birth_year = 1917 WHERE id = 6")
+
+    audit_persons.audit_orphaned_persons(db, seq)
+    assert audit_persons.stats["orphaned_persons"] == 1
+    audit_persons.audit_orphaned_persons(db, None)
+    assert audit_persons.stats["orphaned_persons"] == 2
+    audit_persons.review_items.clear()
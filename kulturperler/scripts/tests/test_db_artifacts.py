@@ -0,0 +1,31 @@
+import gzip
+import json
+
+from utils.db_artifacts import KEEP_VERSIONS, MANIFEST_NAME, publish_artifacts
+
+
+def test_publishes_hashed_identity_and_gzip(tmp_path):
+    source = tmp_path / "kulturperler.db"
+    source.write_bytes(b"SQLite format 3\x00" + bytes(100))
+    out_dir = tmp_path / "db"
+
+    manifest = publish_artifacts(source, out_dir)
+
+    assert set(manifest["files"]) == {"identity", "gzip"}
+    gz = out_dir / manifest["files"]["gzip"]["file"]
+    assert gzip.decompress(gz.read_bytes()) == source.read_bytes()
+    assert json.loads((out_dir / MANIFEST_NAME).read_text())["version"] == manifest["version"]
+    assert not (out_dir / "kulturperler.db").exists()
+
+
+def test_keeps_previous_versions_only(tmp_path):
+    source = tmp_path / "kulturperler.db"
+    out_dir = tmp_path / "db"
+    versions = []
+    for n in range(KEEP_VERSIONS + 1):
+        source.write_bytes(bytes([n]) * 64)
+        versions.append(publish_artifacts(source, out_dir)["version"])
+
+    names = {path.name for path in out_dir.iterdir()}
+    assert not any(versions[0] in name for name in names)
+    assert all(any(v in name for name in names) for v in versions[1:])
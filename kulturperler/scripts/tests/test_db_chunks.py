@@ -0,0 +1,48 @@
+import json
+import sqlite3
+
+import pytest
+
+from utils.db_chunks import btree_pages, chunks_touched, opened_btrees, query_chunk_upper_bounds, write_chunks
+from utils.web_export import export_web_db
+
+
+@pytest.fixture
+def web_db(db, tmp_path):
+    output = tmp_path / "web" / "kulturperler.db"
+    export_web_db(tmp_path / "kulturperler.db", output, page_size=1024)
+    return output
+
+
+def test_chunks_reassemble_to_the_database(web_db, tmp_path):
+    manifest = write_chunks(web_db, tmp_path / "chunks", chunk_size=4096)
+    data = b"".join((tmp_path / "chunks" / c["file"]).read_bytes() for c in manifest["chunks"])
+    assert data == web_db.read_bytes()
+    assert manifest["page_size"] == 1024
+    assert json.loads((tmp_path / "chunks" / "manifest.json").read_text())["total_length"] == len(data)
+    with pytest.raises(ValueError):
+        write_chunks(web_db, tmp_path / "chunks", chunk_size=1000)
+
+
+def test_opened_btrees_follow_the_query_plan(web_db):
+    conn = sqlite3.connect(web_db)
+    try:
+        root = conn.execute("SELECT rootpage FROM sqlite_schema WHERE name = 'persons'").fetchone()[0]
+        assert opened_btrees(conn, "SELECT name FROM persons WHERE id = ?", (1,)) == {1, root}
+        pages = btree_pages(conn)
+        assert 1 in pages[1]
+        assert sum(len(p) for p in pages.values()) == conn.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_chunks_touched_maps_pages_to_chunks():
+    pages = {1: [1, 2], 5: [5, 9]}
+    assert chunks_touched(pages, {1}, page_size=1024, chunk_size=4096) == [0]
+    assert chunks_touched(pages, {1, 5}, page_size=1024, chunk_size=4096) == [0, 1, 2]
+
+
+def test_report_covers_standard_queries(web_db):
+    report = query_chunk_upper_bounds(web_db, chunk_size=4096)
+    assert "home: performance listing" in report
+    assert all(chunks[0] == 0 for chunks in report.values())
@@ -0,0 +1,123 @@
+import threading
+import time
+
+from utils.executor import HostLimit, run_enrichment
+from utils.job_queue import JobQueue
+
+
+def quiet(_):
+    pass
+
+
+def persons(db):
+    return {str(pid): (pid, name) for pid, name in db.execute("SELECT id, name FROM persons")}
+
+
+def set_nationality(conn, person, bio):
+    conn.execute("UPDATE persons SET nationality = ? WHERE id = ?", (bio, person[0]))
+    return {"length": len(bio)}
+
+
+def test_fetches_concurrently_and_writes_once(db):
+    items = persons(db)
+    queue = JobQueue(db, "nationalities")
+    queue.enqueue(items)
+
+    def fetch(person):
+        time.sleep(0.05)
+        return None if person[1] == "Liv Ullmann" else f"Bio of {person[1]}"
+
+    start = time.perf_counter()
+    stats = run_enrichment(db, queue, items, fetch, set_nationality, workers=5, log=quiet)
+    assert time.perf_counter() - start < 0.2  # five sequential lookups take 0.25 s
+
+    assert (stats.done, stats.no_match, stats.failed) == (4, 1, 0)
+    assert db.execute("SELECT nationality FROM persons WHERE id = 1").fetchone() == ("Bio of Henrik Ibsen",)
+    assert queue.result(1) == {"length": len("Bio of Henrik Ibsen")}
+    assert queue.status(4) == "no_match"
+
+    # Everything is checkpointed; a rerun has nothing to do
+    assert run_enrichment(db, queue, items, fetch, set_nationality, log=quiet).processed == 0
+
+
+def test_honours_per_host_concurrency(db):
+    items = persons(db)
+    queue = JobQueue(db, "nationalities")
+    queue.enqueue(items)
+    active = {"slow": 0}
+    peak = {"slow": 0}
+    lock = threading.Lock()
+
+    def fetch(person):
+        with lock:
+            active["slow"] += 1
+            peak["slow"] = max(peak["slow"], active["slow"])
+        time.sleep(0.02)
+        with lock:
+            active["slow"] -= 1
+        return "bio"
+
+    run_enrichment(
+        db, queue, items, fetch, set_nationality,
+        host=lambda _: "slow", host_limits={"slow": HostLimit(concurrency=2)}, workers=8, log=quiet,
+    )
+    assert peak["slow"] == 2
+
+
+def test_failures_are_recorded_and_rolled_back(db):
+    items = persons(db)
+    queue = JobQueue(db, "nationalities")
+    queue.enqueue(items)
+
+    def fetch(person):
+        if person[0] == 1:
+            raise TimeoutError("timed out")
+        return "bio"
+
+    def apply(conn, person, bio):
+        conn.execute("UPDATE persons SET nationality = ? WHERE id = ?", (bio, person[0]))
+        if person[0] == 2:
+            raise ValueError("bad bio")
+
+    stats = run_enrichment(db, queue, items, fetch, apply, workers=0, log=quiet)
+    assert (stats.done, stats.failed) == (3, 2)
+    assert queue.status(1) == "failed"
+    assert db.execute("SELECT nationality FROM persons WHERE id = 2").fetchone() == (None,)
+    assert db.execute("SELECT last_error FROM jobs WHERE task_key = '2'").fetchone() == ("bad bio",)
+
+
+def test_limit_and_priority(db):
+    items = persons(db)
+    queue = JobQueue(db, "nationalities")
+    queue.enqueue((key, int(key)) for key in items)
+    seen = []
+
+    def fetch(person):
+        seen.append(person[0])
+        return "bio"
+
+    stats = run_enrichment(db, queue, items, fetch, set_nationality, workers=0, limit=2, log=quiet)
+    assert stats.processed == 2
+    assert seen == [5, 4]
+    assert queue.counts()["pending"] == 3
+
+
+def test_commits_once_per_batch(db):
+    db.execute("CREATE TABLE lookups (key TEXT PRIMARY KEY, value TEXT)")
+    items = {str(n): n for n in range(200)}
+    queue = JobQueue(db, "lookups")
+    queue.enqueue(items)
+    db.commit()
+    commits = []
+    db.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper().startswith("COMMIT") else None)
+
+    def apply(conn, n, value):
+        conn.execute("INSERT INTO lookups VALUES (?, ?)", (str(n), value))
+
+    stats = run_enrichment(db, queue, items, lambda n: f"value {n}", apply, workers=4, batch_size=50, log=quiet)
+    db.set_trace_callback(None)
+
+    assert stats.done == 200
+    assert db.execute("SELECT COUNT(*) FROM lookups").fetchone()[0] == 200
+    # A lease and at most one checkpoint per batch, plus the final checkpoint
+    assert len(commits) <= 2 * 200 // 50 + 2
@@ -0,0 +1,73 @@
+from utils.gazetteer import Entry, Gazetteer, author_candidates, scan_descriptions, store_candidates
+
+
+def build(*names):
+    gazetteer = Gazetteer()
+    for i, name in enumerate(names):
+        gazetteer.add(name, Entry("person", i, name))
+    return gazetteer
+
+
+def test_longest_whole_word_matches_with_offsets():
+    gazetteer = build("Henrik Ibsen", "Ibsen", "Liv Ullmann", "Ullmann Liv")
+    text = "Et drama av Henrik Ibsen, med LIV ULLMANN. Ibsenske Ibsen."
+    found = [(m.text, m.start, m.entry.name) for m in gazetteer.find(text)]
+    assert found == [
+        ("Henrik Ibsen", 12, "Henrik Ibsen"),
+        ("LIV ULLMANN", 30, "Liv Ullmann"),
+        ("Ibsen", 52, "Ibsen"),
+    ]
+
+
+def test_whitespace_runs_match_with_original_offsets():
+    gazetteer = build("Henrik Ibsen", "Liv Ullmann")
+    text = "Drama av  Henrik  Ibsen,\nmed Liv\n   Ullmann."
+    found = [(m.text, m.start, m.end, m.entry.name, m.cue) for m in gazetteer.find(text)]
+    assert found == [
+        ("Henrik  Ibsen", 10, 23, "Henrik Ibsen", "av"),
+        ("Liv\n   Ullmann", 29, 43, "Liv Ullmann", None),
+    ]
+    assert all(text[start:end] == matched for matched, start, end, *_ in found)
+
+
+def test_overlapping_patterns_and_failure_links():
+    gazetteer = build("abcd", "bcde", "cdef gh")
+    assert [m.text for m in gazetteer.find("XABCDEF GH")] == []  # not whole words
+    assert [m.text for m in gazetteer.find("ABCDEF GH BCDE")] == ["BCDE"]
+    assert [m.text for m in gazetteer.find("ABC CDEF GH")] == ["CDEF GH"]
+
+
+def test_one_word_patterns_need_a_capital():
+    gazetteer = Gazetteer()
+    gazetteer.add("Spor", Entry("play", 1, "Spor"))
+    assert gazetteer.find("ingen spor av ham") == []
+    assert [m.entry.entity_id for m in gazetteer.find("NRK viste Spor i 1995")] == [1]
+
+
+def test_cues():
+    gazetteer = build("Henrik Ibsen", "Liv Ullmann", "Cora Sandel")
+    matches = gazetteer.find(
+        "Skuespill av den norske dramatikeren Henrik Ibsen. Liv Ullmann spiller. Drama etter Cora Sandel."
+    )
+    assert [(m.text, m.cue) for m in matches] == [
+        ("Henrik Ibsen", "dramatiker"), ("Liv Ullmann", None), ("Cora Sandel", "etter"),
+    ]
+    assert [m.text for m in author_candidates(matches)] == ["Henrik Ibsen"]
+
+
+def test_database_gazetteer_and_scan(db):
+    db.execute("UPDATE plays SET original_title = 'Ett dockhem' WHERE id = 2")
+    db.execute("UPDATE episodes SET description = 'Ett dockhem av Ibsen, med Toralv Maurstad.' "
+               "WHERE prf_id = 'FTEA00007974'")
+    gazetteer = Gazetteer.from_database(db)
+
+    hits = [(table, key, m.entry.kind, m.entry.entity_id, m.entry.alias, m.cue)
+            for table, key, m in scan_descriptions(db, gazetteer)]
+    assert hits == [
+        ("episodes", "FTEA00007974", "play", 2, True, None),
+        ("episodes", "FTEA00007974", "person", 1, True, "av"),
+        ("episodes", "FTEA00007974", "person", 5, False, None),
+    ]
+    assert store_candidates(db, gazetteer) == 3
+    assert store_candidates(db, gazetteer) == 3
+    assert db.execute("SELECT COUNT(*) FROM mention_candidates").fetchone()[0] == 3
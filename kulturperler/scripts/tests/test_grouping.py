@@ -0,0 +1,128 @@
+from utils.grouping import group_episodes, part_info, prf_family, refresh_performances, regroup_performances
+
+
+def test_part_info():
+    assert part_info("Peer Gynt 1:2") == ("Peer Gynt", 1, 2)
+    assert part_info("Brand - Del 2 av 3") == ("Brand", 2, 3)
+    assert part_info("Kongsemnene del 1") == ("Kongsemnene", 1, None)
+    assert part_info("Et dukkehjem") == (None, None, None)
+
+
+def test_prf_family():
+    assert prf_family("FTEA00015883") == "FTEA00005883"
+    assert prf_family("FUHA03010086") == "FUHA03000086"
+    assert prf_family("FTEA63011463") == "FTEA63001463"
+    assert prf_family("MKRT00000162") is None
+
+
+def test_group_episodes_joins_on_any_shared_key():
+    rows = [
+        ("FTEA00005883", "Vildanden", 1970, None, "tv", None, None),
+        ("FTEA00015883", "Vildanden", 1970, None, "tv", None, None),
+        ("FDRP42000192", "Morsarven 1:6", 1992, None, "tv", None, None),
+        ("FDRP42000292", "Morsarven 2:6", 1992, None, "tv", None, None),
+        ("MKRT00000162", "En fallit", 1962, 3, "radio", "radioteatret", None),
+        ("MKRT00000262", "Et dukkehjem", 1962, 2, "radio", "radioteatret", None),
+        ("MKTT54001454", "Episode 1", 1954, None, "radio", "maaken", None),
+        ("MKTT54001554", "Episode 2", 1954, None, "radio", "maaken", None),
+        ("FTEA00000001", "Introduksjon", 1970, None, "tv", None, "FTEA00005883"),
+    ]
+    assert group_episodes(rows) == [
+        ["FDRP42000192", "FDRP42000292"],
+        ["FTEA00000001", "FTEA00005883", "FTEA00015883"],
+        ["MKRT00000162"],
+        ["MKRT00000262"],
+        ["MKTT54001454", "MKTT54001554"],
+    ]
+
+
+def test_group_episodes_keeps_existing_membership():
+    rows = [
+        ("FTEA01008185", "Av måneskinn gror det ingenting", 1985, None, "tv", None, None, 7),
+        ("FTEA01008285", "Av måneskinn gror det ingenting", 1985, None, "tv", None, None, 7),
+        ("FTEA00009999", "Kaare og kråka", 1980, None, "tv", None, None, None),
+    ]
+    assert group_episodes(rows) == [["FTEA00009999"], ["FTEA01008185", "FTEA01008285"]]
+
+
+def test_regroup_merges_split_parts(db):
+    # Split Peer Gynt back into one performance per part
+    with db:
+        db.execute("""
+            INSERT INTO performances (work_id, source, year, title, medium)
+            VALUES (1, 'nrk', 1975, 'Peer Gynt 2:2', 'tv')
+        """)
+        split_id = db.execute("SELECT last_insert_rowid()").fetchone()[0]
+        db.execute("UPDATE episodes SET performance_id = ? WHERE prf_id = 'FTEA00001178'", (split_id,))
+    peer_gynt = db.execute("SELECT performance_id FROM episodes WHERE prf_id = 'FTEA00001078'").fetchone()[0]
+
+    with db:
+        result = regroup_performances(db)
+
+    assert result["moved"] == 1
+    assert result["deleted"] == 1
+    assert db.execute(
+        "SELECT DISTINCT performance_id FROM episodes WHERE play_id = 1"
+    ).fetchall() == [(peer_gynt,)]
+    assert db.execute("SELECT total_duration FROM performances WHERE id = ?", (peer_gynt,)).fetchone() == (6600,)
+    assert db.execute("SELECT COUNT(*) FROM performances WHERE id = ?", (split_id,)).fetchone() == (0,)
+    assert db.execute(
+        "SELECT person_id, role FROM performance_persons WHERE performance_id = ?", (peer_gynt,)
+    ).fetchall() == [(5, "actor")]
+
+    with db:
+        assert regroup_performances(db)["moved"] == 0
+
+
+def test_regroup_creates_performances_for_unlinked_episodes(db):
+    with db:
+        db.execute("""
+            INSERT INTO episodes (prf_id, title, year, duration_seconds, medium)
+            VALUES ('FTEA00001278', 'Peer Gynt - Introduksjon', 1975, 600, 'tv')
+        """)
+        db.execute("""
+            INSERT INTO episodes (prf_id, title, year, duration_seconds, medium)
+            VALUES ('FTEA00002080', 'Gjengangere 1:2', 1980, 3000, 'tv'),
+                   ('FTEA00002180', 'Gjengangere 2:2', 1980, 3100, 'tv')
+        """)
+        result = regroup_performances(db)
+
+    assert result["created"] == 2
+    perf_ids = {row[0] for row in db.execute(
+        "SELECT performance_id FROM episodes WHERE prf_id IN ('FTEA00002080', 'FTEA00002180')"
+    )}
+    assert len(perf_ids) == 1
+    assert db.execute(
+        "SELECT title, total_duration FROM performances WHERE id = ?", (perf_ids.pop(),)
+    ).fetchone() == ("Gjengangere", 6100)
+
+
+def test_episode_changes_mark_performances_stale(db):
+    peer_gynt = db.execute("SELECT performance_id FROM episodes WHERE prf_id = 'FTEA00001078'").fetchone()[0]
+    with db:
+        db.execute("UPDATE episodes SET duration_seconds = 4000 WHERE prf_id = 'FTEA00001078'")
+        db.execute("INSERT INTO episode_persons (episode_id, person_id, role) VALUES ('FTEA00001178', 4, 'actor')")
+    assert db.execute("SELECT id FROM performances_stale").fetchall() == [(peer_gynt,)]
+
+    with db:
+        assert refresh_performances(db) == 1
+    assert db.execute("SELECT COUNT(*) FROM performances_stale").fetchone() == (0,)
+    assert db.execute("SELECT total_duration FROM performances WHERE id = ?", (peer_gynt,)).fetchone() == (7000,)
+    assert db.execute(
+        "SELECT person_id FROM performance_persons WHERE performance_id = ? ORDER BY person_id", (peer_gynt,)
+    ).fetchall() == [(4,), (5,)]
+
+
+def test_refresh_picks_representative_episode_by_part(db):
+    peer_gynt = db.execute("SELECT performance_id FROM episodes WHERE prf_id = 'FTEA00001078'").fetchone()[0]
+    with db:
+        db.execute("""
+            UPDATE episodes SET description = 'Del to', image_url = 'https://img/2.jpg', part_number = 2
+            WHERE prf_id = 'FTEA00001178'
+        """)
+        db.execute("UPDATE episodes SET description = 'Del en', part_number = 1 WHERE prf_id = 'FTEA00001078'")
+        db.execute("DELETE FROM episodes WHERE prf_id = 'FTEA00007974'")
+        refresh_performances(db)
+    assert db.execute(
+        "SELECT description, image_url, year FROM performances WHERE id = ?", (peer_gynt,)
+    ).fetchone() == ("Del en", "https://img/2.jpg", 1975)
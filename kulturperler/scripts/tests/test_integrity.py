@@ -0,0 +1,84 @@
+import json
+
+from utils.integrity import missing_indexes, scan_integrity
+from utils.migrations import run_migrations
+
+
+def issues(report):
+    return {(i.check, i.table): i for i in report.issues}
+
+
+def break_db(db):
+    with db:
+        db.execute("DROP INDEX uq_episode_persons_key")
+        db.execute("INSERT INTO episode_persons (episode_id, person_id, role) VALUES ('FTEA00009999', 3, 'director')")
+        db.execute("INSERT INTO episode_persons (episode_id, person_id, role) VALUES ('FTEA00007974', 99, 'actor')")
+        db.execute("UPDATE episodes SET play_id = 99 WHERE prf_id = 'FTEA00009999'")
+        db.execute("INSERT INTO persons (id, name) VALUES (6, 'Wenche Foss')")
+        db.execute("INSERT INTO performances (id, title, source) VALUES (900, 'Tom', 'nrk')")
+        db.execute("INSERT INTO performances (id, title, source) VALUES (901, 'Ekstern', 'external')")
+        db.execute("INSERT INTO performance_persons (performance_id, person_id, role) VALUES (900, 4, 'actor')")
+
+
+def test_migrated_fixture_is_clean_and_indexed(db):
+    report = scan_integrity(db)
+    db.rollback()
+
+    assert report.clean
+    assert report.missing_indexes == []
+    assert missing_indexes(db) == []
+
+
+def test_scan_reports_without_changing_anything(db):
+    break_db(db)
+    report = scan_integrity(db)
+    db.rollback()
+    found = issues(report)
+
+    assert found[("foreign_key", "episode_persons")].count == 1
+    assert found[("foreign_key", "episode_persons")].action == "delete"
+    assert found[("foreign_key", "episodes")].action == "set_null"
+    assert found[("foreign_key", "episodes")].detail == "play_id -> plays(id)"
+    assert found[("duplicate", "episode_persons")].count == 1
+    assert found[("orphan", "persons")].sample == [6]
+    assert found[("orphan", "performances")].sample == [900]
+    assert report.fixed == 0
+    assert report.missing_indexes == ["uq_episode_persons_key"]
+    assert db.execute("SELECT COUNT(*) FROM episode_persons").fetchone()[0] == 6
+
+
+def test_fix_repairs_everything_in_one_transaction(db):
+    break_db(db)
+    with db:
+        report = scan_integrity(db, fix=True)
+
+    assert report.fixed == 4
+    assert report.created_indexes == ["uq_episode_persons_key"]
+    assert db.execute("SELECT play_id FROM episodes WHERE prf_id = 'FTEA00009999'").fetchone()[0] is None
+    assert db.execute("SELECT COUNT(*) FROM episode_persons").fetchone()[0] == 4
+    assert db.execute("SELECT id FROM performances WHERE id >= 900").fetchall() == [(901,)]
+    assert db.execute("SELECT COUNT(*) FROM performance_persons WHERE performance_id = 900").fetchone()[0] == 0
+    # Orphaned persons are left for review
+    assert db.execute("SELECT name FROM persons WHERE id = 6").fetchone() == ("Wenche Foss",)
+
+    after = scan_integrity(db)
+    db.rollback()
+    assert [(i.check, i.table) for i in after.issues] == [("orphan", "persons")]
+    json.dumps(report.to_dict())
+
+
+def test_migration_dedupes_and_unique_index_ignores_repeats(raw_db):
+    with raw_db:
+        raw_db.execute("INSERT INTO episode_persons (episode_id, person_id, role) VALUES ('FTEA00009999', 3, 'director')")
+    run_migrations(raw_db, log=lambda _: None)
+
+    assert raw_db.execute(
+        "SELECT COUNT(*) FROM episode_persons WHERE episode_id = 'FTEA00009999'"
+    ).fetchone()[0] == 1
+    with raw_db:
+        raw_db.execute(
+            "INSERT OR IGNORE INTO episode_persons (episode_id, person_id, role) VALUES ('FTEA00009999', 3, 'director')"
+        )
+    assert raw_db.execute(
+        "SELECT COUNT(*) FROM episode_persons WHERE episode_id = 'FTEA00009999'"
+    ).fetchone()[0] == 1
@@ -0,0 +1,135 @@
+import importlib
+import json
+from datetime import datetime, timedelta
+
+from utils.job_queue import JobQueue, import_progress_file
+from utils.sceneweb_mirror import connect_mirror, seed, store_artwork
+from utils.sceneweb_scraper import ScenewebArtwork
+
+match_sceneweb = importlib.import_module("02_match_sceneweb")
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, 12, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def test_leases_by_priority_and_never_twice(db):
+    first = JobQueue(db, "stage", worker="a")
+    second = JobQueue(db, "stage", worker="b")
+    assert first.enqueue([("low", 0), ("high", 5), ("mid", 1)]) == 3
+    assert first.enqueue(["high"]) == 0
+    db.commit()
+
+    assert first.lease(2) == ["high", "mid"]
+    assert second.lease(5) == ["low"]
+    assert second.lease(5) == []
+    assert first.counts()["leased"] == 3
+
+
+def test_status_commits_with_the_callers_transaction(db):
+    queue = JobQueue(db, "stage")
+    queue.enqueue(["a", "b"])
+    db.commit()
+    queue.lease(2)
+
+    queue.done("a", {"play_id": 1})
+    queue.no_match("b")
+    queue.flush()
+    db.rollback()
+    assert queue.status("a") == "leased"
+
+    queue.done("a", {"play_id": 1})
+    queue.no_match("b")
+    queue.flush()
+    db.commit()
+    assert queue.status("a") == "done"
+    assert queue.result("a") == {"play_id": 1}
+    assert queue.status("b") == "no_match"
+    assert queue.lease(5) == []
+
+    assert queue.retry() == 1
+    assert queue.lease(5) == ["b"]
+
+
+def test_expired_leases_are_handed_out_again(db):
+    clock = Clock()
+    crashed = JobQueue(db, "stage", lease_seconds=60, worker="a", clock=clock)
+    crashed.enqueue(["a"])
+    db.commit()
+    assert crashed.lease(1) == ["a"]
+
+    other = JobQueue(db, "stage", lease_seconds=60, worker="b", clock=clock)
+    assert other.lease(1) == []
+    clock.advance(61)
+    assert other.lease(1) == ["a"]
+
+
+def test_failures_back_off_until_max_attempts(db):
+    clock = Clock()
+    queue = JobQueue(db, "stage", max_attempts=2, retry_delay=10, clock=clock)
+    queue.enqueue(["a"])
+    db.commit()
+
+    assert queue.lease(1) == ["a"]
+    queue.fail("a", "timeout")
+    queue.flush()
+    db.commit()
+    assert queue.lease(1) == []
+    clock.advance(10)
+    assert queue.lease(1) == ["a"]
+
+    queue.fail("a", "timeout again")
+    queue.flush()
+    db.commit()
+    clock.advance(3600)
+    assert queue.lease(1) == []
+    assert db.execute("SELECT attempts, last_error FROM jobs WHERE task_key = 'a'").fetchone() == (2, "timeout again")
+
+
+def test_imports_legacy_progress_file_once(db, tmp_path):
+    path = tmp_path / "sceneweb_progress.json"
+    path.write_text(json.dumps({
+        "matched": {"FTEA00001078": {"play_id": 1}},
+        "no_match": ["FTEA00009999"],
+        "errors": [],
+    }))
+    queue = JobQueue(db, "sceneweb_match")
+    assert import_progress_file(queue, path, ["matched"], ["no_match"]) == 2
+    assert import_progress_file(queue, path, ["matched"], ["no_match"]) == 0
+    assert queue.result("FTEA00001078") == {"play_id": 1}
+    assert queue.status("FTEA00009999") == "no_match"
+
+    queue.enqueue(["FTEA00001078", "FTEA00007974"])
+    assert queue.lease(5) == ["FTEA00007974"]
+
+
+def test_sceneweb_matching_resumes_from_the_queue(db, tmp_path):
+    mirror = connect_mirror(tmp_path / "sceneweb.db")
+    seed(mirror, "artwork", [7])
+    with mirror:
+        store_artwork(mirror, 7, ScenewebArtwork(
+            7, "Kaare og kråka", "https://sceneweb.no/nb/artwork/7", None, None, 1970,
+        ))
+    mirror.close()
+    with db:
+        db.execute("UPDATE episodes SET play_id = NULL WHERE prf_id IN ('FTEA00009999', 'FTEA00007974')")
+        db.execute("UPDATE episodes SET title = 'Ukjent tittel' WHERE prf_id = 'FTEA00007974'")
+
+    match_sceneweb.match_episodes(tmp_path / "kulturperler.db", tmp_path / "sceneweb.db")
+
+    queue = JobQueue(db, match_sceneweb.STAGE)
+    assert queue.status("FTEA00009999") == "done"
+    assert queue.status("FTEA00007974") == "no_match"
+    play_id = queue.result("FTEA00009999")["play_id"]
+    assert db.execute("SELECT play_id FROM episodes WHERE prf_id = 'FTEA00009999'").fetchone() == (play_id,)
+
+    # A second run has nothing left to do
+    match_sceneweb.match_episodes(tmp_path / "kulturperler.db", tmp_path / "sceneweb.db")
+    assert queue.counts()["done"] == 1
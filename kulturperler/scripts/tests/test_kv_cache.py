@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from utils.kv_cache import KVCache, open_cache, split_prefixed
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = KVCache(tmp_path / "cache.db", clock=clock)
+    yield cache
+    cache.close()
+
+
+def test_namespaces_keep_keys_apart(cache):
+    cache.set("search", "Ibsen", [{"id": "FTEA00001078"}])
+    cache.set("ai", "Ibsen", {"relevant": True})
+
+    assert cache.get("search", "Ibsen") == [{"id": "FTEA00001078"}]
+    assert cache.get("ai", "Ibsen") == {"relevant": True}
+    assert cache.get("artwork", "Ibsen") is None
+    assert len(cache) == 2
+
+
+def test_set_overwrites_and_survives_reopen(tmp_path, clock):
+    with KVCache(tmp_path / "cache.db", clock=clock) as cache:
+        cache.set("artwork", "https://sceneweb.no/nb/artwork/1", {})
+        cache.set("artwork", "https://sceneweb.no/nb/artwork/1", {"original_title": "Peer Gynt"})
+
+    with KVCache(tmp_path / "cache.db", clock=clock) as cache:
+        assert cache.get("artwork", "https://sceneweb.no/nb/artwork/1") == {"original_title": "Peer Gynt"}
+        assert len(cache) == 1
+
+
+def test_falsy_values_are_hits(cache):
+    searches = cache.namespace("search")
+    searches["nothing"] = []
+
+    assert "nothing" in searches
+    assert searches["nothing"] == []
+    assert "missing" not in searches
+    with pytest.raises(KeyError):
+        searches["missing"]
+
+
+def test_entries_expire_after_ttl(cache, clock):
+    searches = cache.namespace("search", ttl=60)
+    searches["Ibsen"] = ["hit"]
+    cache.set("ai", "kept", True)
+
+    clock.now += 59
+    assert searches["Ibsen"] == ["hit"]
+    clock.now += 1
+    assert "Ibsen" not in searches
+    assert len(searches) == 0
+    assert cache.get("ai", "kept") is True
+
+
+def test_evicts_least_recently_used_over_max_bytes(tmp_path, clock):
+    cache = KVCache(tmp_path / "cache.db", max_bytes=100, clock=clock)
+    for i in range(4):
+        clock.now += 1
+        cache.set("search", f"q{i}", "x" * 18)  # 20 bytes encoded
+    clock.now += 1
+    cache.get("search", "q0")  # q0 is now the most recently used
+
+    clock.now += 1
+    cache.set("search", "q4", "x" * 18)
+    assert len(cache) == 5
+    clock.now += 1
+    cache.set("search", "q5", "x" * 18)
+
+    # Over 100 bytes: the oldest entries go until the total is under 90
+    assert not cache.contains("search", "q1")
+    assert not cache.contains("search", "q2")
+    assert cache.contains("search", "q0")
+    assert cache.contains("search", "q5")
+    assert cache._bytes <= 90
+    cache.close()
+
+
+def test_imports_legacy_json_without_overwriting(cache, tmp_path):
+    legacy = tmp_path / "nrk_about_cache.json"
+    legacy.write_text(json.dumps({
+        "search:Henrik Ibsen": [{"id": "MKRT00000162"}],
+        "ai:Henrik Ibsen:Ibsen i Roma": {"relevant": True},
+    }), encoding="utf-8")
+    cache.set("search", "Henrik Ibsen", ["newer"])
+
+    assert cache.import_json(legacy, split_prefixed) == 1
+    assert cache.get("search", "Henrik Ibsen") == ["newer"]
+    assert cache.get("ai", "Henrik Ibsen:Ibsen i Roma") == {"relevant": True}
+    assert cache.import_json(tmp_path / "missing.json", split_prefixed) == 0
+
+
+def test_open_cache_seeds_only_an_empty_cache(tmp_path, monkeypatch):
+    from utils import kv_cache
+
+    monkeypatch.setattr(kv_cache, "DATA_DIR", tmp_path)
+    (tmp_path / "sceneweb_cache.json").write_text(
+        json.dumps({"https://sceneweb.no/nb/artwork/1": {"year_written": 1867}}), encoding="utf-8"
+    )
+
+    with open_cache(tmp_path / "cache.db") as cache:
+        assert cache.get("artwork", "https://sceneweb.no/nb/artwork/1") == {"year_written": 1867}
+        cache.delete("artwork", "https://sceneweb.no/nb/artwork/1")
+        cache.set("search", "x", [])
+
+    with open_cache(tmp_path / "cache.db") as cache:
+        assert not cache.contains("artwork", "https://sceneweb.no/nb/artwork/1")
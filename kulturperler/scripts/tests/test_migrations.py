@@ -0,0 +1,59 @@
+import pytest
+
+from utils import migrations
+from utils.db_schema import table_columns
+from utils.migrations import MIGRATIONS, Migration, current_version, run_migrations
+
+
+def quiet(_):
+    pass
+
+
+def test_migrates_fresh_database_to_latest(raw_db):
+    results = run_migrations(raw_db, log=quiet)
+    assert [r.version for r in results] == [m.version for m in MIGRATIONS]
+    assert current_version(raw_db) == MIGRATIONS[-1].version
+    assert run_migrations(raw_db, log=quiet) == []
+
+
+def test_groups_and_merges_episodes_into_performances(db):
+    rows = db.execute("""
+        SELECT p.title, p.medium, p.work_id, COUNT(e.prf_id), p.total_duration
+        FROM performances p JOIN episodes e ON e.performance_id = p.id
+        GROUP BY p.id ORDER BY p.title
+    """).fetchall()
+    assert ("Peer Gynt", "tv", 1, 2, 6600) in rows
+    assert ("En fallit", "radio", 3, 1, 4200) in rows
+    assert db.execute("SELECT COUNT(*) FROM episodes WHERE performance_id IS NULL").fetchone()[0] == 0
+
+
+def test_existing_performances_take_radio_medium(raw_db):
+    run_migrations(raw_db, target=2, log=quiet)
+    raw_db.executescript("""
+        CREATE TABLE performances (id INTEGER PRIMARY KEY AUTOINCREMENT, work_id INTEGER, year INTEGER, title TEXT);
+        INSERT INTO performances (id, work_id, title) VALUES (1, 3, 'En fallit');
+        ALTER TABLE episodes ADD COLUMN performance_id INTEGER;
+        UPDATE episodes SET performance_id = 1 WHERE prf_id = 'MKRT00000162';
+    """)
+    run_migrations(raw_db, target=3, log=quiet)
+    assert raw_db.execute("SELECT medium FROM performances WHERE id = 1").fetchone() == ("radio",)
+
+
+def test_dry_run_changes_nothing(raw_db):
+    results = run_migrations(raw_db, dry_run=True, log=quiet)
+    assert results
+    assert current_version(raw_db) == 0
+    assert "work_type" not in table_columns(raw_db, "plays")
+
+
+def test_failed_migration_rolls_back_and_keeps_earlier(raw_db, monkeypatch):
+    def broken(conn):
+        conn.execute("ALTER TABLE plays ADD COLUMN half_done TEXT")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS[:1] + [Migration(99, "broken", broken)])
+    with pytest.raises(RuntimeError):
+        run_migrations(raw_db, log=quiet)
+    assert current_version(raw_db) == 1
+    assert "half_done" not in table_columns(raw_db, "plays")
+    assert not raw_db.in_transaction
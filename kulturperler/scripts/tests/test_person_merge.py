@@ -0,0 +1,35 @@
+import pytest
+
+from utils.person_merge import merge_persons_bulk, resolve_mapping
+
+
+def test_resolve_mapping_follows_chains_and_rejects_cycles():
+    assert resolve_mapping([(3, 2), (2, 1), (4, 4)]) == {3: 1, 2: 1}
+    with pytest.raises(ValueError):
+        resolve_mapping([(1, 2), (2, 1)])
+
+
+def test_merge_rewrites_references_and_fills_attributes(db):
+    with db:
+        db.execute("INSERT INTO persons (id, name, birth_year, wikidata_id) VALUES (6, 'T. Maurstad', 1926, 'Q4')")
+        db.execute("""INSERT INTO episode_persons (episode_id, person_id, role, character_name)
+                      VALUES ('FTEA00001078', 6, 'actor', 'Peer Gynt'), ('FTEA00007974', 6, 'actor', 'Helmer')""")
+
+    result = merge_persons_bulk(db, [(6, 5)])
+
+    assert result.merged == 1
+    assert result.collapsed == {"episode_persons": 1}
+    assert result.filled == {"wikidata_id": 1}
+    roles = db.execute(
+        "SELECT episode_id, character_name FROM episode_persons WHERE person_id = 5 ORDER BY episode_id"
+    ).fetchall()
+    assert roles == [("FTEA00001078", "Peer Gynt"), ("FTEA00001178", "Peer Gynt"), ("FTEA00007974", "Helmer")]
+    assert db.execute("SELECT COUNT(*) FROM persons WHERE id = 6").fetchone()[0] == 0
+
+
+def test_missing_winner_fails_before_any_write(db):
+    before = db.execute("SELECT COUNT(*) FROM episode_persons WHERE person_id = 4").fetchone()[0]
+    with pytest.raises(ValueError, match="not in persons: 99"):
+        merge_persons_bulk(db, [(3, 5), (4, 99)])
+    assert db.execute("SELECT COUNT(*) FROM persons WHERE id IN (3, 4)").fetchone()[0] == 2
+    assert db.execute("SELECT COUNT(*) FROM episode_persons WHERE person_id = 4").fetchone()[0] == before
@@ -0,0 +1,57 @@
+from utils.person_resolution import (
+    AUTO_THRESHOLD,
+    REVIEW_THRESHOLD,
+    PersonRecord,
+    name_tokens,
+    record_decision,
+    resolve_persons,
+    score_pair,
+)
+from utils.union_find import UnionFind
+
+
+def person(pid, name, birth_year=None, wikidata_id=None, sceneweb_id=None, works=()):
+    return PersonRecord(pid, name, name_tokens(name), birth_year, wikidata_id, sceneweb_id, set(works))
+
+
+def test_given_name_variants_stay_below_auto_merge():
+    for a, b in [("Ingar Helge Gimle", "Inger Helge Gimle"), ("Sven Nordin", "Svein Nordin"),
+                 ("Petter Lindbæk", "Peter Lindbæk"), ("H. Ibsen", "Henrik Ibsen")]:
+        pair = score_pair(person(1, a, 1950, works={1, 2}), person(2, b, 1950, works={1, 2}))
+        assert REVIEW_THRESHOLD <= pair.score < AUTO_THRESHOLD, (a, b, pair)
+
+
+def test_identical_names_need_corroboration():
+    assert score_pair(person(1, "Per Hansen"), person(2, "Per Hansen")).score < AUTO_THRESHOLD
+    assert score_pair(person(1, "Per Hansen", 1940), person(2, "Per Hansen")).score < AUTO_THRESHOLD
+    assert score_pair(person(1, "Per Hansen", 1940), person(2, "Per Hansen", 1940)).score >= AUTO_THRESHOLD
+    assert score_pair(person(1, "Per Hansen", sceneweb_id=7), person(2, "Per Hansen", sceneweb_id=7)).score == 1.0
+    assert score_pair(person(1, "Per Hansen", 1940), person(2, "Per Hansen", 1960)) is None
+
+
+def test_union_find_refuses_transitive_cannot_link():
+    uf = UnionFind([(1, 3)])
+    assert uf.union(1, 2)
+    assert not uf.union(2, 3)
+    assert uf.union(3, 4)
+    assert not uf.union(4, 2)
+    assert sorted(uf.groups().values()) == [[1, 2], [3, 4]]
+
+
+def test_resolve_keeps_decided_pairs_apart(db):
+    with db:
+        db.executemany(
+            "INSERT INTO persons (id, name, birth_year) VALUES (?, ?, ?)",
+            [(10, "Per Hansen", 1940), (11, "Per Hansen", 1940), (12, "Hansen Per", 1940),
+             (13, "Per Hansen", None)],
+        )
+        record_decision(db, 10, 12, "different")
+
+    result = resolve_persons(db)
+    clusters = {}
+    for person_id, cluster_id in db.execute("SELECT person_id, cluster_id FROM person_clusters"):
+        clusters.setdefault(cluster_id, set()).add(person_id)
+    assert result["blocked"] == 2  # 10-12 directly, 11-12 through 10
+    assert list(clusters.values()) == [{10, 11}]
+    review = db.execute("SELECT COUNT(*) FROM person_match_pairs WHERE person_b = 13").fetchone()[0]
+    assert review == 3
@@ -0,0 +1,89 @@
+import json
+
+import audit_persons
+from utils.reachability import collect_garbage
+
+
+def results(report):
+    return {r.table: r for r in report.results}
+
+
+def add_garbage(db):
+    with db:
+        # Added by the NRK program fetcher, not part of the build schema
+        db.execute("CREATE TABLE nrk_about_programs (id TEXT PRIMARY KEY, person_id INTEGER REFERENCES persons(id), title TEXT)")
+        db.execute("INSERT INTO persons (id, name) VALUES (6, 'Wenche Foss'), (7, 'Espen Skjønberg'), "
+                   "(8, 'Aase Bye'), (9, 'Henny Moan'), (10, 'Ukjent')")
+        # Reachable only through a performance, an external performance or an NRK program
+        db.execute("INSERT INTO performances (id, title, source) VALUES (901, 'Ekstern', 'sceneweb')")
+        db.execute("INSERT INTO performance_persons (performance_id, person_id, role) VALUES (901, 6, 'actor')")
+        db.execute("INSERT INTO external_performances (id, play_id, title, url) VALUES (1, 3, 'En fallit', 'https://x')")
+        db.execute("INSERT INTO external_performance_persons (performance_id, person_id, role) VALUES (1, 7, 'actor')")
+        db.execute("INSERT INTO nrk_about_programs (id, person_id, title) VALUES ('MSPO1', 8, 'Portrett')")
+        # Unreachable: an NRK performance without episodes, its cast, and a play nobody performs
+        db.execute("INSERT INTO performances (id, title, source, work_id) VALUES (900, 'Tom', 'nrk', 4)")
+        db.execute("INSERT INTO performance_persons (performance_id, person_id, role) VALUES (900, 9, 'actor')")
+        db.execute("INSERT INTO plays (id, title, playwright_id) VALUES (4, 'Gengangere', 10)")
+        db.execute("INSERT INTO tags (id, name, display_name) VALUES (1, 'drama', 'Drama'), (2, 'tragedie', 'Tragedie')")
+        db.execute("INSERT INTO episode_tags (episode_id, tag_id) VALUES ('FTEA00001078', 1)")
+        db.execute("INSERT INTO play_tags (play_id, tag_id) VALUES (4, 2)")
+        db.execute("INSERT INTO external_resources (id, url) VALUES (1, 'https://a'), (2, 'https://b')")
+        db.execute("INSERT INTO person_resources (person_id, resource_id) VALUES (6, 1), (10, 2)")
+        # Kept for its link to another platform
+        db.execute("CREATE TABLE play_external_links (id INTEGER PRIMARY KEY, play_id INTEGER REFERENCES plays(id), url TEXT)")
+        db.execute("INSERT INTO plays (id, title) VALUES (5, 'Prima Facie')")
+        db.execute("INSERT INTO play_external_links (play_id, url) VALUES (5, 'https://y')")
+
+
+def test_migrated_fixture_has_no_garbage(db):
+    report = collect_garbage(db)
+    db.rollback()
+
+    assert report.dead == 0
+    assert results(report)["persons"].live == 5
+    assert results(report)["plays"].live == 3
+
+
+def test_report_only_leaves_the_data(db):
+    add_garbage(db)
+    report = collect_garbage(db)
+    db.rollback()
+    found = results(report)
+
+    assert found["persons"].sample == [9, 10]
+    assert found["plays"].sample == [4]
+    assert found["performances"].sample == [900]
+    assert found["tags"].sample == [2]
+    assert found["external_resources"].sample == [2]
+    assert report.deleted == 0
+    assert db.execute("SELECT COUNT(*) FROM persons").fetchone()[0] == 10
+    json.dumps(report.to_dict())
+
+
+def test_apply_deletes_unreachable_rows_and_their_links(db):
+    add_garbage(db)
+    with db:
+        report = collect_garbage(db, apply=True)
+
+    assert report.deleted == 6
+    assert results(report)["performances"].owned_deleted == {"performance_persons.performance_id": 1}
+    assert [r[0] for r in db.execute("SELECT id FROM persons ORDER BY id")] == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert [r[0] for r in db.execute("SELECT id FROM plays ORDER BY id")] == [1, 2, 3, 5]
+    assert db.execute("SELECT COUNT(*) FROM play_tags").fetchone()[0] == 0
+    assert db.execute("SELECT person_id FROM person_resources").fetchall() == [(6,)]
+    assert db.execute("SELECT id FROM tags").fetchall() == [(1,)]
+
+    again = collect_garbage(db)
+    db.rollback()
+    assert again.dead == 0
+
+
+def test_orphan_audit_agrees_with_the_collector(db):
+    add_garbage(db)
+    db.commit()
+    audit_persons.audit_orphaned_persons(db, None)
+    audit_persons.review_items.clear()
+
+    assert audit_persons.stats["orphaned_persons"] == len(results(collect_garbage(db))["persons"].sample) == 2
+    db.rollback()
+    assert db.execute("SELECT COUNT(*) FROM persons").fetchone()[0] == 10
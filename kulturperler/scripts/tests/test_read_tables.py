@@ -0,0 +1,52 @@
+from utils.read_tables import refresh_read_tables
+
+
+def rows(conn, sql, *params):
+    return conn.execute(sql, params).fetchall()
+
+
+def test_play_and_playwright_counts(db):
+    counts = refresh_read_tables(db)
+    assert counts["mv_plays"] == 3
+
+    peer_gynt = rows(db, "SELECT performance_count, episode_count FROM mv_plays WHERE id = 1")
+    assert peer_gynt == [(1, 2)]  # both parts merged into one performance
+
+    ibsen = rows(db, """
+        SELECT play_count, performance_count, episode_play_count, episode_count
+        FROM mv_playwrights WHERE id = 1
+    """)
+    assert ibsen == [(2, 2, 2, 3)]
+
+
+def test_performance_media_and_first_image(db):
+    with db:
+        db.execute("UPDATE episodes SET image_url = 'b.jpg' WHERE prf_id = 'FTEA00001178'")
+    refresh_read_tables(db)
+    perf = rows(db, """
+        SELECT m.media_count, m.image_url, m.work_title, m.playwright_name
+        FROM mv_performances m JOIN episodes e ON e.performance_id = m.id
+        WHERE e.prf_id = 'FTEA00001078'
+    """)
+    assert perf == [(2, "b.jpg", "Peer Gynt", "Henrik Ibsen")]
+
+    with db:
+        db.execute("UPDATE episodes SET image_url = 'a.jpg' WHERE prf_id = 'FTEA00001078'")
+    refresh_read_tables(db)
+    assert rows(db, """
+        SELECT m.image_url FROM mv_performances m JOIN episodes e ON e.performance_id = m.id
+        WHERE e.prf_id = 'FTEA00001078'
+    """) == [("a.jpg",)]
+
+
+def test_performance_credits_do_not_list_playwrights(db):
+    with db:
+        perf_id = rows(db, "SELECT performance_id FROM episodes WHERE prf_id = 'FTEA00007974'")[0][0]
+        db.execute("UPDATE performances SET work_id = NULL WHERE id = ?", (perf_id,))
+        db.execute(
+            "INSERT INTO performance_persons (performance_id, person_id, role) VALUES (?, 4, 'playwright')",
+            (perf_id,),
+        )
+    refresh_read_tables(db)
+    # Only plays make a playwright
+    assert 4 not in {row[0] for row in rows(db, "SELECT id FROM mv_playwrights")}
@@ -0,0 +1,31 @@
+import gzip
+import json
+import sqlite3
+
+from export_route_bundles import export_bundles
+
+
+def load(path):
+    return json.loads(gzip.decompress(path.read_bytes()))
+
+
+def test_bundles_are_gzipped_json(db, tmp_path):
+    db.row_factory = sqlite3.Row
+    stats = export_bundles(db, tmp_path)
+
+    assert stats["play"][0] == 3
+    assert not list(tmp_path.rglob("*.json"))
+    bundle = load(tmp_path / "episode" / "FTEA00007974.json.gz")
+    assert bundle["episode"]["play_title"] == "Et dukkehjem"
+    assert bundle["contributors"][0]["person_name"] == "Liv Ullmann"
+
+
+def test_play_bundle_buckets_missing_medium_as_tv(db, tmp_path):
+    with db:
+        db.execute("UPDATE performances SET medium = NULL WHERE work_id = 2")
+    db.row_factory = sqlite3.Row
+    export_bundles(db, tmp_path)
+
+    bundle = load(tmp_path / "play" / "2.json.gz")
+    assert [p["title"] for p in bundle["tv_performances"]] == ["Et dukkehjem"]
+    assert load(tmp_path / "play" / "3.json.gz")["radio_performances"]
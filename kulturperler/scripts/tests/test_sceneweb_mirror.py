@@ -0,0 +1,105 @@
+from datetime import datetime
+
+from utils import sceneweb_mirror
+from utils.sceneweb_mirror import (
+    ScenewebMirror,
+    connect_mirror,
+    crawl,
+    due_pages,
+    refresh_cutoff,
+    seed,
+    seed_from_database,
+    store_artist,
+    store_artwork,
+)
+from utils.sceneweb_scraper import ScenewebArtwork, ScenewebPerson
+
+
+def artwork(sceneweb_id, title, playwright_id=None):
+    return ScenewebArtwork(sceneweb_id, title, f"https://sceneweb.no/nb/artwork/{sceneweb_id}",
+                           "Henrik Ibsen" if playwright_id else None, playwright_id, 1866)
+
+
+def mirror_with(artworks):
+    conn = connect_mirror(":memory:")
+    seed(conn, "artwork", [a.sceneweb_id for a in artworks])
+    with conn:
+        for a in artworks:
+            store_artwork(conn, a.sceneweb_id, a)
+    return conn
+
+
+def test_match_title_exact_prefix_then_fuzzy():
+    conn = mirror_with([
+        artwork(1, "Peer Gynt", 10),
+        artwork(2, "Brand - et dramatisk dikt", 10),
+        artwork(3, "Brand", None),
+        artwork(4, "Vildanden", 10),
+    ])
+    mirror = ScenewebMirror(conn)
+    assert len(mirror) == 4
+    assert mirror.match_title("PEER GYNT (1975)").sceneweb_id == 1
+    # Exact wins over a prefix match, even without a playwright
+    assert mirror.match_title("Brand").sceneweb_id == 3
+    assert mirror.match_title("Vildandenn").sceneweb_id == 4
+    assert mirror.match_title("Hamlet") is None
+    assert mirror.match_title("") is None
+
+
+def test_prefix_match_prefers_attributed_artworks():
+    conn = mirror_with([artwork(5, "Kongsemnerne et historisk skuespill"), artwork(6, "Kongsemnerne i fem akter", 10)])
+    assert ScenewebMirror(conn).match_title("Kongsemnerne").sceneweb_id == 6
+
+
+def test_refresh_cutoff():
+    now = datetime(2026, 10, 19, 12, 0, 0)
+    assert refresh_cutoff(None, now) is None
+    assert refresh_cutoff(7, now) == "2026-10-12T12:00:00"
+    assert refresh_cutoff(-1, now) == "2026-10-19T12:00:00"
+
+
+def test_seed_and_due_pages():
+    conn = connect_mirror(":memory:")
+    assert seed(conn, "artwork", [3, 1, None, 1]) == 2
+    assert seed(conn, "artist", [7]) == 1
+    with conn:
+        store_artwork(conn, 1, artwork(1, "Peer Gynt", 7))
+        conn.execute("UPDATE sceneweb_artworks SET fetched_at = '2020-01-01T00:00:00' WHERE sceneweb_id = 1")
+    assert due_pages(conn) == [("artwork", 3), ("artist", 7)]
+    assert due_pages(conn, "2021-01-01T00:00:00") == [("artwork", 1), ("artwork", 3), ("artist", 7)]
+
+
+def test_seed_from_database(db):
+    db.execute("UPDATE plays SET sceneweb_id = 100 WHERE id = 1")
+    db.execute("UPDATE persons SET sceneweb_id = 200 WHERE id = 1")
+    conn = connect_mirror(":memory:")
+    assert seed_from_database(conn, db) == {"artwork": 1, "artist": 1}
+    assert seed_from_database(conn, db) == {"artwork": 0, "artist": 0}
+
+
+def test_store_artist_queues_linked_artworks():
+    conn = connect_mirror(":memory:")
+    seed(conn, "artist", [10])
+    with conn:
+        store_artist(conn, 10, ScenewebPerson(10, "Henrik Ibsen", "u", 1828, 1906, [], [1, 2]))
+    assert due_pages(conn) == [("artwork", 1), ("artwork", 2)]
+    assert ScenewebMirror(conn).artist(10).birth_year == 1828
+
+
+def test_crawl_follows_links_and_marks_missing(monkeypatch):
+    pages = {1: artwork(1, "Peer Gynt", 10)}
+    monkeypatch.setattr(sceneweb_mirror, "fetch_artwork_details", lambda i, delay: pages.get(i))
+    monkeypatch.setattr(
+        sceneweb_mirror, "fetch_person_details",
+        lambda i, delay: ScenewebPerson(i, "Henrik Ibsen", "u", 1828, 1906, [], [1, 2]),
+    )
+    conn = connect_mirror(":memory:")
+    seed(conn, "artwork", [1])
+
+    counts = crawl(conn, delay=0, log=lambda line: None)
+
+    assert counts == {"artwork": 1, "artist": 1, "missing": 1}
+    statuses = dict(conn.execute("SELECT sceneweb_id, status FROM sceneweb_artworks"))
+    assert statuses == {1: "ok", 2: "missing"}
+    assert due_pages(conn) == []
+    assert crawl(conn, max_pages=5, delay=0, log=lambda line: None) == {"artwork": 0, "artist": 0, "missing": 0}
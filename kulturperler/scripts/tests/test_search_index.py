@@ -0,0 +1,74 @@
+from utils.db_schema import add_column
+from utils.search_index import (
+    build_match_query,
+    ensure_search_index,
+    install_search_index,
+    installed_columns,
+    search,
+)
+
+
+def keys(hits, entity):
+    return [hit.key for hit in hits if hit.entity == entity]
+
+
+def test_folds_norwegian_spellings(db):
+    install_search_index(db)
+    for query in ("Kaare", "Kåre", "Kare"):
+        assert "3" in keys(search(db, query, ["person"]), "person")
+    for query in ("Bjørnson", "Björnson", "Bjornson"):
+        assert "2" in keys(search(db, query, ["person"]), "person")
+
+
+def test_triggers_follow_writes(db):
+    install_search_index(db)
+    with db:
+        db.execute("INSERT INTO episodes (prf_id, title) VALUES ('FTEA00000001', 'Vildanden')")
+    assert keys(search(db, "vildanden", ["episode"]), "episode") == ["FTEA00000001"]
+
+    with db:
+        db.execute("UPDATE episodes SET title = 'Gengangere' WHERE prf_id = 'FTEA00000001'")
+    assert search(db, "vildanden", ["episode"]) == []
+    assert keys(search(db, "gengangere", ["episode"]), "episode") == ["FTEA00000001"]
+
+    with db:
+        db.execute("DELETE FROM episodes WHERE prf_id = 'FTEA00000001'")
+    assert search(db, "gengangere", ["episode"]) == []
+
+
+def test_episode_hits_survive_vacuum(db):
+    install_search_index(db)
+    with db:
+        db.execute("DELETE FROM episodes WHERE prf_id = 'FTEA00001078'")
+    db.execute("VACUUM")  # may renumber rowids of a table without an INTEGER PRIMARY KEY
+    hits = search(db, "dukkehjem", ["episode"])
+    assert keys(hits, "episode") == ["FTEA00007974"]
+    assert hits[0].label == "Et dukkehjem"
+
+
+def test_relevance_is_per_entity(db):
+    install_search_index(db)
+    hits = search(db, "peer gynt")
+    assert {hit.entity for hit in hits} >= {"episode", "play"}
+    best = {}
+    for hit in hits:
+        best.setdefault(hit.entity, hit)
+    assert all(hit.relevance == 1.0 for hit in best.values())
+    assert [hit.relevance for hit in hits] == sorted((hit.relevance for hit in hits), reverse=True)
+
+
+def test_ensure_reinstalls_for_new_columns(db):
+    assert ensure_search_index(db) is False  # nothing installed
+    install_search_index(db)
+    assert ensure_search_index(db) is False
+    add_column(db, "persons", "bio", "TEXT")
+    db.execute("UPDATE persons SET bio = 'Norsk skuespillerinne' WHERE id = 4")
+    db.commit()
+    assert ensure_search_index(db) is True
+    assert "bio" in installed_columns(db)["persons_fts"]
+    assert keys(search(db, "skuespillerinne", ["person"]), "person") == ["4"]
+
+
+def test_build_match_query():
+    assert build_match_query("") == ""
+    assert build_match_query("Peer Gynt") == '"Peer"* "Gynt"*'
@@ -0,0 +1,51 @@
+from difflib import SequenceMatcher
+
+from fuzzy_match_archive import find_best_match
+from utils.title_index import TitleIndex
+from utils.titles import normalize_title
+
+
+def ratio(a, b):
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def build(titles):
+    index = TitleIndex(normalize_title)
+    for key, title in enumerate(titles):
+        index.add(key, title)
+    return index
+
+
+def test_exact_and_fuzzy_matches():
+    index = build(["Peer Gynt", "Et dukkehjem", "Vildanden", "Gengangere"])
+    assert index.lookup("peer gynt")[0].key == 0
+    assert index.best("Vildanda", ratio, threshold=0.8).key == 2
+    assert index.best("Hamlet", ratio, threshold=0.8) is None
+
+
+def test_normalized_queries_are_not_normalized_again():
+    calls = []
+    index = TitleIndex(lambda title: calls.append(title) or normalize_title(title))
+    index.add(1, "Peer Gynt")
+    calls.clear()
+    assert index.best("peer gynt", ratio, normalized=True).key == 1
+    assert calls == []
+
+
+def test_boost_reaches_titles_outside_the_top_candidates():
+    titles = [f"Brand {n}" for n in range(40)] + ["Ibsen leser Brand"]
+    index = build(titles)
+    assert 40 not in index.candidates("brand", limit=5)
+
+    matches = index.search("brand", ratio, limit=5, boost_words=["ibsen"], boost=0.9)
+    assert matches[0].key == 40
+    assert matches[0].score == 1.0
+
+
+def test_archive_match_boosts_author():
+    index = build(["Gengangere", "Fruen fra havet av Henrik Ibsen"])
+    item = {"title": "Fruen fra havet (1978)", "description": "Skuespill av Henrik Ibsen"}
+    match = find_best_match(item, index, threshold=0.6)
+    assert match["title"] == "Fruen fra havet av Henrik Ibsen"
+    assert match["score"] > 0.6
+    assert find_best_match({"title": "Fruen fra havet"}, index, threshold=0.6) is None
@@ -0,0 +1,95 @@
+import importlib
+import sqlite3
+
+import pytest
+
+from import_external import ExternalImporter
+from utils.titles import (
+    clean_title,
+    find_by_title,
+    install_normalized_titles,
+    normalize_title,
+    refresh_normalized_titles,
+)
+
+match_sceneweb = importlib.import_module("02_match_sceneweb")
+
+
+def test_normalize_strips_broadcast_noise():
+    assert clean_title("Fjernsynsteatret viser: Peer Gynt 1:2") == "Peer Gynt"
+    assert normalize_title("Vildanden (1970)") == "vildanden"
+    assert normalize_title("En folkefiende, del 2") == "en folkefiende"
+
+
+def test_triggers_fill_normalized_title_on_write(db):
+    install_normalized_titles(db)
+    db.execute("INSERT INTO plays (id, title) VALUES (10, 'Brand - et dramatisk dikt')")
+    assert db.execute("SELECT normalized_title FROM plays WHERE id = 10").fetchone()[0] == "brand et dramatisk dikt"
+
+    db.execute("UPDATE plays SET title = 'Vildanden' WHERE id = 10")
+    assert db.execute("SELECT normalized_title FROM plays WHERE id = 10").fetchone()[0] == "vildanden"
+    assert refresh_normalized_titles(db)["plays"] == 0
+
+
+def test_writers_must_register_the_function(db, tmp_path):
+    db.commit()
+    other = sqlite3.connect(tmp_path / "kulturperler.db")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="normalize_title"):
+            other.execute("INSERT INTO episodes (prf_id, title) VALUES ('FTEA00000001', 'Brand')")
+        # Updates that leave the title alone need nothing
+        other.execute("UPDATE plays SET year_written = 1866 WHERE id = 1")
+    finally:
+        other.close()
+
+
+def test_install_fills_rows_written_before_the_triggers(raw_db):
+    raw_db.execute("INSERT INTO plays (id, title) VALUES (10, 'Kongsemnerne!')")
+    install_normalized_titles(raw_db)
+    assert raw_db.execute("SELECT normalized_title FROM plays WHERE id = 10").fetchone()[0] == "kongsemnerne"
+
+
+def test_find_by_title_uses_the_index(db):
+    install_normalized_titles(db)
+    db.execute("INSERT INTO plays (id, title) VALUES (10, 'Brand - et dramatisk dikt')")
+    db.execute("INSERT INTO plays (id, title) VALUES (11, 'Brandvakt')")
+    refresh_normalized_titles(db)
+
+    assert find_by_title(db, "plays", "id", "PEER GYNT") == [(1,)]
+    assert find_by_title(db, "plays", "id", "Brand") == [(10,)]
+    assert find_by_title(db, "plays", "id", "Brand", prefix=False) == []
+
+    plan = " ".join(
+        row[-1] for row in db.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM plays WHERE normalized_title >= ? AND normalized_title < ?",
+            ("brand ", "brand!"),
+        )
+    )
+    assert "idx_plays_normalized_title" in plan
+
+
+def test_created_plays_carry_normalized_title(db):
+    install_normalized_titles(db)
+    assert match_sceneweb.get_or_create_play(db, "Peer Gynt!") == 1
+    play_id = match_sceneweb.get_or_create_play(db, "Kongsemnerne", sceneweb_id=42)
+    assert db.execute("SELECT normalized_title FROM plays WHERE id = ?", (play_id,)).fetchone()[0] == "kongsemnerne"
+
+
+def test_external_import_matches_on_indexed_titles(db, tmp_path):
+    install_normalized_titles(db)
+    db.execute("INSERT INTO plays (id, title) VALUES (10, 'Brand - et dramatisk dikt')")
+    db.commit()
+    path = tmp_path / "import.db"
+    db.execute(f"VACUUM INTO '{path}'")
+
+    importer = ExternalImporter(path, tmp_path, dry_run=True)
+    importer.connect()
+    try:
+        assert importer.match_to_play("Peer Gynt (1975)") == 1
+        assert importer.match_to_play("Brand - et dramatisk dikt") == 10
+        # A title that is only a whole-word prefix of a longer play is not a match
+        assert importer.match_to_play("Brand") is None
+        assert importer.match_to_play("Et dukkehjemm") == 2
+        assert importer.match_to_play("Hamlet") is None
+    finally:
+        importer.conn.close()
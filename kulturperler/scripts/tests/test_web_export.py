@@ -0,0 +1,33 @@
+import sqlite3
+
+from utils.web_export import WEB_TABLES, export_web_db
+
+
+def test_export_keeps_web_tables_and_columns(db, tmp_path):
+    with db:
+        db.execute("INSERT INTO tags (id, name, display_name) VALUES (1, 'ibsen', 'Ibsen')")
+        db.execute("INSERT INTO episode_tags (episode_id, tag_id) VALUES ('FTEA00007974', 1)")
+        db.execute("INSERT INTO link_checks (url, status_code) VALUES ('https://nrk.no', 200)")
+    source = tmp_path / "kulturperler.db"
+    output = tmp_path / "web" / "kulturperler.db"
+
+    report = export_web_db(source, output)
+
+    conn = sqlite3.connect(output)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        assert {"tags", "episode_tags", "mv_performances", "mv_plays", "mv_playwrights"} <= tables
+        assert "link_checks" not in tables
+        episode_columns = {row[1] for row in conn.execute("PRAGMA table_info(episodes)")}
+        assert episode_columns <= set(WEB_TABLES["episodes"])
+        assert conn.execute("""
+            SELECT e.title FROM episodes e
+            JOIN episode_tags et ON et.episode_id = e.prf_id
+            JOIN tags t ON t.id = et.tag_id
+            WHERE t.name = 'ibsen'
+        """).fetchall() == [("Et dukkehjem",)]
+    finally:
+        conn.close()
+
+    assert report["rows"]["episodes"] == 5
+    assert report["output_bytes"] == output.stat().st_size
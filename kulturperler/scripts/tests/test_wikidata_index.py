@@ -0,0 +1,95 @@
+import gzip
+import importlib
+import json
+
+from utils.job_queue import JobQueue
+from utils.wikidata_index import WikidataIndex, connect_index, ingest_dump, open_dump
+
+enrich_wikidata = importlib.import_module("03_enrich_wikidata")
+
+
+def item(qid):
+    return {"mainsnak": {"datavalue": {"type": "wikibase-entityid", "value": {"id": f"Q{qid}"}}}}
+
+
+def when(year):
+    return [{"mainsnak": {"datavalue": {"type": "time", "value": {"time": f"+{year}-01-01T00:00:00Z"}}}}]
+
+
+def entity(qid, label, classes, aliases=(), sitelink=None, **claims):
+    return {
+        "id": f"Q{qid}",
+        "labels": {"nb": {"language": "nb", "value": label}},
+        "aliases": {"en": [{"language": "en", "value": alias} for alias in aliases]},
+        "claims": {"P31": [item(c) for c in classes], **claims},
+        "sitelinks": {"nowiki": {"title": sitelink}} if sitelink else {},
+    }
+
+
+ENTITIES = [
+    entity(20, "Norge", [6256]),
+    entity(36661, "Henrik Ibsen", [5], ["Henrik Johan Ibsen"], "Henrik Ibsen",
+           P106=[item(214917)], P569=when(1828), P570=when(1906), P27=[item(20)],
+           P18=[{"mainsnak": {"datavalue": {"type": "string", "value": "Henrik Ibsen.jpg"}}}]),
+    entity(900, "Per Hansen", [5], P106=[item(33999)], P569=when(1940)),
+    entity(901, "Per Hansen", [5], P106=[item(33999)], P569=when(1970)),
+    entity(902, "Liv Ullmann", [5], P106=[item(1930187)]),  # journalist only: skipped
+    entity(669694, "Et dukkehjem", [25379], ["A Doll's House"], "Et dukkehjem",
+           P50=[item(36661)], P577=when(1879)),
+    entity(1000, "Et dukkehjem", [7725634]),
+    entity(2000, "Oslo", [515]),
+]
+
+
+def write_dump(path):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write("[\n" + ",\n".join(json.dumps(e) for e in ENTITIES) + "\n]\n")
+
+
+def test_ingest_keeps_only_the_subset(tmp_path):
+    dump = tmp_path / "latest-all.json.gz"
+    write_dump(dump)
+    conn = connect_index(":memory:")
+    with open_dump(dump) as lines:
+        counts = ingest_dump(conn, lines, source=dump.name)
+    assert (counts["person"], counts["work"], counts["country"]) == (3, 2, 1)
+
+    # Ingesting again replaces rows instead of duplicating names
+    with open_dump(dump) as lines:
+        ingest_dump(conn, lines)
+    assert conn.execute("SELECT COUNT(*) FROM wd_names WHERE qid = 36661").fetchone()[0] == 2
+    assert len(WikidataIndex(conn)) == 5
+
+
+def test_lookups(tmp_path):
+    conn = connect_index(":memory:")
+    ingest_dump(conn, [json.dumps(e) + "," for e in ENTITIES])
+    index = WikidataIndex(conn)
+
+    ibsen = index.match_person("Henrik Johan Ibsen")
+    assert (ibsen.wikidata_id, ibsen.birth_year, ibsen.nationality) == ("Q36661", 1828, "Norge")
+    assert ibsen.wikipedia_url == "https://no.wikipedia.org/wiki/Henrik_Ibsen"
+    assert ibsen.image_url.endswith("Special:FilePath/Henrik%20Ibsen.jpg")
+
+    assert index.match_person("Per Hansen") is None
+    assert index.match_person("Per Hansen", 1971).wikidata_id == "Q901"
+    assert index.match_person("Liv Ullmann") is None
+
+    play = index.match_play("A Doll's House")
+    assert (play.wikidata_id, play.author_name, play.year_written) == ("Q669694", "Henrik Ibsen", 1879)
+    assert index.match_play("Et dukkehjem (1974)").wikidata_id == "Q669694"
+
+
+def test_enrichment_runs_against_the_index(db):
+    conn = connect_index(":memory:")
+    ingest_dump(conn, [json.dumps(e) for e in ENTITIES])
+    index = WikidataIndex(conn)
+    db.execute("UPDATE plays SET wikidata_id = NULL")
+    queue = JobQueue(db, "wikidata_plays_index")
+
+    enrich_wikidata.enrich_plays(db, queue, 0, index)
+
+    assert db.execute("SELECT wikidata_id, year_written FROM plays WHERE id = 2").fetchone() == ("Q669694", 1879)
+    assert queue.status(2) == "done"
+    # Local misses stay out of the live stage
+    assert len(JobQueue(db, "wikidata_plays")) == 0
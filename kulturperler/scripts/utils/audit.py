@@ -0,0 +1,277 @@
+"""Rule-based content audit that runs set-oriented in SQL.
+
+Each audit rule is a declarative Rule in the RULES registry:
+
+- fix rules name a Python function (FIX_FUNCTIONS) that is registered as a
+  SQLite function, so applying the rule is one statement:
+  UPDATE table SET column = fix(column) WHERE <where> AND fix(column) IS NOT column
+- check rules only count and sample the rows matching <where>, for review
+
+run_audit() runs the rules in registry order inside the caller's
+transaction and returns an AuditReport with per-rule counts, timings and
+samples, which serializes to JSON. Given a consumer name it audits
+incrementally: only rows in change_log (utils/change_log.py) since that
+consumer's watermark are checked, and the watermark moves forward.
+"""
+
+import re
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from .change_log import advance, changed_filter, watermark
+from .titles import register_title_functions
+
+
+def normalize_whitespace(text):
+    """Remove extra whitespace, leading/trailing spaces."""
+    if not text:
+        return text
+    # Replace multiple spaces with single space
+    text = re.sub(r' {2,}', ' ', text)
+    # Strip leading/trailing whitespace
+    return text.strip()
+
+
+ENCODING_REPLACEMENTS = {
+    'Ã¦': 'æ',
+    'Ã¸': 'ø',
+    'Ã¥': 'å',
+    'Ã\x86': 'Æ',
+    'Ã\x98': 'Ø',
+    'Ã\x85': 'Å',
+    'Ã©': 'é',
+    'Ã¼': 'ü',
+}
+
+
+def fix_encoding(text):
+    """Fix common UTF-8 encoding problems (UTF-8 read as Latin-1)."""
+    if not text:
+        return text
+    for bad, good in ENCODING_REPLACEMENTS.items():
+        text = text.replace(bad, good)
+    return text
+
+
+FIX_FUNCTIONS: dict[str, Callable] = {
+    "fix_encoding": fix_encoding,
+    "normalize_whitespace": normalize_whitespace,
+}
+
+# Primary key of each audited table
+TABLE_KEYS = {
+    "episodes": "prf_id",
+    "plays": "id",
+    "persons": "id",
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    table: str
+    column: str
+    where: str                    # SQL condition on table rows
+    description: str
+    fix: Optional[str] = None     # FIX_FUNCTIONS name; None for check rules
+    severity: str = "review"      # critical, review or info; fix rules are "fix"
+    order_by: Optional[str] = None
+    sample_size: int = 20
+
+    @property
+    def key(self) -> str:
+        return TABLE_KEYS[self.table]
+
+
+@dataclass
+class RuleResult:
+    rule: str
+    table: str
+    column: str
+    severity: str
+    description: str
+    count: int                    # rows with the issue
+    fixed: int = 0                # rows updated
+    seconds: float = 0.0
+    sample: list = field(default_factory=list)
+
+
+@dataclass
+class AuditReport:
+    started_at: str
+    fix: bool
+    results: list[RuleResult] = field(default_factory=list)
+    seconds: float = 0.0
+    since: Optional[int] = None   # change_log seq audited from; None for a full audit
+    until: Optional[int] = None   # watermark after the audit
+
+    @property
+    def fixed(self) -> int:
+        return sum(r.fixed for r in self.results)
+
+    @property
+    def flagged(self) -> list[RuleResult]:
+        """Check rules that matched rows."""
+        return [r for r in self.results if r.severity != "fix" and r.count]
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "fix": self.fix,
+            "since": self.since,
+            "until": self.until,
+            "seconds": round(self.seconds, 4),
+            "fixed": self.fixed,
+            "flagged": len(self.flagged),
+            "rules": [
+                {**asdict(r), "seconds": round(r.seconds, 4)}
+                for r in self.results
+            ],
+        }
+
+
+RULES: list[Rule] = []
+
+
+def register(rule: Rule) -> Rule:
+    if rule.table not in TABLE_KEYS:
+        raise ValueError(f"Rule {rule.name}: no key known for table {rule.table}")
+    if rule.fix is not None and rule.fix not in FIX_FUNCTIONS:
+        raise ValueError(f"Rule {rule.name}: unknown fix function {rule.fix}")
+    if any(r.name == rule.name for r in RULES):
+        raise ValueError(f"Rule {rule.name} is already registered")
+    RULES.append(rule)
+    return rule
+
+
+# Titles and names checked by the text fix rules
+TEXT_COLUMNS = [("episodes", "title"), ("plays", "title"), ("persons", "name")]
+
+
+def _register_text_fix(prefix: str, fix: str, where: str, description: str):
+    """One fix rule per text column; where and description take {column} and {table}."""
+    for table, column in TEXT_COLUMNS:
+        register(Rule(
+            f"{prefix}_{table}", table, column,
+            where.format(column=column), description.format(table=table, column=column),
+            fix=fix, severity="fix",
+        ))
+
+
+_register_text_fix(
+    "encoding", "fix_encoding",
+    "{column} LIKE '%Ã%' OR {column} LIKE '%â%' OR {column} LIKE '%Â%'",
+    "Mis-decoded UTF-8 in {table}.{column}",
+)
+_register_text_fix(
+    "whitespace", "normalize_whitespace",
+    "{column} LIKE '%  %' OR {column} LIKE ' %' OR {column} LIKE '% '",
+    "Repeated, leading or trailing spaces in {table}.{column}",
+)
+
+register(Rule(
+    "empty_episode_title", "episodes", "title", "title IS NULL OR title = ''",
+    "Episodes with NULL/empty titles", severity="critical",
+))
+register(Rule(
+    "empty_person_name", "persons", "name", "name IS NULL OR name = ''",
+    "Persons with NULL/empty names", severity="critical",
+))
+register(Rule(
+    "short_description", "episodes", "description",
+    "description IS NOT NULL AND LENGTH(description) < 10",
+    "Episodes with descriptions < 10 characters", order_by="LENGTH(description)",
+))
+register(Rule(
+    "truncated_description", "episodes", "description", "description LIKE '%...'",
+    'Episodes with descriptions ending in "..."',
+))
+register(Rule(
+    "all_caps_title", "episodes", "title",
+    "title = UPPER(title) AND LENGTH(title) > 5 AND title NOT LIKE '%:%'",
+    "ALL CAPS episode titles",
+))
+register(Rule(
+    # Norwegian starting letters like æ, å, ø are OK
+    "all_lowercase_title", "episodes", "title",
+    "title = LOWER(title) AND LENGTH(title) > 5 AND SUBSTR(title, 1, 1) NOT IN ('æ', 'å', 'ø')",
+    "All lowercase episode titles",
+))
+register(Rule(
+    "mixed_numbering", "episodes", "title",
+    "title LIKE '%:%' OR title LIKE '%Del %' OR title LIKE '%Part %' OR title LIKE '%(%)%'",
+    "Mixed episode numbering patterns", severity="info", order_by="title", sample_size=50,
+))
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Make the fix functions callable from SQL."""
+    for name, fn in FIX_FUNCTIONS.items():
+        conn.create_function(name, 1, fn, deterministic=True)
+    # Title fixes fire the normalized_title triggers
+    register_title_functions(conn)
+
+
+def _run_rule(conn: sqlite3.Connection, rule: Rule, fix: bool, since: Optional[int] = None) -> RuleResult:
+    result = RuleResult(rule.name, rule.table, rule.column, rule.severity, rule.description, 0)
+    where = f"({rule.where})"
+    params = ()
+    if since is not None:
+        changed, params = changed_filter(rule.table, rule.key, since)
+        where += f" AND {changed}"
+    if rule.fix:
+        where += f" AND {rule.fix}({rule.column}) IS NOT {rule.column}"
+        columns = f"{rule.key}, {rule.column}, {rule.fix}({rule.column})"
+    else:
+        columns = f"{rule.key}, {rule.column}"
+    order = rule.order_by or rule.key
+
+    result.count = conn.execute(f"SELECT COUNT(*) FROM {rule.table} WHERE {where}", params).fetchone()[0]
+    if result.count:
+        result.sample = [
+            list(row) for row in conn.execute(
+                f"SELECT {columns} FROM {rule.table} WHERE {where} ORDER BY {order} LIMIT ?",
+                (*params, rule.sample_size),
+            )
+        ]
+    if rule.fix and fix and result.count:
+        result.fixed = conn.execute(
+            f"UPDATE {rule.table} SET {rule.column} = {rule.fix}({rule.column}) WHERE {where}", params
+        ).rowcount
+    return result
+
+
+def run_audit(
+    conn: sqlite3.Connection,
+    rules: Iterable[Rule] = RULES,
+    fix: bool = True,
+    log: Callable[[str], None] = lambda _: None,
+    consumer: Optional[str] = None,
+) -> AuditReport:
+    """Run rules in order in the caller's transaction (begun here if needed).
+
+    With fix=False, fix rules only count the rows they would change. With a
+    consumer, only rows changed since its watermark are audited (all rows on
+    its first run), and unless fix=False the watermark is advanced.
+    """
+    register_functions(conn)
+    report = AuditReport(started_at=datetime.now().isoformat(timespec="seconds"), fix=fix)
+    start = time.perf_counter()
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    if consumer:
+        report.since = watermark(conn, consumer)
+    for rule in rules:
+        rule_start = time.perf_counter()
+        result = _run_rule(conn, rule, fix, report.since)
+        result.seconds = time.perf_counter() - rule_start
+        report.results.append(result)
+        log(f"  {rule.name}: {result.count}" + (f" ({result.fixed} fixed)" if result.fixed else ""))
+    if consumer and fix:
+        # After the fixes, so rows the audit itself changed are not audited again
+        report.until = advance(conn, consumer)
+    report.seconds = time.perf_counter() - start
+    return report
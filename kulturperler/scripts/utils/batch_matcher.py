@@ -0,0 +1,296 @@
+"""Vectorized TF-IDF batch matching of harvested items against plays or episodes.
+
+Both sides become sparse TF-IDF matrices over character n-grams of their
+normalized titles; one sparse product gives the cosine similarity of every
+item with every target, and the top-k per item are blended with year
+proximity and author agreement. Results are written to match_candidates.
+
+Requires numpy and scipy (pip install numpy scipy).
+"""
+
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+from .titles import normalize_title
+
+
+NGRAM_RANGE = (2, 4)
+DEFAULT_TOP_K = 5
+ROW_BLOCK = 1024  # item rows densified at a time when picking top-k
+
+# Blend weights; an unknown year or author counts as neutral (0.5)
+TITLE_WEIGHT = 0.8
+YEAR_WEIGHT = 0.1
+AUTHOR_WEIGHT = 0.1
+YEAR_SCALE = 10  # years apart at which year agreement reaches zero
+
+AUTHOR_RES = [
+    re.compile(r"\bav\s+([A-ZÆØÅ][a-zæøå]+(?:\s+[A-ZÆØÅ][a-zæøå]+)+)"),
+    re.compile(r"[Mm]anuskript(?:forfatter)?:\s*([A-ZÆØÅ][a-zæøå]+(?:\s+[A-ZÆØÅ][a-zæøå]+)*)"),
+]
+
+
+@dataclass
+class MatchRecord:
+    key: str
+    title: str
+    year: Optional[int] = None
+    author: Optional[str] = None
+
+
+@dataclass
+class Candidate:
+    item_key: str
+    item_title: str
+    target_key: str
+    target_title: str
+    rank: int
+    score: float
+    title_score: float
+    year_score: float
+    author_score: float
+
+
+def extract_author(description: Optional[str]) -> Optional[str]:
+    """Author named in a description ("av Henrik Ibsen", "Manuskript: ...")."""
+    if not description:
+        return None
+    for pattern in AUTHOR_RES:
+        match = pattern.search(description)
+        if match:
+            return match.group(1).lower()
+    return None
+
+
+def _require_numpy():
+    if np is None or sparse is None:
+        raise ImportError("batch matching needs numpy and scipy: pip install numpy scipy")
+
+
+def _ngrams(text: str) -> list[str]:
+    padded = f" {text} "
+    lo, hi = NGRAM_RANGE
+    return [padded[i:i + n] for n in range(lo, hi + 1) for i in range(len(padded) - n + 1)]
+
+
+def _count_matrix(texts: list[str], vocab: dict[str, int]):
+    """COO triplets of n-gram counts, adding new grams to vocab."""
+    rows, cols, vals = [], [], []
+    for row, text in enumerate(texts):
+        counts: dict[int, int] = {}
+        for gram in _ngrams(text):
+            col = vocab.setdefault(gram, len(vocab))
+            counts[col] = counts.get(col, 0) + 1
+        rows.extend([row] * len(counts))
+        cols.extend(counts.keys())
+        vals.extend(counts.values())
+    return rows, cols, vals
+
+
+def tfidf_matrices(items: list[str], targets: list[str]):
+    """Row-normalized TF-IDF matrices over a shared n-gram vocabulary."""
+    _require_numpy()
+    vocab: dict[str, int] = {}
+    target_coo = _count_matrix(targets, vocab)
+    item_coo = _count_matrix(items, vocab)
+    shape_cols = max(len(vocab), 1)
+
+    def to_csr(coo, n_rows):
+        rows, cols, vals = coo
+        data = 1.0 + np.log(np.asarray(vals, dtype=np.float64))  # sublinear tf
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, shape_cols))
+
+    target_m = to_csr(target_coo, len(targets))
+    item_m = to_csr(item_coo, len(items))
+
+    n_docs = len(targets) + len(items)
+    df = np.bincount(target_m.indices, minlength=shape_cols) + np.bincount(item_m.indices, minlength=shape_cols)
+    idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+    scale = sparse.diags(idf)
+
+    def l2(m):
+        m = m @ scale
+        norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ m
+
+    return l2(item_m).tocsr(), l2(target_m).tocsr()
+
+
+def top_k_cosine(item_m, target_m, k: int):
+    """(indices, scores) arrays of shape (items, k), best first."""
+    k = min(k, target_m.shape[0])
+    n_items = item_m.shape[0]
+    indices = np.zeros((n_items, k), dtype=np.int64)
+    scores = np.zeros((n_items, k), dtype=np.float64)
+    target_t = target_m.T.tocsc()
+    for start in range(0, n_items, ROW_BLOCK):
+        block = (item_m[start:start + ROW_BLOCK] @ target_t).toarray()
+        part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        indices[start:start + len(block)] = np.take_along_axis(part, order, axis=1)
+        scores[start:start + len(block)] = np.take_along_axis(part_scores, order, axis=1)
+    return indices, scores
+
+
+def year_agreement(a: Optional[int], b: Optional[int]) -> float:
+    if a is None or b is None:
+        return 0.5
+    return max(0.0, 1.0 - abs(a - b) / YEAR_SCALE)
+
+
+def author_agreement(item_author: Optional[str], target_author: Optional[str]) -> float:
+    """1 when the item's author surname appears in the target's author, 0 when it doesn't."""
+    if not item_author or not target_author:
+        return 0.5
+    surname = item_author.split()[-1]
+    return 1.0 if surname in target_author.lower() else 0.0
+
+
+def match_batch(
+    items: list[MatchRecord],
+    targets: list[MatchRecord],
+    top_k: int = DEFAULT_TOP_K,
+    min_score: float = 0.0,
+    normalizer: Callable[[str], str] = normalize_title,
+) -> list[Candidate]:
+    """Top-k blended candidates for every item in one vectorized pass."""
+    _require_numpy()
+    if not items or not targets:
+        return []
+    item_m, target_m = tfidf_matrices(
+        [normalizer(i.title) for i in items], [normalizer(t.title) for t in targets]
+    )
+    indices, cosines = top_k_cosine(item_m, target_m, top_k)
+
+    candidates = []
+    for row, item in enumerate(items):
+        scored = []
+        for col, cosine in zip(indices[row], cosines[row]):
+            if cosine <= 0:
+                continue
+            target = targets[col]
+            y = year_agreement(item.year, target.year)
+            a = author_agreement(item.author, target.author)
+            score = TITLE_WEIGHT * cosine + YEAR_WEIGHT * y + AUTHOR_WEIGHT * a
+            if score >= min_score:
+                scored.append((score, float(cosine), y, a, target))
+        scored.sort(key=lambda s: -s[0])
+        seen = set()  # a play can appear under both title and original title
+        for score, cosine, y, a, target in scored:
+            if target.key in seen:
+                continue
+            seen.add(target.key)
+            candidates.append(Candidate(
+                item.key, item.title, target.key, target.title,
+                len(seen), round(score, 4), round(cosine, 4), y, a,
+            ))
+    return candidates
+
+
+# --- Database side -----------------------------------------------------------
+
+CANDIDATES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_candidates (
+    source TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    item_title TEXT,
+    target_type TEXT NOT NULL,
+    target_key TEXT NOT NULL,
+    target_title TEXT,
+    rank INTEGER NOT NULL,
+    score REAL NOT NULL,
+    title_score REAL,
+    year_score REAL,
+    author_score REAL,
+    created_at TEXT,
+    PRIMARY KEY (source, item_key, target_type, rank)
+);
+CREATE INDEX IF NOT EXISTS idx_match_candidates_target ON match_candidates(target_type, target_key);
+"""
+
+
+def load_targets(conn: sqlite3.Connection, target_type: str) -> list[MatchRecord]:
+    """Plays (title and original title) or episodes, with playwright names."""
+    if target_type == "plays":
+        rows = conn.execute("""
+            SELECT pl.id, pl.title, pl.original_title, per.name
+            FROM plays pl
+            LEFT JOIN persons per ON per.id = pl.playwright_id
+        """).fetchall()
+        targets = []
+        for play_id, title, original_title, author in rows:
+            targets.append(MatchRecord(str(play_id), title, None, author))
+            if original_title and original_title != title:
+                targets.append(MatchRecord(str(play_id), original_title, None, author))
+        return targets
+    if target_type == "episodes":
+        rows = conn.execute("""
+            SELECT e.prf_id, e.title, e.year, per.name
+            FROM episodes e
+            LEFT JOIN plays pl ON pl.id = e.play_id
+            LEFT JOIN persons per ON per.id = pl.playwright_id
+        """).fetchall()
+        return [MatchRecord(prf_id, title, year, author) for prf_id, title, year, author in rows]
+    raise ValueError(f"unknown target type: {target_type}")
+
+
+def write_candidates(conn: sqlite3.Connection, source: str, target_type: str, candidates: list[Candidate]):
+    """Replace the stored candidates for (source, target_type) in one transaction."""
+    now = datetime.now().isoformat(timespec="seconds")
+    with conn:
+        conn.executescript(CANDIDATES_SCHEMA)
+        conn.execute(
+            "DELETE FROM match_candidates WHERE source = ? AND target_type = ?", (source, target_type)
+        )
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO match_candidates (
+                source, item_key, item_title, target_type, target_key, target_title,
+                rank, score, title_score, year_score, author_score, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (source, c.item_key, c.item_title, target_type, c.target_key, c.target_title,
+                 c.rank, c.score, c.title_score, c.year_score, c.author_score, now)
+                for c in candidates
+            ],
+        )
+
+
+def item_year(value) -> Optional[int]:
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        return None
+    return year if 1900 <= year <= 2100 else None
+
+
+def items_from_harvest(raw_items: list[dict]) -> list[MatchRecord]:
+    """MatchRecords for harvested items (source_id or URL as key).
+
+    An item harvested more than once (e.g. listed by two channels) is kept once.
+    """
+    records = []
+    seen = set()
+    for item in raw_items:
+        key = item.get("source_id") or item.get("url")
+        if not key or not item.get("title") or str(key) in seen:
+            continue
+        seen.add(str(key))
+        records.append(MatchRecord(
+            str(key), item["title"], item_year(item.get("year")),
+            extract_author(item.get("description")),
+        ))
+    return records
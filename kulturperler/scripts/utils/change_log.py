@@ -0,0 +1,148 @@
+"""Trigger-maintained log of changed rows, for incremental audits.
+
+Triggers on episodes, plays and persons (and on the links between them)
+record the key of every inserted, updated or deleted row in change_log with
+an increasing sequence number. A row changed many times keeps one entry
+with its latest seq, so the log never grows beyond the number of rows.
+
+Consumers (e.g. the audit scripts) keep a watermark in change_watermarks:
+the last seq they have processed. changed_since() lists what changed after
+it, and advance() moves it forward in the same transaction as the
+consumer's own writes.
+"""
+
+import sqlite3
+from typing import Optional
+
+
+CHANGE_LOG_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS change_log (
+        table_name TEXT NOT NULL,
+        row_key NOT NULL,            -- untyped: integer ids and prf_id strings compare as stored
+        seq INTEGER NOT NULL,
+        PRIMARY KEY (table_name, row_key)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_change_log_seq ON change_log(seq)",
+    """
+    CREATE TABLE IF NOT EXISTS change_watermarks (
+        consumer TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Logged table -> key column
+LOGGED_TABLES = {
+    "episodes": "prf_id",
+    "plays": "id",
+    "persons": "id",
+}
+
+_LOG = """
+    INSERT INTO change_log (table_name, row_key, seq)
+    SELECT '{table}', {key}, (SELECT COALESCE(MAX(seq), 0) + 1 FROM change_log) WHERE {key} IS NOT NULL
+    ON CONFLICT (table_name, row_key) DO UPDATE SET seq = excluded.seq;
+"""
+
+
+def _log(table: str, key: str) -> str:
+    return _LOG.format(table=table, key=key)
+
+
+def install_change_log(conn: sqlite3.Connection):
+    """Create change_log, change_watermarks and the triggers that fill the log.
+
+    Plain SQL, so every writer is logged, with or without this module.
+    """
+    for statement in CHANGE_LOG_SCHEMA:
+        conn.execute(statement)
+
+    triggers = {}
+    for table, key in LOGGED_TABLES.items():
+        triggers[f"{table}_log_ai"] = (f"AFTER INSERT ON {table}", _log(table, f"NEW.{key}"))
+        triggers[f"{table}_log_ad"] = (f"AFTER DELETE ON {table}", _log(table, f"OLD.{key}"))
+        triggers[f"{table}_log_au"] = (
+            f"AFTER UPDATE ON {table}",
+            _log(table, f"OLD.{key}") + _log(table, f"NEW.{key}"),
+        )
+    # Credits and playwright links change whether a person is orphaned
+    triggers["episode_persons_log_ai"] = (
+        "AFTER INSERT ON episode_persons",
+        _log("episodes", "NEW.episode_id") + _log("persons", "NEW.person_id"),
+    )
+    triggers["episode_persons_log_ad"] = (
+        "AFTER DELETE ON episode_persons",
+        _log("episodes", "OLD.episode_id") + _log("persons", "OLD.person_id"),
+    )
+    triggers["episode_persons_log_au"] = (
+        "AFTER UPDATE ON episode_persons",
+        _log("episodes", "OLD.episode_id") + _log("episodes", "NEW.episode_id")
+        + _log("persons", "OLD.person_id") + _log("persons", "NEW.person_id"),
+    )
+    triggers["plays_playwright_log_ai"] = (
+        "AFTER INSERT ON plays",
+        _log("persons", "NEW.playwright_id"),
+    )
+    triggers["plays_playwright_log_ad"] = (
+        "AFTER DELETE ON plays",
+        _log("persons", "OLD.playwright_id"),
+    )
+    triggers["plays_playwright_log_au"] = (
+        "AFTER UPDATE OF playwright_id ON plays",
+        _log("persons", "OLD.playwright_id") + _log("persons", "NEW.playwright_id"),
+    )
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def current_seq(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+
+def watermark(conn: sqlite3.Connection, consumer: str) -> Optional[int]:
+    """Last seq the consumer processed, or None if it never ran incrementally."""
+    row = conn.execute("SELECT seq FROM change_watermarks WHERE consumer = ?", (consumer,)).fetchone()
+    return row[0] if row else None
+
+
+def advance(conn: sqlite3.Connection, consumer: str, seq: Optional[int] = None) -> int:
+    """Set the consumer's watermark (default: everything logged so far)."""
+    seq = current_seq(conn) if seq is None else seq
+    conn.execute(
+        """
+        INSERT INTO change_watermarks (consumer, seq, updated_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (consumer) DO UPDATE SET seq = excluded.seq, updated_at = excluded.updated_at
+        """,
+        (consumer, seq),
+    )
+    return seq
+
+
+def changed_filter(table: str, key: str, since: int) -> tuple[str, tuple]:
+    """SQL condition (and params) keeping rows of table changed after since."""
+    return (
+        f"{key} IN (SELECT row_key FROM change_log WHERE table_name = ? AND seq > ?)",
+        (table, since),
+    )
+
+
+def changed_since(conn: sqlite3.Connection, table: str, since: int) -> list:
+    return [
+        row[0] for row in conn.execute(
+            "SELECT row_key FROM change_log WHERE table_name = ? AND seq > ? ORDER BY seq", (table, since)
+        )
+    ]
+
+
+def prune(conn: sqlite3.Connection) -> int:
+    """Drop entries every consumer has processed. Returns the number removed."""
+    low = conn.execute("SELECT MIN(seq) FROM change_watermarks").fetchone()[0]
+    if low is None:
+        return 0
+    # Keep the newest entry so seq keeps increasing
+    return conn.execute(
+        "DELETE FROM change_log WHERE seq <= ? AND seq < (SELECT MAX(seq) FROM change_log)", (low,)
+    ).rowcount
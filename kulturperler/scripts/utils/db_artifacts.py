@@ -0,0 +1,89 @@
+"""Content-hashed, gzip-compressed copies of the web database.
+
+Each export is written as kulturperler.<hash>.db plus a .gz copy and a small
+current.json manifest naming the hash. Only gzip is produced, since the
+browser decompresses with DecompressionStream, which has no brotli or zstd.
+The hashed files never change, so they can be cached as immutable; only the
+manifest is revalidated on each visit.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+ARTIFACT_PREFIX = "kulturperler."
+MANIFEST_NAME = "current.json"
+HASH_LENGTH = 16
+# Artifact sets kept on disk, so a client holding the previous manifest can
+# still download the file it points at during a deploy
+KEEP_VERSIONS = 2
+
+
+def _compressors() -> dict:
+    """Encoding name -> (file suffix, compress function)."""
+    return {"gzip": (".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))}
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _prune(out_dir: Path, keep_hashes: set[str]):
+    """Remove hashed artifacts not belonging to keep_hashes."""
+    for path in out_dir.glob(f"{ARTIFACT_PREFIX}*.db*"):
+        parts = path.name.split(".")
+        if len(parts) >= 3 and len(parts[1]) == HASH_LENGTH and parts[1] not in keep_hashes:
+            path.unlink()
+
+
+def read_manifest(out_dir: Path) -> dict | None:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def publish_artifacts(db_path: Path, out_dir: Path) -> dict:
+    """Write hashed, compressed copies of db_path and point current.json at them.
+
+    Files for a hash that already exists are left untouched, so re-running
+    an export with unchanged data writes nothing new.
+    """
+    data = db_path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    version = digest[:HASH_LENGTH]
+    base = f"{ARTIFACT_PREFIX}{version}.db"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = {"identity": {"file": base, "bytes": len(data)}}
+    if not (out_dir / base).exists():
+        _write_atomic(out_dir / base, data)
+
+    for encoding, (suffix, compress) in _compressors().items():
+        path = out_dir / f"{base}{suffix}"
+        if not path.exists():
+            _write_atomic(path, compress(data))
+        files[encoding] = {"file": path.name, "bytes": path.stat().st_size}
+
+    previous = read_manifest(out_dir)
+    keep = [version]
+    if previous:
+        keep += [v for v in previous.get("retained", [previous.get("version")]) if v and v != version]
+    keep = keep[:KEEP_VERSIONS]
+
+    manifest = {
+        "version": version,
+        "sha256": digest,
+        "bytes": len(data),
+        "files": files,
+        "retained": keep,
+    }
+    _write_atomic(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8"))
+    _prune(out_dir, set(keep))
+    return manifest
@@ -0,0 +1,202 @@
+"""Page-aligned chunked copy of the web database for HTTP-range loading.
+
+A lazy virtual filesystem in the browser (e.g. sql.js-httpvfs in "chunked"
+server mode) only fetches the pages a query reads. This module splits the
+exported database into fixed-size chunks aligned to SQLite pages, writes a
+JSON manifest describing them, and bounds which chunks each of the web app's
+standard queries can read.
+
+The bound maps the B-trees a query opens (from EXPLAIN) to their pages (from
+dbstat), so it costs one pass over the pages rather than a run per chunk. It
+is not a trace of the pages read: a whole B-tree is counted even when the
+query only seeks into a few of its pages, so a point lookup on a large table
+is charged for every chunk of that table.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+
+CHUNK_PREFIX = "kulturperler.db."
+SUFFIX_LENGTH = 3
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Representative queries per route. Parameters are picked by the companion
+# "params" query so the report reflects a real, well-populated entity.
+STANDARD_QUERIES = {
+    "home: performance listing": {
+        "sql": [
+            "SELECT * FROM mv_performances ORDER BY year DESC, title ASC LIMIT 50",
+            "SELECT COUNT(*) FROM mv_performances",
+        ],
+    },
+    "plays listing": {
+        "sql": [
+            "SELECT id, title, original_title, year_written, playwright_id, playwright_name, "
+            "performance_count FROM mv_plays ORDER BY title",
+        ],
+    },
+    "persons listing": {
+        "sql": [
+            "SELECT id, name, birth_year, death_year, nationality, play_count, performance_count "
+            "FROM mv_playwrights WHERE play_count > 0 ORDER BY name",
+        ],
+    },
+    "person page": {
+        "params": "SELECT id FROM mv_playwrights ORDER BY play_count DESC LIMIT 1",
+        "sql": [
+            "SELECT * FROM persons WHERE id = ?",
+            "SELECT id, title, year_written FROM plays WHERE playwright_id = ? ORDER BY year_written, title",
+            "SELECT DISTINCT role FROM episode_persons WHERE person_id = ? AND role != 'playwright'",
+            "SELECT * FROM nrk_about_programs WHERE person_id = ? ORDER BY interest_score DESC LIMIT 10",
+        ],
+    },
+    "performance page": {
+        "params": "SELECT id FROM mv_performances ORDER BY media_count DESC LIMIT 1",
+        "sql": [
+            "SELECT * FROM mv_performances WHERE id = ?",
+            "SELECT pp.*, p.name FROM performance_persons pp JOIN persons p ON pp.person_id = p.id "
+            "WHERE pp.performance_id = ?",
+            "SELECT * FROM episodes WHERE performance_id = ? ORDER BY prf_id",
+        ],
+    },
+    "play page": {
+        "params": "SELECT id FROM mv_plays ORDER BY performance_count DESC LIMIT 1",
+        "sql": [
+            "SELECT * FROM plays WHERE id = ?",
+            "SELECT * FROM mv_performances WHERE work_id = ? ORDER BY year DESC",
+            "SELECT * FROM play_external_links WHERE play_id = ? ORDER BY title",
+        ],
+    },
+    "episode page": {
+        "params": "SELECT prf_id FROM episodes ORDER BY prf_id LIMIT 1",
+        "sql": [
+            "SELECT * FROM episodes WHERE prf_id = ?",
+            "SELECT ep.*, p.name FROM episode_persons ep JOIN persons p ON ep.person_id = p.id "
+            "WHERE ep.episode_id = ?",
+        ],
+    },
+}
+
+
+def read_page_size(data: bytes) -> int:
+    """Page size from the SQLite file header (1 encodes 65536)."""
+    size = int.from_bytes(data[16:18], "big")
+    return 65536 if size == 1 else size
+
+
+def chunk_name(index: int) -> str:
+    return f"{CHUNK_PREFIX}{index:0{SUFFIX_LENGTH}d}"
+
+
+def write_chunks(db_path: Path, out_dir: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Split db_path into page-aligned chunks under out_dir and write manifest.json."""
+    data = db_path.read_bytes()
+    page_size = read_page_size(data)
+    if chunk_size % page_size:
+        raise ValueError(f"chunk size {chunk_size} is not a multiple of page size {page_size}")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob(f"{CHUNK_PREFIX}*"):
+        stale.unlink()
+
+    chunks = []
+    for index, offset in enumerate(range(0, len(data), chunk_size)):
+        chunk = data[offset:offset + chunk_size]
+        (out_dir / chunk_name(index)).write_bytes(chunk)
+        chunks.append({
+            "file": chunk_name(index),
+            "offset": offset,
+            "length": len(chunk),
+            "sha256": hashlib.sha256(chunk).hexdigest(),
+        })
+
+    manifest = {
+        "page_size": page_size,
+        "chunk_size": chunk_size,
+        "total_length": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "chunks": chunks,
+        # sql.js-httpvfs "chunked" server mode config
+        "serverMode": "chunked",
+        "requestChunkSize": page_size,
+        "databaseLengthBytes": len(data),
+        "serverChunkSize": chunk_size,
+        "urlPrefix": CHUNK_PREFIX,
+        "suffixLength": SUFFIX_LENGTH,
+    }
+    with open(out_dir / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def btree_pages(conn: sqlite3.Connection) -> dict[int, list[int]]:
+    """Pages of every table and index B-tree, keyed by root page, via dbstat."""
+    rows = conn.execute("""
+        SELECT m.rootpage, s.pageno
+        FROM dbstat s
+        JOIN (SELECT name, rootpage FROM sqlite_schema UNION ALL SELECT 'sqlite_schema', 1) m
+          ON m.name = s.name
+    """)
+    pages: dict[int, list[int]] = {}
+    for root, pageno in rows:
+        pages.setdefault(root, []).append(pageno)
+    return pages
+
+
+def opened_btrees(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> set[int]:
+    """Root pages of the B-trees a statement opens, from its bytecode."""
+    roots = {1}  # the schema is always read
+    for _, opcode, _, root, db, *_ in conn.execute(f"EXPLAIN {sql}", params):
+        if opcode in ("OpenRead", "OpenWrite", "ReopenIdx") and db == 0:
+            roots.add(root)
+    return roots
+
+
+def chunks_touched(
+    pages: dict[int, list[int]],
+    roots: set[int],
+    page_size: int,
+    chunk_size: int,
+) -> list[int]:
+    """Indexes of the chunks holding any page of the given B-trees."""
+    return sorted({
+        (pageno - 1) * page_size // chunk_size
+        for root in roots
+        for pageno in pages.get(root, ())
+    })
+
+
+def query_chunk_upper_bounds(db_path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict[str, list[int]]:
+    """Upper bound on the chunks each standard query group reads on a cold load.
+
+    Every chunk holding a page of a B-tree the queries open is listed, whether
+    or not the query reads that page.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        if chunk_size % page_size:
+            raise ValueError(f"chunk size {chunk_size} is not a multiple of page size {page_size}")
+        pages = btree_pages(conn)
+        report = {}
+        for name, spec in STANDARD_QUERIES.items():
+            params = ()
+            if "params" in spec:
+                row = conn.execute(spec["params"]).fetchone()
+                if row is None:
+                    continue
+                params = tuple(row)
+            roots = set()
+            for sql in spec["sql"]:
+                try:
+                    roots |= opened_btrees(conn, sql, params if "?" in sql else ())
+                except sqlite3.OperationalError:
+                    continue  # table not in this export
+            report[name] = chunks_touched(pages, roots, page_size, chunk_size)
+    finally:
+        conn.close()
+    return report
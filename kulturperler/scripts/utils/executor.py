@@ -0,0 +1,253 @@
+"""Concurrent executor for enrichment stages.
+
+Every enrichment script has the same shape: pick candidate rows, look each
+one up over HTTP, write the answer back. run_enrichment() runs that shape
+with a pool of I/O workers and one writer:
+
+- tasks come from a JobQueue stage, highest priority first, leased
+  batch_size at a time; a crash only delays the leased tasks until their
+  leases expire
+- fetch(item) runs on the workers and returns a result, or None for no match;
+  each request passes through a gate per host that caps concurrency and
+  spaces request starts by a minimum interval
+- apply(conn, item, result) runs on the calling thread only, so SQLite sees a
+  single writer; data and task statuses are committed together every
+  batch_size results, which is the checkpoint a rerun resumes from
+
+With workers=0 fetch runs inline on the calling thread, for lookups that use
+the calling thread's SQLite connection (e.g. the local Wikidata index).
+
+fetch_all() is the same pool and host gate without the queue, for one-off
+lookups whose results the caller writes in bulk.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .job_queue import JobQueue
+
+
+USER_AGENT = "KulturperlerBot/1.0"
+
+
+@dataclass
+class HostLimit:
+    concurrency: int = 2
+    interval: float = 0.0  # minimum seconds between request starts
+
+
+@dataclass
+class RunStats:
+    done: int = 0
+    no_match: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.done + self.no_match + self.failed
+
+    @property
+    def rate(self) -> float:
+        return self.processed / self.seconds if self.seconds else 0.0
+
+
+class HostGate:
+    """Concurrency cap and request spacing for one host."""
+
+    def __init__(self, limit: HostLimit):
+        self.semaphore = threading.BoundedSemaphore(max(limit.concurrency, 1))
+        self.interval = limit.interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        if self.interval:
+            with self.lock:
+                now = time.monotonic()
+                wait_for = self.next_start - now
+                self.next_start = max(now, self.next_start) + self.interval
+            if wait_for > 0:
+                time.sleep(wait_for)
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+
+
+class _InlineExecutor:
+    """Runs submitted calls immediately on the calling thread."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def http_session(pool_size: int = 8) -> requests.Session:
+    """Session with a connection pool large enough for pool_size workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def fetch_all(
+    items: dict[str, Any],
+    fetch: Callable[[Any], Any],
+    limit: HostLimit = HostLimit(),
+    workers: int = 8,
+    log: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    """Run fetch(item) for every item on a worker pool, under one host limit.
+
+    For lookups without a job queue: returns results by key, leaving out
+    failed lookups (logged) and None results.
+    """
+    gate = HostGate(limit)
+
+    def run(item):
+        with gate:
+            return fetch(item)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(run, item): key for key, item in items.items()}
+        for future in futures:
+            key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                log(f"    {key}: {e}")
+                continue
+            if result is not None:
+                results[key] = result
+    return results
+
+
+def run_enrichment(
+    conn: sqlite3.Connection,
+    queue: JobQueue,
+    items: dict[str, Any],
+    fetch: Callable[[Any], Any],
+    apply: Callable[[sqlite3.Connection, Any, Any], Any],
+    host: Optional[Callable[[Any], str]] = None,
+    host_limits: Optional[dict[str, HostLimit]] = None,
+    default_limit: HostLimit = HostLimit(),
+    workers: int = 8,
+    batch_size: int = 50,
+    limit: Optional[int] = None,
+    log: Callable[[str], None] = print,
+) -> RunStats:
+    """Run fetch/apply over the queue's ready tasks.
+
+    items maps task keys to the rows fetch() and apply() receive; leased keys
+    missing from it (no longer candidates) are marked done. apply() returns
+    the result stored with the task. At most limit tasks are leased.
+    """
+    host_limits = host_limits or {}
+    gates: dict[str, HostGate] = {}
+
+    def gate(item) -> HostGate:
+        name = host(item) if host else ""
+        if name not in gates:
+            gates[name] = HostGate(host_limits.get(name, default_limit))
+        return gates[name]
+
+    def run(item):
+        with gate(item):
+            return fetch(item)
+
+    stats = RunStats()
+    start = time.perf_counter()
+    total = min(len(items), limit) if limit is not None else len(items)
+    leased = 0
+    exhausted = False
+    backlog: deque[str] = deque()
+    in_flight: dict[Future, str] = {}
+    since_commit = 0
+
+    def checkpoint():
+        queue.flush()
+        conn.commit()
+        stats.seconds = time.perf_counter() - start
+        log(f"  {stats.processed}/{total} ({stats.rate:.1f}/s): {stats.done} done, "
+            f"{stats.no_match} no match, {stats.failed} failed")
+
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 0 else _InlineExecutor()
+    with pool:
+        while True:
+            while len(in_flight) < max(workers, 1) * 2:
+                if not backlog:
+                    size = batch_size if limit is None else min(batch_size, limit - leased)
+                    if exhausted or size <= 0:
+                        break
+                    # Leasing commits, so it doubles as the batch checkpoint
+                    queue.flush()
+                    backlog.extend(queue.lease(size))
+                    leased += len(backlog)
+                    exhausted = len(backlog) < size
+                    since_commit = 0
+                    continue
+                key = backlog.popleft()
+                if key not in items:
+                    queue.done(key)
+                    continue
+                in_flight[pool.submit(run, items[key])] = key
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = in_flight.pop(future)
+                try:
+                    result = future.result()
+                    if result is None:
+                        queue.no_match(key)
+                        stats.no_match += 1
+                        continue
+                    if not conn.in_transaction:
+                        conn.execute("BEGIN")
+                    conn.execute("SAVEPOINT enrich")
+                    try:
+                        stored = apply(conn, items[key], result)
+                        conn.execute("RELEASE enrich")
+                    except Exception:
+                        conn.execute("ROLLBACK TO enrich")
+                        conn.execute("RELEASE enrich")
+                        raise
+                    queue.done(key, stored)
+                    stats.done += 1
+                except Exception as e:
+                    log(f"    {key}: {e}")
+                    queue.fail(key, e)
+                    stats.failed += 1
+                finally:
+                    since_commit += 1
+
+            if since_commit >= batch_size:
+                checkpoint()
+                since_commit = 0
+
+    checkpoint()
+    return stats
@@ -0,0 +1,267 @@
+"""Gazetteer linking of known person names and play titles in free text.
+
+An Aho-Corasick automaton is built once from every person name and play
+title in the database, plus aliases (original titles, and bare surnames of
+playwrights where no other playwright shares them). One linear pass over a
+text then finds every whole-word occurrence of any of them, however many
+names there are. Whitespace runs in the text (double spaces, line breaks)
+count as one space, and offsets still point into the original text.
+Overlapping hits keep the longest, so "Henrik Ibsen" wins over "Ibsen", and
+one-word patterns only match capitalized. Each hit carries the cue word just
+before it ("av", "dramatiker", "etter", ...), which tells a playwright from a
+mere mention.
+"""
+
+import re
+import sqlite3
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+from .db_schema import table_columns, table_exists
+
+
+MIN_PATTERN_LENGTH = 4
+CUE_WINDOW = 3  # words before a hit searched for a cue
+
+# Folded cue word -> cue
+CUE_WORDS = {
+    "av": "av",
+    "etter": "etter",
+    "dramatiker": "dramatiker",
+    "dramatikeren": "dramatiker",
+    "dramatikerinnen": "dramatiker",
+    "dramatikerinna": "dramatiker",
+    "forfatter": "forfatter",
+    "forfatteren": "forfatter",
+    "forfatterinnen": "forfatter",
+    "manus": "manus",
+    "manuskript": "manus",
+}
+AUTHOR_CUES = {"av", "dramatiker", "forfatter"}
+
+# (table, key column, text column) scanned by scan_descriptions()
+DESCRIPTION_SOURCES = [
+    ("episodes", "prf_id", "description"),
+    ("performances", "id", "description"),
+    ("external_performances", "id", "description"),
+]
+
+WORD_RE = re.compile(r"\w+")
+CLAUSE_RE = re.compile(r"[.,;:!?()\"«»]")
+
+LINKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mention_candidates (
+    source_table TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    matched TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    alias INTEGER NOT NULL DEFAULT 0,
+    cue TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mention_candidates_source ON mention_candidates(source_table, source_id);
+CREATE INDEX IF NOT EXISTS idx_mention_candidates_entity ON mention_candidates(kind, entity_id);
+"""
+
+
+@dataclass(frozen=True)
+class Entry:
+    kind: str       # person or play
+    entity_id: int
+    name: str       # canonical name or title
+    alias: bool = False
+
+
+@dataclass
+class GazetteerMatch:
+    start: int
+    end: int
+    text: str
+    entry: Entry
+    cue: Optional[str] = None
+
+
+def fold(text: str) -> str:
+    """Lowercase without changing length, so offsets map back to the input."""
+    return "".join(ch if len(low := ch.lower()) != 1 else low for ch in text)
+
+
+def _collapse(text: str) -> tuple[str, list[int]]:
+    """Folded text with each whitespace run as one space, and the offset in
+    text of every character kept."""
+    chars: list[str] = []
+    offsets: list[int] = []
+    for i, ch in enumerate(fold(text)):
+        if ch.isspace():
+            if chars and chars[-1] == " ":
+                continue
+            ch = " "
+        chars.append(ch)
+        offsets.append(i)
+    return "".join(chars), offsets
+
+
+class Gazetteer:
+    """Aho-Corasick automaton over folded names."""
+
+    def __init__(self):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[list[tuple[int, str]]] = [[]]  # (length, key) of patterns ending here
+        self.entries: dict[str, list[Entry]] = {}
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, name: str, entry: Entry):
+        key = " ".join(fold(name).split())
+        if len(key) < MIN_PATTERN_LENGTH:
+            return
+        if key not in self.entries:
+            self.entries[key] = []
+            state = 0
+            for ch in key:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((len(key), key))
+        if entry not in self.entries[key]:
+            self.entries[key].append(entry)
+        self._built = False
+
+    def build(self):
+        """Compute failure links; called automatically before the first scan."""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                # Patterns ending at the fallback state also end here
+                self.out[nxt] = self.out[nxt] + [o for o in self.out[self.fail[nxt]] if o not in self.out[nxt]]
+        self._built = True
+
+    def find(self, text: str) -> list[GazetteerMatch]:
+        """Whole-word occurrences in text, longest first where they overlap."""
+        if not text:
+            return []
+        if not self._built:
+            self.build()
+        folded, offsets = _collapse(text)
+        hits = []
+        state = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, key in out[state]:
+                start = i + 1 - length
+                if not _boundary(folded, start, i + 1):
+                    continue
+                # One-word names and titles are often plain words too ("spor"); require a capital
+                if " " not in key and not text[offsets[start]].isupper():
+                    continue
+                hits.append((start, i + 1, key))
+
+        # Leftmost-longest, non-overlapping
+        hits.sort(key=lambda h: (h[0], -(h[1] - h[0])))
+        matches = []
+        taken_until = 0
+        for start, end, key in hits:
+            if start < taken_until:
+                continue
+            cue = _cue(folded, start, taken_until)
+            first, last = offsets[start], offsets[end - 1] + 1
+            for entry in self.entries[key]:
+                matches.append(GazetteerMatch(first, last, text[first:last], entry, cue))
+            taken_until = end
+        return matches
+
+    @classmethod
+    def from_database(cls, conn: sqlite3.Connection) -> "Gazetteer":
+        """Persons and plays, with original titles and unique playwright surnames."""
+        gazetteer = cls()
+        for person_id, name in conn.execute("SELECT id, name FROM persons WHERE name IS NOT NULL"):
+            gazetteer.add(name, Entry("person", person_id, name))
+
+        original = "original_title" if "original_title" in table_columns(conn, "plays") else "NULL"
+        for play_id, title, original_title in conn.execute(
+            f"SELECT id, title, {original} FROM plays WHERE title IS NOT NULL"
+        ):
+            gazetteer.add(title, Entry("play", play_id, title))
+            if original_title and original_title != title:
+                gazetteer.add(original_title, Entry("play", play_id, title, alias=True))
+
+        surnames: dict[str, list[tuple[int, str]]] = {}
+        for person_id, name in conn.execute("""
+            SELECT DISTINCT p.id, p.name FROM persons p JOIN plays pl ON pl.playwright_id = p.id
+        """):
+            words = name.split()
+            if len(words) > 1:
+                surnames.setdefault(words[-1], []).append((person_id, name))
+        for surname, owners in surnames.items():
+            if len(owners) == 1 and fold(surname) not in gazetteer.entries:
+                person_id, name = owners[0]
+                gazetteer.add(surname, Entry("person", person_id, name, alias=True))
+        return gazetteer
+
+
+def _boundary(folded: str, start: int, end: int) -> bool:
+    return (start == 0 or not folded[start - 1].isalnum()) and (end == len(folded) or not folded[end].isalnum())
+
+
+def _cue(folded: str, start: int, floor: int = 0) -> Optional[str]:
+    """Cue among the few words before start, within the same clause and after floor."""
+    window = folded[max(floor, start - 60):start]
+    window = CLAUSE_RE.split(window)[-1]
+    for word in reversed(WORD_RE.findall(window)[-CUE_WINDOW:]):
+        if word in CUE_WORDS:
+            return CUE_WORDS[word]
+    return None
+
+
+def scan_descriptions(
+    conn: sqlite3.Connection, gazetteer: Gazetteer, sources: Iterable[tuple[str, str, str]] = DESCRIPTION_SOURCES,
+) -> Iterator[tuple[str, object, GazetteerMatch]]:
+    """(table, row key, match) for every hit in every description, one pass per table."""
+    for table, key, column in sources:
+        if not table_exists(conn, table) or column not in table_columns(conn, table):
+            continue
+        for row_key, text in conn.execute(f"SELECT {key}, {column} FROM {table} WHERE {column} IS NOT NULL"):
+            for match in gazetteer.find(text):
+                yield table, row_key, match
+
+
+def store_candidates(conn: sqlite3.Connection, gazetteer: Gazetteer) -> int:
+    """Replace mention_candidates with a fresh scan. Returns rows written."""
+    conn.executescript(LINKS_SCHEMA)
+    rows = [
+        (table, str(key), m.start, m.end, m.text, m.entry.kind, m.entry.entity_id, int(m.entry.alias), m.cue)
+        for table, key, m in scan_descriptions(conn, gazetteer)
+    ]
+    with conn:
+        conn.execute("DELETE FROM mention_candidates")
+        conn.executemany("INSERT INTO mention_candidates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def author_candidates(matches: Iterable[GazetteerMatch]) -> list[GazetteerMatch]:
+    """Person hits introduced by an authorship cue, in text order."""
+    return [m for m in matches if m.entry.kind == "person" and m.cue in AUTHOR_CUES]
@@ -0,0 +1,322 @@
+"""Single-pass grouping of episodes into performances.
+
+Every episode gets a set of grouping keys in one pass over the table:
+
+- ("series", id): radio series outside the umbrella series
+- ("parts", base title, year, medium): "Peer Gynt 1:2", "Brand - Del 2 av 3"
+- ("prf", family): part-numbered prf_ids of one broadcast (FTEA00015883,
+  FTEA00025883 -> FTEA00005883)
+- ("play", play_id, year, medium): TV episodes of one play in one year
+- ("prf", parent): introductions and their parent episode
+- ("performance", id): the performance an episode already belongs to
+
+Episodes sharing any key are joined with union-find, so each cluster is one
+performance. Because current membership is itself a key, regrouping only
+joins performances; groupings made by hand or by an importer are never
+split. regroup_performances() then writes episodes.performance_id, creates
+and removes performances and rebuilds performance_persons for the
+performances whose membership changed, all in the caller's transaction.
+Existing performance IDs are kept wherever a cluster still has them.
+
+Performance aggregates (total_duration, year, representative description
+and image, performance_persons) are maintained incrementally: triggers on
+episodes and episode_persons record the performances they touch in
+performances_stale, and refresh_performances() recomputes only those.
+"""
+
+import re
+import sqlite3
+import time
+from collections import Counter
+from typing import Optional
+
+from .db_schema import table_exists
+from .titles import clean_title, normalize_title, register_title_functions, split_part
+from .union_find import UnionFind
+
+
+# Umbrella radio series where each episode is a standalone production
+UMBRELLA_SERIES = {"radioteatret"}
+
+DEL_PART_RE = re.compile(r"^(.+?)\s*-?\s*[Dd]el\s+(\d+)(?:\s*av\s*(\d+))?")
+COLON_PART_RE = re.compile(r"^(.+?)\s+(\d+):(\d+)$")
+
+# (pattern, replacement) turning a part-numbered prf_id into its family ID
+PRF_FAMILY_PATTERNS = [
+    (re.compile(r"^(FTEA)000([123])(\d{4})$"), r"\g<1>0000\g<3>"),   # FTEA00015883 -> FTEA00005883
+    (re.compile(r"^(FUHA)030([123])(\d{4})$"), r"\g<1>0300\g<3>"),   # FUHA03010086 -> FUHA03000086
+    (re.compile(r"^(FTEA)6([56])0([12])(\d{4})$"), r"\g<1>6\g<2>00\g<4>"),
+    (re.compile(r"^(FTEA)(\d{2})0([12])(\d{4})$"), r"\g<1>\g<2>00\g<4>"),  # FTEA63011463 -> FTEA63001463
+]
+
+
+def extract_series_id(nrk_url: Optional[str]) -> Optional[str]:
+    """Series slug from an NRK radio URL (/serie/maaken/mktt54001454 -> maaken)."""
+    match = re.search(r"/serie/([^/]+)/", nrk_url or "")
+    return match.group(1) if match else None
+
+
+def part_info(title: str) -> tuple[Optional[str], Optional[int], Optional[int]]:
+    """(base title, part, total parts) for "Peer Gynt 1:2" or "Brand - Del 1 av 2", else Nones."""
+    title = (title or "").strip()
+    match = COLON_PART_RE.search(title)
+    if match:
+        return match.group(1).strip(), int(match.group(2)), int(match.group(3))
+    match = DEL_PART_RE.search(title)
+    if match:
+        total = int(match.group(3)) if match.group(3) else None
+        return match.group(1).strip(), int(match.group(2)), total
+    base, had_part = split_part(title)
+    if had_part:
+        return base, None, None
+    return None, None, None
+
+
+def prf_family(prf_id: Optional[str]) -> Optional[str]:
+    """Base prf_id of a part-numbered recording, or None if it has no part digit."""
+    for pattern, replacement in PRF_FAMILY_PATTERNS:
+        if prf_id and pattern.match(prf_id):
+            return pattern.sub(replacement, prf_id)
+    return None
+
+
+def episode_keys(
+    prf_id: str, title: str, year, play_id, medium, series_id, parent_id, performance_id=None,
+) -> list[tuple]:
+    medium = medium or "tv"
+    keys = []
+    umbrella = medium == "radio" and series_id in UMBRELLA_SERIES
+    if medium == "radio" and series_id and not umbrella:
+        keys.append(("series", series_id))
+    base, _, _ = part_info(title)
+    if base:
+        keys.append(("parts", normalize_title(base), year, medium))
+    # A numbered part joins its family; the unnumbered recording is the family
+    keys.append(("prf", prf_family(prf_id) or prf_id))
+    if play_id is not None and not (medium == "radio" and series_id):
+        keys.append(("play", play_id, year, medium))
+    if parent_id:
+        keys.append(("prf", parent_id))
+    if performance_id is not None:
+        keys.append(("performance", performance_id))
+    return keys
+
+
+def group_episodes(rows) -> list[list[str]]:
+    """Clusters of prf_ids from rows of
+    (prf_id, title, year, play_id, medium, series_id, parent_episode_id[, performance_id])."""
+    uf = UnionFind()
+    owner: dict[tuple, str] = {}
+    for row in rows:
+        prf_id = row[0]
+        uf.find(prf_id)
+        for key in episode_keys(*row):
+            first = owner.setdefault(key, prf_id)
+            if first != prf_id:
+                uf.union(first, prf_id)
+    return sorted(uf.groups().values())
+
+
+def regroup_performances(conn: sqlite3.Connection) -> dict:
+    """Regroup all episodes into performances in the caller's transaction.
+
+    Returns counts and timing.
+    """
+    start = time.perf_counter()
+    register_title_functions(conn)  # new performances get normalized_title by trigger
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(episodes)")}
+    parent = "parent_episode_id" if "parent_episode_id" in columns else "NULL"
+    rows = conn.execute(f"""
+        SELECT prf_id, title, year, play_id, medium, series_id, {parent},
+               performance_id, description, image_url, part_number
+        FROM episodes
+        ORDER BY prf_id
+    """).fetchall()
+    episodes = {row[0]: row for row in rows}
+    clusters = group_episodes([row[:8] for row in rows])
+
+    # Keep the performance most members already point to; bigger clusters choose first
+    assignment: dict[int, Optional[int]] = {}
+    claimed = set()
+    for index in sorted(range(len(clusters)), key=lambda i: (-len(clusters[i]), clusters[i][0])):
+        current = Counter(episodes[p][7] for p in clusters[index] if episodes[p][7] is not None)
+        choice = next(
+            (perf for perf, _ in sorted(current.items(), key=lambda c: (-c[1], c[0])) if perf not in claimed),
+            None,
+        )
+        if choice is not None:
+            claimed.add(choice)
+        assignment[index] = choice
+
+    created = 0
+    for index, members in enumerate(clusters):
+        if assignment[index] is not None:
+            continue
+        assignment[index] = _create_performance(conn, [episodes[p] for p in members])
+        created += 1
+
+    conn.execute("DROP TABLE IF EXISTS temp._regroup")
+    conn.execute("CREATE TEMP TABLE _regroup (prf_id TEXT PRIMARY KEY, performance_id INTEGER NOT NULL)")
+    conn.executemany(
+        "INSERT INTO _regroup (prf_id, performance_id) VALUES (?, ?)",
+        [(p, assignment[index]) for index, members in enumerate(clusters) for p in members],
+    )
+
+    # Performances gaining or losing episodes
+    conn.execute("DROP TABLE IF EXISTS temp._regroup_changed")
+    conn.execute("DROP TABLE IF EXISTS temp._regroup_empty")
+    conn.execute("""
+        CREATE TEMP TABLE _regroup_changed AS
+        SELECT e.performance_id AS id FROM episodes e JOIN _regroup r ON r.prf_id = e.prf_id
+        WHERE e.performance_id IS NOT r.performance_id AND e.performance_id IS NOT NULL
+        UNION
+        SELECT r.performance_id FROM episodes e JOIN _regroup r ON r.prf_id = e.prf_id
+        WHERE e.performance_id IS NOT r.performance_id
+    """)
+    moved = conn.execute("""
+        UPDATE episodes SET performance_id = (SELECT performance_id FROM _regroup WHERE prf_id = episodes.prf_id)
+        WHERE prf_id IN (
+            SELECT r.prf_id FROM _regroup r JOIN episodes e ON e.prf_id = r.prf_id
+            WHERE e.performance_id IS NOT r.performance_id
+        )
+    """).rowcount
+    changed_ids = [row[0] for row in conn.execute("SELECT id FROM _regroup_changed")]
+    refresh_performances(conn, changed_ids)
+
+    conn.execute("""
+        CREATE TEMP TABLE _regroup_empty AS
+        SELECT id FROM _regroup_changed
+        WHERE id IN (SELECT id FROM performances WHERE source = 'nrk')
+          AND id NOT IN (SELECT performance_id FROM episodes WHERE performance_id IS NOT NULL)
+    """)
+    conn.execute("DELETE FROM performance_persons WHERE performance_id IN (SELECT id FROM _regroup_empty)")
+    deleted = conn.execute("DELETE FROM performances WHERE id IN (SELECT id FROM _regroup_empty)").rowcount
+    conn.execute("DROP TABLE _regroup_empty")
+    conn.execute("DROP TABLE _regroup")
+    conn.execute("DROP TABLE _regroup_changed")
+
+    return {
+        "episodes": len(rows),
+        "performances": len(clusters),
+        "moved": moved,
+        "created": created,
+        "deleted": deleted,
+        "changed": len(changed_ids),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _create_performance(conn: sqlite3.Connection, members: list[tuple]) -> int:
+    """Insert a performance for a new cluster; refresh_performances() fills the aggregates."""
+    members = sorted(members, key=lambda m: (m[10] is None, m[10], m[0]))
+    first = members[0]
+    play_ids = {m[3] for m in members if m[3] is not None}
+    play_id = play_ids.pop() if len(play_ids) == 1 else None
+    title = None
+    if play_id is not None:
+        row = conn.execute("SELECT title FROM plays WHERE id = ?", (play_id,)).fetchone()
+        title = row[0] if row else None
+    if title is None:
+        base, _, _ = part_info(first[1])
+        title = base or clean_title(first[1]) or first[1]
+    medium = first[4] or "tv"
+    series_id = first[5] if medium == "radio" and first[5] and first[5] not in UMBRELLA_SERIES else None
+    cursor = conn.execute(
+        "INSERT INTO performances (work_id, source, title, medium, series_id) VALUES (?, 'nrk', ?, ?, ?)",
+        (play_id, title, medium, series_id),
+    )
+    return cursor.lastrowid
+
+
+# --- Incremental aggregates ---------------------------------------------------
+
+# Episode columns the performance aggregates are computed from
+AGGREGATE_COLUMNS = "performance_id, duration_seconds, year, description, image_url, part_number, prf_id"
+
+
+def install_performance_triggers(conn: sqlite3.Connection):
+    """Create performances_stale and the triggers that fill it.
+
+    Plain SQL, so every writer marks performances, with or without this module.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS performances_stale (id INTEGER PRIMARY KEY)")
+    mark = "INSERT OR IGNORE INTO performances_stale (id) SELECT {0} WHERE {0} IS NOT NULL;"
+    episode_of = "(SELECT performance_id FROM episodes WHERE prf_id = {0}.episode_id)"
+    triggers = {
+        "episodes_stale_ai": ("AFTER INSERT ON episodes", mark.format("NEW.performance_id")),
+        "episodes_stale_ad": ("AFTER DELETE ON episodes", mark.format("OLD.performance_id")),
+        "episodes_stale_au": (
+            f"AFTER UPDATE OF {AGGREGATE_COLUMNS} ON episodes",
+            mark.format("OLD.performance_id") + mark.format("NEW.performance_id"),
+        ),
+        "episode_persons_stale_ai": ("AFTER INSERT ON episode_persons", mark.format(episode_of.format("NEW"))),
+        "episode_persons_stale_ad": ("AFTER DELETE ON episode_persons", mark.format(episode_of.format("OLD"))),
+        "episode_persons_stale_au": (
+            "AFTER UPDATE ON episode_persons",
+            mark.format(episode_of.format("OLD")) + mark.format(episode_of.format("NEW")),
+        ),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+
+def refresh_performances(conn: sqlite3.Connection, ids=()) -> int:
+    """Recompute aggregates of the given and all stale performances.
+
+    total_duration and year come from the episodes; description and image
+    from the first episode that has one, in part order. Performances
+    without episodes are left as they are. Runs in the caller's
+    transaction. Returns the number of performances refreshed.
+    """
+    conn.execute("DROP TABLE IF EXISTS temp._refresh")
+    conn.execute("CREATE TEMP TABLE _refresh (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT OR IGNORE INTO _refresh (id) VALUES (?)", [(i,) for i in ids])
+    if table_exists(conn, "performances_stale"):
+        conn.execute("INSERT OR IGNORE INTO _refresh (id) SELECT id FROM performances_stale")
+        conn.execute("DELETE FROM performances_stale")
+
+    conn.execute("""
+        UPDATE performances SET
+            total_duration = agg.total_duration,
+            year = COALESCE(agg.year, performances.year),
+            description = COALESCE(agg.description, performances.description),
+            image_url = COALESCE(agg.image_url, performances.image_url)
+        FROM (
+            SELECT performance_id,
+                   SUM(duration_seconds) AS total_duration,
+                   MAX(year) AS year,
+                   MAX(CASE WHEN description_rank = 1 THEN description END) AS description,
+                   MAX(CASE WHEN image_rank = 1 THEN image_url END) AS image_url
+            FROM (
+                SELECT performance_id, duration_seconds, year, description, image_url,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY performance_id
+                           ORDER BY description IS NULL, part_number IS NULL, part_number, prf_id
+                       ) AS description_rank,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY performance_id
+                           ORDER BY image_url IS NULL, part_number IS NULL, part_number, prf_id
+                       ) AS image_rank
+                FROM episodes
+                WHERE performance_id IN (SELECT id FROM _refresh)
+            )
+            GROUP BY performance_id
+        ) AS agg
+        WHERE performances.id = agg.performance_id
+    """)
+    conn.execute("""
+        DELETE FROM performance_persons
+        WHERE performance_id IN (
+            SELECT id FROM _refresh WHERE id IN (SELECT performance_id FROM episodes)
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO performance_persons (performance_id, person_id, role, character_name)
+        SELECT DISTINCT e.performance_id, ep.person_id, ep.role, ep.character_name
+        FROM episode_persons ep
+        JOIN episodes e ON ep.episode_id = e.prf_id
+        WHERE e.performance_id IN (SELECT id FROM _refresh)
+    """)
+    refreshed = conn.execute("SELECT COUNT(*) FROM _refresh").fetchone()[0]
+    conn.execute("DROP TABLE _refresh")
+    return refreshed
@@ -0,0 +1,295 @@
+"""One-pass relational integrity and duplicate scanner.
+
+scan_integrity() runs every check in one transaction and returns an
+IntegrityReport:
+
+- foreign keys: PRAGMA foreign_key_check over every table with declared
+  foreign keys (works with enforcement off, which is the default here)
+- duplicates: ROW_NUMBER() over each junction table's key in JUNCTION_KEYS;
+  NULL role or character_name counts as equal, unlike in a UNIQUE constraint
+- orphans: anti-joins against every table that references persons,
+  external resources and NRK performances
+
+With fix=True the same transaction sets dangling nullable references to
+NULL, deletes dangling rows otherwise, keeps the first of each group of
+duplicates and removes NRK performances without episodes. It then adds the
+indexes that make the checks cheap: one per foreign key column and a unique
+one per junction key, so INSERT OR IGNORE stops creating duplicates.
+Orphaned persons and resources are reported only.
+"""
+
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .db_schema import table_exists
+
+
+# Junction table -> columns identifying a row
+JUNCTION_KEYS = {
+    "episode_persons": ("episode_id", "person_id", "role", "character_name"),
+    "performance_persons": ("performance_id", "person_id", "role", "character_name"),
+    "external_performance_persons": ("performance_id", "person_id", "role"),
+    "episode_tags": ("episode_id", "tag_id"),
+    "play_tags": ("play_id", "tag_id"),
+    "episode_resources": ("episode_id", "resource_id"),
+    "play_resources": ("play_id", "resource_id"),
+    "person_resources": ("person_id", "resource_id"),
+}
+
+
+@dataclass(frozen=True)
+class OrphanCheck:
+    table: str
+    where: Optional[str] = None                       # restricts the rows checked
+    referenced_by: Optional[tuple[tuple[str, str], ...]] = None  # default: declared foreign keys
+    fixable: bool = False
+
+
+ORPHAN_CHECKS = [
+    OrphanCheck("persons"),
+    OrphanCheck("external_resources"),
+    # Regrouping removes these too; other sources keep performances without NRK episodes
+    OrphanCheck("performances", "source = 'nrk'", (("episodes", "performance_id"),), fixable=True),
+]
+
+SAMPLE_SIZE = 20
+
+
+@dataclass
+class Issue:
+    check: str                    # foreign_key, duplicate or orphan
+    table: str
+    detail: str                   # column -> parent, key columns, or referencing tables
+    count: int
+    action: str = "report"        # set_null, delete or report
+    fixed: int = 0
+    sample: list = field(default_factory=list)
+
+
+@dataclass
+class IntegrityReport:
+    started_at: str
+    fix: bool
+    issues: list[Issue] = field(default_factory=list)
+    missing_indexes: list[str] = field(default_factory=list)
+    created_indexes: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def fixed(self) -> int:
+        return sum(i.fixed for i in self.issues)
+
+    @property
+    def clean(self) -> bool:
+        return not self.issues
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "fix": self.fix,
+            "seconds": round(self.seconds, 4),
+            "issues": [asdict(i) for i in self.issues],
+            "fixed": self.fixed,
+            "missing_indexes": self.missing_indexes,
+            "created_indexes": self.created_indexes,
+        }
+
+
+def _tables(conn: sqlite3.Connection) -> list[str]:
+    return [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    )]
+
+
+def foreign_keys(conn: sqlite3.Connection) -> list[tuple[str, int, str, str, str]]:
+    """(table, fk id, column, parent table, parent column) of single-column foreign keys."""
+    keys = []
+    for table in _tables(conn):
+        rows = conn.execute(f"PRAGMA foreign_key_list({table})").fetchall()
+        columns_per_fk = {}
+        for fk_id, seq, parent, column, parent_column, *_ in rows:
+            columns_per_fk.setdefault(fk_id, []).append((column, parent, parent_column))
+        for fk_id, columns in sorted(columns_per_fk.items()):
+            if len(columns) == 1:
+                column, parent, parent_column = columns[0]
+                keys.append((table, fk_id, column, parent, parent_column or "rowid"))
+    return keys
+
+
+def _not_null(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    for row in conn.execute(f"PRAGMA table_info({table})"):
+        if row[1] == column:
+            return bool(row[3]) or bool(row[5])
+    return False
+
+
+def _key_expressions(conn: sqlite3.Connection, table: str) -> list[str]:
+    """Junction key columns, with nullable ones folded so NULL equals ''."""
+    return [
+        column if _not_null(conn, table, column) else f"COALESCE({column}, '')"
+        for column in JUNCTION_KEYS[table]
+    ]
+
+
+def check_foreign_keys(conn: sqlite3.Connection, report: IntegrityReport, fix: bool):
+    conn.execute("DROP TABLE IF EXISTS temp._fk_violations")
+    conn.execute("CREATE TEMP TABLE _fk_violations (tbl TEXT, rid INTEGER, parent TEXT, fkid INTEGER)")
+    for table in {fk[0] for fk in foreign_keys(conn)}:
+        conn.executemany(
+            "INSERT INTO _fk_violations VALUES (?, ?, ?, ?)",
+            conn.execute(f"PRAGMA foreign_key_check({table})").fetchall(),
+        )
+
+    for table, fk_id, column, parent, parent_column in foreign_keys(conn):
+        violations = "SELECT rid FROM _fk_violations WHERE tbl = ? AND fkid = ?"
+        count = conn.execute(f"SELECT COUNT(*) FROM ({violations})", (table, fk_id)).fetchone()[0]
+        if not count:
+            continue
+        issue = Issue(
+            "foreign_key", table, f"{column} -> {parent}({parent_column})", count,
+            action="delete" if _not_null(conn, table, column) else "set_null",
+        )
+        issue.sample = [
+            list(row) for row in conn.execute(
+                f"SELECT rowid, {column} FROM {table} WHERE rowid IN ({violations}) ORDER BY rowid LIMIT ?",
+                (table, fk_id, SAMPLE_SIZE),
+            )
+        ]
+        if fix:
+            if issue.action == "delete":
+                statement = f"DELETE FROM {table} WHERE rowid IN ({violations})"
+            else:
+                statement = f"UPDATE {table} SET {column} = NULL WHERE rowid IN ({violations})"
+            issue.fixed = conn.execute(statement, (table, fk_id)).rowcount
+        report.issues.append(issue)
+
+
+def check_duplicates(conn: sqlite3.Connection, report: IntegrityReport, fix: bool):
+    for table in JUNCTION_KEYS:
+        if not table_exists(conn, table):
+            continue
+        key = ", ".join(_key_expressions(conn, table))
+        duplicates = f"""
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY rowid) AS copy
+                FROM {table}
+            )
+            WHERE copy > 1
+        """
+        count = conn.execute(f"SELECT COUNT(*) FROM ({duplicates})").fetchone()[0]
+        if not count:
+            continue
+        issue = Issue("duplicate", table, ", ".join(JUNCTION_KEYS[table]), count, action="delete")
+        issue.sample = [
+            list(row) for row in conn.execute(
+                f"SELECT rowid, {', '.join(JUNCTION_KEYS[table])} FROM {table} "
+                f"WHERE rowid IN ({duplicates}) ORDER BY rowid LIMIT ?",
+                (SAMPLE_SIZE,),
+            )
+        ]
+        if fix:
+            issue.fixed = conn.execute(f"DELETE FROM {table} WHERE rowid IN ({duplicates})").rowcount
+        report.issues.append(issue)
+
+
+def check_orphans(conn: sqlite3.Connection, report: IntegrityReport, fix: bool):
+    keys = foreign_keys(conn)
+    for check in ORPHAN_CHECKS:
+        if not table_exists(conn, check.table):
+            continue
+        referenced_by = check.referenced_by or tuple(
+            (table, column) for table, _, column, parent, _ in keys if parent == check.table
+        )
+        referenced_by = tuple((t, c) for t, c in referenced_by if table_exists(conn, t))
+        conditions = [f"({check.where})"] if check.where else []
+        conditions += [
+            f"NOT EXISTS (SELECT 1 FROM {table} r WHERE r.{column} = o.id)"
+            for table, column in referenced_by
+        ]
+        orphans = f"SELECT o.id FROM {check.table} o WHERE {' AND '.join(conditions) or '1'}"
+        count = conn.execute(f"SELECT COUNT(*) FROM ({orphans})").fetchone()[0]
+        if not count:
+            continue
+        issue = Issue(
+            "orphan", check.table, ", ".join(f"{t}.{c}" for t, c in referenced_by), count,
+            action="delete" if check.fixable else "report",
+        )
+        issue.sample = [row[0] for row in conn.execute(f"{orphans} ORDER BY o.id LIMIT ?", (SAMPLE_SIZE,))]
+        if fix and check.fixable:
+            conn.execute("DROP TABLE IF EXISTS temp._orphans")
+            conn.execute(f"CREATE TEMP TABLE _orphans AS {orphans}")
+            # Rows still pointing at the orphans go first, so no new dangling references appear
+            for table, _, column, parent, _ in keys:
+                if parent == check.table and (table, column) not in referenced_by:
+                    conn.execute(f"DELETE FROM {table} WHERE {column} IN (SELECT id FROM _orphans)")
+            issue.fixed = conn.execute(
+                f"DELETE FROM {check.table} WHERE id IN (SELECT id FROM _orphans)"
+            ).rowcount
+        report.issues.append(issue)
+
+
+def missing_indexes(conn: sqlite3.Connection) -> list[tuple[str, str]]:
+    """(name, CREATE INDEX statement) for unindexed foreign keys and junction keys."""
+    leading = {}
+    unique = {}
+    for table in _tables(conn):
+        for _, index, is_unique, *_ in conn.execute(f"PRAGMA index_list({table})"):
+            columns = [row[2] for row in conn.execute(f"PRAGMA index_xinfo({index})") if row[5]]
+            if columns:
+                leading.setdefault(table, set()).add(columns[0])
+            if is_unique:
+                unique.setdefault(table, []).append(columns)
+
+    statements = []
+    for table, _, column, _, _ in foreign_keys(conn):
+        if column not in leading.get(table, set()):
+            name = f"idx_{table}_{column}"
+            statements.append((name, f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column})"))
+            leading.setdefault(table, set()).add(column)
+    for table, key in JUNCTION_KEYS.items():
+        if not table_exists(conn, table):
+            continue
+        name = f"uq_{table}_key"
+        expressions = _key_expressions(conn, table)
+        # A unique index on plain columns only covers the key when none can be NULL
+        covered = expressions == list(key) and any(columns == list(key) for columns in unique.get(table, []))
+        if covered or conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone():
+            continue
+        statements.append((name, f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table}({', '.join(expressions)})"))
+    return statements
+
+
+def ensure_integrity_indexes(conn: sqlite3.Connection) -> list[str]:
+    """Create the missing indexes. Junction tables must be free of duplicates."""
+    created = []
+    for name, statement in missing_indexes(conn):
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone():
+            conn.execute(statement)
+            created.append(name)
+    return created
+
+
+def remove_duplicates(conn: sqlite3.Connection) -> int:
+    """Keep the first row of each junction key. Returns the number removed."""
+    report = IntegrityReport(started_at="", fix=True)
+    check_duplicates(conn, report, fix=True)
+    return report.fixed
+
+
+def scan_integrity(conn: sqlite3.Connection, fix: bool = False) -> IntegrityReport:
+    """Run all checks in the caller's transaction (begun here if needed)."""
+    report = IntegrityReport(started_at=datetime.now().isoformat(timespec="seconds"), fix=fix)
+    start = time.perf_counter()
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    check_foreign_keys(conn, report, fix)
+    check_duplicates(conn, report, fix)
+    check_orphans(conn, report, fix)
+    if fix:
+        report.created_indexes = ensure_integrity_indexes(conn)
+    report.missing_indexes = [name for name, _ in missing_indexes(conn)]
+    report.seconds = time.perf_counter() - start
+    return report
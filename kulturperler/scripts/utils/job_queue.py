@@ -0,0 +1,218 @@
+"""Durable work queue for enrichment stages, stored in the database itself.
+
+Each task is a (stage, task_key) row with a status:
+
+- pending: waiting to be leased
+- leased: taken by a worker until lease_expires_at; expired leases are
+  handed out again, so a crashed worker only delays its tasks
+- done: finished, with an optional JSON result
+- no_match: looked up without a result; retried only on request (--rematch)
+- failed: errored; retried after next_attempt_at with exponential backoff,
+  until max_attempts is reached
+
+Leasing is one UPDATE ... RETURNING in its own short transaction, so several
+workers (processes or connections) can pull from the same stage without
+getting the same task. Status changes are buffered and written by flush() in
+the caller's transaction, so a stage's progress commits together with the
+data it describes and never gets ahead of it.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    stage TEXT NOT NULL,
+    task_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, leased, done, no_match, failed
+    priority INTEGER NOT NULL DEFAULT 0,     -- higher first
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at TEXT,
+    lease_owner TEXT,
+    lease_expires_at TEXT,
+    result TEXT,                             -- JSON
+    updated_at TEXT,
+    PRIMARY KEY (stage, task_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(stage, status, priority DESC, task_key);
+"""
+
+STATUSES = ("pending", "leased", "done", "no_match", "failed")
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat(timespec="seconds")
+
+
+class JobQueue:
+    """Tasks of one stage in the jobs table."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        stage: str,
+        lease_seconds: float = 600,
+        max_attempts: int = 3,
+        retry_delay: float = 60,
+        worker: Optional[str] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.conn = conn
+        self.stage = stage
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        self.clock = clock
+        self._updates: list[tuple] = []
+        for statement in JOBS_SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE stage = ?", (self.stage,)).fetchone()[0]
+
+    def enqueue(self, keys: Iterable, priority: int = 0) -> int:
+        """Add tasks not yet known in this stage. Keys may be (key, priority) pairs."""
+        rows = [
+            (self.stage, str(key[0]), key[1]) if isinstance(key, tuple) else (self.stage, str(key), priority)
+            for key in keys
+        ]
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR IGNORE INTO jobs (stage, task_key, priority) VALUES (?, ?, ?)", rows)
+        return self.conn.total_changes - before
+
+    def lease(self, limit: int) -> list[str]:
+        """Claim up to limit ready tasks, highest priority first.
+
+        Commits, so flush() pending work first.
+        """
+        now = self.clock()
+        with self.conn:
+            rows = self.conn.execute(
+                """
+                UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires_at = ?,
+                                attempts = attempts + 1, updated_at = ?
+                WHERE stage = ? AND task_key IN (
+                    SELECT task_key FROM jobs
+                    WHERE stage = ? AND (
+                        status = 'pending'
+                        OR (status = 'leased' AND lease_expires_at < ?)
+                        OR (status = 'failed' AND attempts < ? AND next_attempt_at <= ?)
+                    )
+                    ORDER BY priority DESC, task_key
+                    LIMIT ?
+                )
+                RETURNING task_key, priority
+                """,
+                (
+                    self.worker, _timestamp(now + timedelta(seconds=self.lease_seconds)), _timestamp(now),
+                    self.stage, self.stage, _timestamp(now), self.max_attempts, _timestamp(now), limit,
+                ),
+            ).fetchall()
+        # RETURNING order is unspecified
+        return [key for key, _ in sorted(rows, key=lambda r: (-r[1], r[0]))]
+
+    def done(self, key, result=None):
+        self._set(key, "done", result=json.dumps(result, ensure_ascii=False) if result is not None else None)
+
+    def no_match(self, key):
+        self._set(key, "no_match")
+
+    def fail(self, key, error):
+        """Record an error; the task is retried after an exponentially growing delay."""
+        attempts = self.conn.execute(
+            "SELECT attempts FROM jobs WHERE stage = ? AND task_key = ?", (self.stage, str(key))
+        ).fetchone()
+        delay = self.retry_delay * 2 ** max((attempts[0] if attempts else 1) - 1, 0)
+        self._set(key, "failed", error=str(error), next_attempt_at=_timestamp(self.clock() + timedelta(seconds=delay)))
+
+    def _set(self, key, status: str, result=None, error=None, next_attempt_at=None):
+        self._updates.append(
+            (status, result, error, next_attempt_at, _timestamp(self.clock()), self.stage, str(key))
+        )
+
+    def flush(self) -> int:
+        """Write buffered status changes in the caller's transaction."""
+        updates, self._updates = self._updates, []
+        self.conn.executemany(
+            """
+            UPDATE jobs SET status = ?, result = COALESCE(?, result), last_error = ?, next_attempt_at = ?,
+                            lease_owner = NULL, lease_expires_at = NULL, updated_at = ?
+            WHERE stage = ? AND task_key = ?
+            """,
+            updates,
+        )
+        return len(updates)
+
+    def retry(self, statuses: Iterable[str] = ("no_match", "failed")) -> int:
+        """Put tasks with the given statuses back to pending with fresh attempts."""
+        statuses = list(statuses)
+        marks = ", ".join("?" * len(statuses))
+        return self.conn.execute(
+            f"""
+            UPDATE jobs SET status = 'pending', attempts = 0, last_error = NULL, next_attempt_at = NULL
+            WHERE stage = ? AND status IN ({marks})
+            """,
+            (self.stage, *statuses),
+        ).rowcount
+
+    def record(self, keys: Iterable, status: str, results: Optional[dict] = None) -> int:
+        """Store already finished tasks, e.g. from an older progress file. Existing tasks are kept."""
+        results = results or {}
+        rows = [
+            (self.stage, str(key), status,
+             json.dumps(results[key], ensure_ascii=False) if key in results else None,
+             _timestamp(self.clock()))
+            for key in keys
+        ]
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (stage, task_key, status, result, updated_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return self.conn.total_changes - before
+
+    def status(self, key) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT status FROM jobs WHERE stage = ? AND task_key = ?", (self.stage, str(key))
+        ).fetchone()
+        return row[0] if row else None
+
+    def result(self, key):
+        row = self.conn.execute(
+            "SELECT result FROM jobs WHERE stage = ? AND task_key = ?", (self.stage, str(key))
+        ).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self.conn.execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE stage = ? GROUP BY status", (self.stage,)
+        ))
+        return counts
+
+
+def import_progress_file(queue: JobQueue, path, done_keys: Iterable[str], no_match_keys: Iterable[str]) -> int:
+    """One-off import of a legacy JSON progress file into an empty stage.
+
+    done_keys and no_match_keys name the file's lists (or dicts of results).
+    """
+    if len(queue) or not path.exists():
+        return 0
+    with open(path, "r", encoding="utf-8") as f:
+        progress = json.load(f)
+    imported = 0
+    for name in done_keys:
+        items = progress.get(name) or []
+        results = items if isinstance(items, dict) else {}
+        imported += queue.record(list(items), "done", results)
+    for name in no_match_keys:
+        imported += queue.record(progress.get(name) or [], "no_match")
+    return imported
@@ -0,0 +1,219 @@
+"""Embedded key-value cache for HTTP and AI lookups.
+
+Entries live in a small SQLite file (data/cache.db by default, outside the
+web bundle) keyed by (namespace, key), e.g. ("search", query),
+("ai", "Ibsen:Program") or ("artwork", url). Every set() is a single-row
+upsert committed on its own in WAL mode, so writing an entry costs the same
+however large the cache grows. Entries can expire (ttl), and when the values
+exceed max_bytes the least recently used ones are evicted.
+
+open_cache() imports the old whole-file JSON caches (data/nrk_about_cache.json,
+data/sceneweb_cache.json) into a new cache file.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+DEFAULT_PATH = DATA_DIR / "cache.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,         -- JSON
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    expires_at REAL,             -- NULL: never
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache(accessed_at);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at) WHERE expires_at IS NOT NULL;
+"""
+
+_MISSING = object()
+
+
+class KVCache:
+    """Namespaced cache with TTL expiry and size-based LRU eviction."""
+
+    def __init__(
+        self,
+        path=DEFAULT_PATH,
+        max_bytes: Optional[int] = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, namespace: str, key: str, default=None) -> Any:
+        row = self.conn.execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        now = self.clock()
+        if expires_at is not None and expires_at <= now:
+            self.delete(namespace, key)
+            return default
+        self.conn.execute(
+            "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key)
+        )
+        return json.loads(value)
+
+    def contains(self, namespace: str, key: str) -> bool:
+        return self.get(namespace, key, _MISSING) is not _MISSING
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store value (anything JSON can encode); ttl in seconds."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = self.clock()
+        old = self.conn.execute(
+            "SELECT size FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        self.conn.execute(
+            """
+            INSERT INTO cache (namespace, key, value, size, created_at, accessed_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (namespace, key) DO UPDATE SET
+                value = excluded.value, size = excluded.size, created_at = excluded.created_at,
+                accessed_at = excluded.accessed_at, expires_at = excluded.expires_at
+            """,
+            (namespace, key, encoded, len(encoded), now, now, now + ttl if ttl is not None else None),
+        )
+        self._bytes += len(encoded) - (old[0] if old else 0)
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            self.evict()
+
+    def delete(self, namespace: str, key: str):
+        row = self.conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ? RETURNING size", (namespace, key)
+        ).fetchone()
+        if row:
+            self._bytes -= row[0]
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under 90% of max_bytes."""
+        self.conn.execute("BEGIN")
+        removed = self.conn.execute(
+            "DELETE FROM cache WHERE expires_at <= ?", (self.clock(),)
+        ).rowcount
+        self._bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            target = self._bytes - int(self.max_bytes * 0.9)
+            # Oldest first, up to and including the entry that brings the total under target
+            removed += self.conn.execute(
+                """
+                DELETE FROM cache WHERE (namespace, key) IN (
+                    SELECT namespace, key FROM (
+                        SELECT namespace, key,
+                               SUM(size) OVER (ORDER BY accessed_at, namespace, key) - size AS freed_before
+                        FROM cache
+                    )
+                    WHERE freed_before < ?
+                )
+                """,
+                (target,),
+            ).rowcount
+            self._bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        self.conn.execute("COMMIT")
+        return removed
+
+    def namespace(self, namespace: str, ttl: Optional[float] = None) -> "Namespace":
+        return Namespace(self, namespace, ttl)
+
+    def import_json(self, path: Path, split: Callable[[str], tuple[str, str]]) -> int:
+        """Load a legacy JSON cache file; split maps each file key to (namespace, key).
+
+        Existing entries win. Returns the number of entries imported.
+        """
+        if not path.exists():
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        now = self.clock()
+        rows = []
+        for file_key, value in data.items():
+            namespace, key = split(file_key)
+            encoded = json.dumps(value, ensure_ascii=False)
+            rows.append((namespace, key, encoded, len(encoded), now, now))
+        self.conn.execute("BEGIN")
+        before = self.conn.total_changes
+        self.conn.executemany(
+            """
+            INSERT OR IGNORE INTO cache (namespace, key, value, size, created_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        imported = self.conn.total_changes - before
+        self.conn.execute("COMMIT")
+        self._bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        return imported
+
+
+class Namespace:
+    """Dict-like view of one namespace, so existing cache code keeps its shape."""
+
+    def __init__(self, cache: KVCache, namespace: str, ttl: Optional[float] = None):
+        self.cache = cache
+        self.name = namespace
+        self.ttl = ttl
+
+    def __contains__(self, key: str) -> bool:
+        return self.cache.contains(self.name, key)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.cache.get(self.name, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.cache.set(self.name, key, value, self.ttl)
+
+    def get(self, key: str, default=None) -> Any:
+        return self.cache.get(self.name, key, default)
+
+    def __len__(self) -> int:
+        return self.cache.conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.name,)
+        ).fetchone()[0]
+
+
+def open_cache(path=DEFAULT_PATH, **kwargs) -> KVCache:
+    """Open the cache, seeding an empty one from the legacy JSON files."""
+    cache = KVCache(path, **kwargs)
+    if not len(cache):
+        cache.import_json(DATA_DIR / "nrk_about_cache.json", split_prefixed)
+        cache.import_json(DATA_DIR / "sceneweb_cache.json", lambda url: ("artwork", url))
+    return cache
+
+
+def split_prefixed(file_key: str) -> tuple[str, str]:
+    """Split "search:Ibsen" into ("search", "Ibsen")."""
+    namespace, _, key = file_key.partition(":")
+    return namespace, key
@@ -0,0 +1,463 @@
+"""Versioned schema and data migrations for the kulturperler database.
+
+Migrations are registered in order with @migration(version, name). Each runs
+in its own transaction and is recorded in schema_version with its duration,
+so upgrading a database only applies what it is missing.
+Every migration is idempotent: it probes the schema and only touches rows not
+yet migrated, so databases predating schema_version upgrade cleanly too.
+
+Replaces the one-off web/scripts/07-13 migration scripts.
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from .change_log import install_change_log
+from .db_schema import add_column, table_columns, table_exists
+from .grouping import (
+    UMBRELLA_SERIES,
+    extract_series_id,
+    install_performance_triggers,
+    refresh_performances,
+    regroup_performances,
+)
+from .integrity import ensure_integrity_indexes, remove_duplicates
+from .search_index import ensure_search_index
+from .titles import install_normalized_titles, normalize_title, register_title_functions, split_part
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+    doc: str = ""
+
+
+@dataclass
+class MigrationResult:
+    version: int
+    name: str
+    seconds: float
+    changes: int
+
+
+MIGRATIONS: list[Migration] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration. Versions must be unique and increasing."""
+    def register(func: Callable[[sqlite3.Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"migration {version} registered out of order")
+        MIGRATIONS.append(Migration(version, name, func, (func.__doc__ or "").strip()))
+        return func
+    return register
+
+
+# --- Runner ------------------------------------------------------------------
+
+def ensure_version_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL,
+            duration_ms REAL
+        )
+    """)
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    if not table_exists(conn, "schema_version"):
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def applied_versions(conn: sqlite3.Connection) -> set[int]:
+    if not table_exists(conn, "schema_version"):
+        return set()
+    return {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+
+def pending_migrations(conn: sqlite3.Connection, target: Optional[int] = None) -> list[Migration]:
+    applied = applied_versions(conn)
+    return [
+        m for m in MIGRATIONS
+        if m.version not in applied and (target is None or m.version <= target)
+    ]
+
+
+def run_migrations(
+    conn: sqlite3.Connection,
+    target: Optional[int] = None,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> list[MigrationResult]:
+    """Apply pending migrations in order, one transaction each.
+
+    A failing migration is rolled back and re-raised; earlier migrations stay
+    committed. With dry_run all pending migrations run in one
+    transaction that is rolled back at the end, which reports timing and row
+    counts without changing the database.
+
+    Afterwards an installed search index is reinstalled if the migrations
+    added columns it indexes.
+    """
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # explicit BEGIN/COMMIT below
+    conn.create_function("nrk_series_id", 1, extract_series_id, deterministic=True)
+    register_title_functions(conn)
+    results = []
+    try:
+        ensure_version_table(conn)
+        if dry_run:
+            conn.execute("BEGIN IMMEDIATE")
+        for m in pending_migrations(conn, target):
+            start = time.perf_counter()
+            changes_before = conn.total_changes
+            if not dry_run:
+                conn.execute("BEGIN IMMEDIATE")
+            try:
+                m.apply(conn)
+            except Exception:
+                conn.execute("ROLLBACK")
+                log(f"  {m.version:04d} {m.name}: FAILED, rolled back")
+                raise
+            seconds = time.perf_counter() - start
+            changes = conn.total_changes - changes_before
+
+            if not dry_run:
+                conn.execute(
+                    "INSERT INTO schema_version (version, name, applied_at, duration_ms) VALUES (?, ?, ?, ?)",
+                    (m.version, m.name, datetime.now().isoformat(timespec="seconds"), seconds * 1000),
+                )
+                conn.execute("COMMIT")
+
+            results.append(MigrationResult(m.version, m.name, seconds, changes))
+            log(f"  {m.version:04d} {m.name}: {changes} rows changed in {seconds * 1000:.1f} ms")
+        if dry_run and conn.in_transaction:
+            conn.execute("ROLLBACK")
+    finally:
+        conn.isolation_level = isolation_level
+    if results and not dry_run and ensure_search_index(conn):
+        log("  search index reinstalled for new columns")
+    return results
+
+
+# --- Migrations --------------------------------------------------------------
+
+@migration(1, "plays_work_columns")
+def plays_work_columns(conn):
+    """Add work_type and synopsis to plays."""
+    add_column(conn, "plays", "work_type", "TEXT DEFAULT 'play'")
+    add_column(conn, "plays", "synopsis", "TEXT")
+
+
+@migration(2, "episode_media_columns")
+def episode_media_columns(conn):
+    """Add part, medium, series and media_type columns to episodes."""
+    add_column(conn, "episodes", "part_number", "INTEGER")
+    add_column(conn, "episodes", "total_parts", "INTEGER")
+    add_column(conn, "episodes", "is_introduction", "INTEGER DEFAULT 0")
+    add_column(conn, "episodes", "parent_episode_id", "TEXT REFERENCES episodes(prf_id)")
+    add_column(conn, "episodes", "medium", "TEXT DEFAULT 'tv'")
+    add_column(conn, "episodes", "series_id", "TEXT")
+    added_media_type = add_column(conn, "episodes", "media_type", "TEXT DEFAULT 'episode'")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_medium ON episodes(medium)")
+
+    conn.execute("""
+        UPDATE episodes SET medium = 'radio'
+        WHERE medium = 'tv' AND (nrk_url LIKE '%radio.nrk.no%' OR prf_id LIKE 'MKRT%')
+    """)
+    conn.execute("""
+        UPDATE episodes SET series_id = nrk_series_id(nrk_url)
+        WHERE medium = 'radio' AND series_id IS NULL AND nrk_series_id(nrk_url) IS NOT NULL
+    """)
+    if added_media_type:
+        conn.execute("""
+            UPDATE episodes SET media_type = CASE
+                WHEN is_introduction = 1 THEN 'intro'
+                WHEN part_number IS NOT NULL THEN 'part'
+                ELSE 'episode'
+            END
+        """)
+
+
+@migration(3, "performances_schema")
+def performances_schema(conn):
+    """Create performances and performance_persons and link episodes to them."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS performances (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_id INTEGER REFERENCES plays(id),
+            source TEXT DEFAULT 'nrk',
+            year INTEGER,
+            title TEXT,
+            description TEXT,
+            venue TEXT,
+            total_duration INTEGER,
+            image_url TEXT,
+            medium TEXT DEFAULT 'tv',
+            series_id TEXT
+        )
+    """)
+    add_column(conn, "performances", "medium", "TEXT DEFAULT 'tv'")
+    add_column(conn, "performances", "series_id", "TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performances_work ON performances(work_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performances_year ON performances(year)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performances_medium ON performances(medium)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performances_series ON performances(series_id)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS performance_persons (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            performance_id INTEGER NOT NULL REFERENCES performances(id),
+            person_id INTEGER NOT NULL REFERENCES persons(id),
+            role TEXT,
+            character_name TEXT,
+            UNIQUE(performance_id, person_id, role, character_name)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performance_persons_perf ON performance_persons(performance_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performance_persons_person ON performance_persons(person_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_performance_persons_role ON performance_persons(role)")
+
+    add_column(conn, "episodes", "performance_id", "INTEGER REFERENCES performances(id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_episodes_performance ON episodes(performance_id)")
+
+    # Performances created before the medium column default to tv
+    conn.execute("""
+        UPDATE performances SET medium = 'radio'
+        WHERE medium = 'tv' AND id IN (
+            SELECT DISTINCT performance_id FROM episodes
+            WHERE medium = 'radio' AND performance_id IS NOT NULL
+        )
+    """)
+
+
+@migration(4, "group_unlinked_episodes")
+def group_unlinked_episodes(conn):
+    """Attach episodes without a performance to one, creating it if needed.
+
+    Radio episodes group by series (each episode of an umbrella series is its
+    own production), TV episodes by play and year, and TV episodes without a
+    play stand alone. Only unlinked episodes are touched.
+    """
+    rows = conn.execute("""
+        SELECT prf_id, title, description, year, duration_seconds, image_url,
+               play_id, medium, series_id
+        FROM episodes
+        WHERE performance_id IS NULL
+        ORDER BY prf_id
+    """).fetchall()
+    if not rows:
+        return
+
+    groups: dict[tuple, list] = {}
+    for row in rows:
+        prf_id, _, _, year, _, _, play_id, medium, series_id = row
+        if medium == "radio" and series_id and series_id not in UMBRELLA_SERIES:
+            key = ("series", series_id)
+        elif medium == "radio" and series_id:
+            key = ("series", f"{series_id}_{prf_id}")
+        elif play_id is not None:
+            key = ("play", play_id, year, medium)
+        else:
+            key = ("episode", prf_id)
+        groups.setdefault(key, []).append(row)
+
+    touched = set()
+    for key, members in groups.items():
+        perf_id = None
+        if key[0] == "series":
+            found = conn.execute(
+                "SELECT id FROM performances WHERE series_id = ? ORDER BY id LIMIT 1", (key[1],)
+            ).fetchone()
+            perf_id = found[0] if found else None
+        elif key[0] == "play":
+            found = conn.execute(
+                "SELECT id FROM performances WHERE work_id = ? AND year IS ? AND medium = ? ORDER BY id LIMIT 1",
+                key[1:],
+            ).fetchone()
+            perf_id = found[0] if found else None
+
+        if perf_id is None:
+            first = members[0]
+            title = first[1]
+            if key[0] == "play":
+                play = conn.execute("SELECT title FROM plays WHERE id = ?", (key[1],)).fetchone()
+                title = play[0] if play else title
+            image = next((m[5] for m in members if m[5]), None)
+            cursor = conn.execute(
+                """
+                INSERT INTO performances (work_id, source, year, title, description, image_url,
+                                          medium, series_id)
+                VALUES (?, 'nrk', ?, ?, ?, ?, ?, ?)
+                """,
+                (first[6], max((m[3] for m in members if m[3] is not None), default=None),
+                 title, first[2], image, first[7] or "tv",
+                 key[1] if key[0] == "series" else None),
+            )
+            perf_id = cursor.lastrowid
+
+        conn.executemany(
+            "UPDATE episodes SET performance_id = ? WHERE prf_id = ?",
+            [(perf_id, m[0]) for m in members],
+        )
+        touched.add(perf_id)
+
+    conn.execute("CREATE TEMP TABLE _touched_performances (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO _touched_performances (id) VALUES (?)", [(i,) for i in touched])
+    conn.execute("""
+        UPDATE performances SET total_duration = (
+            SELECT SUM(duration_seconds) FROM episodes WHERE performance_id = performances.id
+        )
+        WHERE id IN (SELECT id FROM _touched_performances)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO performance_persons (performance_id, person_id, role, character_name)
+        SELECT DISTINCT e.performance_id, ep.person_id, ep.role, ep.character_name
+        FROM episode_persons ep
+        JOIN episodes e ON ep.episode_id = e.prf_id
+        WHERE e.performance_id IN (SELECT id FROM _touched_performances)
+    """)
+    conn.execute("DROP TABLE _touched_performances")
+
+
+@migration(5, "link_performances_to_plays")
+def link_performances_to_plays(conn):
+    """Link unlinked performances to an existing play with the same title.
+
+    The old bootstrap also created a play for every remaining title; plays
+    now come from the import and matching pipeline, so none are created here.
+    """
+    plays = {}
+    for play_id, title in conn.execute("SELECT id, title FROM plays ORDER BY id"):
+        plays.setdefault(normalize_title(title), play_id)
+
+    updates = []
+    for perf_id, title in conn.execute(
+        "SELECT id, title FROM performances WHERE work_id IS NULL AND title IS NOT NULL"
+    ):
+        play_id = plays.get(normalize_title(title))
+        if play_id is not None:
+            updates.append((play_id, perf_id))
+    conn.executemany("UPDATE performances SET work_id = ? WHERE id = ?", updates)
+
+    conn.execute("""
+        UPDATE episodes SET play_id = (
+            SELECT p.work_id FROM performances p WHERE p.id = episodes.performance_id
+        )
+        WHERE play_id IS NULL AND performance_id IN (
+            SELECT id FROM performances WHERE work_id IS NOT NULL
+        )
+    """)
+
+
+@migration(6, "merge_multipart_performances")
+def merge_multipart_performances(conn):
+    """Merge per-part performances ("Peer Gynt 1:2", "Peer Gynt 2:2") into one."""
+    groups: dict[tuple, list] = {}
+    for perf_id, title, year, medium in conn.execute(
+        "SELECT id, title, year, medium FROM performances WHERE title IS NOT NULL"
+    ):
+        base_title, had_part = split_part(title)
+        if had_part:
+            groups.setdefault((base_title, year, medium), []).append((title, perf_id))
+
+    conn.execute("CREATE TEMP TABLE _perf_merge (loser INTEGER PRIMARY KEY, winner INTEGER NOT NULL)")
+    for (base_title, _, _), parts in groups.items():
+        if len(parts) < 2:
+            continue
+        parts.sort()
+        winner = parts[0][1]
+        conn.execute("UPDATE performances SET title = ? WHERE id = ?", (base_title, winner))
+        conn.executemany(
+            "INSERT INTO _perf_merge (loser, winner) VALUES (?, ?)",
+            [(perf_id, winner) for _, perf_id in parts[1:]],
+        )
+
+    conn.execute("""
+        UPDATE episodes SET performance_id = (
+            SELECT winner FROM _perf_merge WHERE loser = episodes.performance_id
+        )
+        WHERE performance_id IN (SELECT loser FROM _perf_merge)
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO performance_persons (performance_id, person_id, role, character_name)
+        SELECT m.winner, pp.person_id, pp.role, pp.character_name
+        FROM performance_persons pp
+        JOIN _perf_merge m ON m.loser = pp.performance_id
+    """)
+    conn.execute("DELETE FROM performance_persons WHERE performance_id IN (SELECT loser FROM _perf_merge)")
+    conn.execute("DELETE FROM performances WHERE id IN (SELECT loser FROM _perf_merge)")
+    conn.execute("""
+        UPDATE performances SET total_duration = (
+            SELECT SUM(duration_seconds) FROM episodes WHERE performance_id = performances.id
+        )
+        WHERE id IN (SELECT winner FROM _perf_merge)
+    """)
+    conn.execute("DROP TABLE _perf_merge")
+
+    # Plays titled with a part suffix: fold into the base-titled play or rename
+    for play_id, title in conn.execute("SELECT id, title FROM plays").fetchall():
+        base_title, had_part = split_part(title)
+        if not had_part:
+            continue
+        existing = conn.execute(
+            "SELECT id FROM plays WHERE title = ? AND id != ?", (base_title, play_id)
+        ).fetchone()
+        if existing:
+            conn.execute("UPDATE performances SET work_id = ? WHERE work_id = ?", (existing[0], play_id))
+            conn.execute("UPDATE episodes SET play_id = ? WHERE play_id = ?", (existing[0], play_id))
+            conn.execute("DELETE FROM plays WHERE id = ?", (play_id,))
+        else:
+            conn.execute("UPDATE plays SET title = ? WHERE id = ?", (base_title, play_id))
+
+
+@migration(7, "normalized_titles")
+def normalized_titles(conn):
+    """Add indexed normalized_title columns to plays, performances and episodes."""
+    install_normalized_titles(conn)
+
+
+@migration(8, "regroup_performances")
+def regroup_episodes(conn):
+    """Regroup all episodes in one pass (series, part titles, prf_id families, play and year)."""
+    regroup_performances(conn)
+
+
+@migration(9, "performance_triggers")
+def performance_triggers(conn):
+    """Mark performances stale when their episodes change, then refresh them all once."""
+    install_performance_triggers(conn)
+    refresh_performances(conn, [row[0] for row in conn.execute("SELECT id FROM performances")])
+
+
+@migration(10, "change_log")
+def change_log(conn):
+    """Log changed episodes, plays and persons for incremental audits."""
+    install_change_log(conn)
+
+
+@migration(11, "integrity_indexes")
+def integrity_indexes(conn):
+    """Drop duplicate junction rows, then index every foreign key and junction key."""
+    remove_duplicates(conn)
+    ensure_integrity_indexes(conn)
+
+
+@migration(12, "normalized_title_triggers")
+def normalized_title_triggers(conn):
+    """Compute normalized_title in triggers on insert and title change."""
+    install_normalized_titles(conn)
+
+
+@migration(13, "playwright_log_triggers")
+def playwright_log_triggers(conn):
+    """Log the playwright when a play is inserted or deleted."""
+    install_change_log(conn)
@@ -0,0 +1,152 @@
+"""Set-based bulk merge of duplicate persons.
+
+merge_persons_bulk() takes (loser_id, winner_id) pairs, loads them into a
+temporary mapping table and rewrites every table that references persons
+with one UPDATE each, so thousands of merges cost a handful of statements in
+a single transaction. Rows that become duplicates after the rewrite are
+collapsed, empty attributes on the winner are filled from its losers, and the
+losers are deleted.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from .db_schema import table_columns, table_exists
+
+
+# (table, person column, columns that together with the person identify a row)
+REFERENCES = [
+    ("episode_persons", "person_id", ("episode_id", "role", "character_name")),
+    ("performance_persons", "person_id", ("performance_id", "role", "character_name")),
+    ("external_performance_persons", "person_id", ("performance_id", "role")),
+    ("person_resources", "person_id", ("resource_id",)),
+    ("nrk_about_programs", "person_id", None),
+    ("plays", "playwright_id", None),
+]
+
+# Person attributes a winner inherits from a loser when its own is empty
+COALESCE_COLUMNS = [
+    "normalized_name", "birth_year", "death_year", "nationality", "wikidata_id",
+    "sceneweb_id", "sceneweb_url", "wikipedia_url", "bio", "image_url",
+]
+
+
+@dataclass
+class MergeResult:
+    merged: int = 0
+    rewritten: dict[str, int] = field(default_factory=dict)
+    collapsed: dict[str, int] = field(default_factory=dict)
+    filled: dict[str, int] = field(default_factory=dict)
+
+
+def resolve_mapping(pairs: Iterable[tuple[int, int]]) -> dict[int, int]:
+    """Map every loser to its final winner, following chains (a -> b -> c).
+
+    Raises ValueError on a cycle.
+    """
+    mapping = {}
+    for loser, winner in pairs:
+        if loser != winner:
+            mapping[loser] = winner
+    resolved = {}
+    for loser in mapping:
+        seen = {loser}
+        winner = mapping[loser]
+        while winner in mapping:
+            if winner in seen:
+                raise ValueError(f"merge cycle through person {winner}")
+            seen.add(winner)
+            winner = mapping[winner]
+        resolved[loser] = winner
+    return resolved
+
+
+def merge_persons_bulk(conn: sqlite3.Connection, pairs: Iterable[tuple[int, int]]) -> MergeResult:
+    """Merge each loser into its winner in one transaction.
+
+    pairs are (loser_id, winner_id); chains are followed, so a cluster can be
+    given as any spanning set of pairs. Losers that do not exist are ignored.
+    Raises ValueError before anything is written on a cycle or on a winner
+    that is not in persons, since its losers' rows would be orphaned.
+    """
+    mapping = resolve_mapping(pairs)
+    result = MergeResult()
+    if not mapping:
+        return result
+
+    missing = [row[0] for row in conn.execute(
+        "SELECT value FROM json_each(?) WHERE value NOT IN (SELECT id FROM persons) ORDER BY value",
+        (json.dumps(sorted(set(mapping.values()))),),
+    )]
+    if missing:
+        shown = ", ".join(str(pid) for pid in missing[:10])
+        raise ValueError(f"{len(missing)} merge winners not in persons: {shown}")
+
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS temp._person_merge")
+        conn.execute("CREATE TEMP TABLE _person_merge (loser INTEGER PRIMARY KEY, winner INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO _person_merge (loser, winner) VALUES (?, ?)", mapping.items())
+        conn.execute("DELETE FROM _person_merge WHERE loser NOT IN (SELECT id FROM persons)")
+
+        for table, column, key in REFERENCES:
+            if not table_exists(conn, table):
+                continue
+            # OR IGNORE skips rows that would hit a unique key; they are deleted below
+            cursor = conn.execute(f"""
+                UPDATE OR IGNORE {table}
+                SET {column} = (SELECT winner FROM _person_merge WHERE loser = {table}.{column})
+                WHERE {column} IN (SELECT loser FROM _person_merge)
+            """)
+            result.rewritten[table] = cursor.rowcount
+            collapsed = conn.execute(
+                f"DELETE FROM {table} WHERE {column} IN (SELECT loser FROM _person_merge)"
+            ).rowcount
+            if key:
+                # Unique keys don't catch rows differing only by NULLs
+                collapsed += conn.execute(f"""
+                    DELETE FROM {table}
+                    WHERE {column} IN (SELECT winner FROM _person_merge)
+                      AND rowid NOT IN (
+                          SELECT MIN(rowid) FROM {table}
+                          WHERE {column} IN (SELECT winner FROM _person_merge)
+                          GROUP BY {column}, {", ".join(key)}
+                      )
+                """).rowcount
+            if collapsed:
+                result.collapsed[table] = collapsed
+
+        columns = table_columns(conn, "persons")
+        for column in COALESCE_COLUMNS:
+            if column not in columns:
+                continue
+            # Longest value wins for free text, lowest loser id otherwise
+            order = "LENGTH(l.bio) DESC, m.loser" if column == "bio" else "m.loser"
+            cursor = conn.execute(f"""
+                UPDATE persons SET {column} = (
+                    SELECT l.{column} FROM _person_merge m
+                    JOIN persons l ON l.id = m.loser
+                    WHERE m.winner = persons.id AND l.{column} IS NOT NULL AND l.{column} != ''
+                    ORDER BY {order}
+                    LIMIT 1
+                )
+                WHERE id IN (SELECT winner FROM _person_merge)
+                  AND ({column} IS NULL OR {column} = '')
+                  AND EXISTS (
+                      SELECT 1 FROM _person_merge m JOIN persons l ON l.id = m.loser
+                      WHERE m.winner = persons.id AND l.{column} IS NOT NULL AND l.{column} != ''
+                  )
+            """)
+            if cursor.rowcount:
+                result.filled[column] = cursor.rowcount
+
+        if table_exists(conn, "person_clusters"):
+            conn.execute("DELETE FROM person_clusters WHERE person_id IN (SELECT loser FROM _person_merge)")
+
+        result.merged = conn.execute(
+            "DELETE FROM persons WHERE id IN (SELECT loser FROM _person_merge)"
+        ).rowcount
+        conn.execute("DROP TABLE _person_merge")
+
+    return result
@@ -0,0 +1,314 @@
+"""Entity resolution for duplicate persons.
+
+Candidates are blocked by surname key, initial + surname, surname prefix,
+token-sorted name and shared wikidata/sceneweb IDs, and never compared when
+both birth years are known and further apart than the window. Pairs are
+scored on folded-name similarity, external IDs and co-occurring works.
+Only pairs backed by a shared wikidata/sceneweb ID, or an identical name
+with the same birth year, reach the automatic threshold; the rest are left
+for review. Accepted pairs are clustered with union-find, which refuses any
+union that would put two persons marked different in one cluster. Clusters
+and manual same/different decisions are persisted so a merge step can act
+on them.
+"""
+
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Optional
+
+from .union_find import UnionFind
+
+
+AUTO_THRESHOLD = 0.92    # pairs at or above are clustered automatically
+REVIEW_THRESHOLD = 0.80  # pairs at or above are kept for review
+REVIEW_CAP = 0.91        # highest score for a pair without corroborating evidence
+EXACT_NAME = 0.97        # same name tokens, possibly reordered
+BIRTH_YEAR_WINDOW = 2
+MAX_BLOCK_SIZE = 1000    # larger blocks are skipped; narrower keys still cover them
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS person_match_decisions (
+    person_a INTEGER NOT NULL,
+    person_b INTEGER NOT NULL,
+    decision TEXT NOT NULL CHECK (decision IN ('same', 'different')),
+    note TEXT,
+    decided_at TEXT,
+    PRIMARY KEY (person_a, person_b)
+);
+
+CREATE TABLE IF NOT EXISTS person_match_pairs (
+    person_a INTEGER NOT NULL,
+    person_b INTEGER NOT NULL,
+    score REAL NOT NULL,
+    reasons TEXT,
+    PRIMARY KEY (person_a, person_b)
+);
+
+CREATE TABLE IF NOT EXISTS person_clusters (
+    person_id INTEGER PRIMARY KEY,
+    cluster_id INTEGER NOT NULL,
+    winner_id INTEGER NOT NULL,
+    confidence REAL,
+    resolved_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_person_clusters_winner ON person_clusters(winner_id);
+"""
+
+FOLD = str.maketrans({"ø": "o", "æ": "ae", "ß": "ss", "ð": "d", "þ": "th", "ł": "l"})
+NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+@dataclass
+class PersonRecord:
+    id: int
+    name: str
+    tokens: list[str]
+    birth_year: Optional[int] = None
+    wikidata_id: Optional[str] = None
+    sceneweb_id: Optional[int] = None
+    works: set = field(default_factory=set)
+    references: int = 0
+
+
+@dataclass
+class PairScore:
+    a: int
+    b: int
+    score: float
+    reasons: list[str]
+
+
+def name_tokens(name: str) -> list[str]:
+    """Lowercase, diacritic-free name tokens ("Lars Norén" -> ["lars", "noren"])."""
+    text = (name or "").lower().replace("aa", "å").translate(FOLD)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = NON_WORD_RE.sub(" ", text)
+    return text.split()
+
+
+def blocking_keys(person: PersonRecord) -> set[tuple]:
+    keys = set()
+    tokens = person.tokens
+    if tokens:
+        surname = tokens[-1]
+        keys.add(("surname", surname))
+        keys.add(("initial", tokens[0][0], surname))
+        keys.add(("prefix", tokens[0][0], surname[:4]))
+        keys.add(("sorted", " ".join(sorted(tokens))))
+    if person.wikidata_id:
+        keys.add(("wikidata", person.wikidata_id))
+    if person.sceneweb_id:
+        keys.add(("sceneweb", person.sceneweb_id))
+    return keys
+
+
+def _ratio(a: str, b: str, floor: float = 0.0) -> float:
+    """SequenceMatcher ratio, skipping the full computation when it can't reach floor."""
+    matcher = SequenceMatcher(None, a, b)
+    if matcher.real_quick_ratio() < floor or matcher.quick_ratio() < floor:
+        return 0.0
+    return matcher.ratio()
+
+
+def name_similarity(a: list[str], b: list[str]) -> float:
+    """Similarity of two folded names; only identical names can reach auto-merge."""
+    if a == b:
+        return 1.0
+    if sorted(a) == sorted(b):
+        return EXACT_NAME
+    if a and b and a[-1] == b[-1]:
+        given_a, given_b = a[:-1], b[:-1]
+        if not given_a or not given_b:
+            return 0.85
+        # "H. Ibsen" / "Henrik Ibsen": initials agree with the full given names
+        if len(given_a) == len(given_b) and all(
+            x == y or (len(x) == 1 and y.startswith(x)) or (len(y) == 1 and x.startswith(y))
+            for x, y in zip(given_a, given_b)
+        ):
+            return REVIEW_CAP
+        # "Ingar" / "Inger", "Sven" / "Svein" are often different people
+        return min(REVIEW_CAP, 0.3 + 0.7 * _ratio(" ".join(given_a), " ".join(given_b)))
+    # Different surnames ("Lund" / "Lunde") never auto-merge on the name alone
+    return min(0.9, _ratio(" ".join(a), " ".join(b), REVIEW_THRESHOLD - 0.1))
+
+
+def score_pair(a: PersonRecord, b: PersonRecord) -> Optional[PairScore]:
+    """Score two persons, or None when they cannot be the same person."""
+    if a.wikidata_id and b.wikidata_id and a.wikidata_id != b.wikidata_id:
+        return None
+    if a.sceneweb_id and b.sceneweb_id and a.sceneweb_id != b.sceneweb_id:
+        return None
+    if a.birth_year and b.birth_year and abs(a.birth_year - b.birth_year) > BIRTH_YEAR_WINDOW:
+        return None
+
+    similarity = name_similarity(a.tokens, b.tokens)
+    score = similarity
+    reasons = [f"name {similarity:.2f}"]
+
+    corroborated = False
+    if a.wikidata_id and a.wikidata_id == b.wikidata_id:
+        score = max(score, 1.0)
+        reasons.append("wikidata")
+        corroborated = True
+    if a.sceneweb_id and a.sceneweb_id == b.sceneweb_id:
+        score = max(score, 1.0)
+        reasons.append("sceneweb")
+        corroborated = True
+    if a.birth_year and a.birth_year == b.birth_year:
+        score += 0.03
+        reasons.append("birth year")
+        corroborated = corroborated or similarity >= EXACT_NAME
+    shared = len(a.works & b.works)
+    if shared:
+        score += min(0.06, 0.03 * shared)
+        reasons.append(f"{shared} shared works")
+
+    # Two "Per Hansen" with nothing else in common are left for review
+    if not corroborated:
+        score = min(score, REVIEW_CAP)
+
+    return PairScore(min(a.id, b.id), max(a.id, b.id), round(min(score, 1.0), 4), reasons)
+
+
+def load_persons(conn: sqlite3.Connection) -> dict[int, PersonRecord]:
+    """Persons with the plays they are connected to and their reference counts."""
+    persons = {}
+    for pid, name, birth_year, wikidata_id, sceneweb_id in conn.execute(
+        "SELECT id, name, birth_year, wikidata_id, sceneweb_id FROM persons"
+    ):
+        persons[pid] = PersonRecord(pid, name, name_tokens(name), birth_year, wikidata_id, sceneweb_id)
+
+    work_queries = [
+        "SELECT playwright_id, id FROM plays WHERE playwright_id IS NOT NULL",
+        """SELECT ep.person_id, e.play_id FROM episode_persons ep
+           JOIN episodes e ON e.prf_id = ep.episode_id WHERE e.play_id IS NOT NULL""",
+        """SELECT pp.person_id, p.work_id FROM performance_persons pp
+           JOIN performances p ON p.id = pp.performance_id WHERE p.work_id IS NOT NULL""",
+    ]
+    for sql in work_queries:
+        try:
+            rows = conn.execute(sql).fetchall()
+        except sqlite3.OperationalError:
+            continue  # table not present in this database
+        for person_id, play_id in rows:
+            person = persons.get(person_id)
+            if person is not None:
+                person.works.add(play_id)
+                person.references += 1
+    return persons
+
+
+def candidate_pairs(persons: dict[int, PersonRecord]) -> set[tuple[int, int]]:
+    blocks = defaultdict(list)
+    for person in persons.values():
+        for key in blocking_keys(person):
+            blocks[key].append(person.id)
+
+    pairs = set()
+    for members in blocks.values():
+        if 1 < len(members) <= MAX_BLOCK_SIZE:
+            pairs.update(combinations(sorted(members), 2))
+    return pairs
+
+
+def load_decisions(conn: sqlite3.Connection) -> dict[tuple[int, int], str]:
+    conn.executescript(SCHEMA)
+    return {
+        (a, b): decision
+        for a, b, decision in conn.execute("SELECT person_a, person_b, decision FROM person_match_decisions")
+    }
+
+
+def record_decision(conn: sqlite3.Connection, a: int, b: int, decision: str, note: str = ""):
+    """Persist a manual same/different decision for a pair of persons."""
+    conn.executescript(SCHEMA)
+    conn.execute(
+        """
+        INSERT INTO person_match_decisions (person_a, person_b, decision, note, decided_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (person_a, person_b) DO UPDATE SET
+            decision = excluded.decision, note = excluded.note, decided_at = excluded.decided_at
+        """,
+        (min(a, b), max(a, b), decision, note, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def resolve_persons(conn: sqlite3.Connection) -> dict:
+    """Score candidate pairs, cluster duplicates and persist the result.
+
+    Replaces person_match_pairs and person_clusters in one transaction.
+    Returns counts and timings for reporting.
+    """
+    start = time.perf_counter()
+    decisions = load_decisions(conn)
+    persons = load_persons(conn)
+    pairs = candidate_pairs(persons)
+
+    scored: list[PairScore] = []
+    for a, b in pairs:
+        result = score_pair(persons[a], persons[b])
+        if result is not None and result.score >= REVIEW_THRESHOLD:
+            scored.append(result)
+
+    # Manual decisions first, then the strongest pairs, so a weak link can't
+    # pull a cluster together that a stronger one or a decision keeps apart
+    uf = UnionFind(pair for pair, decision in decisions.items() if decision == "different")
+    confidence = {}
+    blocked = 0
+    for (a, b), decision in sorted(decisions.items()):
+        if decision == "same" and a in persons and b in persons:
+            if uf.union(a, b):
+                confidence[(a, b)] = 1.0
+            else:
+                blocked += 1
+    for pair in sorted(scored, key=lambda p: (-p.score, p.a, p.b)):
+        if pair.score < AUTO_THRESHOLD:
+            break
+        if uf.union(pair.a, pair.b):
+            confidence[(pair.a, pair.b)] = pair.score
+        else:
+            blocked += 1
+
+    clusters = [members for members in uf.groups().values() if len(members) > 1]
+    now = datetime.now().isoformat(timespec="seconds")
+    cluster_rows = []
+    for members in clusters:
+        # Keep the best-connected record; the oldest on ties
+        winner = max(members, key=lambda pid: (persons[pid].references, -pid))
+        member_set = set(members)
+        scores = [s for (a, b), s in confidence.items() if a in member_set]
+        cluster_id = min(members)
+        for pid in members:
+            cluster_rows.append((pid, cluster_id, winner, min(scores) if scores else None, now))
+
+    with conn:
+        conn.execute("DELETE FROM person_match_pairs")
+        conn.executemany(
+            "INSERT INTO person_match_pairs (person_a, person_b, score, reasons) VALUES (?, ?, ?, ?)",
+            [(p.a, p.b, p.score, ", ".join(p.reasons)) for p in scored],
+        )
+        conn.execute("DELETE FROM person_clusters")
+        conn.executemany(
+            "INSERT INTO person_clusters (person_id, cluster_id, winner_id, confidence, resolved_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            cluster_rows,
+        )
+
+    return {
+        "persons": len(persons),
+        "candidate_pairs": len(pairs),
+        "scored_pairs": len(scored),
+        "review_pairs": sum(1 for p in scored if p.score < AUTO_THRESHOLD),
+        "clusters": len(clusters),
+        "duplicates": sum(len(c) - 1 for c in clusters),
+        "blocked": blocked,
+        "seconds": time.perf_counter() - start,
+    }
@@ -0,0 +1,212 @@
+"""Reachability garbage collection over the whole entity graph.
+
+Content roots (episodes, external performances, NRK programs about persons
+and performances from other sources than NRK) are always live. Every other
+entity is live only if a live row refers to it: a play through an episode,
+a performance, an external performance or a link to another platform; a
+person through credits, playwright links or NRK programs; a resource or tag
+through a live owner.
+
+mark_live() computes the live set of each entity in GRAPH order as a temp
+table keyed by id (see live_table()). collect_garbage() finds the dead rows
+with one anti-join each and, with apply=True, deletes them together with the
+rows they own (credits, tags, links), all in the caller's transaction.
+Other reports (e.g. orphaned persons in audit_persons.py) read the same live
+sets, so they agree with what a cleanup would delete.
+"""
+
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from .db_schema import table_exists
+
+
+@dataclass(frozen=True)
+class Reference:
+    """Rows of table whose column points at the entity, counted when owner_column is live in owner.
+
+    Without an owner the rows are content themselves and always count.
+    """
+    table: str
+    column: str
+    owner: Optional[str] = None
+    owner_column: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Entity:
+    table: str
+    key: str = "id"
+    root: Optional[str] = None              # SQL condition for rows that are always live
+    references: tuple[Reference, ...] = ()
+    owns: tuple[tuple[str, str], ...] = ()  # (table, column) rows deleted with a dead row
+
+
+ALWAYS = "1"
+
+# Owners come before what they refer to
+GRAPH = [
+    Entity("episodes", "prf_id", root=ALWAYS),
+    Entity("external_performances", root=ALWAYS),
+    Entity("nrk_about_programs", root=ALWAYS),
+    Entity(
+        "performances",
+        root="source IS NOT 'nrk'",
+        references=(Reference("episodes", "performance_id", "episodes", "prf_id"),),
+        owns=(("performance_persons", "performance_id"),),
+    ),
+    Entity(
+        "plays",
+        references=(
+            Reference("episodes", "play_id", "episodes", "prf_id"),
+            Reference("performances", "work_id", "performances", "id"),
+            Reference("external_performances", "play_id", "external_performances", "id"),
+            # Plays listed only for their links to other platforms
+            Reference("play_external_links", "play_id"),
+        ),
+        owns=(("play_tags", "play_id"), ("play_resources", "play_id")),
+    ),
+    Entity(
+        "persons",
+        references=(
+            Reference("episode_persons", "person_id", "episodes", "episode_id"),
+            Reference("performance_persons", "person_id", "performances", "performance_id"),
+            Reference("external_performance_persons", "person_id", "external_performances", "performance_id"),
+            Reference("nrk_about_programs", "person_id", "nrk_about_programs", "id"),
+            Reference("plays", "playwright_id", "plays", "id"),
+        ),
+        owns=(
+            ("person_resources", "person_id"),
+            ("person_clusters", "person_id"),
+            ("person_match_pairs", "person_a"),
+            ("person_match_pairs", "person_b"),
+        ),
+    ),
+    Entity(
+        "external_resources",
+        references=(
+            Reference("episode_resources", "resource_id", "episodes", "episode_id"),
+            Reference("play_resources", "resource_id", "plays", "play_id"),
+            Reference("person_resources", "resource_id", "persons", "person_id"),
+        ),
+    ),
+    Entity(
+        "tags",
+        references=(
+            Reference("episode_tags", "tag_id", "episodes", "episode_id"),
+            Reference("play_tags", "tag_id", "plays", "play_id"),
+        ),
+    ),
+]
+
+SAMPLE_SIZE = 20
+
+
+@dataclass
+class EntityResult:
+    table: str
+    live: int
+    dead: int
+    deleted: int = 0
+    owned_deleted: dict[str, int] = field(default_factory=dict)
+    sample: list = field(default_factory=list)
+
+
+@dataclass
+class GCReport:
+    started_at: str
+    apply: bool
+    results: list[EntityResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def dead(self) -> int:
+        return sum(r.dead for r in self.results)
+
+    @property
+    def deleted(self) -> int:
+        return sum(r.deleted for r in self.results)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "apply": self.apply,
+            "seconds": round(self.seconds, 4),
+            "dead": self.dead,
+            "deleted": self.deleted,
+            "entities": [asdict(r) for r in self.results],
+        }
+
+
+def live_table(table: str) -> str:
+    """Temp table holding the live keys of table after mark_live()."""
+    return f"_live_{table}"
+
+
+def _mark_live(conn: sqlite3.Connection, entity: Entity):
+    live = live_table(entity.table)
+    conn.execute(f"DROP TABLE IF EXISTS temp.{live}")
+    # Untyped key: prf_id strings and integer ids compare as stored
+    conn.execute(f"CREATE TEMP TABLE {live} (id PRIMARY KEY) WITHOUT ROWID")
+    if entity.root:
+        conn.execute(f"INSERT INTO {live} SELECT {entity.key} FROM {entity.table} WHERE {entity.root}")
+    for ref in entity.references:
+        if not table_exists(conn, ref.table):
+            continue
+        owned = f"AND r.{ref.owner_column} IN (SELECT id FROM {live_table(ref.owner)})" if ref.owner else ""
+        conn.execute(f"""
+            INSERT OR IGNORE INTO {live}
+            SELECT r.{ref.column} FROM {ref.table} r
+            WHERE r.{ref.column} IS NOT NULL {owned}
+        """)
+
+
+def mark_live(conn: sqlite3.Connection) -> list[Entity]:
+    """Fill the live table of every entity; returns the entities whose table exists.
+
+    Runs in the caller's transaction, begun here if needed.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    entities = [entity for entity in GRAPH if table_exists(conn, entity.table)]
+    for entity in GRAPH:
+        # A missing table gets an empty live set, so references through it keep nothing alive
+        _mark_live(conn, entity if entity in entities else Entity(entity.table))
+    return entities
+
+
+def collect_garbage(conn: sqlite3.Connection, apply: bool = False) -> GCReport:
+    """Find (and with apply=True delete) unreachable rows of every entity.
+
+    Runs in the caller's transaction, begun here if needed.
+    """
+    report = GCReport(started_at=datetime.now().isoformat(timespec="seconds"), apply=apply)
+    start = time.perf_counter()
+    entities = mark_live(conn)
+
+    for entity in entities:
+        if entity.root == ALWAYS:
+            continue
+        live = live_table(entity.table)
+        dead = f"SELECT {entity.key} FROM {entity.table} WHERE {entity.key} NOT IN (SELECT id FROM {live})"
+        total = conn.execute(f"SELECT COUNT(*) FROM {entity.table}").fetchone()[0]
+        dead_count = conn.execute(f"SELECT COUNT(*) FROM ({dead})").fetchone()[0]
+        result = EntityResult(entity.table, live=total - dead_count, dead=dead_count)
+        if result.dead:
+            result.sample = [row[0] for row in conn.execute(f"{dead} ORDER BY {entity.key} LIMIT ?", (SAMPLE_SIZE,))]
+        if apply and result.dead:
+            for table, column in entity.owns:
+                if table_exists(conn, table):
+                    removed = conn.execute(f"DELETE FROM {table} WHERE {column} IN ({dead})").rowcount
+                    if removed:
+                        result.owned_deleted[f"{table}.{column}"] = removed
+            result.deleted = conn.execute(
+                f"DELETE FROM {entity.table} WHERE {entity.key} NOT IN (SELECT id FROM {live})"
+            ).rowcount
+        report.results.append(result)
+
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,202 @@
+"""Denormalized read tables for the web listing queries.
+
+The web app runs in sql.js, where every multi-way join and GROUP BY is
+recomputed in WASM on each filter change. These mv_* tables precompute the
+joins and counts once per data change, with covering indexes for the orderings
+and filters db.ts uses, so listing queries become plain indexed scans.
+"""
+
+import sqlite3
+
+
+READ_TABLES = {
+    "mv_performances": """
+        CREATE TABLE mv_performances (
+            id INTEGER PRIMARY KEY,
+            work_id INTEGER,
+            source TEXT,
+            year INTEGER,
+            title TEXT,
+            description TEXT,
+            venue TEXT,
+            total_duration INTEGER,
+            image_url TEXT,
+            medium TEXT,
+            work_title TEXT,
+            playwright_id INTEGER,
+            playwright_name TEXT,
+            director_name TEXT,
+            director_names TEXT,
+            media_count INTEGER NOT NULL
+        )
+    """,
+    "mv_plays": """
+        CREATE TABLE mv_plays (
+            id INTEGER PRIMARY KEY,
+            title TEXT,
+            original_title TEXT,
+            year_written INTEGER,
+            playwright_id INTEGER,
+            playwright_name TEXT,
+            performance_count INTEGER NOT NULL,
+            episode_count INTEGER NOT NULL
+        )
+    """,
+    "mv_playwrights": """
+        CREATE TABLE mv_playwrights (
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            normalized_name TEXT,
+            birth_year INTEGER,
+            death_year INTEGER,
+            nationality TEXT,
+            play_count INTEGER NOT NULL,
+            performance_count INTEGER NOT NULL,
+            episode_play_count INTEGER NOT NULL,
+            episode_count INTEGER NOT NULL
+        )
+    """,
+}
+
+POPULATE = [
+    """
+    INSERT INTO mv_performances
+    WITH ranked AS (
+        SELECT
+            performance_id,
+            image_url,
+            COUNT(*) OVER (PARTITION BY performance_id) AS media_count,
+            ROW_NUMBER() OVER (
+                PARTITION BY performance_id ORDER BY image_url IS NULL, prf_id
+            ) AS position
+        FROM episodes
+        WHERE performance_id IS NOT NULL
+    ),
+    media AS (
+        SELECT performance_id, media_count, image_url
+        FROM ranked
+        WHERE position = 1
+    ),
+    directors AS (
+        SELECT
+            performance_id,
+            MIN(name) AS director_name,
+            GROUP_CONCAT(name, ', ') AS director_names
+        FROM (
+            SELECT DISTINCT pp.performance_id, p.name
+            FROM performance_persons pp
+            JOIN persons p ON p.id = pp.person_id
+            WHERE pp.role = 'director'
+            ORDER BY pp.performance_id, p.name
+        )
+        GROUP BY performance_id
+    )
+    SELECT
+        perf.id,
+        perf.work_id,
+        perf.source,
+        perf.year,
+        perf.title,
+        perf.description,
+        perf.venue,
+        perf.total_duration,
+        COALESCE(media.image_url, perf.image_url),
+        perf.medium,
+        w.title,
+        w.playwright_id,
+        playwright.name,
+        directors.director_name,
+        directors.director_names,
+        COALESCE(media.media_count, 0)
+    FROM performances perf
+    LEFT JOIN plays w ON perf.work_id = w.id
+    LEFT JOIN persons playwright ON w.playwright_id = playwright.id
+    LEFT JOIN media ON media.performance_id = perf.id
+    LEFT JOIN directors ON directors.performance_id = perf.id
+    """,
+    """
+    INSERT INTO mv_plays
+    SELECT
+        pl.id,
+        pl.title,
+        pl.original_title,
+        pl.year_written,
+        pl.playwright_id,
+        playwright.name,
+        COUNT(*),
+        SUM(perf.media_count)
+    FROM plays pl
+    JOIN mv_performances perf ON perf.work_id = pl.id
+    LEFT JOIN persons playwright ON pl.playwright_id = playwright.id
+    GROUP BY pl.id
+    """,
+    """
+    INSERT INTO mv_playwrights
+    WITH play_episodes AS (
+        SELECT play_id, COUNT(*) AS episode_count
+        FROM episodes
+        WHERE play_id IS NOT NULL
+        GROUP BY play_id
+    ),
+    per_playwright AS (
+        SELECT
+            pl.playwright_id,
+            COUNT(mp.id) AS play_count,
+            COALESCE(SUM(mp.performance_count), 0) AS performance_count,
+            COUNT(pe.play_id) AS episode_play_count,
+            COALESCE(SUM(pe.episode_count), 0) AS episode_count
+        FROM plays pl
+        LEFT JOIN mv_plays mp ON mp.id = pl.id
+        LEFT JOIN play_episodes pe ON pe.play_id = pl.id
+        WHERE pl.playwright_id IS NOT NULL
+        GROUP BY pl.playwright_id
+    )
+    SELECT
+        p.id,
+        p.name,
+        p.normalized_name,
+        p.birth_year,
+        p.death_year,
+        p.nationality,
+        c.play_count,
+        c.performance_count,
+        c.episode_play_count,
+        c.episode_count
+    FROM per_playwright c
+    JOIN persons p ON p.id = c.playwright_id
+    WHERE c.play_count > 0 OR c.episode_count > 0
+    """,
+]
+
+# Covering indexes for the orderings and filters used in web/src/lib/db.ts
+INDEXES = [
+    "CREATE INDEX idx_mv_performances_year ON mv_performances(year DESC, title)",
+    "CREATE INDEX idx_mv_performances_medium ON mv_performances(medium, year DESC, title)",
+    "CREATE INDEX idx_mv_performances_playwright ON mv_performances(playwright_id, year DESC, title)",
+    "CREATE INDEX idx_mv_performances_work ON mv_performances(work_id, medium, year DESC)",
+    "CREATE INDEX idx_mv_plays_title ON mv_plays(title, id, original_title, year_written, playwright_id, playwright_name, performance_count)",
+    "CREATE INDEX idx_mv_plays_year ON mv_plays(year_written DESC, title)",
+    "CREATE INDEX idx_mv_plays_playwright ON mv_plays(playwright_name, title)",
+    "CREATE INDEX idx_mv_playwrights_name ON mv_playwrights(name, id, birth_year, death_year, nationality, play_count, performance_count)",
+    "CREATE INDEX idx_mv_playwrights_episodes ON mv_playwrights(episode_count DESC, name, id, episode_play_count)",
+    "CREATE INDEX idx_mv_playwrights_nationality ON mv_playwrights(nationality)",
+]
+
+
+def refresh_read_tables(conn: sqlite3.Connection) -> dict[str, int]:
+    """Rebuild all mv_* tables in one transaction. Returns row counts per table."""
+    with conn:
+        for table, ddl in READ_TABLES.items():
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(ddl)
+        for sql in POPULATE:
+            conn.execute(sql)
+        for sql in INDEXES:
+            conn.execute(sql)
+        for table in READ_TABLES:
+            conn.execute(f"ANALYZE {table}")
+
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in READ_TABLES
+    }
@@ -0,0 +1,256 @@
+"""Local mirror of Sceneweb artworks and artists.
+
+Sceneweb is crawled once into its own SQLite file (data/sceneweb.db by
+default, not part of the published database): artwork pages give title,
+playwright and year, artist pages give life years and links to more works,
+which are queued in turn. Rows start as pending stubs, so a crawl can stop
+and resume anywhere, and a refresh re-fetches only pages older than a given
+age. Matching episodes is then an indexed lookup on normalized_title.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from typing import Callable, Iterable, Optional
+
+from .sceneweb_scraper import (
+    BASE_URL,
+    ScenewebArtwork,
+    ScenewebPerson,
+    fetch_artwork_details,
+    fetch_person_details,
+)
+from .title_index import TitleIndex
+from .titles import normalize_title
+
+
+FUZZY_THRESHOLD = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sceneweb_artworks (
+    sceneweb_id INTEGER PRIMARY KEY,
+    title TEXT,
+    normalized_title TEXT,
+    url TEXT,
+    playwright_name TEXT,
+    playwright_sceneweb_id INTEGER,
+    year_written INTEGER,
+    description TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, ok, missing
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sceneweb_artworks_title ON sceneweb_artworks(normalized_title);
+CREATE INDEX IF NOT EXISTS idx_sceneweb_artworks_fetched ON sceneweb_artworks(status, fetched_at);
+
+CREATE TABLE IF NOT EXISTS sceneweb_artists (
+    sceneweb_id INTEGER PRIMARY KEY,
+    name TEXT,
+    url TEXT,
+    birth_year INTEGER,
+    death_year INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sceneweb_artists_fetched ON sceneweb_artists(status, fetched_at);
+"""
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def connect_mirror(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def seed(conn: sqlite3.Connection, kind: str, ids: Iterable[int]) -> int:
+    """Queue artwork or artist IDs that are not mirrored yet. Returns rows added."""
+    table = {"artwork": "sceneweb_artworks", "artist": "sceneweb_artists"}[kind]
+    with conn:
+        cursor = conn.executemany(
+            f"INSERT OR IGNORE INTO {table} (sceneweb_id) VALUES (?)", [(int(i),) for i in ids if i]
+        )
+    return cursor.rowcount
+
+
+def seed_from_database(conn: sqlite3.Connection, db: sqlite3.Connection) -> dict[str, int]:
+    """Queue every Sceneweb ID already referenced by plays and persons."""
+    plays = [row[0] for row in db.execute("SELECT sceneweb_id FROM plays WHERE sceneweb_id IS NOT NULL")]
+    persons = [row[0] for row in db.execute("SELECT sceneweb_id FROM persons WHERE sceneweb_id IS NOT NULL")]
+    return {"artwork": seed(conn, "artwork", plays), "artist": seed(conn, "artist", persons)}
+
+
+def refresh_cutoff(max_age_days: Optional[float], now: Optional[datetime] = None) -> Optional[str]:
+    """Timestamp before which mirrored pages are stale, or None to fetch only pending pages.
+
+    Never later than now, so pages fetched during a crawl are not due again.
+    """
+    if max_age_days is None:
+        return None
+    now = now or datetime.now()
+    return (now - timedelta(days=max(max_age_days, 0))).isoformat(timespec="seconds")
+
+
+def due_pages(conn: sqlite3.Connection, cutoff: Optional[str] = None) -> list[tuple[str, int]]:
+    """(kind, sceneweb_id) of pending pages, plus pages fetched before cutoff."""
+    due = []
+    for kind, table in (("artwork", "sceneweb_artworks"), ("artist", "sceneweb_artists")):
+        rows = conn.execute(
+            f"SELECT sceneweb_id FROM {table} WHERE status = 'pending' OR fetched_at < ? ORDER BY sceneweb_id",
+            (cutoff or "",),
+        )
+        due.extend((kind, row[0]) for row in rows)
+    return due
+
+
+def store_artwork(conn: sqlite3.Connection, sceneweb_id: int, artwork: Optional[ScenewebArtwork]):
+    now = datetime.now().isoformat(timespec="seconds")
+    if artwork is None:
+        conn.execute(
+            "UPDATE sceneweb_artworks SET status = 'missing', fetched_at = ? WHERE sceneweb_id = ?",
+            (now, sceneweb_id),
+        )
+        return
+    conn.execute("""
+        INSERT INTO sceneweb_artworks (
+            sceneweb_id, title, normalized_title, url, playwright_name, playwright_sceneweb_id,
+            year_written, description, status, fetched_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'ok', ?)
+        ON CONFLICT (sceneweb_id) DO UPDATE SET
+            title = excluded.title, normalized_title = excluded.normalized_title, url = excluded.url,
+            playwright_name = excluded.playwright_name,
+            playwright_sceneweb_id = excluded.playwright_sceneweb_id,
+            year_written = excluded.year_written, description = excluded.description,
+            status = 'ok', fetched_at = excluded.fetched_at
+    """, (
+        sceneweb_id, artwork.title, normalize_title(artwork.title), artwork.url, artwork.playwright_name,
+        artwork.playwright_sceneweb_id, artwork.year_written, artwork.description, now,
+    ))
+    if artwork.playwright_sceneweb_id:
+        conn.execute(
+            "INSERT OR IGNORE INTO sceneweb_artists (sceneweb_id) VALUES (?)", (artwork.playwright_sceneweb_id,)
+        )
+
+
+def store_artist(conn: sqlite3.Connection, sceneweb_id: int, person: Optional[ScenewebPerson]):
+    now = datetime.now().isoformat(timespec="seconds")
+    if person is None:
+        conn.execute(
+            "UPDATE sceneweb_artists SET status = 'missing', fetched_at = ? WHERE sceneweb_id = ?",
+            (now, sceneweb_id),
+        )
+        return
+    conn.execute("""
+        INSERT INTO sceneweb_artists (sceneweb_id, name, url, birth_year, death_year, status, fetched_at)
+        VALUES (?, ?, ?, ?, ?, 'ok', ?)
+        ON CONFLICT (sceneweb_id) DO UPDATE SET
+            name = excluded.name, url = excluded.url, birth_year = excluded.birth_year,
+            death_year = excluded.death_year, status = 'ok', fetched_at = excluded.fetched_at
+    """, (sceneweb_id, person.name, person.url, person.birth_year, person.death_year, now))
+    conn.executemany(
+        "INSERT OR IGNORE INTO sceneweb_artworks (sceneweb_id) VALUES (?)",
+        [(artwork_id,) for artwork_id in person.artwork_ids or []],
+    )
+
+
+def crawl(
+    conn: sqlite3.Connection,
+    max_pages: Optional[int] = None,
+    max_age_days: Optional[float] = None,
+    delay: float = 2.0,
+    log: Callable[[str], None] = print,
+) -> dict[str, int]:
+    """Fetch due pages until none are left or max_pages is reached.
+
+    Each page is committed as it is stored, so an interrupted crawl resumes
+    where it stopped. Links found on a page are queued and picked up in the
+    same run.
+    """
+    counts = {"artwork": 0, "artist": 0, "missing": 0}
+    cutoff = refresh_cutoff(max_age_days)  # fixed for the run, so refreshed pages drop out
+    fetched = 0
+    while max_pages is None or fetched < max_pages:
+        due = due_pages(conn, cutoff)
+        if not due:
+            break
+        for kind, sceneweb_id in due:
+            if max_pages is not None and fetched >= max_pages:
+                break
+            if kind == "artwork":
+                page = fetch_artwork_details(sceneweb_id, delay=delay)
+                with conn:
+                    store_artwork(conn, sceneweb_id, page)
+                label = page.title if page else None
+            else:
+                page = fetch_person_details(sceneweb_id, delay=delay)
+                with conn:
+                    store_artist(conn, sceneweb_id, page)
+                label = page.name if page else None
+            fetched += 1
+            counts[kind if page else "missing"] += 1
+            log(f"  [{fetched}] {kind} {sceneweb_id}: {label or '(missing)'}")
+    return counts
+
+
+class ScenewebMirror:
+    """Title lookups against a crawled mirror."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._index: Optional[TitleIndex] = None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM sceneweb_artworks WHERE status = 'ok'").fetchone()[0]
+
+    def _artwork(self, row) -> ScenewebArtwork:
+        sceneweb_id, title, url, playwright_name, playwright_id, year_written, description = row
+        return ScenewebArtwork(sceneweb_id, title, url, playwright_name, playwright_id, year_written, description)
+
+    def _fetch(self, where: str, params: tuple) -> list[ScenewebArtwork]:
+        rows = self.conn.execute(f"""
+            SELECT sceneweb_id, title, url, playwright_name, playwright_sceneweb_id, year_written, description
+            FROM sceneweb_artworks
+            WHERE status = 'ok' AND {where}
+            ORDER BY playwright_sceneweb_id IS NULL, LENGTH(normalized_title), sceneweb_id
+        """, params).fetchall()
+        return [self._artwork(row) for row in rows]
+
+    def match_title(self, title: str) -> Optional[ScenewebArtwork]:
+        """Best artwork for a title: exact, then whole-word prefix, then fuzzy."""
+        normalized = normalize_title(title)
+        if not normalized:
+            return None
+        exact = self._fetch("normalized_title = ?", (normalized,))
+        if exact:
+            return exact[0]
+        # "Brand" -> "Brand et dramatisk dikt", as an index range scan (' ' < '!')
+        prefixed = self._fetch(
+            "normalized_title >= ? AND normalized_title < ?", (normalized + " ", normalized + "!")
+        )
+        if prefixed:
+            return prefixed[0]
+        matches = self.index.search(normalized, _ratio, FUZZY_THRESHOLD, normalized=True)
+        if matches:
+            return self._fetch("sceneweb_id = ?", (matches[0].key,))[0]
+        return None
+
+    def artist(self, sceneweb_id: int) -> Optional[ScenewebPerson]:
+        row = self.conn.execute("""
+            SELECT sceneweb_id, name, url, birth_year, death_year
+            FROM sceneweb_artists WHERE sceneweb_id = ? AND status = 'ok'
+        """, (sceneweb_id,)).fetchone()
+        if row is None:
+            return None
+        return ScenewebPerson(row[0], row[1], row[2] or f"{BASE_URL}/nb/artist/{row[0]}/", row[3], row[4], [])
+
+    @property
+    def index(self) -> TitleIndex:
+        if self._index is None:
+            self._index = TitleIndex(normalize_title)
+            for sceneweb_id, title, normalized in self.conn.execute(
+                "SELECT sceneweb_id, title, normalized_title FROM sceneweb_artworks WHERE status = 'ok'"
+            ):
+                self._index.add(sceneweb_id, title, normalized)
+        return self._index
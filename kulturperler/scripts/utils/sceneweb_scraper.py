@@ -33,6 +33,7 @@ class ScenewebPerson:
     birth_year: Optional[int] = None
     death_year: Optional[int] = None
     roles: list[str] = None
+    artwork_ids: list[int] = None
 
 
 def search_artworks(query: str, delay: float = 2.0) -> list[dict]:
@@ -199,6 +200,13 @@ def fetch_person_details(sceneweb_id: int, name_slug: str = "", delay: float = 2
         if birth_match:
             birth_year = int(birth_match.group(1))
 
+    # Works linked from the artist page, for crawling
+    artwork_ids = []
+    for link in soup.select("a[href*='/nb/artwork/']"):
+        match = re.search(r"/nb/artwork/(\d+)/", link.get("href", ""))
+        if match and int(match.group(1)) not in artwork_ids:
+            artwork_ids.append(int(match.group(1)))
+
     time.sleep(delay)
 
     return ScenewebPerson(
@@ -208,6 +216,7 @@ def fetch_person_details(sceneweb_id: int, name_slug: str = "", delay: float = 2
         birth_year=birth_year,
         death_year=death_year,
         roles=[],
+        artwork_ids=artwork_ids,
     )
 
 
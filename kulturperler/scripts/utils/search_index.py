@@ -0,0 +1,303 @@
+"""Full-text search index (FTS5) over episodes, performances, plays and persons.
+
+Each indexed table gets an external-content FTS5 table fed from a view that
+folds Norwegian spelling variants (aa -> å, æ -> ä, ø -> ö). The unicode61
+tokenizer then strips the diacritics, so "Kaare", "Kåre" and "Kare" index to
+the same token, as do "Bjørnson", "Björnson" and "Bjornson". Triggers keep
+the index current on INSERT, UPDATE and DELETE from any connection, since the
+folding is plain SQL.
+
+FTS rows are keyed by a stable integer: the INTEGER PRIMARY KEY where the
+table has one, otherwise a doc id assigned in a {table}_fts_keys table
+(episodes are keyed by prf_id, and their rowids may change on VACUUM).
+"""
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Historic and Scandinavian spelling variants, applied in order.
+FOLD_RULES = [
+    ("AA", "Å"),
+    ("Aa", "Å"),
+    ("aa", "å"),
+    ("Æ", "Ä"),
+    ("æ", "ä"),
+    ("Ø", "Ö"),
+    ("ø", "ö"),
+]
+
+TOKENIZER = "unicode61 remove_diacritics 2"
+PREFIX_INDEXES = "2 3 4"
+
+
+@dataclass
+class IndexSpec:
+    """An indexed source table."""
+    entity: str
+    table: str
+    key: str
+    label: str
+    columns: list[tuple[str, float]]  # (column, bm25 weight)
+
+
+INDEXES = [
+    IndexSpec("episode", "episodes", "prf_id", "title",
+              [("title", 10.0), ("description", 1.0)]),
+    IndexSpec("performance", "performances", "id", "title",
+              [("title", 10.0), ("description", 1.0)]),
+    IndexSpec("play", "plays", "id", "title",
+              [("title", 10.0), ("original_title", 8.0), ("synopsis", 1.0)]),
+    IndexSpec("person", "persons", "id", "name",
+              [("name", 10.0), ("bio", 1.0)]),
+]
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result.
+
+    score is the raw bm25 score (lower is better), only comparable within one
+    entity; relevance is bm25 relative to the best hit of the same entity
+    (1.0 for the best), which is what results are merged on.
+    """
+    entity: str
+    key: str
+    label: str
+    score: float
+    relevance: float = 1.0
+
+
+def fold(text: Optional[str]) -> str:
+    """Fold spelling variants the same way the index does."""
+    if not text:
+        return ""
+    for old, new in FOLD_RULES:
+        text = text.replace(old, new)
+    return text
+
+
+def fold_sql(expr: str) -> str:
+    """Build the SQL expression equivalent of fold() for a column expression."""
+    for old, new in FOLD_RULES:
+        expr = f"replace({expr}, '{old}', '{new}')"
+    return expr
+
+
+def fts_name(spec: IndexSpec) -> str:
+    return f"{spec.table}_fts"
+
+
+def _existing_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _indexed_columns(conn: sqlite3.Connection, spec: IndexSpec) -> list[tuple[str, float]]:
+    existing = _existing_columns(conn, spec.table)
+    return [(col, weight) for col, weight in spec.columns if col in existing]
+
+
+def _has_integer_key(conn: sqlite3.Connection, spec: IndexSpec) -> bool:
+    """True when spec.key is the table's INTEGER PRIMARY KEY (a rowid alias)."""
+    pk = [row for row in conn.execute(f"PRAGMA table_info({spec.table})") if row[5]]
+    return len(pk) == 1 and pk[0][1] == spec.key and (pk[0][2] or "").upper() == "INTEGER"
+
+
+def _keys_table(spec: IndexSpec) -> str:
+    return f"{fts_name(spec)}_keys"
+
+
+def _drop_index(conn: sqlite3.Connection, spec: IndexSpec):
+    fts = fts_name(spec)
+    for suffix in ("ai", "ad", "au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {spec.table}_{suffix}")
+        conn.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    conn.execute(f"DROP TABLE IF EXISTS {fts}")
+    conn.execute(f"DROP VIEW IF EXISTS {fts}_src")
+    conn.execute(f"DROP TABLE IF EXISTS {_keys_table(spec)}")
+
+
+def _create_index(conn: sqlite3.Connection, spec: IndexSpec, columns: list[str]):
+    fts = fts_name(spec)
+    col_list = ", ".join(columns)
+    folded = ", ".join(f"{fold_sql(f't.{col}')} AS {col}" for col in columns)
+
+    def values(ref: str) -> str:
+        return ", ".join(fold_sql(f"{ref}.{col}") for col in columns)
+
+    if _has_integer_key(conn, spec):
+        source = f"SELECT t.{spec.key} AS doc_id, {folded} FROM {spec.table} t"
+        insert_key = delete_key = ""
+        rekey = ""
+        new_doc = f"NEW.{spec.key}"
+        old_doc = f"OLD.{spec.key}"
+    else:
+        keys = _keys_table(spec)
+        conn.execute(f"CREATE TABLE {keys} (doc_id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL)")
+        conn.execute(f"INSERT INTO {keys} (key) SELECT {spec.key} FROM {spec.table} ORDER BY rowid")
+        source = f"SELECT k.doc_id, {folded} FROM {spec.table} t JOIN {keys} k ON k.key = t.{spec.key}"
+        insert_key = f"INSERT OR IGNORE INTO {keys} (key) VALUES (NEW.{spec.key});"
+        delete_key = f"DELETE FROM {keys} WHERE key = OLD.{spec.key};"
+        rekey = f"UPDATE {keys} SET key = NEW.{spec.key} WHERE key = OLD.{spec.key};"
+        new_doc = f"(SELECT doc_id FROM {keys} WHERE key = NEW.{spec.key})"
+        old_doc = f"(SELECT doc_id FROM {keys} WHERE key = OLD.{spec.key})"
+
+    conn.execute(f"CREATE VIEW {fts}_src AS {source}")
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE {fts} USING fts5(
+            {col_list},
+            content='{fts}_src',
+            content_rowid='doc_id',
+            tokenize='{TOKENIZER}',
+            prefix='{PREFIX_INDEXES}'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {fts}_ai AFTER INSERT ON {spec.table} BEGIN
+            {insert_key}
+            INSERT INTO {fts}(rowid, {col_list})
+            VALUES ({new_doc}, {values('NEW')});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {fts}_ad AFTER DELETE ON {spec.table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list})
+            VALUES ('delete', {old_doc}, {values('OLD')});
+            {delete_key}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER {fts}_au AFTER UPDATE OF {spec.key}, {col_list} ON {spec.table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {col_list})
+            VALUES ('delete', {old_doc}, {values('OLD')});
+            {rekey}
+            INSERT INTO {fts}(rowid, {col_list})
+            VALUES ({new_doc}, {values('NEW')});
+        END
+    """)
+
+
+def installed_columns(conn: sqlite3.Connection) -> dict[str, list[str]]:
+    """{fts_table: [columns]} for the FTS tables currently installed."""
+    installed = {}
+    for spec in INDEXES:
+        fts = fts_name(spec)
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({fts})")]
+        if columns:
+            installed[fts] = columns
+    return installed
+
+
+def install_search_index(conn: sqlite3.Connection) -> dict[str, list[str]]:
+    """Create (or recreate) all FTS tables and triggers, and populate them.
+
+    Only columns that exist in the current schema are indexed, so this works on
+    freshly built databases as well as fully migrated ones. Replaces the legacy
+    insert-only episodes_fts setup. Returns {fts_table: [columns]}.
+    """
+    installed = {}
+    with conn:
+        for spec in INDEXES:
+            if not _existing_columns(conn, spec.table):
+                continue
+            columns = [col for col, _ in _indexed_columns(conn, spec)]
+            _drop_index(conn, spec)
+            _create_index(conn, spec, columns)
+            fts = fts_name(spec)
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            installed[fts] = columns
+    return installed
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> bool:
+    """Reinstall the index if the schema gained indexable columns since install.
+
+    Does nothing on a database without a search index. Returns True when the
+    index was reinstalled; run after schema migrations.
+    """
+    installed = installed_columns(conn)
+    if not installed:
+        return False
+    wanted = {}
+    for spec in INDEXES:
+        if _existing_columns(conn, spec.table):
+            wanted[fts_name(spec)] = [col for col, _ in _indexed_columns(conn, spec)]
+    if wanted == installed:
+        return False
+    install_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """Repopulate all FTS tables from their sources and optimize them."""
+    with conn:
+        for spec in INDEXES:
+            fts = fts_name(spec)
+            if _existing_columns(conn, fts):
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    words = re.findall(r"\w+", fold(query))
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    entities: Optional[list[str]] = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    """Search the index and return the best hits across entities.
+
+    bm25 depends on each table's term statistics, so scores are first made
+    relative to the best hit per entity; ties keep the per-entity rank.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    ranked = []
+    for spec in INDEXES:
+        if entities and spec.entity not in entities:
+            continue
+        fts = fts_name(spec)
+        columns = _existing_columns(conn, fts)
+        if not columns:
+            continue
+        weights = ", ".join(str(w) for col, w in spec.columns if col in columns)
+        if _existing_columns(conn, _keys_table(spec)):
+            join = f"""JOIN {_keys_table(spec)} k ON k.doc_id = {fts}.rowid
+            JOIN {spec.table} t ON t.{spec.key} = k.key"""
+        else:
+            join = f"JOIN {spec.table} t ON t.{spec.key} = {fts}.rowid"
+        rows = conn.execute(f"""
+            SELECT t.{spec.key}, t.{spec.label}, bm25({fts}, {weights}) AS score
+            FROM {fts}
+            {join}
+            WHERE {fts} MATCH ?
+            ORDER BY score
+            LIMIT ?
+        """, (match, limit)).fetchall()
+        if not rows:
+            continue
+        best = rows[0][2]
+        for rank, (key, label, score) in enumerate(rows):
+            # bm25 is negative and lower is better, so score / best is in (0, 1]
+            relevance = score / best if best < 0 else 1.0
+            ranked.append((rank, SearchHit(spec.entity, str(key), label, score, round(relevance, 4))))
+
+    ranked.sort(key=lambda item: (-item[1].relevance, item[0]))
+    return [hit for _, hit in ranked[:limit]]
+
+
+def timed_search(conn: sqlite3.Connection, query: str, **kwargs) -> tuple[list[SearchHit], float]:
+    """Run search() and return (hits, elapsed milliseconds)."""
+    start = time.perf_counter()
+    hits = search(conn, query, **kwargs)
+    return hits, (time.perf_counter() - start) * 1000
@@ -0,0 +1,139 @@
+"""Inverted trigram/token index for fuzzy title matching.
+
+Matching a harvested item against every known title is O(items x titles).
+TitleIndex builds postings from character trigrams and word tokens of the
+normalized titles once; a query collects candidates that share grams with it
+and runs the exact (slow) scorer only on the top-k of those. Titles containing
+given words (e.g. an author's name) can be boosted; they are looked up in the
+word postings, so the boost also reaches titles outside the top-k.
+"""
+
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+DEFAULT_CANDIDATES = 25
+
+
+@dataclass
+class TitleMatch:
+    key: Any
+    title: str
+    normalized: str
+    score: float
+
+
+def title_grams(normalized: str) -> set[str]:
+    """Padded character trigrams plus whole words of a normalized title."""
+    if not normalized:
+        return set()
+    padded = f"  {normalized} "
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    grams.update(f"w:{word}" for word in normalized.split())
+    return grams
+
+
+class TitleIndex:
+    """Postings from title grams to documents, with exact lookup by normalized title.
+
+    Several titles may share a key (e.g. a play's title and original title).
+    """
+
+    def __init__(self, normalize: Callable[[str], str] = lambda s: (s or "").lower().strip()):
+        self.normalize = normalize
+        self.keys: list[Hashable] = []
+        self.titles: list[str] = []
+        self.normalized: list[str] = []
+        self.sizes: list[int] = []
+        self.postings: dict[str, list[int]] = {}
+        self.exact: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: Hashable, title: str, normalized: Optional[str] = None):
+        normalized = self.normalize(title) if normalized is None else normalized
+        if not normalized:
+            return
+        doc = len(self.keys)
+        self.keys.append(key)
+        self.titles.append(title)
+        self.normalized.append(normalized)
+        grams = title_grams(normalized)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(doc)
+        self.exact.setdefault(normalized, []).append(doc)
+
+    def lookup(self, normalized: str) -> list[TitleMatch]:
+        """Documents whose normalized title equals normalized."""
+        return [self._match(doc, 1.0) for doc in self.exact.get(normalized, [])]
+
+    def candidates(self, normalized: str, limit: int = DEFAULT_CANDIDATES) -> list[int]:
+        """Documents sharing the most grams with normalized, best first.
+
+        Ranked by Dice overlap so short exact-ish titles beat long ones that
+        merely contain the query.
+        """
+        grams = title_grams(normalized)
+        if not grams:
+            return []
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        size = len(grams)
+        return heapq.nlargest(
+            limit, shared, key=lambda doc: (2 * shared[doc] / (size + self.sizes[doc]), -doc)
+        )
+
+    def containing(self, words: list[str]) -> set[int]:
+        """Documents whose normalized title contains all of words."""
+        if not words:
+            return set()
+        postings = sorted((self.postings.get(f"w:{word}", []) for word in words), key=len)
+        docs = set(postings[0])
+        for posting in postings[1:]:
+            docs.intersection_update(posting)
+        return docs
+
+    def search(
+        self,
+        query: str,
+        scorer: Callable[[str, str], float],
+        threshold: float = 0.0,
+        limit: int = DEFAULT_CANDIDATES,
+        normalized: bool = False,
+        boost_words: Optional[list[str]] = None,
+        boost: float = 0.0,
+    ) -> list[TitleMatch]:
+        """Score the top candidates for query with scorer(query_norm, title_norm).
+
+        Titles containing all boost_words are scored too, whether or not they
+        are among the top candidates, and get boost added (capped at 1.0).
+        Returns matches scoring at least threshold, best first; ties keep
+        insertion order.
+        """
+        query_norm = query if normalized else self.normalize(query)
+        if not query_norm:
+            return []
+        boosted = self.containing(boost_words) if boost_words and boost else set()
+        docs = sorted(set(self.exact.get(query_norm, [])) | set(self.candidates(query_norm, limit)) | boosted)
+        matches = []
+        for doc in docs:
+            score = scorer(query_norm, self.normalized[doc])
+            if doc in boosted:
+                score = min(1.0, score + boost)
+            if score >= threshold:
+                matches.append(self._match(doc, score))
+        matches.sort(key=lambda m: -m.score)
+        return matches
+
+    def best(self, query: str, scorer: Callable[[str, str], float], threshold: float = 0.0,
+             limit: int = DEFAULT_CANDIDATES, normalized: bool = False) -> Optional[TitleMatch]:
+        matches = self.search(query, scorer, threshold, limit, normalized)
+        return matches[0] if matches else None
+
+    def _match(self, doc: int, score: float) -> TitleMatch:
+        return TitleMatch(self.keys[doc], self.titles[doc], self.normalized[doc], score)
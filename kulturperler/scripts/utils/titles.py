@@ -0,0 +1,163 @@
+"""Shared title cleaning and normalization.
+
+clean_title() strips broadcast noise (part markers, dates, "Fjernsynsteatret
+viser:" prefixes, parenthetical notes) but keeps case, for use as a search
+query. normalize_title() is the lowercase, punctuation-free matching key; it
+is also stored in indexed normalized_title columns on plays, performances and
+episodes, kept current by triggers, so matching can be an indexed equality
+or prefix lookup.
+
+Patterns are compiled once and results memoized, since the same titles are
+normalized over and over by the matchers.
+"""
+
+import re
+import sqlite3
+import unicodedata
+from functools import lru_cache
+
+from .db_schema import table_columns
+
+
+CACHE_SIZE = 1 << 16
+
+# Trailing part markers: "Peer Gynt 1:2", "Brand Del 1", "Brand, del 1", "Brand 1/2"
+PART_SUFFIX_PATTERNS = [
+    re.compile(r"\s+(\d+):(\d+)$", re.IGNORECASE),
+    re.compile(r"\s+Del\s+(\d+)$", re.IGNORECASE),
+    re.compile(r",\s+del\s+(\d+)$", re.IGNORECASE),
+    re.compile(r"\s+(\d+)/(\d+)$", re.IGNORECASE),
+]
+
+BROADCAST_PREFIX_RE = re.compile(
+    r"^(fjernsynsteatret|radioteatret|nrk)\s*(viser|viste)?\s*[:\-]\s*|^fjernsynsteatret\s+(viser|viste)\s+",
+    re.IGNORECASE,
+)
+DATE_RE = re.compile(r"\d{1,2}\.\d{1,2}\.\d{4}")
+PART_MARKER_RE = re.compile(r"\s*\(?\b\d+\s*[:/]\s*\d+\b\)?|\s*\(\d+\s*av\s*\d+\)|\s*-?\s*\bdel\s+\d+\b.*$", re.IGNORECASE)
+PARENTHETICAL_RE = re.compile(r"\s*\([^)]*\)")
+SUFFIX_RE = re.compile(r"\s*-\s*(introduksjon|radioteater)\s*$", re.IGNORECASE)
+TRAILING_YEAR_RE = re.compile(r"\s+\d{4}$")
+TRAILING_RADIO_RE = re.compile(r"\s+radio$", re.IGNORECASE)
+PUNCT_RE = re.compile(r"[^\w\s]")
+
+# Tables that carry a normalized_title column, maintained from their title
+NORMALIZED_TABLES = ["plays", "performances", "episodes"]
+
+
+def split_part(title: str) -> tuple[str, bool]:
+    """Title without a trailing part number. Returns (base_title, had_part)."""
+    for pattern in PART_SUFFIX_PATTERNS:
+        if pattern.search(title):
+            return pattern.sub("", title).strip(), True
+    return title, False
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_title(title: str) -> str:
+    """Title without part markers, dates, broadcaster prefixes or notes; case kept."""
+    if not title:
+        return ""
+    text = unicodedata.normalize("NFKC", title)
+    text = BROADCAST_PREFIX_RE.sub("", text.strip())
+    text = DATE_RE.sub(" ", text)
+    text = PART_MARKER_RE.sub(" ", text)
+    text = PARENTHETICAL_RE.sub(" ", text)
+    text = SUFFIX_RE.sub("", text.strip())
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_title(title: str) -> str:
+    """Matching key: cleaned, lowercase, without punctuation or a trailing year."""
+    text = clean_title(title)
+    text = TRAILING_YEAR_RE.sub("", text)
+    text = TRAILING_RADIO_RE.sub("", text)
+    text = PUNCT_RE.sub(" ", text.lower())
+    return " ".join(text.split())
+
+
+def register_title_functions(conn: sqlite3.Connection):
+    """Make normalize_title() and clean_title() callable from SQL."""
+    conn.create_function("normalize_title", 1, lambda t: normalize_title(t) if t else None, deterministic=True)
+    conn.create_function("clean_title", 1, lambda t: clean_title(t) if t else None, deterministic=True)
+
+
+def install_normalized_titles(conn: sqlite3.Connection) -> dict[str, int]:
+    """Add and index normalized_title on plays, performances and episodes.
+
+    Triggers compute normalized_title on INSERT and on title UPDATE through
+    the SQL normalize_title() function, so every connection that inserts or
+    retitles rows in these tables must call register_title_functions()
+    first (a connection without it gets "no such function"). Rows written
+    before the triggers existed are filled here. Returns rows filled per table.
+    """
+    register_title_functions(conn)
+    for table in NORMALIZED_TABLES:
+        columns = table_columns(conn, table)
+        if not columns:
+            continue
+        if "normalized_title" not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN normalized_title TEXT")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_normalized_title ON {table}(normalized_title)"
+        )
+        # Replaces the earlier trigger that only reset the column to NULL
+        conn.execute(f"DROP TRIGGER IF EXISTS {table}_normalized_title_au")
+        conn.execute(f"""
+            CREATE TRIGGER {table}_normalized_title_au
+            AFTER UPDATE OF title ON {table}
+            WHEN NEW.title IS NOT OLD.title
+            BEGIN
+                UPDATE {table} SET normalized_title = normalize_title(NEW.title) WHERE rowid = NEW.rowid;
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_normalized_title_ai
+            AFTER INSERT ON {table}
+            WHEN NEW.normalized_title IS NOT normalize_title(NEW.title)
+            BEGIN
+                UPDATE {table} SET normalized_title = normalize_title(NEW.title) WHERE rowid = NEW.rowid;
+            END
+        """)
+    return refresh_normalized_titles(conn)
+
+
+def refresh_normalized_titles(conn: sqlite3.Connection) -> dict[str, int]:
+    """Fill normalized_title where it is NULL. Returns rows updated per table."""
+    register_title_functions(conn)
+    updated = {}
+    for table in NORMALIZED_TABLES:
+        columns = table_columns(conn, table)
+        if "normalized_title" not in columns:
+            continue
+        cursor = conn.execute(f"""
+            UPDATE {table} SET normalized_title = normalize_title(title)
+            WHERE normalized_title IS NULL AND title IS NOT NULL
+        """)
+        updated[table] = cursor.rowcount
+    return updated
+
+
+def find_by_title(
+    conn: sqlite3.Connection, table: str, columns: str, title: str,
+    prefix: bool = True, normalized: bool = False,
+) -> list[tuple]:
+    """Rows of table whose normalized_title equals the title's.
+
+    With prefix, falls back to titles that start with it as whole words
+    ("brand" -> "brand et dramatisk dikt"), shortest first. Both are range
+    scans on idx_{table}_normalized_title.
+    """
+    key = title if normalized else normalize_title(title)
+    if not key:
+        return []
+    rows = conn.execute(f"SELECT {columns} FROM {table} WHERE normalized_title = ?", (key,)).fetchall()
+    if rows or not prefix:
+        return rows
+    # ' ' sorts before '!', so this range is exactly the keys starting with "key "
+    return conn.execute(f"""
+        SELECT {columns} FROM {table}
+        WHERE normalized_title >= ? AND normalized_title < ?
+        ORDER BY LENGTH(normalized_title)
+    """, (key + " ", key + "!")).fetchall()
@@ -0,0 +1,51 @@
+"""Union-find with cannot-link constraints.
+
+Shared by person resolution (clusters of duplicate persons) and performance
+grouping (clusters of episodes). Keys only need to be hashable and
+comparable: the smallest key of a cluster becomes its root, so results do
+not depend on the order of the unions.
+"""
+
+from collections import defaultdict
+from typing import Hashable, Iterable, TypeVar
+
+Key = TypeVar("Key", bound=Hashable)
+
+
+class UnionFind:
+    """Union-find that keeps cannot-link pairs apart."""
+
+    def __init__(self, cannot_link: Iterable[tuple[Key, Key]] = ()):
+        self.parent: dict[Key, Key] = {}
+        self.members: dict[Key, set[Key]] = {}
+        self.cannot_link: dict[Key, set[Key]] = defaultdict(set)
+        for a, b in cannot_link:
+            self.cannot_link[a].add(b)
+            self.cannot_link[b].add(a)
+
+    def find(self, x: Key) -> Key:
+        if x not in self.parent:
+            self.parent[x] = x
+            self.members[x] = {x}
+            return x
+        parent = self.parent[x]
+        if parent != x:
+            parent = self.parent[x] = self.find(parent)
+        return parent
+
+    def union(self, a: Key, b: Key) -> bool:
+        """Join the clusters of a and b. Returns False, leaving them apart, if
+        that would put a cannot-link pair in one cluster."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return True
+        small, large = sorted((self.members[ra], self.members[rb]), key=len)
+        if any(self.cannot_link[x] & large for x in small if x in self.cannot_link):
+            return False
+        root, child = min(ra, rb), max(ra, rb)
+        self.parent[child] = root
+        self.members[root] = self.members[root] | self.members.pop(child)
+        return True
+
+    def groups(self) -> dict[Key, list[Key]]:
+        return {root: sorted(members) for root, members in self.members.items()}
@@ -0,0 +1,166 @@
+"""Slim, read-only SQLite export of the working database for the web app.
+
+The web app downloads the whole database file into sql.js, so the export keeps
+only the tables and columns the routes read (see web/src/lib/types.ts), adds
+the indexes those queries use, builds the mv_* read tables, runs ANALYZE and
+VACUUMs into a fresh file with the requested page size.
+"""
+
+import os
+import sqlite3
+import stat
+from pathlib import Path
+
+from .read_tables import refresh_read_tables
+
+
+# Tables shipped to the browser and the columns kept from each
+WEB_TABLES = {
+    "plays": [
+        "id", "title", "original_title", "playwright_id", "year_written",
+        "wikidata_id", "sceneweb_id", "sceneweb_url", "wikipedia_url",
+        "synopsis", "work_type",
+    ],
+    "persons": [
+        "id", "name", "normalized_name", "birth_year", "death_year",
+        "nationality", "wikidata_id", "sceneweb_id", "sceneweb_url",
+        "wikipedia_url", "bio", "image_url",
+    ],
+    "episodes": [
+        "prf_id", "title", "description", "year", "duration_seconds",
+        "image_url", "nrk_url", "play_id", "source", "part_number",
+        "total_parts", "is_introduction", "parent_episode_id",
+        "performance_id", "media_type", "medium",
+    ],
+    "episode_persons": [
+        "episode_id", "person_id", "role", "character_name",
+    ],
+    "performances": [
+        "id", "work_id", "source", "year", "title", "description", "venue",
+        "total_duration", "image_url", "medium",
+    ],
+    "performance_persons": [
+        "id", "performance_id", "person_id", "role", "character_name",
+    ],
+    "tags": [
+        "id", "name", "display_name", "color",
+    ],
+    "episode_tags": [
+        "episode_id", "tag_id",
+    ],
+    "play_external_links": [
+        "id", "play_id", "url", "title", "type", "description", "access_note",
+    ],
+    "nrk_about_programs": [
+        "id", "person_id", "title", "description", "duration_seconds",
+        "image_url", "nrk_url", "program_type", "year", "interest_score",
+        "episode_count",
+    ],
+}
+
+# Indexes backing the queries in web/src/lib/db.ts and the route pages
+WEB_INDEXES = [
+    "CREATE INDEX idx_plays_playwright ON plays(playwright_id, year_written, title)",
+    "CREATE INDEX idx_episodes_performance ON episodes(performance_id, prf_id)",
+    "CREATE INDEX idx_episodes_play ON episodes(play_id)",
+    "CREATE INDEX idx_episode_persons_episode ON episode_persons(episode_id)",
+    "CREATE INDEX idx_episode_persons_person ON episode_persons(person_id, role)",
+    "CREATE INDEX idx_performances_work ON performances(work_id, medium, year)",
+    "CREATE INDEX idx_performance_persons_perf ON performance_persons(performance_id, role)",
+    "CREATE INDEX idx_performance_persons_person ON performance_persons(person_id, role)",
+    "CREATE INDEX idx_play_external_links_play ON play_external_links(play_id)",
+    "CREATE INDEX idx_nrk_about_person ON nrk_about_programs(person_id, interest_score DESC)",
+]
+
+DEFAULT_PAGE_SIZE = 4096
+
+
+def _column_defs(conn: sqlite3.Connection, schema: str, table: str, keep: list[str]) -> tuple[list[str], str]:
+    """Return (kept column names, CREATE TABLE body) mirroring the source types."""
+    info = conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()
+    by_name = {row[1]: row for row in info}
+    columns = [col for col in keep if col in by_name]
+
+    pk_cols = [row[1] for row in sorted(info, key=lambda r: r[5]) if row[5] and row[1] in columns]
+    integer_pk = len(pk_cols) == 1 and (by_name[pk_cols[0]][2] or "").upper() == "INTEGER"
+
+    defs = []
+    for col in columns:
+        col_type = by_name[col][2] or ""
+        if integer_pk and col == pk_cols[0]:
+            defs.append(f"{col} INTEGER PRIMARY KEY")
+        else:
+            defs.append(f"{col} {col_type}".strip())
+    if pk_cols and not integer_pk:
+        defs.append(f"PRIMARY KEY ({', '.join(pk_cols)})")
+    return columns, ",\n    ".join(defs)
+
+
+def _source_tables(conn: sqlite3.Connection) -> set[str]:
+    rows = conn.execute("SELECT name FROM src.sqlite_master WHERE type = 'table'")
+    return {row[0] for row in rows}
+
+
+def _table_sizes(conn: sqlite3.Connection) -> dict[str, int]:
+    """Bytes per table including its indexes, via dbstat when compiled in."""
+    try:
+        rows = conn.execute("""
+            SELECT COALESCE(m.tbl_name, s.name), SUM(s.pgsize)
+            FROM dbstat s
+            LEFT JOIN sqlite_master m ON m.name = s.name
+            GROUP BY 1
+            ORDER BY 2 DESC
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return dict(rows)
+
+
+def export_web_db(source: Path, output: Path, page_size: int = DEFAULT_PAGE_SIZE) -> dict:
+    """Write the slim web database to output. Returns a size report."""
+    tmp = output.with_name(output.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(tmp, uri=True)
+    try:
+        conn.execute(f"PRAGMA page_size = {page_size}")
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("ATTACH DATABASE ? AS src", (f"file:{source}?mode=ro",))
+
+        available = _source_tables(conn)
+        rows = {}
+        with conn:
+            for table, keep in WEB_TABLES.items():
+                if table not in available:
+                    continue
+                columns, body = _column_defs(conn, "src", table, keep)
+                col_list = ", ".join(columns)
+                conn.execute(f"CREATE TABLE {table} (\n    {body}\n)")
+                conn.execute(f"INSERT INTO {table} ({col_list}) SELECT {col_list} FROM src.{table}")
+                rows[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for sql in WEB_INDEXES:
+                table = sql.split(" ON ")[1].split("(")[0]
+                if table in rows:
+                    conn.execute(sql)
+        conn.execute("DETACH DATABASE src")
+
+        rows.update(refresh_read_tables(conn))
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA journal_mode = DELETE")
+        tables = _table_sizes(conn)
+    finally:
+        conn.close()
+
+    os.replace(tmp, output)
+    os.chmod(output, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    return {
+        "source_bytes": source.stat().st_size,
+        "output_bytes": output.stat().st_size,
+        "page_size": page_size,
+        "rows": rows,
+        "table_bytes": tables,
+    }
@@ -2,6 +2,7 @@
 
 import requests
 from typing import Optional
+from urllib.parse import quote
 from dataclasses import dataclass
 
 
@@ -41,6 +42,7 @@ class WikidataPerson:
     death_year: Optional[int] = None
     nationality: Optional[str] = None
     wikipedia_url: Optional[str] = None
+    image_url: Optional[str] = None
 
 
 def search_plays(query: str, language: str = "no") -> list[dict]:
@@ -124,13 +126,37 @@ def get_label(entity: dict, languages: list[str] = None) -> str:
     return ""
 
 
+def wikipedia_page_url(title: str, lang: str = "no") -> str:
+    """URL of a Wikipedia page from its sitelink title."""
+    return f"https://{lang}.wikipedia.org/wiki/{title.replace(' ', '_')}"
+
+
+def fetch_wikipedia_page(title: str, lang: str = "no", session=None) -> Optional[dict]:
+    """REST summary of a Wikipedia article (extract, description, ...), or None if there is none."""
+    url = f"https://{lang}.wikipedia.org/api/rest_v1/page/summary/{quote(title.replace(' ', '_'), safe='')}"
+    resp = (session or requests).get(url, timeout=15)
+    if resp.status_code == 404:
+        return None
+    resp.raise_for_status()
+    data = resp.json()
+    return data if data.get("type") == "standard" else None
+
+
+def fetch_wikipedia_summary(title: str, lang: str = "no", session=None) -> Optional[str]:
+    """Lead paragraph of a Wikipedia article, or None if there is no such article."""
+    page = fetch_wikipedia_page(title, lang, session)
+    if page and page.get("extract"):
+        return page["extract"]
+    return None
+
+
 def get_wikipedia_url(entity: dict, wiki: str = "nowiki") -> Optional[str]:
     """Get Wikipedia URL from sitelinks."""
     sitelinks = entity.get("sitelinks", {})
     if wiki in sitelinks:
         title = sitelinks[wiki].get("title", "")
         if title:
-            return f"https://no.wikipedia.org/wiki/{title.replace(' ', '_')}"
+            return wikipedia_page_url(title)
     return None
 
 
@@ -0,0 +1,378 @@
+"""Local Wikidata subset built from a JSON dump.
+
+ingest_dump() streams a Wikidata JSON dump (latest-all.json.gz, or any
+extract with one entity per line) and keeps only what enrichment needs:
+humans with a stage or writing occupation, literary and dramatic works, and
+countries for citizenship labels. Labels, aliases, life and publication
+years, citizenship, authors, images and Norwegian/English sitelinks go into
+a compact SQLite file (data/wikidata.db by default, not part of the
+published database). Names are stored under the same folded keys the
+resolvers use, so WikidataIndex lookups are a single index probe.
+
+Classes are matched on instance of (P31) only; subclasses would need the
+whole class hierarchy, which a single streaming pass does not have.
+"""
+
+import bz2
+import gzip
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .person_resolution import BIRTH_YEAR_WINDOW, name_tokens
+from .titles import normalize_title
+from .wikidata_api import (
+    P_AUTHOR,
+    P_COUNTRY_OF_CITIZENSHIP,
+    P_DATE_OF_BIRTH,
+    P_DATE_OF_DEATH,
+    P_INSTANCE_OF,
+    P_ORIGINAL_TITLE,
+    P_PUBLICATION_DATE,
+    WikidataPerson,
+    WikidataPlay,
+    extract_year_from_time,
+    get_claim_value,
+    get_label,
+    wikipedia_page_url,
+)
+
+
+P_OCCUPATION = "P106"
+P_IMAGE = "P18"
+HUMAN = 5
+
+OCCUPATIONS = {
+    214917,    # playwright
+    28389,     # screenwriter
+    36180,     # writer
+    6625963,   # novelist
+    49757,     # poet
+    33999,     # actor
+    2259451,   # stage actor
+    10800557,  # film actor
+    10798782,  # television actor
+    3387717,   # theatre director
+    2526255,   # film director
+    3455803,   # director
+    177220,    # singer
+    36834,     # composer
+}
+
+WORK_CLASSES = {
+    25379,     # play
+    7725634,   # literary work
+    8261,      # novel
+    49084,     # short story
+    1344,      # opera
+    5185279,   # poem
+}
+
+COUNTRY_CLASSES = {
+    6256,      # country
+    3624078,   # sovereign state
+    3024240,   # historical country
+}
+
+LABEL_LANGUAGES = ["nb", "no", "nn", "en"]
+NAME_LANGUAGES = ["nb", "no", "nn", "en", "sv", "da", "de", "fr"]
+IMAGE_URL = "http://commons.wikimedia.org/wiki/Special:FilePath/"
+BATCH_SIZE = 5000
+
+# Substrings every kept entity contains; lines without any are not parsed
+PREFILTER = [f'"Q{qid}"' for qid in {HUMAN} | WORK_CLASSES | COUNTRY_CLASSES]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wd_entities (
+    qid INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,  -- person, work, country
+    label TEXT,
+    description TEXT,
+    birth_year INTEGER,
+    death_year INTEGER,
+    citizenship INTEGER,
+    author INTEGER,
+    year INTEGER,
+    original_title TEXT,
+    work_class INTEGER,
+    image TEXT,
+    nowiki TEXT,
+    enwiki TEXT
+);
+
+CREATE TABLE IF NOT EXISTS wd_names (
+    key TEXT NOT NULL,
+    qid INTEGER NOT NULL,
+    alias INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, qid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_wd_names_qid ON wd_names(qid);
+
+CREATE TABLE IF NOT EXISTS wd_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def qid_number(wikidata_id: Optional[str]) -> Optional[int]:
+    """"Q36661" -> 36661."""
+    if not wikidata_id or not wikidata_id.startswith("Q"):
+        return None
+    try:
+        return int(wikidata_id[1:])
+    except ValueError:
+        return None
+
+
+def connect_index(path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def open_dump(path: Path):
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_dump_lines(lines: Iterable[str]) -> Iterator[dict]:
+    """Entities of a dump: a JSON array with one entity per line."""
+    for line in lines:
+        line = line.strip().rstrip(",")
+        if not line or line in ("[", "]"):
+            continue
+        if not any(marker in line for marker in PREFILTER):
+            continue
+        yield json.loads(line)
+
+
+def claim_ids(entity: dict, property_id: str) -> list[int]:
+    """Numeric item IDs of every value of an item-valued property."""
+    ids = []
+    for claim in entity.get("claims", {}).get(property_id, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {})
+        if value.get("type") == "wikibase-entityid":
+            number = qid_number(value.get("value", {}).get("id"))
+            if number is not None:
+                ids.append(number)
+    return ids
+
+
+def _year(entity: dict, property_id: str) -> Optional[int]:
+    value = get_claim_value(entity, property_id)
+    if value and value.get("type") == "time":
+        return extract_year_from_time(value)
+    return None
+
+
+def _first_id(entity: dict, property_id: str) -> Optional[int]:
+    ids = claim_ids(entity, property_id)
+    return ids[0] if ids else None
+
+
+def _names(entity: dict) -> set[str]:
+    names = set()
+    for lang in NAME_LANGUAGES:
+        label = entity.get("labels", {}).get(lang, {}).get("value")
+        if label:
+            names.add(label)
+        names.update(alias.get("value") for alias in entity.get("aliases", {}).get(lang, []))
+    names.discard(None)
+    return names
+
+
+def entity_kind(entity: dict) -> Optional[str]:
+    classes = set(claim_ids(entity, P_INSTANCE_OF))
+    if HUMAN in classes and OCCUPATIONS & set(claim_ids(entity, P_OCCUPATION)):
+        return "person"
+    if WORK_CLASSES & classes:
+        return "work"
+    if COUNTRY_CLASSES & classes:
+        return "country"
+    return None
+
+
+def entity_rows(entity: dict) -> Optional[tuple[tuple, list[tuple]]]:
+    """(wd_entities row, wd_names rows) for an entity worth keeping, else None."""
+    kind = entity_kind(entity)
+    qid = qid_number(entity.get("id"))
+    if kind is None or qid is None:
+        return None
+
+    label = get_label(entity, LABEL_LANGUAGES) or None
+    description = None
+    for lang in LABEL_LANGUAGES:
+        description = entity.get("descriptions", {}).get(lang, {}).get("value")
+        if description:
+            break
+    sitelinks = entity.get("sitelinks", {})
+    original_title = None
+    title_value = get_claim_value(entity, P_ORIGINAL_TITLE)
+    if title_value and title_value.get("type") == "monolingualtext":
+        original_title = title_value.get("value", {}).get("text")
+    image = get_claim_value(entity, P_IMAGE)
+    work_classes = sorted(WORK_CLASSES & set(claim_ids(entity, P_INSTANCE_OF)))
+
+    row = (
+        qid, kind, label, description,
+        _year(entity, P_DATE_OF_BIRTH), _year(entity, P_DATE_OF_DEATH),
+        _first_id(entity, P_COUNTRY_OF_CITIZENSHIP), _first_id(entity, P_AUTHOR),
+        _year(entity, P_PUBLICATION_DATE), original_title,
+        # A play is the most specific class we keep
+        (25379 if 25379 in work_classes else work_classes[0]) if work_classes else None,
+        image.get("value") if image and image.get("type") == "string" else None,
+        sitelinks.get("nowiki", {}).get("title"), sitelinks.get("enwiki", {}).get("title"),
+    )
+
+    names = []
+    if kind != "country":
+        key_of = person_key if kind == "person" else normalize_title
+        names_found = _names(entity)
+        if original_title:
+            names_found.add(original_title)
+        keys = {}
+        for name in names_found:
+            key = key_of(name)
+            if key:
+                keys[key] = keys.get(key, True) and name != label
+        names = [(key, qid, int(alias)) for key, alias in keys.items()]
+    return row, names
+
+
+def person_key(name: str) -> str:
+    return " ".join(name_tokens(name))
+
+
+def ingest_dump(conn: sqlite3.Connection, lines: Iterable[str], source: str = "") -> dict:
+    """Stream entities into the index, replacing earlier rows for the same IDs.
+
+    Commits every BATCH_SIZE kept entities. Returns counts and timing.
+    """
+    start = time.perf_counter()
+    counts = {"parsed": 0, "person": 0, "work": 0, "country": 0}
+    entities, names = [], []
+
+    def flush():
+        with conn:
+            conn.executemany(
+                "DELETE FROM wd_names WHERE qid = ?", [(row[0],) for row in entities]
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO wd_entities VALUES ({', '.join('?' * 14)})", entities
+            )
+            conn.executemany("INSERT OR IGNORE INTO wd_names (key, qid, alias) VALUES (?, ?, ?)", names)
+        entities.clear()
+        names.clear()
+
+    for entity in iter_dump_lines(lines):
+        counts["parsed"] += 1
+        rows = entity_rows(entity)
+        if rows is None:
+            continue
+        entities.append(rows[0])
+        names.extend(rows[1])
+        counts[rows[0][1]] += 1
+        if len(entities) >= BATCH_SIZE:
+            flush()
+    flush()
+
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO wd_meta (key, value) VALUES (?, ?)",
+            [("source", source), ("ingested_at", time.strftime("%Y-%m-%dT%H:%M:%S"))],
+        )
+    counts["seconds"] = time.perf_counter() - start
+    return counts
+
+
+class WikidataIndex:
+    """Person and work lookups against an ingested subset."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM wd_entities WHERE kind != 'country'").fetchone()[0]
+
+    def _candidates(self, kind: str, key: str) -> list[tuple]:
+        return self.conn.execute("""
+            SELECT e.qid, e.birth_year, e.work_class, e.nowiki
+            FROM wd_names n JOIN wd_entities e ON e.qid = n.qid
+            WHERE n.key = ? AND e.kind = ?
+            ORDER BY n.alias, e.qid
+        """, (key, kind)).fetchall()
+
+    def person(self, wikidata_id: str) -> Optional[WikidataPerson]:
+        row = self.conn.execute("""
+            SELECT e.qid, e.label, e.birth_year, e.death_year, c.label, e.nowiki, e.image
+            FROM wd_entities e LEFT JOIN wd_entities c ON c.qid = e.citizenship
+            WHERE e.qid = ? AND e.kind = 'person'
+        """, (qid_number(wikidata_id),)).fetchone()
+        if row is None:
+            return None
+        qid, label, birth_year, death_year, nationality, nowiki, image = row
+        return WikidataPerson(
+            wikidata_id=f"Q{qid}",
+            name=label or "",
+            birth_year=birth_year,
+            death_year=death_year,
+            nationality=nationality,
+            wikipedia_url=wikipedia_page_url(nowiki) if nowiki else None,
+            image_url=IMAGE_URL + image.replace(" ", "%20") if image else None,
+        )
+
+    def work(self, wikidata_id: str) -> Optional[WikidataPlay]:
+        row = self.conn.execute("""
+            SELECT e.qid, e.label, e.original_title, e.author, a.label, e.year, e.nowiki
+            FROM wd_entities e LEFT JOIN wd_entities a ON a.qid = e.author
+            WHERE e.qid = ? AND e.kind = 'work'
+        """, (qid_number(wikidata_id),)).fetchone()
+        if row is None:
+            return None
+        qid, label, original_title, author, author_name, year, nowiki = row
+        return WikidataPlay(
+            wikidata_id=f"Q{qid}",
+            title=label or "",
+            original_title=original_title,
+            author_wikidata_id=f"Q{author}" if author else None,
+            author_name=author_name,
+            year_written=year,
+            wikipedia_url=wikipedia_page_url(nowiki) if nowiki else None,
+        )
+
+    def match_person(self, name: str, birth_year: Optional[int] = None) -> Optional[WikidataPerson]:
+        """The person with this name, or None when there is none or it is ambiguous.
+
+        Candidates whose birth year is known and outside the window are
+        dropped; a tie is broken by a Norwegian Wikipedia article.
+        """
+        candidates = [
+            row for row in self._candidates("person", person_key(name))
+            if not (birth_year and row[1] and abs(row[1] - birth_year) > BIRTH_YEAR_WINDOW)
+        ]
+        if birth_year and len(candidates) > 1:
+            candidates = [row for row in candidates if row[1]] or candidates
+        chosen = _single(candidates)
+        return self.person(f"Q{chosen[0]}") if chosen else None
+
+    def match_play(self, title: str) -> Optional[WikidataPlay]:
+        """The work with this title, preferring plays, or None when ambiguous."""
+        candidates = self._candidates("work", normalize_title(title))
+        if len(candidates) > 1:
+            candidates = [row for row in candidates if row[2] == 25379] or candidates
+        chosen = _single(candidates)
+        return self.work(f"Q{chosen[0]}") if chosen else None
+
+
+def _single(candidates: list[tuple]) -> Optional[tuple]:
+    unique = {row[0]: row for row in candidates}
+    if len(unique) > 1:
+        unique = {qid: row for qid, row in unique.items() if row[3]}
+    return next(iter(unique.values())) if len(unique) == 1 else None
@@ -10,7 +10,7 @@ import time
 import urllib.parse
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "static" / "kulturperler.db"
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "kulturperler.db"
 
 def fetch_wikipedia_extract(title: str) -> tuple[str | None, str | None]:
     """Fetch extract and URL from Norwegian Wikipedia using curl."""
@@ -8,7 +8,7 @@ import sqlite3
 import re
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "static" / "kulturperler.db"
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "kulturperler.db"
 
 
 def extract_author_from_description(description: str) -> str | None:
@@ -5,7 +5,7 @@ Complete enrichment for all remaining playwrights and plays.
 
 import sqlite3
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 # Remaining playwright bios - Norwegian TV dramatists and lesser-known international writers
 PLAYWRIGHT_BIOS = {
@@ -5,7 +5,7 @@ More play synopses to complete the enrichment.
 
 import sqlite3
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 # More play synopses
 PLAY_SYNOPSES = {
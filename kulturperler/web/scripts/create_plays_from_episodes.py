@@ -6,8 +6,12 @@ Identifies series by shared image_url.
 
 import sqlite3
 import os
+import sys
 
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'static', 'kulturperler.db')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+from utils.titles import register_title_functions
+
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'kulturperler.db')
 
 # Series to create plays for (image_url -> play title)
 SERIES_TO_CREATE = {
@@ -20,6 +24,8 @@ SERIES_TO_CREATE = {
 def main():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    # New plays get normalized_title from a trigger
+    register_title_functions(conn)
     cur = conn.cursor()
 
     for image_url, play_title in SERIES_TO_CREATE.items():
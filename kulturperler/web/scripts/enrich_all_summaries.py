@@ -11,7 +11,7 @@ import requests
 import time
 import re
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 # Extended manual synopses for well-known plays
 KNOWN_SYNOPSES = {
@@ -12,7 +12,7 @@ import re
 import urllib.parse
 from pathlib import Path
 
-DB_PATH = Path(__file__).parent.parent / "static" / "kulturperler.db"
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "kulturperler.db"
 
 # Duplicate merges: (keep_id, merge_id)
 DUPLICATES = [
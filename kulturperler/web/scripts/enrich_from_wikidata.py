@@ -10,7 +10,7 @@ import time
 import re
 from urllib.parse import quote
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 WIKIDATA_SPARQL = 'https://query.wikidata.org/sparql'
 
 def sparql_query(query):
@@ -10,7 +10,7 @@ import time
 import re
 from datetime import datetime
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 NRK_SEARCH_API = 'https://psapi.nrk.no/search'
 NRK_PROGRAM_API = 'https://psapi.nrk.no/programs'
 
@@ -8,7 +8,7 @@ import requests
 import time
 import re
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 # Manual synopses for well-known plays
 KNOWN_SYNOPSES = {
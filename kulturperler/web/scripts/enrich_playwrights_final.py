@@ -7,7 +7,7 @@ import sqlite3
 import re
 from collections import Counter
 
-DB_PATH = '../static/kulturperler.db'
+DB_PATH = '../../data/kulturperler.db'
 
 def normalize_name(name):
     return name.lower().strip()
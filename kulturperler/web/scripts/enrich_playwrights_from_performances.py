@@ -10,7 +10,7 @@ common playwright to the play.
 import sqlite3
 from collections import Counter
 
-DB_PATH = '../static/kulturperler.db'
+DB_PATH = '../../data/kulturperler.db'
 
 def main():
     conn = sqlite3.connect(DB_PATH)
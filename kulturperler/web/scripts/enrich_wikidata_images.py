@@ -7,7 +7,7 @@ import sqlite3
 import requests
 import time
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 WIKIDATA_SPARQL = 'https://query.wikidata.org/sparql'
 
 def sparql_query(query):
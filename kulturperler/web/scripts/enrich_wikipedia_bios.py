@@ -8,7 +8,7 @@ import requests
 import time
 import re
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 def get_wikipedia_extract(title):
     """Fetch extract and image from Norwegian Wikipedia."""
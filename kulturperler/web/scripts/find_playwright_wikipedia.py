@@ -8,7 +8,7 @@ import requests
 import time
 import re
 
-DB_PATH = 'static/kulturperler.db'
+DB_PATH = '../data/kulturperler.db'
 
 def search_wikipedia(query):
     """Search Norwegian Wikipedia and return results."""
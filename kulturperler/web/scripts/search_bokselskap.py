@@ -11,7 +11,7 @@ import re
 from pathlib import Path
 from urllib.parse import quote
 
-DB_PATH = Path(__file__).parent.parent / "static" / "kulturperler.db"
+DB_PATH = Path(__file__).parent.parent.parent / "data" / "kulturperler.db"
 
 # Known Norwegian playwrights
 NORWEGIAN_PLAYWRIGHTS = [
@@ -22,15 +22,33 @@ async function loadDatabase(): Promise<Database> {
 		locateFile: (file: string) => `https://sql.js.org/dist/${file}`
 	});
 
-	// Add timestamp to bust cache in development
-	const cacheBuster = import.meta.env.DEV ? `?t=${Date.now()}` : '';
-	const response = await fetch(`/kulturperler.db${cacheBuster}`);
-	const buffer = await response.arrayBuffer();
-	db = new SQL.Database(new Uint8Array(buffer));
+	db = new SQL.Database(await fetchDatabaseFile());
 
 	return db;
 }
 
+interface DatabaseManifest {
+	version: string;
+	bytes: number;
+	files: Record<string, { file: string; bytes: number }>;
+}
+
+// Content-hashed export written by scripts/export_web_db.py. Only the small
+// manifest is revalidated; the hashed files are cached as immutable.
+async function fetchDatabaseFile(): Promise<Uint8Array> {
+	const manifest: DatabaseManifest = await fetch('/db/current.json', { cache: 'no-cache' }).then((r) => r.json());
+
+	const gzipped = manifest.files.gzip;
+	if (gzipped && typeof DecompressionStream !== 'undefined') {
+		const response = await fetch(`/db/${gzipped.file}`);
+		const stream = response.body!.pipeThrough(new DecompressionStream('gzip'));
+		return new Uint8Array(await new Response(stream).arrayBuffer());
+	}
+
+	const response = await fetch(`/db/${manifest.files.identity.file}`);
+	return new Uint8Array(await response.arrayBuffer());
+}
+
 async function loadSqlJs(): Promise<any> {
 	return new Promise((resolve, reject) => {
 		const script = document.createElement('script');
@@ -308,17 +326,10 @@ export interface PlaywrightWithCount {
 export function getPlaywrightsWithCounts(): PlaywrightWithCount[] {
 	const db = getDatabase();
 	const stmt = db.prepare(`
-		SELECT
-			p.id,
-			p.name,
-			COUNT(DISTINCT e.prf_id) as episode_count,
-			COUNT(DISTINCT pl.id) as play_count
-		FROM persons p
-		JOIN plays pl ON p.id = pl.playwright_id
-		JOIN episodes e ON pl.id = e.play_id
-		GROUP BY p.id
-		HAVING episode_count > 0
-		ORDER BY episode_count DESC, p.name
+		SELECT id, name, episode_count, episode_play_count as play_count
+		FROM mv_playwrights
+		WHERE episode_count > 0
+		ORDER BY episode_count DESC, name
 	`);
 
 	const results: PlaywrightWithCount[] = [];
@@ -449,28 +460,14 @@ export function getPerformance(id: number): PerformanceWithDetails | null {
 export function searchPerformances(filters: SearchFilters, limit = 50, offset = 0): PerformanceWithDetails[] {
 	const db = getDatabase();
 
-	let sql = `
-		SELECT
-			perf.*,
-			w.title as work_title,
-			w.playwright_id,
-			playwright.name as playwright_name,
-			(SELECT COUNT(*) FROM episodes e WHERE e.performance_id = perf.id) as media_count,
-			(SELECT name FROM persons WHERE id = (
-				SELECT person_id FROM performance_persons pp
-				WHERE pp.performance_id = perf.id AND pp.role = 'director' LIMIT 1
-			)) as director_name,
-			(SELECT e.image_url FROM episodes e WHERE e.performance_id = perf.id LIMIT 1) as image_url
-		FROM performances perf
-		LEFT JOIN plays w ON perf.work_id = w.id
-		LEFT JOIN persons playwright ON w.playwright_id = playwright.id
-	`;
+	// mv_performances is precomputed by scripts/build_read_tables.py
+	let sql = `SELECT perf.* FROM mv_performances perf`;
 
 	const conditions: string[] = [];
 	const params: (string | number)[] = [];
 
 	if (filters.query) {
-		conditions.push(`(perf.title LIKE ? OR perf.description LIKE ? OR w.title LIKE ?)`);
+		conditions.push(`(perf.title LIKE ? OR perf.description LIKE ? OR perf.work_title LIKE ?)`);
 		const term = `%${filters.query}%`;
 		params.push(term, term, term);
 	}
@@ -486,7 +483,7 @@ export function searchPerformances(filters: SearchFilters, limit = 50, offset =
 	}
 
 	if (filters.playwrightId) {
-		conditions.push(`w.playwright_id = ?`);
+		conditions.push(`perf.playwright_id = ?`);
 		params.push(filters.playwrightId);
 	}
 
@@ -539,13 +536,12 @@ export function searchPerformances(filters: SearchFilters, limit = 50, offset =
 export function getPerformanceCount(filters?: SearchFilters): number {
 	const db = getDatabase();
 
-	let sql = `SELECT COUNT(*) as count FROM performances perf`;
+	let sql = `SELECT COUNT(*) as count FROM mv_performances perf`;
 	const conditions: string[] = [];
 	const params: (string | number)[] = [];
 
 	if (filters?.query) {
-		sql += ` LEFT JOIN plays w ON perf.work_id = w.id`;
-		conditions.push(`(perf.title LIKE ? OR perf.description LIKE ? OR w.title LIKE ?)`);
+		conditions.push(`(perf.title LIKE ? OR perf.description LIKE ? OR perf.work_title LIKE ?)`);
 		const term = `%${filters.query}%`;
 		params.push(term, term, term);
 	}
@@ -762,20 +758,10 @@ export interface PlaywrightWithDetails {
 export function getAllPlaywrights(): PlaywrightWithDetails[] {
 	const db = getDatabase();
 	const stmt = db.prepare(`
-		SELECT
-			p.id,
-			p.name,
-			p.birth_year,
-			p.death_year,
-			p.nationality,
-			COUNT(DISTINCT pl.id) as play_count,
-			COUNT(DISTINCT perf.id) as performance_count
-		FROM persons p
-		JOIN plays pl ON p.id = pl.playwright_id
-		JOIN performances perf ON perf.work_id = pl.id
-		GROUP BY p.id
-		HAVING play_count > 0
-		ORDER BY p.name
+		SELECT id, name, birth_year, death_year, nationality, play_count, performance_count
+		FROM mv_playwrights
+		WHERE play_count > 0
+		ORDER BY name
 	`);
 
 	const results: PlaywrightWithDetails[] = [];
@@ -820,24 +806,14 @@ export interface PlayWithDetails {
 export function getAllPlays(sortBy: 'title' | 'year' | 'playwright' = 'title'): PlayWithDetails[] {
 	const db = getDatabase();
 
-	let orderBy = 'pl.title ASC';
-	if (sortBy === 'year') orderBy = 'pl.year_written DESC NULLS LAST, pl.title ASC';
-	if (sortBy === 'playwright') orderBy = 'playwright.name ASC NULLS LAST, pl.title ASC';
+	let orderBy = 'title ASC';
+	if (sortBy === 'year') orderBy = 'year_written DESC NULLS LAST, title ASC';
+	if (sortBy === 'playwright') orderBy = 'playwright_name ASC NULLS LAST, title ASC';
 
+	// mv_plays only holds plays with at least one performance
 	const stmt = db.prepare(`
-		SELECT
-			pl.id,
-			pl.title,
-			pl.original_title,
-			pl.year_written,
-			pl.playwright_id,
-			playwright.name as playwright_name,
-			COUNT(DISTINCT perf.id) as performance_count
-		FROM plays pl
-		LEFT JOIN persons playwright ON pl.playwright_id = playwright.id
-		LEFT JOIN performances perf ON perf.work_id = pl.id
-		GROUP BY pl.id
-		HAVING performance_count > 0
+		SELECT id, title, original_title, year_written, playwright_id, playwright_name, performance_count
+		FROM mv_plays
 		ORDER BY ${orderBy}
 	`);
 
@@ -852,11 +828,7 @@ export function getAllPlays(sortBy: 'title' | 'year' | 'playwright' = 'title'):
 
 export function getPlayCount(): number {
 	const db = getDatabase();
-	const stmt = db.prepare(`
-		SELECT COUNT(DISTINCT pl.id) as count
-		FROM plays pl
-		JOIN performances perf ON perf.work_id = pl.id
-	`);
+	const stmt = db.prepare('SELECT COUNT(*) as count FROM mv_plays');
 	stmt.step();
 	const result = stmt.getAsObject() as { count: number };
 	stmt.free();
@@ -865,12 +837,7 @@ export function getPlayCount(): number {
 
 export function getAuthorCount(): number {
 	const db = getDatabase();
-	const stmt = db.prepare(`
-		SELECT COUNT(DISTINCT p.id) as count
-		FROM persons p
-		JOIN plays pl ON p.id = pl.playwright_id
-		JOIN performances perf ON perf.work_id = pl.id
-	`);
+	const stmt = db.prepare('SELECT COUNT(*) as count FROM mv_playwrights WHERE play_count > 0');
 	stmt.step();
 	const result = stmt.getAsObject() as { count: number };
 	stmt.free();
@@ -43,6 +43,7 @@ export interface PerformanceWithDetails extends Performance {
 	playwright_name?: string | null;
 	playwright_id?: number | null;
 	director_name?: string | null;
+	director_names?: string | null;
 	media_count?: number;
 }
 